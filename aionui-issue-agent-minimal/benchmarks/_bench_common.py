@@ -0,0 +1,135 @@
+"""Shared helpers for the standalone benchmarks: timing, JSON reports and baseline comparison.
+
+Baselines live in ``benchmarks/baselines/<suite>.json`` as ``{case: {"median_ms": ..., ...}}``.
+A case regresses when its median exceeds ``baseline * (1 + threshold)`` *and* the
+absolute slowdown is above ``min_delta_ms`` (sub-millisecond noise is ignored).
+"""
+from __future__ import annotations
+
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / "scripts" / "python"
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_MIN_DELTA_MS = 1.0
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def time_call(fn: Callable[[], Any], *, repeat: int, warmup: int = 1, setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """Run ``fn`` ``warmup + repeat`` times (``setup`` before each, untimed) and summarize in ms."""
+    samples: List[float] = []
+    for index in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        if index >= warmup:
+            samples.append(elapsed)
+    return summarize_ms(samples)
+
+
+def summarize_ms(samples: List[float]) -> Dict[str, float]:
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples), 3) if samples else 0.0,
+        "p95_ms": round(percentile(samples, 95), 3),
+        "min_ms": round(min(samples), 3) if samples else 0.0,
+        "max_ms": round(max(samples), 3) if samples else 0.0,
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def load_baseline(suite: str) -> Dict[str, Dict[str, Any]]:
+    path = BASELINES_DIR / f"{suite}.json"
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("cases", {})
+
+
+def save_baseline(suite: str, cases: Dict[str, Dict[str, Any]]) -> Path:
+    BASELINES_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINES_DIR / f"{suite}.json"
+    path.write_text(
+        json.dumps({"suite": suite, "environment": environment(), "cases": cases}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def compare_to_baseline(
+    cases: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+    metric: str = "median_ms",
+) -> List[Dict[str, Any]]:
+    regressions = []
+    for name, result in cases.items():
+        base = baseline.get(name)
+        if not base or metric not in base or metric not in result:
+            continue
+        current, reference = float(result[metric]), float(base[metric])
+        if current > reference * (1 + threshold) and current - reference > min_delta_ms:
+            regressions.append(
+                {
+                    "case": name,
+                    "metric": metric,
+                    "baseline": reference,
+                    "current": current,
+                    "ratio": round(current / reference, 2) if reference else None,
+                }
+            )
+    return regressions
+
+
+def add_baseline_args(parser: Any) -> None:
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown ratio (0.5 = +50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--output", help="Also write the full JSON report here")
+
+
+def finish(suite: str, cases: Dict[str, Dict[str, Any]], args: Any, *, metric: str = "median_ms") -> int:
+    """Print the report, update or check the baseline; returns the process exit code."""
+    report: Dict[str, Any] = {"suite": suite, "environment": environment(), "cases": cases}
+    if args.update_baseline:
+        report["baseline_written"] = str(save_baseline(suite, cases))
+        regressions: List[Dict[str, Any]] = []
+    else:
+        regressions = compare_to_baseline(
+            cases, load_baseline(suite), threshold=args.threshold, min_delta_ms=args.min_delta_ms, metric=metric
+        )
+        report["regressions"] = regressions
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if regressions else 0
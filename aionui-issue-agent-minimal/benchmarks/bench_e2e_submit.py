@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark of ``skill_submit_aionui_issue.py`` against the local fake Issue Form.
+
+Each run starts ``fake_issue_form_server.FakeIssueFormServer``, writes a synthetic
+bug work order whose ``project_url`` points at it, and runs the real submitter in
+headless Chromium (``--pause-before-submit-sec 0``, ``--debug-capture none``) as a
+subprocess with ``AIONUI_GITHUB_API_BASE`` aimed at the same server, a throwaway
+``AIONUI_CACHE_DIR`` and retention off.  Nothing leaves 127.0.0.1.
+
+Cases (per scenario: ``no_attachments`` and ``attachments=<n>``):
+
+    e2e/<scenario>                 wall time of the submitter process
+    stage/<scenario>/<span>        per-stage ``duration_sec`` from ``events[-1].extra.timings``
+
+Without a Playwright Chromium (``python -m playwright install chromium``, or
+``--browser-binary``) the runner prints a ``skipped`` report and exits 0.
+
+Usage:
+    python benchmarks/bench_e2e_submit.py
+    python benchmarks/bench_e2e_submit.py --runs 5 --latency upload=0.3 --latency create=1.0
+    python benchmarks/bench_e2e_submit.py --quick --update-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from _bench_common import SCRIPTS_DIR, add_baseline_args, environment, finish, summarize_ms
+from fake_issue_form_server import FakeIssueFormServer, parse_latency
+
+
+SUITE = "e2e_submit"
+SUBMITTER = SCRIPTS_DIR / "skill_submit_aionui_issue.py"
+DEFAULT_RUNS = 3
+DEFAULT_ATTACHMENTS = 3
+ATTACHMENT_BYTES = 256 * 1024
+
+
+def chromium_unavailable_reason(browser_binary: str = "") -> str:
+    """Empty when a Chromium the submitter can launch is present, else why not."""
+    if browser_binary:
+        return "" if Path(browser_binary).is_file() else f"--browser-binary not found: {browser_binary}"
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return "playwright is not installed"
+    try:
+        with sync_playwright() as playwright:
+            executable = playwright.chromium.executable_path
+    except Exception as exc:  # driver missing / unsupported platform
+        return f"playwright driver unavailable: {exc}"
+    if not executable or not Path(executable).is_file():
+        return "Playwright Chromium is not installed (python -m playwright install chromium)"
+    return ""
+
+
+def write_work_order(workspace: Path, project_url: str, run_id: str, attachments: int) -> Path:
+    workspace.mkdir(parents=True, exist_ok=True)
+    paths: List[str] = []
+    for index in range(attachments):
+        path = workspace / f"screen_{index + 1}.png"
+        # unique bytes per run so the attachment cache never short-circuits an upload
+        seed = f"{run_id}:{index}".encode("utf-8")
+        path.write_bytes(seed + os.urandom(max(0, ATTACHMENT_BYTES - len(seed))))
+        paths.append(str(path))
+    data = {
+        "schema_version": "v24",
+        "session_id": "bench",
+        "work_id": workspace.name,
+        "owner_repo": "iOfficeAI/AionUi",
+        "project_url": project_url,
+        "issue_type": "bug",
+        "title": f"[Bug] Offline e2e benchmark {run_id}",
+        "platform": "Linux",
+        "version": "1.0.0",
+        "bug_description": "Synthetic work order for the offline end-to-end benchmark.",
+        "steps_to_reproduce": "1. Open\n2. Click Send",
+        "expected_behavior": "A loading state appears.",
+        "actual_behavior": "The window freezes.",
+        "additional_context": "Generated by bench_e2e_submit.py",
+        "attachments": paths,
+        "attachment_markdown": "",
+    }
+    path = workspace / "work_order.json"
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def run_once(
+    server: FakeIssueFormServer,
+    root: Path,
+    run_id: str,
+    attachments: int,
+    *,
+    browser_binary: str = "",
+    timeout_sec: int = 30,
+) -> Dict[str, Any]:
+    workspace = root / "issue_runs" / "bench" / f"wo-e2e-{run_id}"
+    work_order_path = write_work_order(workspace, server.project_url, run_id, attachments)
+    cmd = [
+        sys.executable,
+        str(SUBMITTER),
+        "--work-order",
+        str(work_order_path),
+        "--headless",
+        "--pause-before-submit-sec",
+        "0",
+        "--login-wait-sec",
+        str(timeout_sec),
+        "--timeout-sec",
+        str(timeout_sec),
+        "--user-data-dir",
+        str(root / "chromium-profile"),
+        "--debug-capture",
+        "none",
+    ]
+    if browser_binary:
+        cmd += ["--browser-binary", browser_binary]
+    env = dict(os.environ)
+    env.update(
+        {
+            "AIONUI_GITHUB_API_BASE": server.base_url,
+            "AIONUI_CACHE_DIR": str(root / f"cache-{run_id}"),
+            "AIONUI_ARTIFACTS_RETENTION": "off",
+        }
+    )
+    env.pop("AIONUI_METRICS_FILE", None)
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=timeout_sec * 10)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    data = json.loads(work_order_path.read_text(encoding="utf-8"))
+    events = data.get("events") or []
+    last = events[-1] if events else {}
+    return {
+        "returncode": proc.returncode,
+        "wall_ms": wall_ms,
+        "issue_url": str(data.get("issue_url") or ""),
+        "timings": (last.get("extra") or {}).get("timings") or [],
+        "stderr_tail": proc.stderr[-2000:],
+    }
+
+
+def run(scenarios: Dict[str, int], runs: int, latency: Dict[str, float], *, browser_binary: str = "") -> Dict[str, Any]:
+    cases: Dict[str, Dict[str, Any]] = {}
+    failures: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="aionui-bench-e2e-") as tmp, FakeIssueFormServer(latency=latency) as server:
+        root = Path(tmp)
+        for scenario, attachments in scenarios.items():
+            walls: List[float] = []
+            stages: Dict[str, List[float]] = {}
+            for index in range(runs):
+                result = run_once(server, root, f"{scenario.replace('=', '')}-{index + 1}", attachments, browser_binary=browser_binary)
+                if result["returncode"] != 0 or not result["issue_url"]:
+                    failures.append({"scenario": scenario, "run": index + 1, **result})
+                    continue
+                walls.append(result["wall_ms"])
+                for span in result["timings"]:
+                    stages.setdefault(str(span["name"]), []).append(float(span.get("duration_sec") or 0.0) * 1000)
+            if walls:
+                cases[f"e2e/{scenario}"] = summarize_ms(walls)
+            for name, samples in sorted(stages.items()):
+                cases[f"stage/{scenario}/{name}"] = summarize_ms(samples)
+        created = len(server.issues)
+    return {"cases": cases, "failures": failures, "issues_created": created}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the Playwright submitter.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Submissions per scenario (default {DEFAULT_RUNS})")
+    parser.add_argument("--attachments", type=int, default=DEFAULT_ATTACHMENTS, help="Files in the attachments scenario")
+    parser.add_argument("--latency", action="append", default=[], metavar="KIND=SEC", help="Fake server delay (page/upload/create/api)")
+    parser.add_argument("--browser-binary", default="", help="Chromium/Chrome binary passed through to the submitter")
+    parser.add_argument("--quick", action="store_true", help="One run per scenario")
+    add_baseline_args(parser)
+    # browser runs are noisy: only flag slowdowns above 250 ms
+    parser.set_defaults(min_delta_ms=250.0)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    reason = chromium_unavailable_reason(args.browser_binary)
+    if reason:
+        print(json.dumps({"suite": SUITE, "environment": environment(), "skipped": reason}, ensure_ascii=False, indent=2))
+        return 0
+    scenarios = {"no_attachments": 0}
+    if args.attachments > 0:
+        scenarios[f"attachments={args.attachments}"] = args.attachments
+    result = run(scenarios, 1 if args.quick else args.runs, parse_latency(args.latency), browser_binary=args.browser_binary)
+    if result["failures"]:
+        print(json.dumps({"suite": SUITE, "failures": result["failures"]}, ensure_ascii=False, indent=2), file=sys.stderr)
+        return 2
+    return finish(SUITE, result["cases"], args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Benchmark ``upload_via_git`` against a local bare ``issue-assets`` repo as its history grows.
+
+For each size the runner builds a bare repo with ``git fast-import`` holding
+``<n>`` existing images (``iOfficeAI/AionUi/wo-bench-<k>/img-<i>.png``, 100 per
+work order, one commit per 1,000 images), then runs the real
+``github_mcp_upload_attachments.upload_via_git`` over ``file://`` and reads the
+spans it records.  Cases, with n in 1,000 / 10,000 / 100,000 (``--quick``: 200 / 1,000):
+
+    clone/images=<n>    git clone --depth 1
+    copy/images=<n>     copying the new attachments into the clone
+    verify/images=<n>   image magic + size checks
+    commit/images=<n>   git add -A + commit
+    push/images=<n>     git push
+    total/images=<n>    upload_via_git end to end; also ``peak_disk_bytes`` (clone size
+                        after the commit) and ``repo_bytes`` (bare repo size)
+
+Each run pushes ``--files`` new images under a fresh work_id, so the repo grows by
+a few files per repetition; that does not change the order of magnitude.
+
+Usage:
+    python benchmarks/bench_git_upload.py
+    python benchmarks/bench_git_upload.py --sizes 1000 50000 --repeat 5
+    python benchmarks/bench_git_upload.py --quick --update-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from _bench_common import add_baseline_args, finish, summarize_ms
+
+from github_mcp_upload_attachments import _tree_size, upload_via_git
+from stage_timings import StageTimer
+
+
+SUITE = "git_upload"
+SIZES = (1_000, 10_000, 100_000)
+QUICK_SIZES = (200, 1_000)
+STAGES = ("clone", "copy", "verify", "commit", "push")
+IMAGES_PER_WORK_ORDER = 100
+IMAGES_PER_COMMIT = 1_000
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+_GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+}
+
+
+def fake_png(seed: str, size: int) -> bytes:
+    """PNG-magic bytes that pass ``_verify_binary_image`` and are unique per ``seed``."""
+    head = PNG_MAGIC + seed.encode("utf-8") + b"\x00"
+    body = bytes((index * 131 + len(seed)) % 251 for index in range(max(0, size - len(head))))
+    return head + body
+
+
+def build_bare_repo(path: Path, images: int, *, image_bytes: int = 2048, branch: str = "main") -> Path:
+    """Create ``path`` as a bare repo whose ``branch`` holds ``images`` existing images."""
+    subprocess.run(["git", "init", "--bare", "--quiet", "-b", branch, str(path)], check=True)
+    chunks: List[bytes] = []
+    mark = 0
+    timestamp = 1_767_225_600  # 2026-01-01T00:00:00Z
+    previous_commit = 0
+    for start in range(0, images, IMAGES_PER_COMMIT) or [0]:
+        entries = []
+        for index in range(start, min(images, start + IMAGES_PER_COMMIT)):
+            mark += 1
+            data = fake_png(f"existing-{index}", image_bytes)
+            chunks.append(b"blob\nmark :%d\ndata %d\n" % (mark, len(data)) + data + b"\n")
+            work_order = index // IMAGES_PER_WORK_ORDER
+            entries.append(f"M 100644 :{mark} iOfficeAI/AionUi/wo-bench-{work_order:05d}/img-{index:06d}.png\n")
+        if not entries:
+            entries.append("M 100644 inline README.md\ndata 15\nissue-assets.\n\n")
+        mark += 1
+        message = f"Seed images {start}..{start + len(entries) - 1}".encode("utf-8")
+        header = (
+            f"commit refs/heads/{branch}\nmark :{mark}\n"
+            f"committer bench <bench@example.invalid> {timestamp + mark} +0000\n"
+        ).encode("utf-8")
+        header += b"data %d\n" % len(message) + message + b"\n"
+        if previous_commit:
+            header += f"from :{previous_commit}\n".encode("utf-8")
+        chunks.append(header + "".join(entries).encode("utf-8") + b"\n")
+        previous_commit = mark
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(chunks), check=True)
+    return path
+
+
+def upload_once(bare: Path, files: List[Path], work_id: str) -> Dict[str, Any]:
+    timer = StageTimer()
+    pairs = [
+        {"local_path": str(path), "remote_path": f"iOfficeAI/AionUi/{work_id}/{path.name}", "filename": path.name}
+        for path in files
+    ]
+    started = time.perf_counter()
+    upload_via_git("bench", "issue-assets", "iOfficeAI/AionUi", work_id, pairs, repo_url=bare.resolve().as_uri(), timer=timer)
+    total_ms = (time.perf_counter() - started) * 1000
+    stages = {span["name"].split(":", 1)[1]: span for span in timer.spans}
+    return {
+        "total_ms": total_ms,
+        "stages_ms": {name: stages[name]["duration_sec"] * 1000 for name in STAGES if name in stages},
+        "clone_bytes": int(stages.get("push", {}).get("clone_bytes") or 0),
+    }
+
+
+def run(sizes: List[int], repeat: int, *, files: int = 3, upload_bytes: int = 512 * 1024, image_bytes: int = 2048) -> Dict[str, Dict[str, Any]]:
+    previous_env = {key: os.environ.get(key) for key in _GIT_IDENTITY}
+    os.environ.update(_GIT_IDENTITY)
+    cases: Dict[str, Dict[str, Any]] = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="aionui-bench-git-") as tmp:
+            root = Path(tmp)
+            uploads = []
+            for index in range(files):
+                path = root / f"upload-{index + 1}.png"
+                path.write_bytes(fake_png(f"upload-{index}", upload_bytes))
+                uploads.append(path)
+            for size in sizes:
+                setup_started = time.perf_counter()
+                bare = build_bare_repo(root / f"issue-assets-{size}.git", size, image_bytes=image_bytes)
+                setup_sec = time.perf_counter() - setup_started
+                results = [upload_once(bare, uploads, f"wo-bench-upload-{size}-{run_index}") for run_index in range(repeat)]
+                for stage in STAGES:
+                    cases[f"{stage}/images={size}"] = summarize_ms([result["stages_ms"].get(stage, 0.0) for result in results])
+                cases[f"total/images={size}"] = {
+                    **summarize_ms([result["total_ms"] for result in results]),
+                    "peak_disk_bytes": max(result["clone_bytes"] for result in results),
+                    "repo_bytes": _tree_size(bare),
+                    "setup_sec": round(setup_sec, 2),
+                }
+    finally:
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark upload_via_git against a local bare issue-assets repo.")
+    parser.add_argument("--sizes", type=int, nargs="+", help=f"Existing images in the repo (default: {' '.join(map(str, SIZES))})")
+    parser.add_argument("--repeat", type=int, default=3, help="Uploads per size")
+    parser.add_argument("--files", type=int, default=3, help="New images pushed per upload")
+    parser.add_argument("--upload-kb", type=int, default=512, help="Size of each new image")
+    parser.add_argument("--image-bytes", type=int, default=2048, help="Size of each existing image")
+    parser.add_argument("--quick", action="store_true", help=f"Sizes {' / '.join(map(str, QUICK_SIZES))}, one upload each")
+    add_baseline_args(parser)
+    # clone/push are process spawns: only flag slowdowns above 20 ms
+    parser.set_defaults(min_delta_ms=20.0)
+    args = parser.parse_args()
+    sizes = list(args.sizes or (QUICK_SIZES if args.quick else SIZES))
+    cases = run(
+        sizes,
+        1 if args.quick else args.repeat,
+        files=args.files,
+        upload_bytes=args.upload_kb * 1024,
+        image_bytes=args.image_bytes,
+    )
+    return finish(SUITE, cases, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark the work_order.json persistence helpers as event history and workspaces grow.
+
+Every helper re-reads and rewrites the whole ``work_order.json`` (and upserts the
+SQLite index), so cost scales with ``len(events)``; ``ensure_work_order_attachments``
+also walks the workspace.  Cases:
+
+    ensure_runtime/events=<n>      ensure_work_order_runtime
+    update_runtime/events=<n>      update_work_order_runtime (status flip)
+    append_event/events=<n>        append_work_order_event
+    ensure_attachments/files=<n>   ensure_work_order_attachments on a workspace with <n> files
+
+with n in 0 / 100 / 1,000 / 10,000 events and 0 / 1,000 / 5,000 files
+(``--quick``: 0 / 100 events, 0 / 200 files).  Work orders are synthetic and live
+under a temporary ``issue_runs/`` tree.
+
+Usage:
+    python benchmarks/bench_persistence.py                    # compare with baselines/persistence.json
+    python benchmarks/bench_persistence.py --update-baseline
+    python benchmarks/bench_persistence.py --quick --threshold 1.0
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from _bench_common import add_baseline_args, finish, time_call
+
+from issue_payload_support import (
+    append_work_order_event,
+    ensure_work_order_attachments,
+    ensure_work_order_runtime,
+    update_work_order_runtime,
+)
+
+
+SUITE = "persistence"
+EVENT_COUNTS = (0, 100, 1_000, 10_000)
+FILE_COUNTS = (0, 1_000, 5_000)
+QUICK_EVENT_COUNTS = (0, 100)
+QUICK_FILE_COUNTS = (0, 200)
+
+
+def synthetic_event(index: int) -> Dict[str, Any]:
+    return {
+        "timestamp": f"2026-03-{1 + index % 28:02d}T10:{index % 60:02d}:00+00:00",
+        "stage": ("submit", "submit_attempt", "upload_attachments", "payload_build")[index % 4],
+        "status": ("started", "retry", "succeeded", "failed")[index % 4],
+        "submitter": ("skill", "github_mcp", "chrome_mcp", "api")[index % 4],
+        "message": f"Synthetic event {index} for benchmarking persistence helpers.",
+        "error": "" if index % 5 else "Timeout waiting for element/state",
+        "issue_url": "",
+        "issue_number": "",
+        "artifacts_dir": "/tmp/issue_runs/bench/artifacts",
+        "extra": {"attempt": index % 3 + 1, "wait_sec": 30, "observation": "url=... title=... heading=..."},
+    }
+
+
+def write_work_order(workspace: Path, events: int) -> Path:
+    workspace.mkdir(parents=True, exist_ok=True)
+    path = workspace / "work_order.json"
+    data = {
+        "schema_version": "v24",
+        "session_id": "bench",
+        "work_id": workspace.name,
+        "owner_repo": "iOfficeAI/AionUi",
+        "issue_type": "bug",
+        "title": "[Bug] Synthetic benchmark work order",
+        "bug_description": "x" * 400,
+        "attachments": [],
+        "runtime": {"status": "draft"},
+        "events": [synthetic_event(index) for index in range(events)],
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def populate_workspace(workspace: Path, files: int) -> None:
+    """``files`` files: 1 in 50 a discoverable image, the rest logs/JSON, spread over nested dirs and artifacts/."""
+    for index in range(files):
+        if index % 4 == 0:
+            folder = workspace / "artifacts"
+        else:
+            folder = workspace / "captures" / f"d{index % 20:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        suffix = ".png" if index % 50 == 0 else (".log", ".json", ".txt")[index % 3]
+        (folder / f"f{index:05d}{suffix}").write_bytes(b"\x89PNG" if suffix == ".png" else b"x")
+
+
+def run(event_counts: List[int], file_counts: List[int], repeat: int) -> Dict[str, Dict[str, Any]]:
+    cases: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="aionui-bench-") as tmp:
+        runs = Path(tmp) / "issue_runs" / "bench"
+        for events in event_counts:
+            path = write_work_order(runs / f"wo-events-{events}", events)
+            ensure_work_order_runtime(path)
+            n = max(3, repeat // 4) if events >= 10_000 else repeat
+            cases[f"ensure_runtime/events={events}"] = time_call(lambda: ensure_work_order_runtime(path), repeat=n)
+            flip = {"value": 0}
+
+            def update() -> None:
+                flip["value"] ^= 1
+                update_work_order_runtime(path, {"status": "submitting" if flip["value"] else "draft"})
+
+            cases[f"update_runtime/events={events}"] = time_call(update, repeat=n)
+            cases[f"append_event/events={events}"] = time_call(
+                lambda: append_work_order_event(path, stage="submit_attempt", status="retry", submitter="skill"),
+                repeat=n,
+            )
+        for files in file_counts:
+            workspace = runs / f"wo-files-{files}"
+            path = write_work_order(workspace, 20)
+            populate_workspace(workspace, files)
+            ensure_work_order_attachments(path)  # first call writes the discovered attachments back
+            cases[f"ensure_attachments/files={files}"] = time_call(lambda: ensure_work_order_attachments(path), repeat=repeat)
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark work_order.json persistence helpers.")
+    parser.add_argument("--quick", action="store_true", help="Small sizes only (smoke run)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case (10k-event cases use a quarter)")
+    add_baseline_args(parser)
+    args = parser.parse_args()
+    cases = run(
+        list(QUICK_EVENT_COUNTS if args.quick else EVENT_COUNTS),
+        list(QUICK_FILE_COUNTS if args.quick else FILE_COUNTS),
+        max(1, args.repeat),
+    )
+    return finish(SUITE, cases, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
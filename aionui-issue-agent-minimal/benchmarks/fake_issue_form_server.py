@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""Local stand-in for GitHub's Issue Form page, for offline end-to-end runs of the submitter.
+
+Serves just enough of github.com for ``skill_submit_aionui_issue.py`` to run unchanged
+against ``http://127.0.0.1:<port>/<owner>/<repo>``:
+
+    GET  /<owner>/<repo>/issues/new?template=<file>  form rendered from assets/templates/<file>:
+         ``input[aria-label='Add a title']``, ``<label id>`` + ``aria-labelledby`` controls,
+         ActionList dropdowns (``aria-expanded`` button -> ``ul[role=menu]`` of ``menuitemradio``),
+         a ``file-attachment`` per textarea and ``button[data-testid='create-issue-button']``
+    POST /upload/policies/assets                     upload policy JSON (``upload_url`` / ``form.key`` /
+                                                     ``asset_upload_url`` / ``asset.href``)
+    POST /storage/upload                             the "S3" bucket
+    PUT  /upload/assets/<id>                         finalize; the page then inserts the markdown
+    POST /<owner>/<repo>/issues                      create -> 303 to /<owner>/<repo>/issues/<n>
+    GET  /<owner>/<repo>/issues/<n>                  issue page (title ``... · Issue #<n> · owner/repo``)
+    GET  /repos/<owner>/<repo>/issues                REST list used by the recent-issue probe
+                                                     (point ``AIONUI_GITHUB_API_BASE`` at the server)
+
+Latency is configurable per route kind (``page`` / ``upload`` / ``create`` / ``api``),
+so the benchmark can model a slow upload or a slow Create without touching the network.
+
+Usage:
+    python benchmarks/fake_issue_form_server.py --port 8765 --latency upload=0.5 --latency create=1.0
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import html
+import json
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+TEMPLATES_DIR = ROOT / "assets" / "templates"
+DEFAULT_OWNER_REPO = "iOfficeAI/AionUi"
+LATENCY_KINDS = ("page", "upload", "create", "api")
+
+_PAGE_SCRIPT = r"""
+document.querySelectorAll('button[data-dropdown]').forEach((button) => {
+  button.addEventListener('click', () => {
+    const open = document.querySelector('ul[role="menu"]');
+    if (open) { open.remove(); }
+    if (button.getAttribute('aria-expanded') === 'true') {
+      button.setAttribute('aria-expanded', 'false');
+      return;
+    }
+    const menu = document.createElement('ul');
+    menu.setAttribute('role', 'menu');
+    JSON.parse(button.dataset.options).forEach((option) => {
+      const item = document.createElement('li');
+      item.setAttribute('role', 'menuitemradio');
+      item.setAttribute('aria-checked', 'false');
+      item.textContent = option;
+      item.addEventListener('click', () => {
+        button.querySelector('span').textContent = option;
+        document.getElementById(button.dataset.dropdown).value = option;
+        button.setAttribute('aria-expanded', 'false');
+        menu.remove();
+      });
+      menu.appendChild(item);
+    });
+    button.after(menu);
+    button.setAttribute('aria-expanded', 'true');
+  });
+});
+
+async function uploadOne(file, textarea) {
+  const placeholder = `<!-- Uploading "${file.name}"... -->`;
+  textarea.value = textarea.value ? `${textarea.value}\n${placeholder}` : placeholder;
+  const policyForm = new FormData();
+  policyForm.append('name', file.name);
+  policyForm.append('size', String(file.size));
+  policyForm.append('content_type', file.type || 'application/octet-stream');
+  const policy = await (await fetch('/upload/policies/assets', { method: 'POST', body: policyForm })).json();
+  const storageForm = new FormData();
+  Object.entries(policy.form).forEach(([key, value]) => storageForm.append(key, value));
+  storageForm.append('file', file);
+  const stored = await fetch(policy.upload_url, { method: 'POST', body: storageForm });
+  if (!stored.ok) { throw new Error(`storage HTTP ${stored.status}`); }
+  const finalized = await fetch(policy.asset_upload_url, { method: 'PUT', headers: { Accept: 'application/json' } });
+  if (!finalized.ok) { throw new Error(`finalize HTTP ${finalized.status}`); }
+  const image = (file.type || '').startsWith('image/');
+  const markdown = `${image ? '!' : ''}[${file.name}](${policy.asset.href})`;
+  textarea.value = textarea.value.replace(placeholder, markdown);
+  textarea.dispatchEvent(new Event('input', { bubbles: true }));
+}
+
+document.querySelectorAll('file-attachment input[type="file"]').forEach((input) => {
+  input.addEventListener('change', () => {
+    const textarea = input.closest('file-attachment').querySelector('textarea');
+    Array.from(input.files).forEach((file) => uploadOne(file, textarea).catch(() => {
+      textarea.value = textarea.value.replace(`<!-- Uploading "${file.name}"... -->`, '');
+    }));
+    input.value = '';
+  });
+});
+"""
+
+
+def _esc(value: Any) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def render_issue_form(template: Dict[str, Any], owner_repo: str) -> str:
+    """HTML for ``/issues/new``: one labelled control per template body field, GitHub-style."""
+    parts: List[str] = []
+    for item in template.get("body") or []:
+        kind = str(item.get("type") or "")
+        fid = str(item.get("id") or "")
+        attrs = item.get("attributes") or {}
+        label = str(attrs.get("label") or "")
+        if kind == "markdown" or not fid or not label:
+            continue
+        label_id = f"issue-form-label-{fid}"
+        name = f"issue_form[{fid}]"
+        parts.append('<div class="ElementWrapper">')
+        parts.append(f'<label id="{label_id}" class="FormControl-label">{_esc(label)}</label>')
+        if kind == "dropdown":
+            options = [str(option) for option in attrs.get("options") or []]
+            parts.append(
+                f'<button type="button" aria-haspopup="true" aria-expanded="false" aria-labelledby="{label_id}" '
+                f'data-dropdown="field-{_esc(fid)}" data-options="{_esc(json.dumps(options))}">'
+                "<span>Selections: None</span></button>"
+            )
+            parts.append(f'<input type="hidden" id="field-{_esc(fid)}" name="{_esc(name)}" value="">')
+        elif kind == "input":
+            parts.append(f'<input type="text" name="{_esc(name)}" aria-labelledby="{label_id}">')
+        else:
+            parts.append(
+                "<file-attachment>"
+                f'<textarea name="{_esc(name)}" aria-labelledby="{label_id}" rows="6"></textarea>'
+                '<input type="file" multiple hidden class="manual-file-chooser">'
+                "</file-attachment>"
+            )
+        parts.append("</div>")
+    title = str(template.get("title") or "")
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>New Issue · {_esc(owner_repo)}</title></head><body><main>"
+        f'<form method="post" action="/{_esc(owner_repo)}/issues">'
+        f'<input type="text" name="issue[title]" aria-label="Add a title" value="{_esc(title)}">'
+        + "".join(parts)
+        + '<button type="submit" data-testid="create-issue-button">Create</button>'
+        f"</form></main><script>{_PAGE_SCRIPT}</script></body></html>"
+    )
+
+
+def render_issue_page(issue: Dict[str, Any], owner_repo: str) -> str:
+    title = _esc(issue["title"])
+    number = issue["number"]
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{title} · Issue #{number} · {_esc(owner_repo)}</title>"
+        f'<link rel="canonical" href="{_esc(issue["html_url"])}"></head>'
+        f"<body><main><h1>{title} #{number}</h1></main></body></html>"
+    )
+
+
+class FakeIssueFormServer:
+    """Threaded local server; use as a context manager or call ``start()`` / ``stop()``."""
+
+    def __init__(
+        self,
+        *,
+        owner_repo: str = DEFAULT_OWNER_REPO,
+        templates_dir: Path = TEMPLATES_DIR,
+        latency: Optional[Dict[str, float]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.owner_repo = owner_repo
+        self.templates_dir = templates_dir
+        self.latency = {kind: 0.0 for kind in LATENCY_KINDS}
+        self.latency.update(latency or {})
+        self.issues: List[Dict[str, Any]] = []
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def project_url(self) -> str:
+        return f"{self.base_url}/{self.owner_repo}"
+
+    def start(self) -> "FakeIssueFormServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-issue-form", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeIssueFormServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def create_issue(self, title: str, fields: Dict[str, str]) -> Dict[str, Any]:
+        with self._lock:
+            number = len(self.issues) + 1
+            issue = {
+                "number": number,
+                "title": title,
+                "fields": fields,
+                "html_url": f"{self.project_url}/issues/{number}",
+                "created_at": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+            self.issues.append(issue)
+        return issue
+
+
+def _make_handler(server: FakeIssueFormServer) -> type:
+    repo_prefix = f"/{server.owner_repo}"
+    issue_page_re = re.compile(rf"^{re.escape(repo_prefix)}/issues/(\d+)$")
+    finalize_re = re.compile(r"^/upload/assets/([0-9a-f-]+)$")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - BaseHTTPRequestHandler signature
+            return
+
+        # -- plumbing -----------------------------------------------------
+
+        def _delay(self, kind: str) -> None:
+            seconds = float(server.latency.get(kind) or 0.0)
+            if seconds > 0:
+                time.sleep(seconds)
+
+        def _body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8", headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _send_json(self, status: int, payload: Any) -> None:
+            self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+        def _record(self, path: str) -> None:
+            with server._lock:
+                server.requests.append({"method": self.command, "path": path, "at": time.monotonic()})
+
+        # -- routes -------------------------------------------------------
+
+        def do_GET(self) -> None:
+            url = urllib.parse.urlsplit(self.path)
+            self._record(url.path)
+            if url.path == f"{repo_prefix}/issues/new":
+                self._delay("page")
+                template_name = (urllib.parse.parse_qs(url.query).get("template") or [""])[0]
+                template_path = server.templates_dir / Path(template_name).name
+                if not template_name or not template_path.is_file():
+                    self._send(404, b"template not found")
+                    return
+                template = yaml.safe_load(template_path.read_text(encoding="utf-8")) or {}
+                self._send(200, render_issue_form(template, server.owner_repo).encode("utf-8"))
+                return
+            match = issue_page_re.match(url.path)
+            if match:
+                self._delay("page")
+                number = int(match.group(1))
+                issue = next((item for item in server.issues if item["number"] == number), None)
+                if issue is None:
+                    self._send(404, b"not found")
+                    return
+                self._send(200, render_issue_page(issue, server.owner_repo).encode("utf-8"))
+                return
+            if url.path == f"/repos/{server.owner_repo}/issues":
+                self._delay("api")
+                self._send_json(
+                    200,
+                    [
+                        {key: issue[key] for key in ("number", "title", "html_url", "created_at")}
+                        for issue in reversed(server.issues)
+                    ],
+                )
+                return
+            match = re.match(r"^/user-attachments/assets/([0-9a-f-]+)$", url.path)
+            if match and match.group(1) in server.uploads:
+                upload = server.uploads[match.group(1)]
+                self._send(200, upload.get("data", b""), upload.get("content_type") or "application/octet-stream")
+                return
+            self._send(404, b"not found")
+
+        def do_POST(self) -> None:
+            url = urllib.parse.urlsplit(self.path)
+            self._record(url.path)
+            body = self._body()
+            if url.path == "/upload/policies/assets":
+                self._delay("upload")
+                fields = _form_fields(self.headers.get("Content-Type", ""), body)
+                asset_id = str(uuid.uuid4())
+                with server._lock:
+                    server.uploads[asset_id] = {
+                        "name": fields.get("name", ""),
+                        "content_type": fields.get("content_type", ""),
+                        "state": "policy",
+                    }
+                base = f"http://{self.headers.get('Host') or server.base_url.split('://', 1)[1]}"
+                self._send_json(
+                    201,
+                    {
+                        "upload_url": f"{base}/storage/upload",
+                        "form": {"key": f"uploads/{asset_id}", "Content-Type": fields.get("content_type", "")},
+                        "asset_upload_url": f"/upload/assets/{asset_id}",
+                        "asset": {"id": asset_id, "name": fields.get("name", ""), "href": f"{base}/user-attachments/assets/{asset_id}"},
+                    },
+                )
+                return
+            if url.path == "/storage/upload":
+                self._delay("upload")
+                match = re.search(rb"uploads/([0-9a-f-]{36})", body)
+                upload = server.uploads.get(match.group(1).decode("ascii")) if match else None
+                if upload is None:
+                    self._send(400, b"unknown key")
+                    return
+                upload.update({"state": "stored", "data": body, "size": len(body)})
+                self._send(204)
+                return
+            if url.path == f"{repo_prefix}/issues":
+                self._delay("create")
+                form = urllib.parse.parse_qs(body.decode("utf-8"), keep_blank_values=True)
+                title = (form.get("issue[title]") or [""])[0].strip()
+                if not title:
+                    self._send(422, b"title can't be blank")
+                    return
+                fields = {
+                    key[len("issue_form["):-1]: values[0]
+                    for key, values in form.items()
+                    if key.startswith("issue_form[") and key.endswith("]")
+                }
+                issue = server.create_issue(title, fields)
+                self._send(303, headers={"Location": f"{repo_prefix}/issues/{issue['number']}"})
+                return
+            self._send(404, b"not found")
+
+        def do_PUT(self) -> None:
+            url = urllib.parse.urlsplit(self.path)
+            self._record(url.path)
+            self._body()
+            match = finalize_re.match(url.path)
+            upload = server.uploads.get(match.group(1)) if match else None
+            if upload is None or upload.get("state") != "stored":
+                self._send(422 if upload else 404, b"asset not uploaded")
+                return
+            self._delay("upload")
+            upload["state"] = "finalized"
+            self._send_json(200, {"id": match.group(1), "name": upload["name"]})
+
+    return Handler
+
+
+def _form_fields(content_type: str, body: bytes) -> Dict[str, str]:
+    """Text fields of a ``multipart/form-data`` or urlencoded body (files are ignored)."""
+    if "multipart/form-data" not in content_type:
+        parsed = urllib.parse.parse_qs(body.decode("utf-8", errors="replace"))
+        return {key: values[0] for key, values in parsed.items()}
+    boundary = content_type.split("boundary=", 1)[-1].strip('"').encode("utf-8")
+    fields: Dict[str, str] = {}
+    for part in body.split(b"--" + boundary):
+        head, _, value = part.partition(b"\r\n\r\n")
+        match = re.search(rb'name="([^"]+)"', head)
+        if match and b"filename=" not in head:
+            fields[match.group(1).decode("utf-8")] = value.rstrip(b"\r\n").decode("utf-8", errors="replace")
+    return fields
+
+
+def parse_latency(values: List[str]) -> Dict[str, float]:
+    latency: Dict[str, float] = {}
+    for raw in values:
+        kind, _, seconds = raw.partition("=")
+        if kind not in LATENCY_KINDS:
+            raise SystemExit(f"--latency kind must be one of {', '.join(LATENCY_KINDS)}: {raw}")
+        latency[kind] = float(seconds)
+    return latency
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a local copy of the GitHub Issue Form flow.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--owner-repo", default=DEFAULT_OWNER_REPO)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="KIND=SEC",
+        help=f"Added delay per route kind ({' / '.join(LATENCY_KINDS)}); repeatable",
+    )
+    args = parser.parse_args()
+    server = FakeIssueFormServer(owner_repo=args.owner_repo, latency=parse_latency(args.latency), port=args.port)
+    print(f"Fake issue form: {server.project_url}/issues/new?template=bug_report.yml")
+    print(f"Point the probe here with AIONUI_GITHUB_API_BASE={server.base_url}")
+    with server:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Stress harness: many concurrent submitter processes on one ``issue_runs/<session_id>`` tree.
+
+Starts ``--processes`` worker processes (released together by a barrier).  Each
+performs ``--ops`` operations on randomly chosen shared work orders, cycling
+through the roles that touch ``work_order.json`` in production:
+
+    github_payload   github_mcp_build_payload.build_payload_for_work_order (no cache)
+    chrome_bundle    chrome_mcp_build_bundle.build_bundle_for_work_order (no cache)
+    uploader         github_mcp_upload_attachments.prepare_attachments (no attachments,
+                     so no network: the runtime/event/prepare_count writes only)
+    runtime          update_work_order_runtime (status flip, attempt_count + 1) + one event
+    submitter        claims the issue: writes issue_number/issue_url unless one is set,
+                     the same check-then-write the submitters do before creating an issue
+
+Every operation appends exactly one event.  Afterwards the harness checks:
+
+    lost_events          appended events missing from the final ``events[]``
+    lost_counter_updates ``prepare_count`` / ``attempt_count`` increments that vanished
+    corrupt_reads        operations that read a half-written work_order.json
+    corrupt_files        work orders that no longer parse at the end
+    duplicate_issue_claims  work orders where more than one process believed it wrote
+                         the issue_number (a real run would have created two issues)
+    errors               any other exception, by type
+
+and reports throughput (ops/s overall and per role, p50/p95 latency).  Exit code
+is 1 when any check fails, so a locking or store change can be validated with
+the same seed on a laptop.
+
+Usage:
+    python benchmarks/stress_shared_workspace.py
+    python benchmarks/stress_shared_workspace.py --processes 16 --ops 100 --work-orders 2 --seed 7
+    python benchmarks/stress_shared_workspace.py --root /tmp/stress --keep --output report.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import random
+import shutil
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from _bench_common import environment, percentile
+
+from chrome_mcp_build_bundle import build_bundle_for_work_order
+from github_mcp_build_payload import build_payload_for_work_order
+from github_mcp_upload_attachments import prepare_attachments
+from issue_payload_support import append_work_order_event, update_work_order_runtime
+
+
+ROLES = ("github_payload", "chrome_bundle", "uploader", "runtime", "submitter")
+DEFAULT_SESSION = "stress-session"
+
+
+def write_work_orders(root: Path, session_id: str, count: int) -> List[Path]:
+    paths = []
+    for index in range(count):
+        workspace = root / "issue_runs" / session_id / f"wo-stress-{index + 1:03d}"
+        workspace.mkdir(parents=True, exist_ok=True)
+        path = workspace / "work_order.json"
+        data = {
+            "schema_version": "v24",
+            "session_id": session_id,
+            "work_id": workspace.name,
+            "owner_repo": "iOfficeAI/AionUi",
+            "project_url": "https://github.com/iOfficeAI/AionUi",
+            "issue_type": "bug",
+            "title": f"[Bug] Stress work order {index + 1}",
+            "platform": "Linux",
+            "version": "1.0.0",
+            "bug_description": "Synthetic work order shared by concurrent stress workers.",
+            "steps_to_reproduce": "1. Open\n2. Click Send",
+            "expected_behavior": "A loading state appears.",
+            "actual_behavior": "The window freezes.",
+            "additional_context": "",
+            "attachments": [],
+            "attachment_markdown": "",
+        }
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _claim_issue(path: Path, worker: int, op: int) -> Optional[str]:
+    """Check-then-write of issue_number; returns the number written, or None if already claimed."""
+    current = _read_json(path)
+    if str(current.get("issue_number") or "").strip():
+        return None
+    number = str(100_000 + worker * 1_000 + op)
+    update_work_order_runtime(
+        path,
+        {"status": "submitted"},
+        {"issue_number": number, "issue_url": f"https://github.com/iOfficeAI/AionUi/issues/{number}"},
+    )
+    return number
+
+
+def _run_op(role: str, path: Path, worker: int, op: int) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"role": role, "work_order": str(path)}
+    if role == "github_payload":
+        build_payload_for_work_order(path, use_cache=False)
+    elif role == "chrome_bundle":
+        build_bundle_for_work_order(path, use_cache=False)
+    elif role == "uploader":
+        code, _ = prepare_attachments(path, login="stress")
+        if code != 0:
+            raise RuntimeError(f"prepare_attachments exit {code}")
+        result["prepare_increment"] = 1
+    elif role == "runtime":
+        attempts = int((_read_json(path).get("runtime") or {}).get("attempt_count") or 0)
+        update_work_order_runtime(path, {"status": ("draft", "payload_ready")[op % 2], "attempt_count": attempts + 1})
+        append_work_order_event(path, stage="stress", status="runtime_update", submitter="stress", extra={"worker": worker, "op": op})
+        result["attempt_increment"] = 1
+    elif role == "submitter":
+        claimed = _claim_issue(path, worker, op)
+        append_work_order_event(
+            path,
+            stage="stress",
+            status="issue_claimed" if claimed else "issue_already_claimed",
+            submitter="stress",
+            issue_number=claimed or "",
+            extra={"worker": worker, "op": op},
+        )
+        result["claimed_issue_number"] = claimed or ""
+    return result
+
+
+def worker_main(worker: int, paths: List[str], ops: int, seed: int, barrier: Any, results: Any) -> None:
+    rng = random.Random(seed * 10_007 + worker)
+    records = []
+    barrier.wait()
+    for op in range(ops):
+        role = ROLES[(worker + op) % len(ROLES)]
+        path = Path(rng.choice(paths))
+        started = time.perf_counter()
+        record: Dict[str, Any] = {"role": role, "work_order": str(path), "events": 1, "ok": True}
+        try:
+            record.update(_run_op(role, path, worker, op))
+        except json.JSONDecodeError as exc:
+            record.update({"ok": False, "events": 0, "error_type": "corrupt_read", "error": str(exc)})
+        except Exception as exc:  # every failure is part of the report
+            record.update(
+                {"ok": False, "events": 0, "error_type": type(exc).__name__, "error": "".join(traceback.format_exception_only(type(exc), exc)).strip()}
+            )
+        record["latency_ms"] = (time.perf_counter() - started) * 1000
+        records.append(record)
+    results.put((worker, records))
+
+
+def check_integrity(paths: List[Path], records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare what the workers did with what ended up on disk."""
+    expected: Dict[str, Dict[str, int]] = {str(path): {"events": 0, "prepare": 0, "attempt": 0} for path in paths}
+    claims: Dict[str, List[str]] = {str(path): [] for path in paths}
+    errors: Dict[str, int] = {}
+    for record in records:
+        totals = expected.setdefault(record["work_order"], {"events": 0, "prepare": 0, "attempt": 0})
+        if record.get("ok"):
+            totals["events"] += record.get("events", 0)
+            totals["prepare"] += record.get("prepare_increment", 0)
+            totals["attempt"] += record.get("attempt_increment", 0)
+            if record.get("claimed_issue_number"):
+                claims.setdefault(record["work_order"], []).append(record["claimed_issue_number"])
+        elif record.get("error_type") != "corrupt_read":
+            errors[record["error_type"]] = errors.get(record["error_type"], 0) + 1
+
+    report: Dict[str, Any] = {
+        "lost_events": 0,
+        "lost_counter_updates": 0,
+        "corrupt_reads": sum(1 for record in records if record.get("error_type") == "corrupt_read"),
+        "corrupt_files": [],
+        "duplicate_issue_claims": [],
+        "errors": errors,
+        "work_orders": {},
+    }
+    for key, totals in expected.items():
+        path = Path(key)
+        try:
+            data = _read_json(path)
+        except (OSError, ValueError) as exc:
+            report["corrupt_files"].append({"work_order": key, "error": str(exc)})
+            continue
+        events = [event for event in data.get("events") or [] if isinstance(event, dict)]
+        runtime = data.get("runtime") if isinstance(data.get("runtime"), dict) else {}
+        lost_events = max(0, totals["events"] - len(events))
+        lost_counters = max(0, totals["prepare"] - int(runtime.get("prepare_count") or 0)) + max(
+            0, totals["attempt"] - int(runtime.get("attempt_count") or 0)
+        )
+        report["lost_events"] += lost_events
+        report["lost_counter_updates"] += lost_counters
+        if len(claims.get(key, [])) > 1:
+            report["duplicate_issue_claims"].append(
+                {"work_order": key, "claimed": claims[key], "on_disk": str(data.get("issue_number") or "")}
+            )
+        report["work_orders"][path.parent.name] = {
+            "expected_events": totals["events"],
+            "events": len(events),
+            "lost_events": lost_events,
+            "lost_counter_updates": lost_counters,
+            "issue_claims": len(claims.get(key, [])),
+        }
+    report["ok"] = not (
+        report["lost_events"]
+        or report["lost_counter_updates"]
+        or report["corrupt_reads"]
+        or report["corrupt_files"]
+        or report["duplicate_issue_claims"]
+        or report["errors"]
+    )
+    return report
+
+
+def _throughput(records: List[Dict[str, Any]], wall_sec: float) -> Dict[str, Any]:
+    by_role: Dict[str, Dict[str, Any]] = {}
+    for role in ROLES:
+        latencies = [record["latency_ms"] for record in records if record["role"] == role]
+        if latencies:
+            by_role[role] = {
+                "ops": len(latencies),
+                "ops_per_sec": round(len(latencies) / wall_sec, 1) if wall_sec else 0.0,
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+            }
+    return {
+        "ops": len(records),
+        "wall_sec": round(wall_sec, 3),
+        "ops_per_sec": round(len(records) / wall_sec, 1) if wall_sec else 0.0,
+        "by_role": by_role,
+    }
+
+
+def run(root: Path, *, processes: int, ops: int, work_orders: int, seed: int = 0, session_id: str = DEFAULT_SESSION) -> Dict[str, Any]:
+    paths = write_work_orders(root, session_id, work_orders)
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes + 1)
+    results = context.Queue()
+    workers = [
+        context.Process(target=worker_main, args=(index, [str(path) for path in paths], ops, seed, barrier, results))
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    records: List[Dict[str, Any]] = []
+    for _ in workers:
+        _, worker_records = results.get()
+        records.extend(worker_records)
+    wall_sec = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+    return {
+        "config": {"processes": processes, "ops": ops, "work_orders": work_orders, "seed": seed, "root": str(root)},
+        "environment": environment(),
+        "throughput": _throughput(records, wall_sec),
+        "integrity": check_integrity(paths, records),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent submitters on one shared issue_runs session.")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50, help="Operations per process")
+    parser.add_argument("--work-orders", type=int, default=2, help="Shared work orders in the session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--root", help="Directory for issue_runs/ (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary tree for inspection")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    root = Path(args.root).expanduser().resolve() if args.root else Path(tempfile.mkdtemp(prefix="aionui-stress-"))
+    try:
+        report = run(root, processes=args.processes, ops=args.ops, work_orders=args.work_orders, seed=args.seed)
+    finally:
+        if not args.root and not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0 if report["integrity"]["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Create the issue with a single REST call: the ``api`` submitter.
+
+No browser: title/body come from the same builder as ``github_mcp``
+(``build_issue_body_markdown``) and are POSTed to
+``/repos/{owner}/{repo}/issues`` with ``GITHUB_TOKEN`` / ``GH_TOKEN``.
+
+Idempotency:
+    - an existing ``issue_number`` / ``issue_url`` skips submission unless ``--force``
+    - ``--skip-if-duplicate`` checks the local issue corpus first
+    - if the POST response is lost (network error / 5xx), or a previous ``api`` run
+      was interrupted mid-submit, the recent-issue probe looks for the exact
+      title before anything is reported as failed or re-posted
+
+Local image attachments cannot be uploaded through the REST API; run
+``github_mcp_upload_attachments.py`` first so ``attachment_markdown`` holds
+hosted URLs.
+
+Usage:
+    GITHUB_TOKEN=... python api_submit_issue.py --work-order /path/to/work_order.json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from github_http import HttpClientError, HttpResponse, default_http_client
+from github_issue_probe import (
+    RECENT_ISSUE_LOOKBACK_SEC,
+    SubmissionSuccessInfo,
+    find_recent_issue_by_title,
+    issue_number_from_url,
+)
+from attachment_cache import split_hosted
+from github_mcp_build_payload import ASSETS_TEMPLATES_DIR, build_payload
+from issue_corpus_cache import DEFAULT_DUPLICATE_THRESHOLD, find_duplicate_issues
+from issue_payload_support import (
+    AIONUI_REPO,
+    AIONUI_URL,
+    SUBMITTER_API,
+    append_work_order_event,
+    apply_template_defaults,
+    ensure_work_order_attachments,
+    ensure_work_order_runtime,
+    filter_uploadable_attachments,
+    github_api_base,
+    github_api_headers,
+    github_token_from_env,
+    iso_now,
+    load_issue_template_cached,
+    missing_required_fields,
+    normalize_work_order_dict,
+    resolve_attachment_paths,
+    split_owner_repo,
+    template_for_issue_type,
+    update_work_order_runtime,
+    write_work_order_updates,
+)
+
+
+API_USER_AGENT = "aionui-issue-agent-minimal/api-submitter"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create a GitHub issue from work_order.json via the REST API.")
+    parser.add_argument("--work-order", required=True, help="Path to work_order.json")
+    parser.add_argument("--timeout-sec", type=int, default=30, help="HTTP timeout seconds")
+    parser.add_argument("--force", action="store_true", help="Ignore existing issue_number/issue_url and submit anyway")
+    parser.add_argument(
+        "--skip-if-duplicate",
+        action="store_true",
+        help="Skip submission if the local issue corpus has a near-identical title",
+    )
+    parser.add_argument(
+        "--duplicate-threshold",
+        type=float,
+        default=DEFAULT_DUPLICATE_THRESHOLD,
+        help=f"Title similarity (0-1) treated as duplicate (default: {DEFAULT_DUPLICATE_THRESHOLD})",
+    )
+    return parser.parse_args()
+
+
+def _parse_iso(value: str) -> Optional[datetime.datetime]:
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value or "").strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _template_labels(tpl: dict) -> List[str]:
+    labels = tpl.get("labels") if isinstance(tpl, dict) else None
+    if isinstance(labels, str):
+        labels = [item.strip() for item in labels.split(",")]
+    return [str(item) for item in (labels or []) if str(item).strip()]
+
+
+def _response_error(response: HttpResponse) -> str:
+    try:
+        detail = response.json()
+    except ValueError:
+        detail = None
+    message = detail.get("message", "") if isinstance(detail, dict) else ""
+    errors = detail.get("errors") if isinstance(detail, dict) else None
+    if errors:
+        message = f"{message} {json.dumps(errors, ensure_ascii=False)}".strip()
+    return f"HTTP {response.status}: {message or response.body[:200].decode('utf-8', 'replace')}"
+
+
+def _record_failure(
+    work_order_path: Path,
+    artifacts_dir: Path,
+    *,
+    error: str,
+    message: str,
+    extra: Dict[str, Any] | None = None,
+) -> None:
+    update_work_order_runtime(
+        work_order_path,
+        {
+            "status": "failed",
+            "last_submitter": SUBMITTER_API,
+            "last_error": error,
+            "last_error_at": iso_now(),
+        },
+    )
+    append_work_order_event(
+        work_order_path,
+        stage="submit",
+        status="failed",
+        submitter=SUBMITTER_API,
+        message=message,
+        error=error,
+        artifacts_dir=str(artifacts_dir.resolve()),
+        extra=extra,
+    )
+
+
+def _record_success(
+    work_order_path: Path,
+    artifacts_dir: Path,
+    result: SubmissionSuccessInfo,
+) -> Dict[str, Any]:
+    update_work_order_runtime(
+        work_order_path,
+        {
+            "status": "submitted",
+            "last_submitter": SUBMITTER_API,
+            "last_error": "",
+            "last_error_at": "",
+        },
+        {
+            "issue_url": result.issue_url,
+            "issue_number": result.issue_number,
+        },
+    )
+    append_work_order_event(
+        work_order_path,
+        stage="submit",
+        status="succeeded",
+        submitter=SUBMITTER_API,
+        message=f"Issue created successfully via {result.detection_method}.",
+        issue_url=result.issue_url,
+        issue_number=result.issue_number,
+        artifacts_dir=str(artifacts_dir.resolve()),
+        extra={
+            "detection_method": result.detection_method,
+            "evidence": result.evidence,
+        },
+    )
+    return {
+        "status": "submitted",
+        "issue_url": result.issue_url,
+        "issue_number": result.issue_number,
+        "detection_method": result.detection_method,
+    }
+
+
+def submit_work_order(
+    work_order_path: Path,
+    *,
+    token: str = "",
+    force: bool = False,
+    skip_if_duplicate: bool = False,
+    duplicate_threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+    timeout_sec: int = 30,
+) -> Tuple[int, Dict[str, Any]]:
+    """Create the issue for one work order. Returns ``(exit_code, result)`` like the other CLIs."""
+    if not work_order_path.is_file():
+        return 1, {"error": f"work_order.json not found: {work_order_path}"}
+
+    previous_runtime = dict(ensure_work_order_runtime(work_order_path)["runtime"])
+    ensure_work_order_attachments(work_order_path)
+    artifacts_dir = work_order_path.parent / "artifacts"
+    raw = json.loads(work_order_path.read_text(encoding="utf-8"))
+    norm = normalize_work_order_dict(raw)
+    owner_repo = str(raw.get("owner_repo") or AIONUI_REPO)
+    project_url = str(raw.get("project_url") or AIONUI_URL)
+
+    existing_url = str(raw.get("issue_url") or "").strip()
+    existing_number = str(raw.get("issue_number") or "").strip() or issue_number_from_url(existing_url)
+    if not force and (existing_number or existing_url):
+        update_work_order_runtime(
+            work_order_path,
+            {
+                "status": "skipped_duplicate",
+                "last_submitter": SUBMITTER_API,
+                "last_error": "",
+                "last_error_at": "",
+            },
+        )
+        append_work_order_event(
+            work_order_path,
+            stage="submit",
+            status="skipped_duplicate",
+            submitter=SUBMITTER_API,
+            message="Skip because issue_number/issue_url already exists in work_order.json.",
+            issue_url=existing_url,
+            issue_number=existing_number,
+            artifacts_dir=str(artifacts_dir.resolve()),
+        )
+        return 0, {"status": "skipped_existing", "issue_url": existing_url, "issue_number": existing_number}
+
+    token = token or github_token_from_env()
+    if not token:
+        error = "Missing GitHub token: set GITHUB_TOKEN or GH_TOKEN."
+        _record_failure(work_order_path, artifacts_dir, error=error, message="api submitter needs a token.")
+        return 2, {"error": error}
+
+    _, template_path = template_for_issue_type(norm.get("issue_type", "bug"), ASSETS_TEMPLATES_DIR)
+    tpl = load_issue_template_cached(template_path)
+    norm, defaults = apply_template_defaults(tpl, norm)
+    write_work_order_updates(work_order_path, defaults)
+    missing = missing_required_fields(tpl, norm)
+    if missing:
+        error = "work_order.json missing required fields: " + ", ".join(item["id"] for item in missing)
+        _record_failure(
+            work_order_path,
+            artifacts_dir,
+            error=error,
+            message="Required Issue Forms fields are empty.",
+            extra={"missing_required": missing},
+        )
+        return 2, {"error": error, "missing_required": missing}
+
+    attachment_paths, _ = resolve_attachment_paths(norm.get("attachments", []), work_order_path.parent)
+    uploadable, _ = filter_uploadable_attachments(attachment_paths)
+    if str(norm.get("attachment_markdown") or "").strip():
+        # github_mcp_upload_attachments.py already hosted them; attachments keeps the local paths
+        uploadable = []
+    else:
+        _, uploadable = split_hosted(uploadable, owner_repo=owner_repo)
+    if uploadable:
+        error = (
+            "Local attachments need hosted URLs first: run github_mcp_upload_attachments.py "
+            "so attachment_markdown is filled, then re-run."
+        )
+        _record_failure(
+            work_order_path,
+            artifacts_dir,
+            error=error,
+            message="REST API cannot upload local attachments.",
+            extra={"attachments": [str(path) for path in uploadable]},
+        )
+        return 2, {"error": error}
+
+    payload = build_payload(raw, norm, template_path, work_order_path)
+    title = payload["title"]
+
+    if skip_if_duplicate and not force:
+        duplicates = find_duplicate_issues(owner_repo, title, threshold=duplicate_threshold, timeout_sec=timeout_sec)
+        if duplicates:
+            top = duplicates[0]
+            update_work_order_runtime(
+                work_order_path,
+                {
+                    "status": "skipped_duplicate",
+                    "last_submitter": SUBMITTER_API,
+                    "last_error": "",
+                    "last_error_at": "",
+                },
+            )
+            append_work_order_event(
+                work_order_path,
+                stage="submit",
+                status="skipped_duplicate",
+                submitter=SUBMITTER_API,
+                message=f"Skip because issue #{top.number} in the local issue corpus has a near-identical title.",
+                artifacts_dir=str(artifacts_dir.resolve()),
+                extra={
+                    "duplicate_source": "issue_corpus",
+                    "duplicate_candidates": [
+                        {"number": item.number, "title": item.title, "html_url": item.html_url, "score": item.score}
+                        for item in duplicates
+                    ],
+                },
+            )
+            return 0, {"status": "skipped_duplicate", "duplicate_of": top.html_url, "score": top.score}
+
+    # A previous api run died between POST and write-back: look before posting again.
+    if previous_runtime.get("last_submitter") == SUBMITTER_API and previous_runtime.get("status") == "submitting":
+        interrupted_at = _parse_iso(str(previous_runtime.get("updated_at") or ""))
+        if interrupted_at is not None:
+            recovered = find_recent_issue_by_title(
+                owner_repo,
+                title,
+                project_url=project_url,
+                not_before=interrupted_at - datetime.timedelta(seconds=RECENT_ISSUE_LOOKBACK_SEC),
+                timeout_sec=timeout_sec,
+            )
+            if recovered is not None:
+                return 0, _record_success(work_order_path, artifacts_dir, recovered)
+
+    runtime = ensure_work_order_runtime(work_order_path)["runtime"]
+    update_work_order_runtime(
+        work_order_path,
+        {
+            "status": "submitting",
+            "last_submitter": SUBMITTER_API,
+            "attempt_count": int(runtime.get("attempt_count") or 0) + 1,
+            "submission_count": int(runtime.get("submission_count") or 0) + 1,
+            "last_error": "",
+            "last_error_at": "",
+        },
+    )
+    append_work_order_event(
+        work_order_path,
+        stage="submit",
+        status="started",
+        submitter=SUBMITTER_API,
+        message="POST issue via GitHub REST API.",
+        artifacts_dir=str(artifacts_dir.resolve()),
+    )
+
+    owner, repo = split_owner_repo(owner_repo)
+    headers = github_api_headers(API_USER_AGENT, token)
+    headers["Content-Type"] = "application/json"
+    request_body = {"title": title, "body": payload["body"]}
+    labels = _template_labels(tpl)
+    if labels:
+        # GitHub silently drops labels when the token lacks triage access.
+        request_body["labels"] = labels
+    attempt_started_at = datetime.datetime.now(datetime.timezone.utc)
+    response: Optional[HttpResponse] = None
+    try:
+        response = default_http_client().request(
+            "POST",
+            f"{github_api_base()}/repos/{owner}/{repo}/issues",
+            headers=headers,
+            body=json.dumps(request_body, ensure_ascii=False).encode("utf-8"),
+            timeout_sec=timeout_sec,
+        )
+    except HttpClientError as exc:
+        error = str(exc)
+    else:
+        error = "" if response.status == 201 else _response_error(response)
+
+    if response is not None and response.status == 201:
+        try:
+            created = response.json()
+        except ValueError:
+            created = None
+        if isinstance(created, dict) and created.get("html_url"):
+            issue_url = str(created["html_url"])
+            return 0, _record_success(
+                work_order_path,
+                artifacts_dir,
+                SubmissionSuccessInfo(
+                    issue_url=issue_url,
+                    issue_number=str(created.get("number") or "") or issue_number_from_url(issue_url),
+                    detection_method="github_api_create",
+                    evidence=f"x-github-request-id={response.headers.get('x-github-request-id', '')!r}",
+                ),
+            )
+        error = "HTTP 201 without html_url in response body"
+
+    if response is None or response.status >= 500 or response.status == 201:
+        recovered = find_recent_issue_by_title(
+            owner_repo,
+            title,
+            project_url=project_url,
+            not_before=attempt_started_at - datetime.timedelta(seconds=RECENT_ISSUE_LOOKBACK_SEC),
+            timeout_sec=timeout_sec,
+        )
+        if recovered is not None:
+            return 0, _record_success(work_order_path, artifacts_dir, recovered)
+
+    _record_failure(
+        work_order_path,
+        artifacts_dir,
+        error=error,
+        message="GitHub REST API issue creation failed.",
+        extra={"http_status": response.status if response is not None else 0},
+    )
+    return 1, {"error": error}
+
+
+def main() -> int:
+    args = parse_args()
+    code, result = submit_work_order(
+        Path(args.work_order).expanduser().resolve(),
+        force=args.force,
+        skip_if_duplicate=args.skip_if_duplicate,
+        duplicate_threshold=args.duplicate_threshold,
+        timeout_sec=args.timeout_sec,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
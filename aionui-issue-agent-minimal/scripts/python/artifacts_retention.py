@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Retention and compaction for ``issue_runs/<session_id>/<work_id>/artifacts/``.
+
+Every run leaves ``run.log``, debug captures, ``sh_status.txt`` and payload JSON
+behind.  ``apply_retention`` walks the work orders under an ``issue_runs`` root
+and, in order:
+
+    1. empties ``artifacts/`` of work orders idle longer than their status TTL
+       (``work_order.json`` itself is never touched):
+         - submitted (has ``issue_number``/``issue_url``): 7 days
+         - failed (``runtime.status == "failed"``):       90 days
+         - anything else (draft / prepared / in progress):  30 days
+    2. compresses ``*.html`` / ``*.log`` / rotated ``run.log.N`` / ``*.jsonl`` older
+       than ``compress_after_days`` to ``.gz``
+    3. evicts the oldest remaining artifact files until the total fits the size
+       budget (``AIONUI_ARTIFACTS_BUDGET_MB``, default 2048); files of submitted
+       work orders go first, failed work orders' evidence last
+
+The work order being submitted is passed as ``exclude`` and left alone, as is
+any work order whose ``runtime.status`` says a submitter may still need its
+artifacts (``submitting`` / ``retry_scheduled`` / ``needs_confirmation``).  The
+``skill`` submitter calls this once per run; ``AIONUI_ARTIFACTS_RETENTION=off``
+disables that.  ``--dry-run`` prints the same report without changing anything.
+
+Usage:
+    python artifacts_retention.py --root issue_runs --dry-run
+    python artifacts_retention.py --root issue_runs --budget-mb 500
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gzip
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from work_order_index import ISSUE_RUNS_DIRNAME
+
+
+RETENTION_ENV = "AIONUI_ARTIFACTS_RETENTION"
+BUDGET_ENV = "AIONUI_ARTIFACTS_BUDGET_MB"
+DEFAULT_BUDGET_MB = 2048
+COMPRESSIBLE_SUFFIXES = (".html", ".log", ".jsonl")
+STATUS_SUBMITTED = "submitted"
+STATUS_FAILED = "failed"
+STATUS_ACTIVE = "active"
+STATUS_OTHER = "other"
+ACTIVE_RUNTIME_STATUSES = {"submitting", "retry_scheduled", "needs_confirmation"}
+# eviction order under the size budget: lowest first
+EVICTION_PRIORITY = {STATUS_SUBMITTED: 0, STATUS_OTHER: 1, STATUS_FAILED: 2}
+_ROTATED_LOG_RE = re.compile(r"\.(log|jsonl)\.\d+$")
+_DAY_SEC = 86400
+_DISABLED_VALUES = {"0", "off", "false", "no", "none"}
+
+
+@dataclass
+class RetentionPolicy:
+    submitted_ttl_days: float = 7
+    failed_ttl_days: float = 90
+    other_ttl_days: float = 30
+    compress_after_days: float = 2
+    budget_bytes: int = DEFAULT_BUDGET_MB * 1024 * 1024
+
+    def ttl_sec(self, status_group: str) -> float:
+        days = {
+            STATUS_SUBMITTED: self.submitted_ttl_days,
+            STATUS_FAILED: self.failed_ttl_days,
+        }.get(status_group, self.other_ttl_days)
+        return days * _DAY_SEC
+
+
+def budget_bytes_from_env(default_mb: float = DEFAULT_BUDGET_MB) -> int:
+    raw = os.environ.get(BUDGET_ENV, "").strip()
+    try:
+        mb = float(raw) if raw else float(default_mb)
+    except ValueError:
+        mb = float(default_mb)
+    return max(0, int(mb * 1024 * 1024))
+
+
+def find_issue_runs_root(work_order_path: Path) -> Optional[Path]:
+    for parent in work_order_path.resolve().parents:
+        if parent.name == ISSUE_RUNS_DIRNAME:
+            return parent
+    return None
+
+
+def _status_group(work_order_path: Path) -> str:
+    with contextlib.suppress(OSError, ValueError):
+        data = json.loads(work_order_path.read_text(encoding="utf-8"))
+        if str(data.get("issue_number") or "").strip() or str(data.get("issue_url") or "").strip():
+            return STATUS_SUBMITTED
+        runtime = data.get("runtime") if isinstance(data.get("runtime"), dict) else {}
+        status = str(runtime.get("status") or "")
+        if status in ACTIVE_RUNTIME_STATUSES:
+            return STATUS_ACTIVE
+        if status == STATUS_FAILED:
+            return STATUS_FAILED
+    return STATUS_OTHER
+
+
+def _compressible(path: Path) -> bool:
+    return path.suffix in COMPRESSIBLE_SUFFIXES or bool(_ROTATED_LOG_RE.search(path.name))
+
+
+def _artifact_files(artifacts: Path) -> List[Path]:
+    files: List[Path] = []
+    with contextlib.suppress(OSError):
+        for root, _dirs, names in os.walk(artifacts):
+            files.extend(Path(root) / name for name in names)
+    return files
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    with contextlib.suppress(OSError):
+        return path.stat()
+    return None
+
+
+def _gzip_file(path: Path) -> Path:
+    target = path.with_name(path.name + ".gz")
+    tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+    with path.open("rb") as src, gzip.open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    stat = path.stat()
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp, target)
+    path.unlink()
+    return target
+
+
+def apply_retention(
+    root: Path,
+    policy: Optional[RetentionPolicy] = None,
+    *,
+    dry_run: bool = False,
+    exclude: Iterable[Path] = (),
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Compress, expire and evict artifacts under ``root``; returns a report of what was (or would be) done."""
+    policy = policy or RetentionPolicy(budget_bytes=budget_bytes_from_env())
+    now = time.time() if now is None else now
+    excluded = {str(Path(path).resolve()) for path in exclude}
+    report: Dict[str, Any] = {
+        "root": str(root),
+        "dry_run": dry_run,
+        "work_orders": 0,
+        "compressed": [],
+        "expired": [],
+        "evicted": [],
+        "errors": [],
+        "bytes_before": 0,
+        "bytes_after": 0,
+    }
+    # (priority, mtime_ns, size, path) of files that survive steps 1-2
+    survivors: List[tuple] = []
+
+    for work_order_path in sorted(root.glob("*/*/work_order.json")):
+        artifacts = work_order_path.parent / "artifacts"
+        if not artifacts.is_dir():
+            continue
+        report["work_orders"] += 1
+        files = [(path, _stat(path)) for path in _artifact_files(artifacts)]
+        files = [(path, stat) for path, stat in files if stat is not None]
+        size_total = sum(stat.st_size for _, stat in files)
+        report["bytes_before"] += size_total
+        group = _status_group(work_order_path)
+        if group == STATUS_ACTIVE or str(artifacts.resolve()) in excluded:
+            report["bytes_after"] += size_total
+            continue
+
+        wo_stat = _stat(work_order_path)
+        last_activity = max([stat.st_mtime for _, stat in files] + [wo_stat.st_mtime if wo_stat else 0])
+        if now - last_activity > policy.ttl_sec(group):
+            report["expired"].append(
+                {"work_order": str(work_order_path), "status": group, "files": len(files), "bytes": size_total}
+            )
+            if not dry_run:
+                for path, _ in files:
+                    with contextlib.suppress(OSError):
+                        path.unlink()
+            continue
+
+        priority = EVICTION_PRIORITY[group]
+        for path, stat in files:
+            if _compressible(path) and now - stat.st_mtime > policy.compress_after_days * _DAY_SEC:
+                entry = {"path": str(path), "bytes": stat.st_size}
+                if dry_run:
+                    report["compressed"].append(entry)
+                    survivors.append((priority, stat.st_mtime_ns, stat.st_size, path))
+                    continue
+                try:
+                    target = _gzip_file(path)
+                except OSError as exc:
+                    report["errors"].append({"path": str(path), "error": str(exc)})
+                    survivors.append((priority, stat.st_mtime_ns, stat.st_size, path))
+                    continue
+                entry["gz_bytes"] = target.stat().st_size
+                report["compressed"].append(entry)
+                survivors.append((priority, stat.st_mtime_ns, entry["gz_bytes"], target))
+            else:
+                survivors.append((priority, stat.st_mtime_ns, stat.st_size, path))
+
+    excluded_bytes = report["bytes_after"]
+    total = excluded_bytes + sum(size for _, _, size, _ in survivors)
+    for _, _, size, path in sorted(survivors, key=lambda item: (item[0], item[1], str(item[3]))):
+        if total <= policy.budget_bytes:
+            break
+        if not dry_run:
+            try:
+                path.unlink()
+            except OSError as exc:
+                report["errors"].append({"path": str(path), "error": str(exc)})
+                continue
+        report["evicted"].append({"path": str(path), "bytes": size})
+        total -= size
+    report["bytes_after"] = total
+    report["freed_bytes"] = report["bytes_before"] - total
+    return report
+
+
+def retention_enabled() -> bool:
+    return os.environ.get(RETENTION_ENV, "").strip().lower() not in _DISABLED_VALUES
+
+
+def apply_retention_for_run(work_order_path: Path, artifacts: Path) -> Optional[Dict[str, Any]]:
+    """Per-run hook for submitters: enforce retention on the enclosing ``issue_runs`` tree; never raises."""
+    if not retention_enabled():
+        return None
+    root = find_issue_runs_root(work_order_path)
+    if root is None:
+        return None
+    with contextlib.suppress(Exception):
+        return apply_retention(root, exclude=[artifacts])
+    return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compress, expire and size-cap issue_runs artifacts.")
+    parser.add_argument("--root", default=ISSUE_RUNS_DIRNAME, help="issue_runs directory (default: ./issue_runs)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without touching files")
+    parser.add_argument("--budget-mb", type=float, help=f"Total artifacts budget (default: ${BUDGET_ENV} or {DEFAULT_BUDGET_MB})")
+    parser.add_argument("--submitted-ttl-days", type=float, default=RetentionPolicy.submitted_ttl_days)
+    parser.add_argument("--failed-ttl-days", type=float, default=RetentionPolicy.failed_ttl_days)
+    parser.add_argument("--other-ttl-days", type=float, default=RetentionPolicy.other_ttl_days)
+    parser.add_argument("--compress-after-days", type=float, default=RetentionPolicy.compress_after_days)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    policy = RetentionPolicy(
+        submitted_ttl_days=args.submitted_ttl_days,
+        failed_ttl_days=args.failed_ttl_days,
+        other_ttl_days=args.other_ttl_days,
+        compress_after_days=args.compress_after_days,
+        budget_bytes=int(args.budget_mb * 1024 * 1024) if args.budget_mb is not None else budget_bytes_from_env(),
+    )
+    report = apply_retention(Path(args.root).expanduser().resolve(), policy, dry_run=args.dry_run)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Content-hash cache of attachments that are already hosted on GitHub.
+
+``attachment_markdown`` is per work order and is cleared when a ``skill``
+upload is incomplete, so a retry used to upload every file again.  This cache
+maps ``sha256(file bytes)`` to the hosted URL and markdown line, whichever
+submitter produced it:
+
+    - ``browser``: ``github.com/user-attachments/...`` from the Issue Form upload;
+      reused only for the same ``owner_repo`` (the asset inherits repo visibility)
+    - ``repo``: ``raw.githubusercontent.com/{login}/issue-assets/...`` from
+      ``github_mcp_upload_attachments.py``; reusable for any target repo
+
+Submitters upload only the files that are not hosted yet.
+
+Cache location: ``<user_cache_dir()>/attachment_cache.json``; updates hold a
+file lock, entries older than ``MAX_AGE_DAYS`` are dropped and only the
+``MAX_FILES`` most recently cached files are kept.
+
+Usage:
+    python attachment_cache.py lookup --owner-repo iOfficeAI/AionUi screenshot.png
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from issue_payload_support import (
+    ATTACHMENT_UPLOAD_METHOD_BROWSER,
+    ATTACHMENT_UPLOAD_METHOD_REPO,
+    AIONUI_REPO,
+    build_local_attachment_markdown,
+    derive_attachment_upload_status,
+    file_lock,
+    iso_now,
+    user_cache_dir,
+)
+
+
+CACHE_FILENAME = "attachment_cache.json"
+MAX_ENTRIES_PER_FILE = 8
+MAX_FILES = 500
+MAX_AGE_DAYS = 90
+_HASH_CHUNK = 1024 * 1024
+
+_sha_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+@dataclass
+class HostedAttachment:
+    sha256: str
+    method: str
+    url: str
+    markdown: str
+    owner_repo: str
+    name: str
+    attachment_repo: str = ""
+    cached_at: str = ""
+
+
+def cache_path() -> Path:
+    return user_cache_dir() / CACHE_FILENAME
+
+
+def cache_signature() -> List[int]:
+    """(size, mtime_ns) of the cache file; payload builders fold it into their cache key."""
+    with contextlib.suppress(OSError):
+        stat = cache_path().stat()
+        return [stat.st_size, stat.st_mtime_ns]
+    return [0, 0]
+
+
+def file_sha256(path: Path) -> str:
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    cached = _sha_memo.get(memo_key)
+    if cached:
+        return cached
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    _sha_memo[memo_key] = digest.hexdigest()
+    return _sha_memo[memo_key]
+
+
+def _load() -> Dict[str, List[Dict[str, Any]]]:
+    with contextlib.suppress(OSError, ValueError):
+        data = json.loads(cache_path().read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            return data
+    return {}
+
+
+def _store(data: Dict[str, List[Dict[str, Any]]]) -> None:
+    target = cache_path()
+    with contextlib.suppress(OSError):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, target)
+
+
+def _evict(data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Drop entries older than MAX_AGE_DAYS, then keep the MAX_FILES most recently cached files."""
+    cutoff = (
+        datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0) - datetime.timedelta(days=MAX_AGE_DAYS)
+    ).isoformat()
+    kept: Dict[str, List[Dict[str, Any]]] = {}
+    for sha, entries in data.items():
+        fresh = [entry for entry in entries or [] if isinstance(entry, dict) and str(entry.get("cached_at") or "") >= cutoff]
+        if fresh:
+            kept[sha] = fresh
+    newest = sorted(kept, key=lambda sha: max(str(entry.get("cached_at") or "") for entry in kept[sha]), reverse=True)
+    return {sha: kept[sha] for sha in newest[:MAX_FILES]}
+
+
+def _usable(entry: Dict[str, Any], owner_repo: str) -> bool:
+    if entry.get("method") == ATTACHMENT_UPLOAD_METHOD_REPO:
+        return True
+    return entry.get("method") == ATTACHMENT_UPLOAD_METHOD_BROWSER and entry.get("owner_repo") == owner_repo
+
+
+def lookup_hosted(path: Path, *, owner_repo: str, methods: Optional[Iterable[str]] = None) -> Optional[HostedAttachment]:
+    """Newest usable hosted copy of ``path`` for ``owner_repo``, or None."""
+    try:
+        sha = file_sha256(path)
+    except OSError:
+        return None
+    allowed = set(methods) if methods is not None else None
+    for entry in reversed(_load().get(sha, [])):
+        if not isinstance(entry, dict) or not _usable(entry, owner_repo):
+            continue
+        if allowed is not None and entry.get("method") not in allowed:
+            continue
+        fields = {key: entry.get(key, "") for key in HostedAttachment.__dataclass_fields__ if key != "sha256"}
+        return HostedAttachment(sha256=sha, **fields)
+    return None
+
+
+def split_hosted(
+    paths: List[Path],
+    *,
+    owner_repo: str,
+    methods: Optional[Iterable[str]] = None,
+) -> Tuple[List[Tuple[Path, HostedAttachment]], List[Path]]:
+    """Partition ``paths`` into (already hosted, still to upload), preserving order."""
+    hosted: List[Tuple[Path, HostedAttachment]] = []
+    remaining: List[Path] = []
+    for path in paths:
+        entry = lookup_hosted(path, owner_repo=owner_repo, methods=methods)
+        if entry is None:
+            remaining.append(path)
+        else:
+            hosted.append((path, entry))
+    return hosted, remaining
+
+
+def hosted_markdown(hosted: List[Tuple[Path, HostedAttachment]]) -> str:
+    return "\n".join(entry.markdown for _, entry in hosted if entry.markdown).strip()
+
+
+def attachment_block_with_cache(
+    existing: List[Path],
+    missing: List[str],
+    skipped: List[Dict[str, str]],
+    *,
+    owner_repo: str,
+    raw_status: str = "",
+) -> Tuple[str, str]:
+    """Attachment section and upload status for a work order without ``attachment_markdown``.
+
+    Uploadable files already hosted are embedded from the cache; the rest keep
+    the local-path listing of ``build_local_attachment_markdown``.  The status
+    is ``uploaded`` when nothing is left as a local path; a stored
+    ``listed_local`` is re-derived since the cache may have filled in since.
+    """
+    skipped_paths = {str(item.get("path")) for item in skipped}
+    uploadable = [path for path in existing if str(path) not in skipped_paths]
+    hosted, remaining = split_hosted(uploadable, owner_repo=owner_repo)
+    hosted_names = {str(path) for path, _ in hosted}
+    local_paths = [path for path in existing if str(path) not in hosted_names]
+    embedded = hosted_markdown(hosted)
+    local = build_local_attachment_markdown(local_paths, missing, skipped)
+    status = derive_attachment_upload_status(
+        "" if str(raw_status or "").strip().lower() == "listed_local" else raw_status,
+        attachment_markdown="" if local_paths else embedded,
+        existing_paths=local_paths,
+        missing_paths=missing,
+    )
+    return "\n\n".join(part for part in (embedded, local) if part).strip(), status
+
+
+def remember_hosted(
+    path: Path,
+    *,
+    method: str,
+    url: str,
+    markdown: str,
+    owner_repo: str,
+    attachment_repo: str = "",
+) -> None:
+    """Record a hosted copy of ``path``; best-effort, never raises."""
+    if not url:
+        return
+    try:
+        sha = file_sha256(path)
+    except OSError:
+        return
+    with contextlib.suppress(OSError), file_lock(cache_path()):
+        data = _load()
+        entries = [
+            entry
+            for entry in data.get(sha, [])
+            if isinstance(entry, dict) and not (entry.get("method") == method and entry.get("owner_repo") == owner_repo)
+        ]
+        entries.append(
+            {
+                "method": method,
+                "url": url,
+                "markdown": markdown or f"![{path.name}]({url})",
+                "owner_repo": owner_repo,
+                "name": path.name,
+                "attachment_repo": attachment_repo,
+                "cached_at": iso_now(),
+            }
+        )
+        data[sha] = entries[-MAX_ENTRIES_PER_FILE:]
+        _store(_evict(data))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Look up locally cached hosted attachment URLs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    lookup = sub.add_parser("lookup", help="Show the hosted copy of each file, if any")
+    lookup.add_argument("--owner-repo", default=AIONUI_REPO)
+    lookup.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+    result = {}
+    for raw in args.paths:
+        entry = lookup_hosted(Path(raw).expanduser(), owner_repo=args.owner_repo)
+        result[raw] = asdict(entry) if entry else None
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Per-file progress for GitHub's browser attachment upload, read from network events.
+
+Dropping a file on an Issue Form textarea triggers, per file:
+    1. POST https://github.com/upload/policies/assets   (form field ``name`` = filename)
+       -> JSON with ``upload_url`` (S3), ``form.key``, ``asset_upload_url`` and ``asset.href``
+    2. POST/PUT to the S3 ``upload_url``               (multipart body contains ``form.key``)
+    3. PUT  https://github.com/upload/assets/<id>       (finalize; markdown appears right after)
+
+``AttachmentUploadTracker`` listens to ``request`` / ``response`` /
+``requestfailed`` page events and maps them back to files, so the submitter
+knows which files failed (and retries only those), when the last one finished,
+and how fast each one went.  It only duck-types the Playwright objects.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import re
+import time
+import urllib.parse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+POLICY_PATH = "/upload/policies/assets"
+FINALIZE_PATH_PREFIX = "/upload/assets/"
+STATE_PENDING = "pending"
+STATE_POLICY = "policy"
+STATE_UPLOADING = "uploading"
+STATE_UPLOADED = "uploaded"  # S3 accepted the bytes; finalize not seen yet
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+SETTLED_STATES = {STATE_DONE, STATE_FAILED}
+
+_MULTIPART_NAME_RE = re.compile(r'name="name"\r?\n\r?\n([^\r\n]+)')
+
+
+@dataclass
+class FileUploadProgress:
+    path: Path
+    name: str
+    size_bytes: int
+    state: str = STATE_PENDING
+    attempts: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    asset_url: str = ""
+    error: str = ""
+    asset_upload_path: str = ""
+    s3_key: str = ""
+
+    @property
+    def duration_sec(self) -> float:
+        if not self.started_at or not self.finished_at:
+            return 0.0
+        return max(0.0, self.finished_at - self.started_at)
+
+    def as_report(self) -> Dict[str, Any]:
+        duration = self.duration_sec
+        return {
+            "name": self.name,
+            "size_bytes": self.size_bytes,
+            "state": self.state,
+            "attempts": self.attempts,
+            "duration_sec": round(duration, 3),
+            "throughput_kib_s": round(self.size_bytes / 1024 / duration, 1) if duration > 0 else 0.0,
+            "asset_url": self.asset_url,
+            "error": self.error,
+        }
+
+
+def _policy_file_name(request: Any) -> str:
+    data = ""
+    with contextlib.suppress(Exception):
+        data = str(request.post_data or "")
+    match = _MULTIPART_NAME_RE.search(data)
+    if match:
+        return match.group(1).strip()
+    with contextlib.suppress(Exception):
+        return (urllib.parse.parse_qs(data).get("name") or [""])[0]
+    return ""
+
+
+def _request_body(request: Any) -> bytes:
+    with contextlib.suppress(Exception):
+        body = request.post_data_buffer
+        if body:
+            return bytes(body)
+    return b""
+
+
+def _response_json(response: Any) -> Dict[str, Any]:
+    with contextlib.suppress(Exception):
+        data = response.json()
+        if isinstance(data, dict):
+            return data
+    with contextlib.suppress(Exception):
+        data = json.loads(response.text())
+        if isinstance(data, dict):
+            return data
+    return {}
+
+
+class AttachmentUploadTracker:
+    def __init__(self, paths: List[Path], clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.files: List[FileUploadProgress] = []
+        for path in paths:
+            size = 0
+            with contextlib.suppress(OSError):
+                size = Path(path).stat().st_size
+            self.files.append(FileUploadProgress(path=Path(path), name=Path(path).name, size_bytes=size))
+        self.observed = False
+        self._active: List[FileUploadProgress] = []
+        self._by_policy_request: Dict[int, FileUploadProgress] = {}
+        self._by_asset_path: Dict[str, FileUploadProgress] = {}
+        self._s3_urls: set[str] = set()
+        self._handlers = {
+            "request": self.on_request,
+            "response": self.on_response,
+            "requestfailed": self.on_request_failed,
+        }
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def attach(self, page: Any) -> None:
+        for event, handler in self._handlers.items():
+            with contextlib.suppress(Exception):
+                page.on(event, handler)
+
+    def detach(self, page: Any) -> None:
+        for event, handler in self._handlers.items():
+            with contextlib.suppress(Exception):
+                page.remove_listener(event, handler)
+
+    def begin_attempt(self, paths: List[Path]) -> None:
+        wanted = {str(Path(path)) for path in paths}
+        self._active = [item for item in self.files if str(item.path) in wanted]
+        for item in self._active:
+            item.state = STATE_PENDING
+            item.attempts += 1
+            item.started_at = item.finished_at = 0.0
+            item.error = ""
+
+    # -- queries -------------------------------------------------------------
+
+    def settled(self) -> bool:
+        return bool(self._active) and all(item.state in SETTLED_STATES for item in self._active)
+
+    def failed_paths(self) -> List[Path]:
+        return [item.path for item in self._active if item.state == STATE_FAILED]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "xhr_observed": self.observed,
+            "files": [item.as_report() for item in self.files],
+            "retried_files": [item.name for item in self.files if item.attempts > 1],
+        }
+
+    # -- event handlers ------------------------------------------------------
+
+    def _claim(self, name: str) -> Optional[FileUploadProgress]:
+        pending = [item for item in self._active if item.state == STATE_PENDING]
+        if name:
+            return next((item for item in pending if item.name == name), None)
+        # no file name in the policy request: only unambiguous with a single pending upload
+        return pending[0] if len(pending) == 1 else None
+
+    def _fail(self, item: FileUploadProgress, error: str) -> None:
+        item.state = STATE_FAILED
+        item.error = error
+        item.finished_at = self.clock()
+
+    def _s3_item(self, request: Any) -> Optional[FileUploadProgress]:
+        body = _request_body(request)
+        uploading = [item for item in self._active if item.state == STATE_UPLOADING]
+        for item in uploading:
+            if item.s3_key and body and item.s3_key.encode("utf-8") in body:
+                return item
+        return uploading[0] if len(uploading) == 1 else None
+
+    def on_request(self, request: Any) -> None:
+        with contextlib.suppress(Exception):
+            if request.method == "POST" and POLICY_PATH in request.url:
+                item = self._claim(_policy_file_name(request))
+                if item is None:
+                    return
+                self.observed = True
+                item.state = STATE_POLICY
+                item.started_at = self.clock()
+                self._by_policy_request[id(request)] = item
+
+    def on_response(self, response: Any) -> None:
+        with contextlib.suppress(Exception):
+            request = response.request
+            url = str(response.url or request.url)
+            status = int(response.status)
+            item = self._by_policy_request.pop(id(request), None)
+            if item is not None:
+                if status >= 400:
+                    self._fail(item, f"upload policy HTTP {status}")
+                    return
+                data = _response_json(response)
+                item.asset_upload_path = urllib.parse.urlsplit(str(data.get("asset_upload_url") or "")).path
+                item.s3_key = str((data.get("form") or {}).get("key") or "")
+                item.asset_url = str((data.get("asset") or {}).get("href") or "")
+                item.state = STATE_UPLOADING
+                if item.asset_upload_path:
+                    self._by_asset_path[item.asset_upload_path] = item
+                if data.get("upload_url"):
+                    self._s3_urls.add(str(data["upload_url"]))
+                return
+            path = urllib.parse.urlsplit(url).path
+            if request.method == "PUT" and path.startswith(FINALIZE_PATH_PREFIX):
+                item = self._by_asset_path.get(path)
+                if item is None or item.state in SETTLED_STATES:
+                    return
+                if status >= 400:
+                    self._fail(item, f"asset finalize HTTP {status}")
+                else:
+                    item.state = STATE_DONE
+                    item.finished_at = self.clock()
+                return
+            if url in self._s3_urls and request.method in ("POST", "PUT"):
+                item = self._s3_item(request)
+                if item is None:
+                    return
+                if status >= 400:
+                    self._fail(item, f"storage upload HTTP {status}")
+                elif item.asset_upload_path:
+                    item.state = STATE_UPLOADED
+                else:
+                    item.state = STATE_DONE
+                    item.finished_at = self.clock()
+
+    def on_request_failed(self, request: Any) -> None:
+        with contextlib.suppress(Exception):
+            failure = str(request.failure or "request failed")
+            item = self._by_policy_request.pop(id(request), None)
+            if item is None:
+                path = urllib.parse.urlsplit(str(request.url)).path
+                item = self._by_asset_path.get(path)
+            if item is None and str(request.url) in self._s3_urls:
+                item = self._s3_item(request)
+            if item is not None and item.state not in SETTLED_STATES:
+                self._fail(item, failure)
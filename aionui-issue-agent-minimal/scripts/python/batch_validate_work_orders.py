@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Validate many work orders at once and write one consolidated report.
+
+``preflight_validate_required`` checks a single work order right before the
+browser starts.  This script runs the same checks over a whole backlog (batch
+imports, queue mode) in one columnar pass:
+
+    1. every work_order.json is read and normalized (``normalize_work_order_dict``)
+    2. rows are grouped by template; per template the required field ids and the
+       dropdown option sets (lower-cased, as ``option_matches`` compares them) are
+       compiled once
+    3. ``apply_template_defaults`` runs on every row of the group, as the
+       submitters and the importer do before their required-field check
+    4. each rule is applied to a whole column of values instead of row by row
+    5. attachment paths are resolved without touching the disk, then every
+       referenced directory is listed once (``os.scandir``) instead of one
+       ``stat`` per file
+
+Problems per work order:
+
+    missing_required     same fields, defaults and fallbacks as the submitters' preflight, plus ``title``
+    missing_attachments  ``attachments`` entries that are not files
+    invalid_options      dropdown values outside the template options; a warning only,
+                         because ``apply_template_defaults`` coerces them (``coerced_to``)
+    error                work_order.json could not be read or parsed
+
+Usage:
+    python batch_validate_work_orders.py issue_runs
+    python batch_validate_work_orders.py issue_runs/<session_id> --skip-submitted --output report.json
+    python batch_validate_work_orders.py path/to/a/work_order.json path/to/b/work_order.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from github_mcp_build_payload import ASSETS_TEMPLATES_DIR
+from issue_payload_support import (
+    all_fields_from_template,
+    apply_template_defaults,
+    field_label,
+    field_options,
+    field_type,
+    infer_platform_default,
+    load_issue_template_cached,
+    normalize_work_order_dict,
+    template_for_issue_type,
+)
+
+
+TITLE_FIELD = {"id": "title", "label": "Title", "type": "input"}
+
+
+class TemplateRules:
+    """Required fields and dropdown option sets of one Issue Forms template."""
+
+    def __init__(self, name: str, template: dict):
+        self.name = name
+        self.template = template
+        self.required: List[Dict[str, str]] = []
+        self.dropdowns: Dict[str, Tuple[List[str], frozenset]] = {}
+        for field in all_fields_from_template(template):
+            field_id = str(field.get("id"))
+            if bool((field.get("validations", {}) or {}).get("required", False)):
+                self.required.append({"id": field_id, "label": field_label(field), "type": field_type(field)})
+            options = field_options(field)
+            if field_type(field) == "dropdown" and options:
+                self.dropdowns[field_id] = (options, frozenset(str(option).strip().lower() for option in options))
+
+
+def template_rules(issue_type: str, templates_dir: Path = ASSETS_TEMPLATES_DIR) -> TemplateRules:
+    name, template_path = template_for_issue_type(issue_type, templates_dir)
+    return TemplateRules(name, load_issue_template_cached(template_path))
+
+
+def iter_work_order_paths(targets: Iterable[Path]) -> Iterable[Path]:
+    """``work_order.json`` files given directly, or found under the given directories."""
+    for target in targets:
+        if target.is_dir():
+            yield from sorted(target.rglob("work_order.json"))
+        else:
+            yield target
+
+
+def _required_column(rows: List[int], norms: List[Dict[str, Any]], field_id: str) -> List[str]:
+    column = [str(norms[row].get(field_id, "") or "") for row in rows]
+    if field_id == "platform":
+        inferred = infer_platform_default()
+        column = [value if value.strip() else inferred for value in column]
+    elif field_id == "actual_behavior":
+        column = [
+            value if value.strip() else str(norms[row].get("bug_description", "") or "")
+            for row, value in zip(rows, column)
+        ]
+    return column
+
+
+def _attachment_candidates(path: Path, norm: Dict[str, Any]) -> List[str]:
+    base_dir = str(path.parent.absolute())
+    return [
+        os.path.normpath(os.path.join(base_dir, os.path.expanduser(str(raw).strip())))
+        for raw in norm.get("attachments") or []
+        if str(raw).strip()
+    ]
+
+
+def _existing_files(candidates: Iterable[str]) -> set:
+    """Every candidate that is a file, with one directory listing per parent directory."""
+    by_dir: Dict[str, List[str]] = {}
+    for candidate in candidates:
+        by_dir.setdefault(os.path.dirname(candidate), []).append(candidate)
+    existing = set()
+    for directory, members in by_dir.items():
+        try:
+            with os.scandir(directory) as entries:
+                files = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            continue
+        existing.update(member for member in members if os.path.basename(member) in files)
+    return existing
+
+
+def validate_work_orders(
+    records: List[Tuple[Path, Dict[str, Any]]],
+    *,
+    templates_dir: Path = ASSETS_TEMPLATES_DIR,
+) -> List[Dict[str, Any]]:
+    """One result per ``(path, work_order_dict)``, in input order."""
+    norms = [normalize_work_order_dict(data) for _, data in records]
+    results: List[Dict[str, Any]] = [
+        {
+            "path": str(path),
+            "work_id": str(data.get("work_id") or path.parent.name),
+            "issue_type": norm["issue_type"],
+            "missing_required": [],
+            "missing_attachments": [],
+            "invalid_options": [],
+        }
+        for (path, data), norm in zip(records, norms)
+    ]
+
+    groups: Dict[str, List[int]] = {}
+    for row, norm in enumerate(norms):
+        groups.setdefault(template_for_issue_type(norm["issue_type"], templates_dir)[0], []).append(row)
+
+    defaulted: List[Dict[str, Any]] = list(norms)
+    for rows in groups.values():
+        rules = template_rules(norms[rows[0]]["issue_type"], templates_dir)
+        coerced: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            defaulted[row], coerced[row] = apply_template_defaults(rules.template, norms[row])
+        for field in [TITLE_FIELD] + rules.required:
+            for row, value in zip(rows, _required_column(rows, defaulted, field["id"])):
+                if not value.strip():
+                    results[row]["missing_required"].append(dict(field))
+        for field_id, (options, allowed) in rules.dropdowns.items():
+            column = [str(norms[row].get(field_id, "") or "").strip() for row in rows]
+            for row, value in zip(rows, column):
+                if value and value.lower() not in allowed:
+                    results[row]["invalid_options"].append(
+                        {"id": field_id, "value": value, "options": options, "coerced_to": coerced[row].get(field_id, "")}
+                    )
+
+    candidates = [_attachment_candidates(path, norm) for (path, _), norm in zip(records, norms)]
+    existing = _existing_files(candidate for row in candidates for candidate in row)
+    for result, row in zip(results, candidates):
+        result["missing_attachments"] = [candidate for candidate in row if candidate not in existing]
+
+    for result in results:
+        result["ok"] = not (result["missing_required"] or result["missing_attachments"])
+    return results
+
+
+def load_records(paths: Iterable[Path], *, skip_submitted: bool = False) -> Tuple[List[Tuple[Path, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """``(records, unreadable)``; submitted work orders are dropped when ``skip_submitted``."""
+    records: List[Tuple[Path, Dict[str, Any]]] = []
+    unreadable: List[Dict[str, Any]] = []
+    for path in paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            unreadable.append({"path": str(path), "work_id": path.parent.name, "ok": False, "error": str(exc)})
+            continue
+        if not isinstance(data, dict):
+            unreadable.append({"path": str(path), "work_id": path.parent.name, "ok": False, "error": "not a JSON object"})
+            continue
+        if skip_submitted and (str(data.get("issue_number") or "").strip() or str(data.get("issue_url") or "").strip()):
+            continue
+        records.append((path, data))
+    return records, unreadable
+
+
+def build_report(results: List[Dict[str, Any]], unreadable: List[Dict[str, Any]], elapsed_sec: float) -> Dict[str, Any]:
+    missing_by_field: Dict[str, int] = {}
+    options_by_field: Dict[str, int] = {}
+    for result in results:
+        for field in result["missing_required"]:
+            missing_by_field[field["id"]] = missing_by_field.get(field["id"], 0) + 1
+        for option in result["invalid_options"]:
+            options_by_field[option["id"]] = options_by_field.get(option["id"], 0) + 1
+    invalid = [result for result in results if not result["ok"]]
+    return {
+        "ok": not invalid and not unreadable,
+        "checked": len(results) + len(unreadable),
+        "valid": len(results) - len(invalid),
+        "invalid": len(invalid) + len(unreadable),
+        "warnings": sum(1 for result in results if result["ok"] and result["invalid_options"]),
+        "missing_required_by_field": missing_by_field,
+        "invalid_options_by_field": options_by_field,
+        "missing_attachments": sum(len(result["missing_attachments"]) for result in results),
+        "elapsed_ms": round(elapsed_sec * 1000, 1),
+        "work_orders": unreadable
+        + [result for result in results if not result["ok"] or result["invalid_options"]],
+    }
+
+
+def validate_paths(targets: Iterable[Path], *, skip_submitted: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    records, unreadable = load_records(iter_work_order_paths(targets), skip_submitted=skip_submitted)
+    results = validate_work_orders(records)
+    return build_report(results, unreadable, time.perf_counter() - started)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate many work orders against the Issue Forms templates in one pass.")
+    parser.add_argument("targets", nargs="+", help="work_order.json files, session directories or the whole issue_runs")
+    parser.add_argument("--skip-submitted", action="store_true", help="Ignore work orders that already have an issue")
+    parser.add_argument("--output", help="Write the consolidated JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = validate_paths([Path(target).expanduser() for target in args.targets], skip_submitted=args.skip_submitted)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(
+            f"checked={report['checked']} valid={report['valid']} invalid={report['invalid']} "
+            f"warnings={report['warnings']} elapsed_ms={report['elapsed_ms']} report={args.output}",
+            file=sys.stderr,
+        )
+    else:
+        print(text)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
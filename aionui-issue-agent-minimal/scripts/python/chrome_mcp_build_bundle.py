@@ -4,27 +4,37 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+from typing import Any, Dict, Tuple
 
+from attachment_cache import attachment_block_with_cache, cache_signature
 from issue_payload_support import (
     AIONUI_REPO,
     AIONUI_URL,
+    SUBMITTER_CHROME_MCP,
     all_fields_from_template,
     apply_template_defaults,
     append_work_order_event,
     build_issue_body_markdown,
-    build_local_attachment_markdown,
+    compute_payload_cache_key,
     derive_attachment_upload_status,
     ensure_work_order_attachments,
     ensure_work_order_runtime,
     field_label,
     field_type,
     filter_uploadable_attachments,
-    load_issue_template,
+    load_cached_payload,
+    load_issue_template_cached,
     normalize_work_order_dict,
+    payload_cache_path,
     resolve_attachment_paths,
+    store_cached_payload,
     template_for_issue_type,
     update_work_order_runtime,
 )
+from profiling import add_profile_args, run_profiled
+
+
+ASSETS_TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "assets" / "templates"
 
 
 def parse_args() -> argparse.Namespace:
@@ -33,33 +43,44 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--work-order", required=True, help="Path to work_order.json")
     parser.add_argument("--output", help="Optional output JSON file path")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild the bundle even if work order, template and attachments are unchanged",
+    )
+    add_profile_args(parser)
     return parser.parse_args()
 
 
-def main() -> int:
-    args = parse_args()
-    work_order_path = Path(args.work_order).expanduser().resolve()
-    ensure_work_order_runtime(work_order_path)
-    ensure_work_order_attachments(work_order_path)
-
-    raw = json.loads(work_order_path.read_text(encoding="utf-8"))
-    norm = normalize_work_order_dict(raw)
-    assets_templates_dir = Path(__file__).resolve().parents[2] / "assets" / "templates"
-    template_filename, template_path = template_for_issue_type(norm.get("issue_type", "bug"), assets_templates_dir)
-    tpl = load_issue_template(template_path)
+def build_bundle(
+    raw: Dict[str, Any],
+    norm: Dict[str, Any],
+    template_filename: str,
+    template_path: Path,
+    work_order_path: Path,
+) -> Dict[str, Any]:
+    tpl = load_issue_template_cached(template_path)
     norm, _ = apply_template_defaults(tpl, norm)
 
     attachment_paths, missing_paths = resolve_attachment_paths(norm.get("attachments", []), work_order_path.parent)
     _, skipped = filter_uploadable_attachments(attachment_paths)
     attachment_markdown = str(norm.get("attachment_markdown") or "").strip()
-    local_attachment_markdown = build_local_attachment_markdown(attachment_paths, missing_paths, skipped)
-    attachment_block = attachment_markdown or local_attachment_markdown
-    attachment_status = derive_attachment_upload_status(
-        raw.get("attachment_upload_status") or "",
-        attachment_markdown=attachment_markdown,
-        existing_paths=attachment_paths,
-        missing_paths=missing_paths,
-    )
+    if attachment_markdown:
+        attachment_block = attachment_markdown
+        attachment_status = derive_attachment_upload_status(
+            raw.get("attachment_upload_status") or "",
+            attachment_markdown=attachment_markdown,
+            existing_paths=attachment_paths,
+            missing_paths=missing_paths,
+        )
+    else:
+        attachment_block, attachment_status = attachment_block_with_cache(
+            attachment_paths,
+            missing_paths,
+            skipped,
+            owner_repo=raw.get("owner_repo") or AIONUI_REPO,
+            raw_status=raw.get("attachment_upload_status") or "",
+        )
 
     base = {
         "schema_version": raw.get("schema_version") or "",
@@ -92,19 +113,40 @@ def main() -> int:
                 "value": value,
             }
         )
-    bundle = {
+    return {
         **base,
         "submitter": "chrome_mcp",
         "fields": fields,
     }
 
-    if args.output:
-        output_path = Path(args.output).expanduser().resolve()
+
+def build_bundle_for_work_order(
+    work_order_path: Path,
+    *,
+    output_path: Path | None = None,
+    use_cache: bool = True,
+) -> Tuple[Dict[str, Any], bool]:
+    """Build (or reuse) the chrome_mcp field bundle and record runtime/event history.
+
+    Returns ``(bundle, cache_hit)``. Shared by the CLI and ``payload_service.py``.
+    """
+    ensure_work_order_runtime(work_order_path)
+    ensure_work_order_attachments(work_order_path)
+
+    raw = json.loads(work_order_path.read_text(encoding="utf-8"))
+    norm = normalize_work_order_dict(raw)
+    template_filename, template_path = template_for_issue_type(norm.get("issue_type", "bug"), ASSETS_TEMPLATES_DIR)
+    cache_path = payload_cache_path(work_order_path, SUBMITTER_CHROME_MCP)
+    cache_key = compute_payload_cache_key(raw, template_path, work_order_path.parent, builder=SUBMITTER_CHROME_MCP, extra=cache_signature())
+    bundle = load_cached_payload(cache_path, cache_key) if use_cache else None
+    cache_hit = bundle is not None
+    if bundle is None:
+        bundle = build_bundle(raw, norm, template_filename, template_path, work_order_path)
+        store_cached_payload(cache_path, cache_key, bundle)
+
+    if output_path:
         output_path.write_text(json.dumps(bundle, ensure_ascii=False, indent=2), encoding="utf-8")
-        payload_path = str(output_path)
-    else:
-        print(json.dumps(bundle, ensure_ascii=False, indent=2))
-        payload_path = ""
+    payload_path = str(output_path or "")
 
     update_work_order_runtime(
         work_order_path,
@@ -119,14 +161,28 @@ def main() -> int:
     append_work_order_event(
         work_order_path,
         stage="chrome_bundle_build",
-        status="succeeded",
+        status="payload_cache_hit" if cache_hit else "succeeded",
         submitter="chrome_mcp",
-        message="Built chrome_mcp field bundle from work_order.json.",
+        message=(
+            "Reused cached chrome_mcp field bundle; work order, template and attachments are unchanged."
+            if cache_hit
+            else "Built chrome_mcp field bundle from work_order.json."
+        ),
         artifacts_dir=str((work_order_path.parent / "artifacts").resolve()),
-        extra={"output_path": payload_path},
+        extra={"output_path": payload_path, "cache_key": cache_key},
     )
+    return bundle, cache_hit
+
+
+def main() -> int:
+    args = parse_args()
+    work_order_path = Path(args.work_order).expanduser().resolve()
+    output_path = Path(args.output).expanduser().resolve() if args.output else None
+    bundle, _ = build_bundle_for_work_order(work_order_path, output_path=output_path, use_cache=not args.no_cache)
+    if output_path is None:
+        print(json.dumps(bundle, ensure_ascii=False, indent=2))
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(run_profiled(main, "chrome_mcp_build_bundle", submitter=SUBMITTER_CHROME_MCP))
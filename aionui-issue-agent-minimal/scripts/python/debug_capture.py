@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Debug capture for the Playwright submitter, with selectable weight.
+
+``save_debug`` used to take a ``full_page=True`` PNG plus the whole
+``page.content()`` HTML at every checkpoint (retry, ``no_submit``,
+``prepare_attachments_only``, failure), which is several MB and hundreds of ms
+on a long issue page.  Levels:
+
+    - ``none``:     capture nothing
+    - ``viewport``: checkpoints get a viewport JPEG; failures get ``full`` (default)
+    - ``full``:     full-page PNG + HTML everywhere (the old behavior)
+    - ``trace``:    Playwright tracing for the whole run; each failure saves the
+                    chunk since the previous one as ``trace_<prefix>_<ts>.zip`` plus a
+                    viewport JPEG, successful runs keep no trace
+
+Level comes from ``--debug-capture`` or ``AIONUI_DEBUG_CAPTURE``.
+
+The screenshot / ``page.content()`` calls must stay on the Playwright thread
+(the sync API is not thread-safe), but encoding and disk writes go to one
+background worker so the submit loop does not wait for them.  After each write
+the captured files in ``artifacts/`` are pruned oldest-first to stay under
+``max_bytes`` (``--debug-max-mb`` / ``AIONUI_DEBUG_MAX_MB``, default 50 MB);
+``run.log``, payloads and other artifacts are never touched.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional
+
+
+CAPTURE_NONE = "none"
+CAPTURE_VIEWPORT = "viewport"
+CAPTURE_FULL = "full"
+CAPTURE_TRACE = "trace"
+CAPTURE_LEVELS = (CAPTURE_NONE, CAPTURE_VIEWPORT, CAPTURE_FULL, CAPTURE_TRACE)
+DEFAULT_CAPTURE_LEVEL = CAPTURE_VIEWPORT
+DEFAULT_MAX_MB = 50
+VIEWPORT_JPEG_QUALITY = 60
+CAPTURE_SUFFIXES = (".png", ".jpg", ".html")
+TRACE_PREFIX = "trace_"
+
+
+def resolve_capture_level(value: Optional[str] = None) -> str:
+    level = str(value or os.environ.get("AIONUI_DEBUG_CAPTURE") or DEFAULT_CAPTURE_LEVEL).strip().lower()
+    return level if level in CAPTURE_LEVELS else DEFAULT_CAPTURE_LEVEL
+
+
+def resolve_max_bytes(value_mb: Optional[float] = None) -> int:
+    raw: Any = value_mb if value_mb is not None else os.environ.get("AIONUI_DEBUG_MAX_MB")
+    try:
+        mb = float(raw) if raw not in (None, "") else float(DEFAULT_MAX_MB)
+    except (TypeError, ValueError):
+        mb = float(DEFAULT_MAX_MB)
+    return max(0, int(mb * 1024 * 1024))
+
+
+def _is_capture_file(path: Path) -> bool:
+    if not path.is_file():
+        return False
+    return path.suffix.lower() in CAPTURE_SUFFIXES or (path.name.startswith(TRACE_PREFIX) and path.suffix == ".zip")
+
+
+def prune_captures(artifacts: Path, max_bytes: int) -> List[Path]:
+    """Delete the oldest capture files until their total size is <= ``max_bytes``."""
+    if max_bytes <= 0:
+        return []
+    files = []
+    with contextlib.suppress(OSError):
+        for path in artifacts.iterdir():
+            with contextlib.suppress(OSError):
+                if _is_capture_file(path):
+                    stat = path.stat()
+                    files.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    removed: List[Path] = []
+    for _, size, path in sorted(files, key=lambda item: (item[0], item[2].name)):
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            path.unlink()
+            total -= size
+            removed.append(path)
+    return removed
+
+
+class DebugCapture:
+    def __init__(self, artifacts: Path, level: str = DEFAULT_CAPTURE_LEVEL, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.artifacts = artifacts
+        self.level = resolve_capture_level(level)
+        self.max_bytes = max_bytes
+        self.written: List[Path] = []
+        self.pruned: List[Path] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self._tracing_context: Any = None
+
+    # -- tracing -------------------------------------------------------------
+
+    def start_tracing(self, context: Any) -> None:
+        if self.level != CAPTURE_TRACE or context is None:
+            return
+        with contextlib.suppress(Exception):
+            context.tracing.start(screenshots=True, snapshots=True)
+            context.tracing.start_chunk()
+            self._tracing_context = context
+
+    def _save_trace_chunk(self, prefix: str) -> None:
+        """Write the trace since the last failure to ``trace_<prefix>_<ts>.zip`` and start a new chunk."""
+        context = self._tracing_context
+        if context is None:
+            return
+        self.artifacts.mkdir(parents=True, exist_ok=True)
+        target = self.artifacts / f"{TRACE_PREFIX}{prefix}_{int(time.time())}.zip"
+        with contextlib.suppress(Exception):
+            context.tracing.stop_chunk(path=str(target))
+            self.written.append(target)
+        with contextlib.suppress(Exception):
+            context.tracing.start_chunk()
+
+    def _stop_tracing(self) -> None:
+        context, self._tracing_context = self._tracing_context, None
+        if context is None:
+            return
+        with contextlib.suppress(Exception):
+            context.tracing.stop_chunk()
+        with contextlib.suppress(Exception):
+            context.tracing.stop()
+
+    # -- capture -------------------------------------------------------------
+
+    def capture(self, page: Any, prefix: str, *, failure: bool = False) -> None:
+        """Capture ``page`` for checkpoint ``prefix``; never raises."""
+        if page is None or self.level == CAPTURE_NONE:
+            return
+        if self.level == CAPTURE_TRACE:
+            if failure:
+                self._save_trace_chunk(prefix)
+                self._capture_viewport(page, prefix)
+            return
+        if self.level == CAPTURE_FULL or failure:
+            self._capture_full(page, prefix)
+        else:
+            self._capture_viewport(page, prefix)
+
+    def _capture_viewport(self, page: Any, prefix: str) -> None:
+        with contextlib.suppress(Exception):
+            data = page.screenshot(type="jpeg", quality=VIEWPORT_JPEG_QUALITY, full_page=False)
+            self._write_async(f"{prefix}_{int(time.time())}.jpg", data)
+
+    def _capture_full(self, page: Any, prefix: str) -> None:
+        ts = int(time.time())
+        with contextlib.suppress(Exception):
+            self._write_async(f"{prefix}_{ts}.png", page.screenshot(full_page=True))
+        with contextlib.suppress(Exception):
+            self._write_async(f"{prefix}_{ts}.html", page.content())
+
+    def _write_async(self, name: str, data: Any) -> None:
+        if not data:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debug-capture")
+            self._pending.append(self._executor.submit(self._write, name, data))
+
+    def _write(self, name: str, data: Any) -> None:
+        self.artifacts.mkdir(parents=True, exist_ok=True)
+        target = self.artifacts / name
+        if isinstance(data, str):
+            target.write_text(data, encoding="utf-8")
+        else:
+            target.write_bytes(bytes(data))
+        self.written.append(target)
+        self.pruned.extend(prune_captures(self.artifacts, self.max_bytes))
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            with contextlib.suppress(Exception):
+                future.result()
+
+    def close(self) -> None:
+        """Stop tracing (unsaved chunks are discarded) and wait for pending writes."""
+        self._stop_tracing()
+        self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.pruned.extend(prune_captures(self.artifacts, self.max_bytes))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Map submitter failures (exceptions, stderr, ``runtime.last_error`` text) to typed categories.
+
+``append_work_order_event`` stores the category of every event that carries an
+``error`` as ``error_category``; retry loops use ``is_permanent`` to stop at once
+instead of spending their whole budget on a failure a retry cannot fix.
+
+    transient_network  DNS/connect/reset errors, net::ERR_*, 5xx         retry
+    timeout            Playwright / socket / subprocess timeouts         retry
+    rate_limited       GitHub 429 or rate-limit 403                      retry later
+    conflict           git push rejected (non-fast-forward)              retry
+    auth               missing/bad token, 401, non-rate-limit 403,       permanent
+                       push permission denied, GitHub login page
+                       instead of the issue form
+    browser_missing    Playwright browser not installed / no display     permanent
+    browser_closed     the page, context or browser was closed           permanent within the run
+    sandbox_blocked    ``bootstrap_check_in`` / sandbox / EACCES, EPERM  permanent
+                       from the browser launch
+    validation         missing required fields, invalid work order, 422  permanent
+    unknown            anything else                                     retry
+
+"Permanent within the run" stops the loop inside one submitter run (the page is
+gone); a new run starts a fresh browser, so the queue worker and the orchestrator
+(``is_permanent`` without ``within_run``) still retry it.
+
+Only the standard library is used, so ``skill_bootstrap.py`` can import it
+before requirements are installed.
+
+Usage:
+    python error_classifier.py "BrowserType.launch: Executable doesn't exist at ..."
+    python error_classifier.py --scan issue_runs        # categories of every failed event
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import socket
+import subprocess
+import urllib.error
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+TRANSIENT_NETWORK = "transient_network"
+TIMEOUT = "timeout"
+RATE_LIMITED = "rate_limited"
+CONFLICT = "conflict"
+AUTH = "auth"
+BROWSER_MISSING = "browser_missing"
+BROWSER_CLOSED = "browser_closed"
+SANDBOX_BLOCKED = "sandbox_blocked"
+VALIDATION = "validation"
+UNKNOWN = "unknown"
+
+PERMANENT_CATEGORIES = frozenset({AUTH, BROWSER_MISSING, SANDBOX_BLOCKED, VALIDATION})
+PERMANENT_WITHIN_RUN_CATEGORIES = PERMANENT_CATEGORIES | {BROWSER_CLOSED}
+
+# first match wins: the more specific browser/sandbox messages before generic "permission denied",
+# and network/timeout errors before the URL-based auth patterns (a DNS failure on /login is not an auth error)
+_PATTERNS = (
+    # EACCES / EPERM only count when the browser launch hit them; elsewhere (a file, a git dir) they are not a sandbox
+    (SANDBOX_BLOCKED, r"bootstrap_check_in|permission denied \(1100\)|sandbox_host_linux|no usable sandbox"
+                      r"|(launch|chrom|browser)[^\n]*\b(eacces|eperm)\b|\b(eacces|eperm)\b[^\n]*(launch|chrom|browser)"),
+    (BROWSER_MISSING, r"executable doesn't exist|playwright install|browser(type)?\.launch: .*(not found|no such file)"
+                      r"|host system is missing dependencies|missing x server|\$display|cannot open display"),
+    (BROWSER_CLOSED, r"target (page, context or browser|closed)|has been closed|browser has disconnected"),
+    (VALIDATION, r"missing required|missing_required|required fields|work_order\.json not found|owner_repo must be"
+                 r"|validation failed|http 422|unprocessable entity|minimal branch only supports"),
+    (RATE_LIMITED, r"rate limit|ratelimit|http 429|too many requests|secondary rate"),
+    (AUTH, r"missing github token|bad credentials|http 401|requires authentication|authentication failed"
+           r"|could not read username|permission to \S+ denied|denied to \S+"
+           r"|http 403|403 forbidden|resource not accessible by"),
+    (CONFLICT, r"\[rejected\]|non-fast-forward|fetch first|failed to push some refs"),
+    (TRANSIENT_NETWORK, r"could not resolve host|enotfound|econnreset|econnrefused|etimedout|getaddrinfo|name or service not known|temporary failure in name resolution"
+                        r"|connection (reset|refused|aborted)|remote end closed|broken pipe|network is unreachable"
+                        r"|sslerror|ssl: |eof occurred in violation|http 50[0-4]|bad gateway|service unavailable|net::err_\w+|\berr_(connection|network|internet|name)"),
+    (TIMEOUT, r"timeout|timed out"),
+    (AUTH, r"sign in to github|/login\b|session expired"),
+)
+_COMPILED = tuple((category, re.compile(pattern, re.I)) for category, pattern in _PATTERNS)
+
+
+def classify_text(text: str) -> str:
+    """Category of a free-text error; ``""`` when there is no error text."""
+    if not str(text or "").strip():
+        return ""
+    for category, pattern in _COMPILED:
+        if pattern.search(text):
+            return category
+    return UNKNOWN
+
+
+def _status_category(status: int, text: str = "") -> str:
+    if status == 429 or (status == 403 and re.search(r"rate limit", text, re.I)):
+        return RATE_LIMITED
+    if status in (401, 403):
+        return AUTH
+    if status == 422:
+        return VALIDATION
+    if status >= 500:
+        return TRANSIENT_NETWORK
+    return ""
+
+
+def classify_error(error: Optional[BaseException] = None, *, text: str = "", stderr: str = "", status: int = 0) -> str:
+    """Category of an exception and/or its error text, stderr or HTTP status."""
+    combined = " ".join(part for part in (str(error or "") if error is not None else "", text, stderr) if part)
+    if not status and error is not None:
+        response = getattr(error, "response", None)  # github_http.HttpStatusError
+        raw_status = getattr(response, "status", None) or getattr(error, "status", None) or getattr(error, "code", None)
+        status = raw_status if isinstance(raw_status, int) else 0
+    if status:
+        category = _status_category(status, combined)
+        if category:
+            return category
+    if error is not None:
+        if isinstance(error, subprocess.CalledProcessError):
+            output = error.stderr or error.output or ""
+            if isinstance(output, bytes):
+                output = output.decode("utf-8", "replace")
+            return classify_text(" ".join((combined, output))) or UNKNOWN
+        if type(error).__name__ == "TimeoutError" or isinstance(error, (socket.timeout, subprocess.TimeoutExpired)):
+            return TIMEOUT
+        by_text = classify_text(combined)
+        if by_text not in ("", UNKNOWN):
+            return by_text
+        if isinstance(error, (ConnectionError, urllib.error.URLError)):
+            return TRANSIENT_NETWORK
+        return UNKNOWN
+    return classify_text(combined)
+
+
+def is_permanent(category: str, *, within_run: bool = False) -> bool:
+    """Whether retrying cannot help; ``within_run`` also counts failures a fresh run may not hit."""
+    return category in (PERMANENT_WITHIN_RUN_CATEGORIES if within_run else PERMANENT_CATEGORIES)
+
+
+def scan(root: Path) -> Dict[str, Any]:
+    """Category counts over the failed events of every work order under ``root``."""
+    counts: Dict[str, int] = {}
+    examples: Dict[str, str] = {}
+    for path in sorted(root.rglob("work_order.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        for event in data.get("events") or []:
+            if not isinstance(event, dict) or not event.get("error"):
+                continue
+            category = event.get("error_category") or classify_text(str(event["error"]))
+            counts[category] = counts.get(category, 0) + 1
+            examples.setdefault(category, str(event["error"])[:200])
+    return {"counts": dict(sorted(counts.items(), key=lambda item: -item[1])), "examples": examples}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Classify submitter error text into retry categories.")
+    parser.add_argument("text", nargs="?", default="", help="Error text to classify")
+    parser.add_argument("--scan", help="Summarize the error categories of every work order under this directory")
+    args = parser.parse_args()
+    if args.scan:
+        result: Any = scan(Path(args.scan).expanduser())
+    else:
+        category = classify_text(args.text)
+        result = {"category": category, "permanent": is_permanent(category)}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
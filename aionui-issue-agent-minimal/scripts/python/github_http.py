@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Small pooled keep-alive HTTP client shared by the GitHub API callers.
+
+``urllib.request.urlopen`` opens (and TLS-handshakes) a fresh connection per
+call.  The submit probe, the issue corpus sync and the raw-URL checks after an
+assets upload all talk to the same one or two hosts, so this client keeps idle
+``http.client`` connections per (scheme, host, port) and reuses them.
+
+Features:
+    - keep-alive pooling (``max_idle_per_host`` idle connections per host)
+    - ``Accept-Encoding: gzip`` with transparent decoding
+    - per-request timeouts
+    - retries with exponential backoff for idempotent methods on network
+      errors and 502/503/504; a request that fails on a reused idle
+      connection before any response is retried once on a fresh connection
+    - ``HTTP(S)_PROXY`` / ``NO_PROXY`` via ``urllib.request.getproxies``
+
+Non-2xx responses are returned, not raised; call ``raise_for_status()``.
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_TIMEOUT_SEC = 15
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_SEC = 0.5
+DEFAULT_MAX_IDLE_PER_HOST = 4
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {502, 503, 504}
+# Errors that mean an idle keep-alive connection was closed by the server.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+_PoolKey = Tuple[str, str, int]
+
+
+class HttpClientError(OSError):
+    """Network-level failure after all retries were used."""
+
+
+class HttpStatusError(HttpClientError):
+    def __init__(self, response: "HttpResponse"):
+        super().__init__(f"HTTP {response.status} for {response.url}")
+        self.response = response
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)  # lower-case keys
+    body: bytes = b""
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+    def raise_for_status(self) -> "HttpResponse":
+        if self.status >= 400:
+            raise HttpStatusError(self)
+        return self
+
+
+class PooledHttpClient:
+    def __init__(
+        self,
+        *,
+        timeout_sec: float = DEFAULT_TIMEOUT_SEC,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_sec: float = DEFAULT_BACKOFF_SEC,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.timeout_sec = timeout_sec
+        self.max_retries = max(0, max_retries)
+        self.backoff_sec = max(0.0, backoff_sec)
+        self.max_idle_per_host = max(0, max_idle_per_host)
+        self.ssl_context = ssl_context
+        self.connections_opened = 0
+        self._idle: Dict[_PoolKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "PooledHttpClient":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(conns) for conns in self._idle.values())
+
+    def _new_connection(self, scheme: str, host: str, port: int, timeout: float) -> http.client.HTTPConnection:
+        proxy = urllib.request.getproxies().get(scheme)
+        if proxy and urllib.request.proxy_bypass(host):
+            proxy = None
+        target_host, target_port = host, port
+        if proxy:
+            parsed_proxy = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            target_host = parsed_proxy.hostname or host
+            target_port = parsed_proxy.port or (443 if parsed_proxy.scheme == "https" else 80)
+        if scheme == "https":
+            context = self.ssl_context or ssl.create_default_context()
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                target_host, target_port, timeout=timeout, context=context
+            )
+            if proxy:
+                conn.set_tunnel(host, port)
+        else:
+            conn = http.client.HTTPConnection(target_host, target_port, timeout=timeout)
+        conn._aionui_http_proxy = bool(proxy) and scheme == "http"  # type: ignore[attr-defined]
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _checkout(self, key: _PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._new_connection(*key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _checkin(self, key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout_sec: Optional[float] = None,
+    ) -> HttpResponse:
+        method = method.upper()
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key: _PoolKey = (scheme, parsed.hostname, parsed.port or (443 if scheme == "https" else 80))
+        path = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        request_headers = {"Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        request_headers.update(headers or {})
+        timeout = self.timeout_sec if timeout_sec is None else timeout_sec
+        attempts = 1 + (self.max_retries if method in IDEMPOTENT_METHODS else 0)
+
+        last_error: Optional[BaseException] = None
+        attempt = 0
+        stale_retry_used = False
+        while attempt < attempts:
+            conn, reused = self._checkout(key, timeout)
+            target = url if getattr(conn, "_aionui_http_proxy", False) else path
+            try:
+                conn.request(method, target, body=body, headers=request_headers)
+                raw = conn.getresponse()
+                data = raw.read()
+            except _STALE_CONNECTION_ERRORS as exc:
+                conn.close()
+                last_error = exc
+                if reused and not stale_retry_used:
+                    stale_retry_used = True
+                    continue
+            except (OSError, socket.timeout, http.client.HTTPException) as exc:
+                conn.close()
+                last_error = exc
+            else:
+                response_headers = {name.lower(): value for name, value in raw.getheaders()}
+                if raw.will_close:
+                    conn.close()
+                else:
+                    self._checkin(key, conn)
+                if "gzip" in response_headers.get("content-encoding", "").lower() and data:
+                    data = gzip.decompress(data)
+                response = HttpResponse(status=raw.status, url=url, headers=response_headers, body=data)
+                if response.status not in RETRY_STATUSES or attempt + 1 >= attempts:
+                    return response
+                last_error = HttpStatusError(response)
+            attempt += 1
+            if attempt < attempts and self.backoff_sec:
+                time.sleep(self.backoff_sec * (2 ** (attempt - 1)))
+        if isinstance(last_error, HttpStatusError):
+            return last_error.response
+        raise HttpClientError(f"{method} {url} failed: {last_error}") from last_error
+
+    def get(self, url: str, **kwargs: Any) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> HttpResponse:
+        return self.request("HEAD", url, **kwargs)
+
+
+_default_client: Optional[PooledHttpClient] = None
+_default_lock = threading.Lock()
+
+
+def default_http_client() -> PooledHttpClient:
+    """Process-wide client so every caller shares the same idle connections."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = PooledHttpClient()
+        return _default_client
+
+
+def close_default_http_client() -> None:
+    global _default_client
+    with _default_lock:
+        client, _default_client = _default_client, None
+    if client is not None:
+        client.close()
+
+
+atexit.register(close_default_http_client)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Recent-issue idempotency probe shared by the submitters.
+
+After an ambiguous Create click (``skill``) or a POST whose response was lost
+(``api``), the submitter asks the GitHub API for the newest issues and looks
+for an exact title match created after the attempt started.
+
+The skill records every Create click as a ``submit_attempt`` / ``clicked``
+event.  ``create_clicked_at`` and ``recover_clicked_issue`` let the queue
+worker and the orchestrator settle a failed run that already clicked Create
+instead of submitting again.
+"""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from github_http import HttpClientError, default_http_client
+from issue_payload_support import (
+    AIONUI_REPO,
+    AIONUI_URL,
+    append_work_order_event,
+    ensure_work_order_runtime,
+    github_api_base,
+    github_api_headers,
+    github_rate_limit_backoff_until,
+    github_token_from_env,
+    iso_now,
+    update_work_order_runtime,
+    user_cache_dir,
+)
+
+
+RECENT_ISSUE_PROBE_USER_AGENT = "aionui-issue-agent-minimal/submit-probe"
+RECENT_ISSUE_PROBE_FIELDS = ("number", "title", "html_url", "created_at", "pull_request")
+RECENT_ISSUE_LOOKBACK_SEC = 120
+CREATE_CLICK_EVENT = ("submit_attempt", "clicked")
+
+
+@dataclass
+class SubmissionSuccessInfo:
+    issue_url: str
+    issue_number: str
+    detection_method: str
+    evidence: str = ""
+
+
+def issue_number_from_url(url: str) -> str:
+    m = re.search(r"/issues/(\d+)(?:$|[/?#])", url or "")
+    return m.group(1) if m else ""
+
+
+def _parse_github_timestamp(value: str) -> Optional[datetime.datetime]:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    with contextlib.suppress(ValueError):
+        return datetime.datetime.fromisoformat(text.replace("Z", "+00:00")).astimezone(datetime.timezone.utc)
+    return None
+
+
+def _recent_issue_probe_cache_path(owner: str, repo: str) -> Path:
+    return user_cache_dir() / "github_api" / f"recent_issues_{owner}__{repo}.json"
+
+
+def _load_recent_issue_probe_cache(path: Path) -> Dict[str, Any]:
+    with contextlib.suppress(OSError, ValueError):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            return data
+    return {}
+
+
+def _store_recent_issue_probe_cache(path: Path, cache: Dict[str, Any]) -> None:
+    with contextlib.suppress(OSError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _fetch_recent_issues(owner: str, repo: str, *, timeout_sec: int) -> Optional[List[Dict[str, Any]]]:
+    """GET the newest issues with If-None-Match/If-Modified-Since and rate-limit backoff.
+
+    ETag, Last-Modified, the trimmed payload and any backoff deadline persist per repo
+    under ``user_cache_dir()/github_api`` so concurrent submitters share one quota.
+    """
+    cache_path = _recent_issue_probe_cache_path(owner, repo)
+    cache = _load_recent_issue_probe_cache(cache_path)
+    now = time.time()
+    blocked_until = float(cache.get("blocked_until") or 0)
+    if blocked_until > now:
+        print(f"[INFO] GitHub API rate limit backoff active for {int(blocked_until - now)}s; skip recent-issue probe.")
+        return None
+
+    headers = github_api_headers(RECENT_ISSUE_PROBE_USER_AGENT, github_token_from_env())
+    cached_payload = cache.get("payload") if isinstance(cache.get("payload"), list) else None
+    if cached_payload is not None and cache.get("etag"):
+        headers["If-None-Match"] = str(cache["etag"])
+    elif cached_payload is not None and cache.get("last_modified"):
+        headers["If-Modified-Since"] = str(cache["last_modified"])
+    api_url = (
+        f"{github_api_base()}/repos/{owner}/{repo}/issues"
+        "?state=all&per_page=20&sort=created&direction=desc"
+    )
+    try:
+        response = default_http_client().get(api_url, headers=headers, timeout_sec=timeout_sec)
+    except HttpClientError:
+        return None
+
+    if response.status == 304 or response.status >= 400:
+        cache["blocked_until"] = github_rate_limit_backoff_until(response.status, response.headers, now)
+        _store_recent_issue_probe_cache(cache_path, cache)
+        return cached_payload if response.status == 304 else None
+    try:
+        payload = response.json()
+    except ValueError:
+        return None
+
+    if not isinstance(payload, list):
+        return None
+    payload = [
+        {key: item[key] for key in RECENT_ISSUE_PROBE_FIELDS if key in item}
+        for item in payload
+        if isinstance(item, dict)
+    ]
+    cache.update(
+        {
+            "etag": response.headers.get("etag", ""),
+            "last_modified": response.headers.get("last-modified", ""),
+            "fetched_at": iso_now(),
+            "blocked_until": github_rate_limit_backoff_until(response.status, response.headers, now),
+            "payload": payload,
+        }
+    )
+    _store_recent_issue_probe_cache(cache_path, cache)
+    return payload
+
+
+def find_recent_issue_by_title(
+    owner_repo: str,
+    title: str,
+    *,
+    project_url: str,
+    not_before: datetime.datetime,
+    timeout_sec: int,
+) -> Optional[SubmissionSuccessInfo]:
+    parts = str(owner_repo or "").split("/", 1)
+    if len(parts) != 2 or not all(parts):
+        return None
+
+    wanted_title = re.sub(r"\s+", " ", str(title or "")).strip().casefold()
+    if not wanted_title:
+        return None
+    probe_timeout = max(5, min(timeout_sec, 15))
+
+    payload = _fetch_recent_issues(parts[0], parts[1], timeout_sec=probe_timeout)
+    if not isinstance(payload, list):
+        return None
+
+    cutoff = not_before.astimezone(datetime.timezone.utc)
+    for item in payload:
+        if not isinstance(item, dict) or item.get("pull_request"):
+            continue
+        candidate_title = re.sub(r"\s+", " ", str(item.get("title") or "")).strip().casefold()
+        if candidate_title != wanted_title:
+            continue
+        created_at = _parse_github_timestamp(str(item.get("created_at") or ""))
+        if created_at and created_at < cutoff:
+            continue
+        issue_url = str(item.get("html_url") or "").strip()
+        issue_number = str(item.get("number") or "").strip() or issue_number_from_url(issue_url)
+        if not issue_url or not issue_number:
+            continue
+        created_hint = created_at.isoformat() if created_at else str(item.get("created_at") or "")
+        return SubmissionSuccessInfo(
+            issue_url=issue_url,
+            issue_number=issue_number,
+            detection_method="github_api_recent_exact_title",
+            evidence=f"title={str(item.get('title') or '').strip()!r}; created_at={created_hint!r}",
+        )
+    return None
+
+
+def create_clicked_at(work_order_path: Path, since: int = 0, *, latest: bool = False) -> Optional[datetime.datetime]:
+    """Time of the first (``latest``: last) Create click recorded after event index ``since``; ``None`` if none."""
+    events = ensure_work_order_runtime(work_order_path)["events"][since:]
+    for event in reversed(events) if latest else events:
+        if isinstance(event, dict) and (event.get("stage"), event.get("status")) == CREATE_CLICK_EVENT:
+            return _parse_github_timestamp(str(event.get("timestamp") or "")) or datetime.datetime.now(datetime.timezone.utc)
+    return None
+
+
+def recover_clicked_issue(
+    work_order_path: Path,
+    clicked_at: datetime.datetime,
+    *,
+    submitter: str,
+    timeout_sec: int = 15,
+) -> Optional[SubmissionSuccessInfo]:
+    """Look up the issue an unconfirmed Create click may have created; record it when found."""
+    data = ensure_work_order_runtime(work_order_path)
+    result = find_recent_issue_by_title(
+        str(data.get("owner_repo") or AIONUI_REPO),
+        str(data.get("title") or ""),
+        project_url=str(data.get("project_url") or AIONUI_URL),
+        not_before=clicked_at - datetime.timedelta(seconds=RECENT_ISSUE_LOOKBACK_SEC),
+        timeout_sec=timeout_sec,
+    )
+    if result is None:
+        return None
+    update_work_order_runtime(
+        work_order_path,
+        {"status": "submitted", "last_error": "", "last_error_at": ""},
+        {"issue_url": result.issue_url, "issue_number": result.issue_number},
+    )
+    append_work_order_event(
+        work_order_path,
+        stage="submit",
+        status="succeeded",
+        submitter=submitter,
+        message=f"Issue created by an unconfirmed Create click, found via {result.detection_method}.",
+        issue_url=result.issue_url,
+        issue_number=result.issue_number,
+        extra={"detection_method": result.detection_method, "evidence": result.evidence},
+    )
+    return result
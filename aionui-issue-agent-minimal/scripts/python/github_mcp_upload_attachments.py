@@ -23,6 +23,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import shutil
@@ -30,8 +31,10 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
+from attachment_cache import remember_hosted, split_hosted
+from github_http import HttpClientError, PooledHttpClient, default_http_client
 from issue_payload_support import (
     ATTACHMENT_UPLOAD_METHOD_REPO,
     DEFAULT_ASSETS_REPO_NAME,
@@ -49,6 +52,8 @@ from issue_payload_support import (
     update_work_order_runtime,
     write_work_order_updates,
 )
+from profiling import add_profile_args, run_profiled
+from stage_timings import StageTimer
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -115,6 +120,15 @@ def _build_remote_path(owner_repo: str, work_id: str, filename: str) -> str:
     return build_assets_repo_attachment_path(owner_repo, work_id, filename)
 
 
+def _tree_size(root: Path) -> int:
+    total = 0
+    for dirpath, _dirs, names in os.walk(root):
+        for name in names:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+    return total
+
+
 def _run(cmd: list[str], cwd: str | None = None) -> subprocess.CompletedProcess:
     """Run a subprocess; raise on failure."""
     result = subprocess.run(
@@ -140,19 +154,33 @@ def upload_via_git(
     work_id: str,
     file_pairs: list[dict],  # [{"local_path": ..., "remote_path": ..., "filename": ...}]
     branch: str = "main",
+    *,
+    repo_url: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
 ) -> list[dict]:
-    """Clone, copy binary files, commit, push. Returns list of uploaded file info."""
+    """Clone, copy binary files, commit, push. Returns list of uploaded file info.
+
+    ``repo_url`` overrides the GitHub remote (benchmarks use a local ``file://`` bare
+    repo).  With a ``timer``, the git:clone / git:copy / git:verify / git:commit /
+    git:push spans are recorded on it and the push span carries ``clone_bytes``
+    (size of the working clone once the commit exists, i.e. the peak disk use).
+    """
 
-    repo_url = f"https://github.com/{login}/{repo_name}.git"
+    repo_url = repo_url or f"https://github.com/{login}/{repo_name}.git"
+    measure_disk = timer is not None
+    timer = timer or StageTimer()
 
     tmpdir = tempfile.mkdtemp(prefix="issue-assets-")
     clone_dir = os.path.join(tmpdir, repo_name)
 
     try:
         # Shallow clone (depth 1 is enough — we just need to push a new commit)
-        _run(["git", "clone", "--depth", "1", repo_url, clone_dir])
+        with timer.span("git:clone"):
+            _run(["git", "clone", "--depth", "1", repo_url, clone_dir])
 
         uploaded = []
+        copy_started = verify_started = 0.0
+        copy_sec = verify_sec = 0.0
         for fp in file_pairs:
             local = Path(fp["local_path"])
             remote = fp["remote_path"]         # e.g. "iOfficeAI/AionUi/wo-xxx/file.png"
@@ -162,9 +190,14 @@ def upload_via_git(
             dest.parent.mkdir(parents=True, exist_ok=True)
 
             # Copy BINARY file — no base64, no encoding, raw bytes
+            started = timer.now()
+            copy_started = copy_started or started
             shutil.copy2(str(local), str(dest))
+            copy_sec += timer.now() - started
 
             # Verify: destination must be a real binary image, not text
+            started = timer.now()
+            verify_started = verify_started or started
             verify_err = _verify_binary_image(dest)
             if verify_err:
                 raise RuntimeError(
@@ -183,6 +216,7 @@ def upload_via_git(
                     f"Size mismatch for {filename}: "
                     f"source={src_size} bytes, dest={dst_size} bytes"
                 )
+            verify_sec += timer.now() - started
 
             raw_url = build_github_raw_url(login=login, repo=repo_name, path=remote, branch=branch)
             uploaded.append({
@@ -193,14 +227,20 @@ def upload_via_git(
 
         if not uploaded:
             return []
+        timer.record("git:copy", copy_started, copy_sec, files=len(uploaded))
+        timer.record("git:verify", verify_started, verify_sec, files=len(uploaded))
 
         # Stage, commit, push
-        _run(["git", "add", "-A"], cwd=clone_dir)
-        _run(
-            ["git", "commit", "-m", f"Upload attachments for {work_id}"],
-            cwd=clone_dir,
-        )
-        _run(["git", "push", "origin", branch], cwd=clone_dir)
+        with timer.span("git:commit"):
+            _run(["git", "add", "-A"], cwd=clone_dir)
+            _run(
+                ["git", "commit", "-m", f"Upload attachments for {work_id}"],
+                cwd=clone_dir,
+            )
+        with timer.span("git:push") as push:
+            _run(["git", "push", "origin", branch], cwd=clone_dir)
+            if measure_disk:
+                push["clone_bytes"] = _tree_size(Path(clone_dir))
 
         return uploaded
 
@@ -208,6 +248,30 @@ def upload_via_git(
         shutil.rmtree(tmpdir, ignore_errors=True)
 
 
+def check_raw_urls(
+    uploaded: list[dict],
+    *,
+    timeout_sec: int = 15,
+    client: Optional[PooledHttpClient] = None,
+) -> list[dict]:
+    """HEAD every raw URL after the push (raw.githubusercontent.com can lag a push).
+
+    All requests go to the same host, so the pooled client reuses one keep-alive
+    connection instead of paying TCP + TLS setup per file.
+    """
+    http = client or default_http_client()
+    checks = []
+    for item in uploaded:
+        check = {"filename": item["filename"], "raw_url": item["raw_url"], "status": 0, "ok": False}
+        try:
+            check["status"] = http.head(item["raw_url"], timeout_sec=timeout_sec).status
+        except HttpClientError as exc:
+            check["error"] = str(exc)
+        check["ok"] = 200 <= check["status"] < 300
+        checks.append(check)
+    return checks
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -234,16 +298,31 @@ def parse_args() -> argparse.Namespace:
         default=True,
         help="Do not write uploaded URLs back to work_order.json",
     )
+    parser.add_argument(
+        "--verify-raw-urls",
+        action="store_true",
+        help="HEAD each raw URL after the push and report its HTTP status",
+    )
+    add_profile_args(parser)
     return parser.parse_args()
 
 
-def main() -> int:
-    args = parse_args()
-    work_order_path = Path(args.work_order).expanduser().resolve()
+def prepare_attachments(
+    work_order_path: Path,
+    *,
+    login: str,
+    repo_name: str = DEFAULT_ASSETS_REPO_NAME,
+    branch: str = "main",
+    writeback: bool = True,
+    verify_raw_urls: bool = False,
+) -> Tuple[int, Dict[str, Any]]:
+    """Upload the work order's image attachments to the assets repo.
 
+    Returns ``(exit_code, result)`` where ``result`` is the JSON object the CLI prints.
+    Shared by the CLI and ``payload_service.py``.
+    """
     if not work_order_path.is_file():
-        print(json.dumps({"error": f"work_order.json not found: {work_order_path}"}))
-        return 1
+        return 1, {"error": f"work_order.json not found: {work_order_path}"}
 
     runtime_data = ensure_work_order_runtime(work_order_path)
     ensure_work_order_attachments(work_order_path)
@@ -269,11 +348,10 @@ def main() -> int:
             message="Skipped git upload because attachment_markdown already exists.",
             extra={"attachment_upload_status": "uploaded"},
         )
-        print(json.dumps({
+        return 0, {
             "status": "already_uploaded",
             "attachment_markdown": existing_md,
-        }, ensure_ascii=False))
-        return 0
+        }
 
     owner_repo = norm.get("owner_repo") or raw.get("owner_repo") or ""
     work_id = norm.get("work_id") or raw.get("work_id") or ""
@@ -300,8 +378,7 @@ def main() -> int:
             message="Skipped git upload because no attachments were provided.",
             extra={"attachment_upload_status": "none"},
         )
-        print(json.dumps({"status": "no_attachments"}))
-        return 0
+        return 0, {"status": "no_attachments"}
 
     if not owner_repo or not work_id:
         error_msg = "owner_repo or work_id missing in work_order.json"
@@ -320,8 +397,7 @@ def main() -> int:
             error=error_msg,
             message="Attachment upload aborted because work_order identity fields are missing.",
         )
-        print(json.dumps({"error": error_msg}))
-        return 1
+        return 1, {"error": error_msg}
 
     # Resolve and filter
     existing_paths, missing_paths = resolve_attachment_paths(
@@ -360,12 +436,11 @@ def main() -> int:
                 "missing_attachments": missing_paths,
             },
         )
-        print(json.dumps({
+        return 0, {
             "status": "nothing_uploadable",
             "skipped": [s["reason"] for s in skipped],
             "missing": missing_paths,
-        }, ensure_ascii=False))
-        return 0
+        }
 
     # Build file pairs
     seen: dict = {}
@@ -405,19 +480,23 @@ def main() -> int:
                 error=error_msg,
                 message="Attachment validation failed before git upload.",
             )
-            print(json.dumps({"error": error_msg}, ensure_ascii=False))
-            return 1
+            return 1, {"error": error_msg}
 
-    # Upload
-    login = args.login
-    repo_name = args.repo_name
+    # Files already hosted (same content hash) are reused instead of pushed again.
+    hosted, _ = split_hosted([Path(fp["local_path"]) for fp in file_pairs], owner_repo=owner_repo)
+    hosted_by_path = {str(path): entry for path, entry in hosted}
+    to_upload = [fp for fp in file_pairs if fp["local_path"] not in hosted_by_path]
 
+    # Upload
     append_work_order_event(
         work_order_path,
         stage="upload_attachments",
         status="started",
         submitter=SUBMITTER_GITHUB_MCP,
-        message=f"Uploading {len(file_pairs)} file(s) via git clone+push.",
+        message=(
+            f"Uploading {len(to_upload)} file(s) via git clone+push; "
+            f"{len(hosted_by_path)} reused from the attachment cache."
+        ),
     )
 
     try:
@@ -426,9 +505,9 @@ def main() -> int:
             repo_name,
             owner_repo,
             work_id,
-            file_pairs,
-            branch=args.branch,
-        )
+            to_upload,
+            branch=branch,
+        ) if to_upload else []
     except Exception as exc:
         error_msg = str(exc)
         write_work_order_updates(work_order_path, {
@@ -450,10 +529,9 @@ def main() -> int:
             error=error_msg,
             message="git clone+push upload failed.",
         )
-        print(json.dumps({"error": error_msg}, ensure_ascii=False))
-        return 1
+        return 1, {"error": error_msg}
 
-    if not uploaded:
+    if not uploaded and not hosted_by_path:
         update_work_order_runtime(work_order_path, {
             "status": "attachments_prepared",
             "last_submitter": SUBMITTER_GITHUB_MCP,
@@ -461,15 +539,41 @@ def main() -> int:
             "last_error": "",
             "last_error_at": "",
         })
-        print(json.dumps({"status": "nothing_uploaded"}))
-        return 0
+        return 0, {"status": "nothing_uploaded"}
+
+    assets_repo = f"{login}/{repo_name}"
+    uploaded_by_name = {u["filename"]: u for u in uploaded}
+    for fp in to_upload:
+        item = uploaded_by_name.get(fp["filename"])
+        if item:
+            remember_hosted(
+                Path(fp["local_path"]),
+                method=ATTACHMENT_UPLOAD_METHOD_REPO,
+                url=item["raw_url"],
+                markdown=build_repo_attachment_markdown([item]),
+                owner_repo=owner_repo,
+                attachment_repo=assets_repo,
+            )
+    markdown_lines = []
+    for fp in file_pairs:
+        entry = hosted_by_path.get(fp["local_path"])
+        if entry is not None:
+            markdown_lines.append(entry.markdown)
+        elif fp["filename"] in uploaded_by_name:
+            markdown_lines.append(build_repo_attachment_markdown([uploaded_by_name[fp["filename"]]]))
+    reused = [
+        {"filename": fp["filename"], "url": hosted_by_path[fp["local_path"]].url, "method": hosted_by_path[fp["local_path"]].method}
+        for fp in file_pairs
+        if fp["local_path"] in hosted_by_path
+    ]
 
     # Build markdown and write back
-    attachment_markdown = build_repo_attachment_markdown(uploaded)
+    attachment_markdown = "\n".join(markdown_lines)
     url_map = {u["filename"]: u["raw_url"] for u in uploaded}
-    assets_repo = f"{login}/{repo_name}"
+    url_map.update({item["filename"]: item["url"] for item in reused})
+    raw_url_checks = check_raw_urls(uploaded) if verify_raw_urls else []
 
-    if args.writeback:
+    if writeback:
         write_work_order_updates(work_order_path, {
             "attachment_markdown": attachment_markdown,
             "attachment_upload_status": "uploaded",
@@ -489,29 +593,50 @@ def main() -> int:
         stage="upload_attachments",
         status="succeeded",
         submitter=SUBMITTER_GITHUB_MCP,
-        message=f"Uploaded {len(uploaded)} file(s) to {assets_repo} via git push.",
+        message=f"Uploaded {len(uploaded)} file(s) to {assets_repo} via git push; reused {len(reused)} cached file(s).",
         extra={
             "method": ATTACHMENT_UPLOAD_METHOD_REPO,
             "attachment_repo": assets_repo,
             "uploaded_count": len(uploaded),
+            "uploaded_bytes": sum(
+                Path(fp["local_path"]).stat().st_size for fp in to_upload if fp["filename"] in uploaded_by_name
+            ),
+            "reused_count": len(reused),
             "filenames": list(url_map.keys()),
             "urls": url_map,
-            "branch": args.branch,
+            "branch": branch,
+            **({"raw_url_checks": raw_url_checks} if verify_raw_urls else {}),
         },
     )
 
-    result = {
+    result: Dict[str, Any] = {
         "status": "uploaded",
         "method": ATTACHMENT_UPLOAD_METHOD_REPO,
         "attachment_markdown": attachment_markdown,
         "uploaded_count": len(uploaded),
         "uploaded_files": uploaded,
+        "reused_files": reused,
         "skipped": [{"path": s["path"], "reason": s["reason"]} for s in skipped],
         "missing": missing_paths,
     }
-    print(json.dumps(result, ensure_ascii=False, indent=2))
-    return 0
+    if verify_raw_urls:
+        result["raw_url_checks"] = raw_url_checks
+    return 0, result
+
+
+def main() -> int:
+    args = parse_args()
+    code, result = prepare_attachments(
+        Path(args.work_order).expanduser().resolve(),
+        login=args.login,
+        repo_name=args.repo_name,
+        branch=args.branch,
+        writeback=args.writeback,
+        verify_raw_urls=args.verify_raw_urls,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2 if result.get("status") == "uploaded" else None))
+    return code
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(run_profiled(main, "github_mcp_upload_attachments", submitter=SUBMITTER_GITHUB_MCP))
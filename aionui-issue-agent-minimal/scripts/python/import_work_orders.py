@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Bulk-create work orders from a CSV or JSONL export of another tracker.
+
+Rows are streamed one at a time (``csv.DictReader`` / one JSON object per line),
+so memory stays flat however large the input is.  For each row:
+
+    1. column names are mapped to work order keys: template ids as-is
+       (``bug_description``), template labels (``Bug Description``) and the legacy
+       aliases ``normalize_work_order_dict`` accepts (``description`` / ``steps`` / ...)
+    2. ``normalize_work_order_dict`` + ``apply_template_defaults`` run against the
+       cached Issue Forms template, exactly as the submitters do
+    3. required fields are checked like ``preflight_validate_required`` (plus ``title``)
+    4. valid rows become ``<root>/<session_id>/<work_id>/work_order.json`` with an
+       ``import`` event; invalid rows go to the failure report (JSONL, one line per row)
+
+``work_id`` comes from a ``work_id`` column when present (so re-running an import
+skips rows that already exist), otherwise a fresh one is generated.  CSV
+``attachments`` cells may list several paths separated by ``;`` or newlines.
+Reported ``row`` numbers are data rows for CSV (header excluded) and lines for JSONL.
+``--overwrite`` replaces the fields of an existing work order but keeps its
+submission history (``issue_number`` / ``issue_url`` / ``runtime`` / ``events``).
+
+Usage:
+    python import_work_orders.py --input bugs.csv --session-id import-20260401
+    python import_work_orders.py --input bugs.jsonl --session-id import-20260401 --dry-run
+    python import_work_orders.py --input bugs.csv --session-id s1 --report failed_rows.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from github_mcp_build_payload import ASSETS_TEMPLATES_DIR
+from issue_payload_support import (
+    AIONUI_REPO,
+    AIONUI_URL,
+    WORK_ORDER_SCHEMA_VERSION,
+    all_fields_from_template,
+    append_work_order_event,
+    apply_template_defaults,
+    field_label,
+    load_issue_template_cached,
+    missing_required_fields,
+    new_work_id,
+    normalize_work_order_dict,
+    template_for_issue_type,
+)
+from work_order_index import ISSUE_RUNS_DIRNAME
+
+
+FORMATS = ("csv", "jsonl")
+PRESERVED_ON_OVERWRITE = ("issue_number", "issue_url", "runtime", "events")
+_WORK_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+_ATTACHMENT_SPLIT_RE = re.compile(r"[;\n]")
+
+
+def _key(name: str) -> str:
+    return re.sub(r"[\s\-]+", "_", str(name or "").strip().lower())
+
+
+def label_aliases() -> Dict[str, str]:
+    """``_key(label)`` -> field id for every field of the bundled templates."""
+    aliases: Dict[str, str] = {}
+    for issue_type in ("bug", "feature"):
+        _, template_path = template_for_issue_type(issue_type, ASSETS_TEMPLATES_DIR)
+        for field in all_fields_from_template(load_issue_template_cached(template_path)):
+            aliases.setdefault(_key(field_label(field)), str(field["id"]))
+    return aliases
+
+
+def normalize_row_keys(row: Dict[str, Any], aliases: Dict[str, str]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, value in row.items():
+        if name is None:  # csv: more cells than header columns
+            continue
+        key = _key(name)
+        key = aliases.get(key, key)
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        out[key] = value
+    attachments = out.get("attachments")
+    if isinstance(attachments, str):
+        out["attachments"] = [item.strip() for item in _ATTACHMENT_SPLIT_RE.split(attachments) if item.strip()]
+    return out
+
+
+def iter_rows(handle: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], str]]:
+    """Yield ``(row_number, row_or_None, error)``; one row in memory at a time."""
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(handle), start=1):
+            yield number, row, ""
+        return
+    for number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "JSON line is not an object"
+            continue
+        yield number, row, ""
+
+
+def validate_row(raw: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+    """Template defaults to write back, and the required fields still missing."""
+    norm = normalize_work_order_dict(raw)
+    _, template_path = template_for_issue_type(norm.get("issue_type", "bug"), ASSETS_TEMPLATES_DIR)
+    template = load_issue_template_cached(template_path)
+    norm, updates = apply_template_defaults(template, norm)
+    missing = missing_required_fields(template, norm)
+    if not norm.get("title"):
+        missing.insert(0, {"id": "title", "label": "Title", "type": "input"})
+    updates["issue_type"] = norm["issue_type"]
+    return updates, missing
+
+
+def build_work_order(raw: Dict[str, Any], updates: Dict[str, Any], *, session_id: str, work_id: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    data = {key: value for key, value in raw.items() if key not in ("work_id", "session_id")}
+    data.update(updates)
+    data.update(
+        {
+            "schema_version": WORK_ORDER_SCHEMA_VERSION,
+            "session_id": session_id,
+            "work_id": work_id,
+            "owner_repo": str(raw.get("owner_repo") or AIONUI_REPO),
+            "project_url": str(raw.get("project_url") or AIONUI_URL),
+            "attachments": list(raw.get("attachments") or []),
+            "attachment_markdown": str(raw.get("attachment_markdown") or ""),
+            "import_source": source,
+        }
+    )
+    return data
+
+
+def _preserved_fields(path: Path) -> Dict[str, Any]:
+    """Submission history of an existing work order, carried over by ``--overwrite``."""
+    try:
+        existing = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(existing, dict):
+        return {}
+    return {key: existing[key] for key in PRESERVED_ON_OVERWRITE if key in existing}
+
+
+def import_rows(
+    input_path: Path,
+    *,
+    session_id: str,
+    root: Path,
+    fmt: str,
+    report: Optional[TextIO] = None,
+    dry_run: bool = False,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    aliases = label_aliases()
+    summary: Dict[str, Any] = {
+        "input": str(input_path),
+        "session_dir": str(root / session_id),
+        "dry_run": dry_run,
+        "rows": 0,
+        "created": 0,
+        "skipped_existing": 0,
+        "failed": 0,
+    }
+
+    def fail(number: int, error: str, **extra: Any) -> None:
+        summary["failed"] += 1
+        if report is not None:
+            report.write(json.dumps({"row": number, "error": error, **extra}, ensure_ascii=False) + "\n")
+
+    with input_path.open("r", encoding="utf-8-sig", newline="") as handle:
+        for number, row, error in iter_rows(handle, fmt):
+            summary["rows"] += 1
+            if row is None:
+                fail(number, error)
+                continue
+            raw = normalize_row_keys(row, aliases)
+            updates, missing = validate_row(raw)
+            if missing:
+                fail(number, "missing required fields", title=str(raw.get("title") or ""), missing_required=missing)
+                continue
+            work_id = str(raw.get("work_id") or "").strip() or new_work_id()
+            if not _WORK_ID_RE.match(work_id):
+                fail(number, f"invalid work_id: {work_id!r}", title=str(raw.get("title") or ""))
+                continue
+            path = root / session_id / work_id / "work_order.json"
+            if path.exists() and not overwrite:
+                summary["skipped_existing"] += 1
+                continue
+            summary["created"] += 1
+            if dry_run:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            source = {"file": str(input_path.resolve()), "row": number}
+            data = build_work_order(raw, updates, session_id=session_id, work_id=work_id, source=source)
+            if path.exists():
+                data.update(_preserved_fields(path))
+            path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            append_work_order_event(
+                path,
+                stage="import",
+                status="succeeded",
+                message=f"Imported from {input_path.name} row {number}.",
+                extra={"source": source},
+            )
+    return summary
+
+
+def detect_format(path: Path, explicit: str = "") -> str:
+    if explicit:
+        return explicit
+    return "jsonl" if path.suffix.lower() in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Create work orders from a CSV or JSONL file (streamed).")
+    parser.add_argument("--input", required=True, help="CSV (header row) or JSONL file")
+    parser.add_argument("--session-id", required=True, help="issue_runs/<session_id> to create the work orders in")
+    parser.add_argument("--root", default=ISSUE_RUNS_DIRNAME, help="issue_runs directory (default: ./issue_runs)")
+    parser.add_argument("--format", choices=FORMATS, default="", help="Default: from the file extension")
+    parser.add_argument("--report", help="Write failed rows here as JSONL (default: stderr)")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only; write no work orders")
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace the fields of work orders whose work_id already exists (issue/runtime/events are kept)",
+    )
+    args = parser.parse_args()
+
+    input_path = Path(args.input).expanduser()
+    if not _WORK_ID_RE.match(args.session_id):
+        print(f"ERROR: invalid --session-id: {args.session_id!r}", file=sys.stderr)
+        return 2
+    if not input_path.is_file():
+        print(f"ERROR: input not found: {input_path}", file=sys.stderr)
+        return 2
+    report_handle = open(args.report, "w", encoding="utf-8") if args.report else sys.stderr
+    try:
+        summary = import_rows(
+            input_path,
+            session_id=args.session_id,
+            root=Path(args.root).expanduser().resolve(),
+            fmt=detect_format(input_path, args.format),
+            report=report_handle,
+            dry_run=args.dry_run,
+            overwrite=args.overwrite,
+        )
+    finally:
+        if args.report:
+            report_handle.close()
+    if args.report:
+        summary["report"] = str(Path(args.report).resolve())
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Local cache of a target repo's issues for pre-submit duplicate detection.
+
+``find_recent_issue_by_title`` only sees the 20 newest issues and only runs
+after an ambiguous Create click.  This module keeps a SQLite copy of the
+repo's issues (number, title, state, body excerpt) that syncs incrementally
+with ``since=`` + ``If-None-Match`` and answers fuzzy title queries through a
+character trigram index, so an obvious duplicate can be skipped before the
+browser is ever opened.
+
+Cache location: ``<user_cache_dir()>/issue_corpus/<owner>__<repo>.sqlite3``
+
+Usage:
+    python issue_corpus_cache.py sync --owner-repo iOfficeAI/AionUi
+    python issue_corpus_cache.py search "发送按钮卡死 / Freeze after Send"
+    python issue_corpus_cache.py check --work-order /path/to/work_order.json --sync
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import re
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from github_http import default_http_client
+from issue_payload_support import (
+    AIONUI_REPO,
+    github_api_base,
+    github_api_headers,
+    github_token_from_env,
+    split_owner_repo,
+    user_cache_dir,
+)
+from work_order_index import normalize_issue_title
+
+
+USER_AGENT = "aionui-issue-agent-minimal/issue-corpus"
+BODY_EXCERPT_CHARS = 500
+PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = 50
+DEFAULT_DUPLICATE_THRESHOLD = 0.75
+MAX_QUERY_GRAMS = 400
+CANDIDATE_LIMIT = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    number INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '',
+    body_excerpt TEXT NOT NULL DEFAULT '',
+    html_url TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    gram_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS title_grams (
+    gram TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    PRIMARY KEY (gram, number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class DuplicateCandidate:
+    number: int
+    title: str
+    state: str
+    html_url: str
+    score: float
+    body_excerpt: str = ""
+
+
+@dataclass
+class SyncResult:
+    fetched: int
+    upserted: int
+    pages: int
+    not_modified: bool
+    since: str
+
+
+def corpus_path(owner_repo: str, cache_dir: Optional[Path] = None) -> Path:
+    owner, repo = split_owner_repo(owner_repo)
+    return (cache_dir or user_cache_dir()) / "issue_corpus" / f"{owner}__{repo}.sqlite3"
+
+
+def open_corpus(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def title_grams(title: str) -> set[str]:
+    """Character trigrams over the normalized title (works for CJK and Latin mixed titles)."""
+    text = re.sub(r"[^\w]+", " ", normalize_issue_title(title)).strip()
+    if not text:
+        return set()
+    padded = f" {text} "
+    if len(padded) < 3:
+        return {padded}
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return str(row["value"]) if row else ""
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def upsert_issue(conn: sqlite3.Connection, item: Dict[str, Any]) -> bool:
+    if not isinstance(item, dict) or "pull_request" in item:
+        return False
+    try:
+        number = int(item.get("number"))
+    except (TypeError, ValueError):
+        return False
+    title = str(item.get("title") or "").strip()
+    grams = title_grams(title)
+    body = re.sub(r"\s+", " ", str(item.get("body") or "")).strip()[:BODY_EXCERPT_CHARS]
+    conn.execute(
+        "INSERT INTO issues (number, title, state, body_excerpt, html_url, created_at, updated_at, gram_count) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(number) DO UPDATE SET "
+        "title = excluded.title, state = excluded.state, body_excerpt = excluded.body_excerpt, "
+        "html_url = excluded.html_url, created_at = excluded.created_at, "
+        "updated_at = excluded.updated_at, gram_count = excluded.gram_count",
+        (
+            number,
+            title,
+            str(item.get("state") or ""),
+            body,
+            str(item.get("html_url") or ""),
+            str(item.get("created_at") or ""),
+            str(item.get("updated_at") or ""),
+            len(grams),
+        ),
+    )
+    conn.execute("DELETE FROM title_grams WHERE number = ?", (number,))
+    conn.executemany("INSERT INTO title_grams (gram, number) VALUES (?, ?)", [(gram, number) for gram in grams])
+    return True
+
+
+def _next_link(link_header: str) -> str:
+    for part in str(link_header or "").split(","):
+        match = re.match(r'\s*<([^>]+)>\s*;\s*rel="next"', part)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def _fetch_page(url: str, headers: Dict[str, str], timeout_sec: int) -> Tuple[int, Dict[str, str], Any]:
+    response = default_http_client().get(url, headers=headers, timeout_sec=timeout_sec)
+    if response.status == 304:
+        return 304, response.headers, None
+    response.raise_for_status()
+    return response.status, response.headers, response.json()
+
+
+def sync_corpus(
+    conn: sqlite3.Connection,
+    owner_repo: str,
+    *,
+    token: str = "",
+    timeout_sec: int = 15,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> SyncResult:
+    """Pull issues updated since the last sync; a 304 on the first page means nothing changed."""
+    owner, repo = split_owner_repo(owner_repo)
+    since = _get_meta(conn, "since")
+    url = (
+        f"{github_api_base()}/repos/{owner}/{repo}/issues"
+        f"?state=all&sort=updated&direction=asc&per_page={PAGE_SIZE}"
+    )
+    if since:
+        url += f"&since={since}"
+    headers = github_api_headers(USER_AGENT, token)
+    etag = _get_meta(conn, f"etag:{url}")
+    if etag:
+        headers["If-None-Match"] = etag
+
+    fetched = upserted = pages = 0
+    first_url = url
+    newest = since
+    while url and pages < max_pages:
+        status, response_headers, payload = _fetch_page(url, headers, timeout_sec)
+        pages += 1
+        if status == 304:
+            return SyncResult(fetched=0, upserted=0, pages=pages, not_modified=True, since=since)
+        if not isinstance(payload, list):
+            break
+        with conn:
+            for item in payload:
+                fetched += 1
+                if upsert_issue(conn, item):
+                    upserted += 1
+                updated_at = str((item or {}).get("updated_at") or "") if isinstance(item, dict) else ""
+                if updated_at > newest:
+                    newest = updated_at
+            if url == first_url and response_headers.get("etag"):
+                conn.execute("DELETE FROM meta WHERE key LIKE 'etag:%'")
+                _set_meta(conn, f"etag:{first_url}", response_headers["etag"])
+        url = _next_link(response_headers.get("link", ""))
+        headers.pop("If-None-Match", None)
+
+    if newest and newest != since:
+        with conn:
+            _set_meta(conn, "since", newest)
+    return SyncResult(fetched=fetched, upserted=upserted, pages=pages, not_modified=False, since=newest)
+
+
+def search_similar_titles(
+    conn: sqlite3.Connection,
+    title: str,
+    *,
+    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+    limit: int = 5,
+) -> List[DuplicateCandidate]:
+    """Dice similarity over title trigrams; the gram index narrows candidates first."""
+    grams = sorted(title_grams(title))[:MAX_QUERY_GRAMS]
+    if not grams:
+        return []
+    placeholders = ", ".join("?" for _ in grams)
+    rows = conn.execute(
+        f"SELECT i.number, i.title, i.state, i.html_url, i.body_excerpt, i.gram_count, COUNT(*) AS hits "
+        f"FROM title_grams g JOIN issues i ON i.number = g.number "
+        f"WHERE g.gram IN ({placeholders}) GROUP BY i.number ORDER BY hits DESC LIMIT ?",
+        (*grams, CANDIDATE_LIMIT),
+    ).fetchall()
+    results: List[DuplicateCandidate] = []
+    for row in rows:
+        score = 2.0 * row["hits"] / (len(grams) + max(1, row["gram_count"]))
+        if score < threshold:
+            continue
+        results.append(
+            DuplicateCandidate(
+                number=int(row["number"]),
+                title=row["title"],
+                state=row["state"],
+                html_url=row["html_url"],
+                score=round(score, 4),
+                body_excerpt=row["body_excerpt"],
+            )
+        )
+    results.sort(key=lambda item: (-item.score, -item.number))
+    return results[:limit]
+
+
+def find_duplicate_issues(
+    owner_repo: str,
+    title: str,
+    *,
+    sync: bool = True,
+    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+    timeout_sec: int = 15,
+    cache_dir: Optional[Path] = None,
+) -> List[DuplicateCandidate]:
+    """Best-effort lookup used by submitters; a failed sync falls back to the cached corpus."""
+    conn = open_corpus(corpus_path(owner_repo, cache_dir))
+    try:
+        if sync:
+            with contextlib.suppress(OSError, ValueError):
+                sync_corpus(conn, owner_repo, token=github_token_from_env(), timeout_sec=timeout_sec)
+        return search_similar_titles(conn, title, threshold=threshold)
+    finally:
+        conn.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync and query the local issue corpus used for duplicate detection.")
+    parser.add_argument("--owner-repo", default=AIONUI_REPO, help=f"Target repo (default: {AIONUI_REPO})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Incrementally sync issues from the GitHub API")
+    sync.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES)
+    search = sub.add_parser("search", help="Fuzzy search cached issue titles")
+    search.add_argument("title")
+    search.add_argument("--threshold", type=float, default=0.5)
+    search.add_argument("--limit", type=int, default=5)
+    check = sub.add_parser("check", help="Check a work order's title against the corpus")
+    check.add_argument("--work-order", required=True)
+    check.add_argument("--threshold", type=float, default=DEFAULT_DUPLICATE_THRESHOLD)
+    check.add_argument("--sync", action="store_true", help="Sync before checking")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "check":
+        work_order = json.loads(Path(args.work_order).expanduser().read_text(encoding="utf-8"))
+        owner_repo = str(work_order.get("owner_repo") or args.owner_repo)
+        duplicates = find_duplicate_issues(
+            owner_repo,
+            str(work_order.get("title") or ""),
+            sync=args.sync,
+            threshold=args.threshold,
+        )
+        print(json.dumps([asdict(item) for item in duplicates], ensure_ascii=False, indent=2))
+        return 3 if duplicates else 0
+
+    conn = open_corpus(corpus_path(args.owner_repo))
+    try:
+        if args.command == "sync":
+            result: Any = asdict(
+                sync_corpus(conn, args.owner_repo, token=github_token_from_env(), max_pages=args.max_pages)
+            )
+        else:
+            result = [
+                asdict(item)
+                for item in search_similar_titles(conn, args.title, threshold=args.threshold, limit=args.limit)
+            ]
+    finally:
+        conn.close()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
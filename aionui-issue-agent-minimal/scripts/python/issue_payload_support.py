@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import contextlib
 import datetime
+import hashlib
 import json
 import os
 import platform as py_platform
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
 import yaml
 
+try:
+    import fcntl
+except ImportError:  # Windows: best-effort without an inter-process lock, like metrics_exporter
+    fcntl = None  # type: ignore[assignment]
+
+from error_classifier import classify_text
+from metrics_exporter import record_event_metrics, record_runtime_metrics
+from work_order_index import index_work_order
+
 
 AIONUI_REPO = "iOfficeAI/AionUi"
 AIONUI_URL = "https://github.com/iOfficeAI/AionUi"
@@ -37,12 +48,80 @@ ATTACHMENT_UPLOAD_METHOD_BROWSER = "browser"
 SUBMITTER_SKILL = "skill"
 SUBMITTER_CHROME_MCP = "chrome_mcp"
 SUBMITTER_GITHUB_MCP = "github_mcp"
+SUBMITTER_API = "api"
+GITHUB_API_BASE_ENV = "AIONUI_GITHUB_API_BASE"
+DEFAULT_GITHUB_API_BASE = "https://api.github.com"
+GITHUB_TOKEN_ENVS = ("GITHUB_TOKEN", "GH_TOKEN")
+USER_CACHE_DIR_ENV = "AIONUI_CACHE_DIR"
+PAYLOAD_CACHE_VOLATILE_KEYS = {"runtime", "events"}
 
 
 def iso_now() -> str:
     return datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0).isoformat()
 
 
+def user_cache_dir() -> Path:
+    """Per-user cache shared by all work orders (ETag caches, issue corpus, stats)."""
+    override = os.environ.get(USER_CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    home = Path.home()
+    if os.name == "nt":
+        base = Path(os.environ.get("LOCALAPPDATA") or (home / ".aionui"))
+        return base / "AionUi" / "cache"
+    return Path(os.environ.get("XDG_CACHE_HOME", str(home / ".cache"))) / "AionUi"
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive inter-process lock on ``<path>.lock`` around a read-modify-write of ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a+") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+def github_api_base() -> str:
+    return (os.environ.get(GITHUB_API_BASE_ENV) or DEFAULT_GITHUB_API_BASE).rstrip("/")
+
+
+def github_token_from_env() -> str:
+    for name in GITHUB_TOKEN_ENVS:
+        token = str(os.environ.get(name) or "").strip()
+        if token:
+            return token
+    return ""
+
+
+def github_api_headers(user_agent: str, token: str = "") -> Dict[str, str]:
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": user_agent,
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def github_rate_limit_backoff_until(status: int, headers: Dict[str, str], now: float) -> float:
+    """Epoch seconds until which GitHub API calls should pause (0 = no backoff).
+
+    ``headers`` must use lower-case keys.
+    """
+    if status in (403, 429):
+        with contextlib.suppress(TypeError, ValueError):
+            retry_after = float(headers.get("retry-after") or "")
+            return now + max(0.0, retry_after)
+    if str(headers.get("x-ratelimit-remaining") or "").strip() == "0":
+        with contextlib.suppress(TypeError, ValueError):
+            return float(headers.get("x-ratelimit-reset") or "")
+    if status == 429:
+        return now + 60.0
+    return 0.0
+
+
 def new_work_id(prefix: str = "wo") -> str:
     ts = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
     return f"{prefix}-{ts}-{uuid.uuid4().hex[:6]}"
@@ -53,6 +132,23 @@ def load_issue_template(template_path: Path) -> dict:
         return yaml.safe_load(f)
 
 
+_TEMPLATE_CACHE: Dict[str, Tuple[int, dict]] = {}
+
+
+def load_issue_template_cached(template_path: Path) -> dict:
+    """Parse a template once per process; re-parse only when the file's mtime changes.
+
+    Callers must treat the returned dict as read-only because it is shared.
+    """
+    key = str(template_path.resolve())
+    mtime_ns = template_path.stat().st_mtime_ns
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is None or cached[0] != mtime_ns:
+        cached = (mtime_ns, load_issue_template(template_path))
+        _TEMPLATE_CACHE[key] = cached
+    return cached[1]
+
+
 def template_for_issue_type(issue_type: str, assets_templates_dir: Path) -> Tuple[str, Path]:
     issue_type = (issue_type or "").lower()
     name = "feature_request.yml" if issue_type.startswith("feat") else "bug_report.yml"
@@ -194,6 +290,23 @@ def apply_template_defaults(tpl: dict, norm: Dict[str, Any]) -> Tuple[Dict[str,
     return out, updates
 
 
+def missing_required_fields(tpl: dict, norm: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Required Issue Forms fields that are still empty after the usual fallbacks."""
+    missing = []
+    for field in all_fields_from_template(tpl):
+        if not bool((field.get("validations", {}) or {}).get("required", False)):
+            continue
+        field_id = field.get("id")
+        value = norm.get(field_id, "")
+        if field_id == "platform" and not str(value).strip():
+            value = infer_platform_default()
+        if field_id == "actual_behavior" and not str(value).strip():
+            value = norm.get("bug_description", "")
+        if not str(value).strip():
+            missing.append({"id": field_id, "label": field_label(field), "type": field_type(field)})
+    return missing
+
+
 def resolve_attachment_paths(attachments: List[str], base_dir: Path) -> Tuple[List[Path], List[str]]:
     existing: List[Path] = []
     missing: List[str] = []
@@ -227,6 +340,11 @@ def _work_order_attachment_entry(path: Path, base_dir: Path) -> str:
         return str(resolved)
 
 
+def _write_work_order_json(path: Path, data: Dict[str, Any]) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    index_work_order(path, data)
+
+
 def discover_workspace_attachments(base_dir: Path) -> List[Path]:
     if not base_dir.is_dir():
         return []
@@ -278,7 +396,7 @@ def ensure_work_order_attachments(path: Path) -> Dict[str, Any]:
         changed = True
 
     if changed:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_work_order_json(path, data)
     return data
 
 
@@ -408,6 +526,74 @@ def build_issue_body_markdown(norm: Dict[str, Any], tpl: dict, attachment_markdo
     return "\n\n".join(sections).strip()
 
 
+def _attachment_stat_signature(attachments: List[str], base_dir: Path) -> List[List[Any]]:
+    signature: List[List[Any]] = []
+    for raw in attachments or []:
+        if not str(raw).strip():
+            continue
+        candidate = _resolve_attachment_candidate(str(raw), base_dir)
+        try:
+            stat = candidate.stat()
+        except OSError:
+            signature.append([str(candidate), None, None])
+            continue
+        signature.append([str(candidate), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def compute_payload_cache_key(
+    raw: Dict[str, Any],
+    template_path: Path,
+    base_dir: Path,
+    *,
+    builder: str,
+    extra: Any = None,
+) -> str:
+    """Hash everything a payload builder reads: work order fields, template and attachment stats.
+
+    ``runtime``/``events`` are excluded because every builder run rewrites them.
+    ``extra`` covers other inputs (e.g. the hosted-attachment cache signature).
+    """
+    relevant = {key: value for key, value in (raw or {}).items() if key not in PAYLOAD_CACHE_VOLATILE_KEYS}
+    attachments = relevant.get("attachments")
+    digest = hashlib.sha256()
+    digest.update(builder.encode("utf-8"))
+    digest.update(json.dumps(relevant, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(template_path.read_bytes())
+    digest.update(infer_platform_default().encode("utf-8"))
+    digest.update(
+        json.dumps(
+            _attachment_stat_signature(attachments if isinstance(attachments, list) else [], base_dir)
+        ).encode("utf-8")
+    )
+    if extra is not None:
+        digest.update(json.dumps(extra, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def payload_cache_path(work_order_path: Path, builder: str) -> Path:
+    return work_order_path.parent / "artifacts" / f"{builder}_payload_cache.json"
+
+
+def load_cached_payload(cache_path: Path, cache_key: str) -> Dict[str, Any] | None:
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("cache_key") != cache_key:
+        return None
+    payload = cached.get("payload")
+    return payload if isinstance(payload, dict) else None
+
+
+def store_cached_payload(cache_path: Path, cache_key: str, payload: Dict[str, Any]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"cache_key": cache_key, "created_at": iso_now(), "payload": payload}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+
+
 def write_work_order_updates(path: Path, updates: Dict[str, Any]) -> None:
     if not updates:
         return
@@ -418,7 +604,7 @@ def write_work_order_updates(path: Path, updates: Dict[str, Any]) -> None:
             data[key] = value
             changed = True
     if changed:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_work_order_json(path, data)
 
 
 def ensure_work_order_runtime(path: Path) -> Dict[str, Any]:
@@ -464,7 +650,7 @@ def ensure_work_order_runtime(path: Path) -> Dict[str, Any]:
         changed = True
 
     if changed:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_work_order_json(path, data)
     return data
 
 
@@ -473,6 +659,7 @@ def update_work_order_runtime(path: Path, runtime_updates: Dict[str, Any], top_l
     changed = False
 
     runtime = data["runtime"]
+    previous_status = str(runtime.get("status") or "")
     for key, value in (runtime_updates or {}).items():
         if runtime.get(key) != value:
             runtime[key] = value
@@ -485,10 +672,24 @@ def update_work_order_runtime(path: Path, runtime_updates: Dict[str, Any], top_l
             changed = True
 
     if changed:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_work_order_json(path, data)
+        record_runtime_metrics(previous_status, str(runtime.get("status") or ""))
     return data
 
 
+def annotate_last_work_order_event(path: Path, extra: Dict[str, Any], *, submitter: str = "") -> bool:
+    """Merge ``extra`` into the newest event (of ``submitter``, if given); False when there is none."""
+    data = ensure_work_order_runtime(path)
+    for event in reversed(data["events"]):
+        if not isinstance(event, dict) or (submitter and event.get("submitter") != submitter):
+            continue
+        event_extra = event.get("extra") if isinstance(event.get("extra"), dict) else {}
+        event["extra"] = {**event_extra, **extra}
+        _write_work_order_json(path, data)
+        return True
+    return False
+
+
 def append_work_order_event(
     path: Path,
     *,
@@ -501,7 +702,9 @@ def append_work_order_event(
     issue_number: str = "",
     artifacts_dir: str = "",
     extra: Dict[str, Any] | None = None,
+    error_category: str = "",
 ) -> Dict[str, Any]:
+    """Append one event; events with an ``error`` also get ``error_category`` (classified when not given)."""
     data = ensure_work_order_runtime(path)
     event = {
         "timestamp": iso_now(),
@@ -514,9 +717,12 @@ def append_work_order_event(
         "issue_number": issue_number,
         "artifacts_dir": artifacts_dir,
     }
+    if error:
+        event["error_category"] = error_category or classify_text(error)
     if extra:
         event["extra"] = extra
     data["events"].append(event)
     data["runtime"]["updated_at"] = event["timestamp"]
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_work_order_json(path, data)
+    record_event_metrics(event)
     return data
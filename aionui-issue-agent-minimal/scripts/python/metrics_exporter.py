@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Optional node_exporter textfile metrics for submitter health.
+
+Set ``AIONUI_METRICS_FILE=/var/lib/node_exporter/textfile/aionui.prom`` and
+every ``append_work_order_event`` / ``update_work_order_runtime`` call updates it;
+when the variable is unset nothing is written.  Counters are cumulative across
+processes: the running totals live in ``<file>.state.json`` (updated under a
+lock file), and the ``.prom`` file is re-rendered atomically after each change.
+
+Metrics:
+    aionui_submissions_total{submitter,status}            events with stage="submit"
+    aionui_duplicate_skips_total{submitter}               status="skipped_duplicate" (any stage)
+    aionui_submit_retries_total{submitter}                stage="submit_attempt", status="retry"
+    aionui_runtime_status_changes_total{status}           runtime.status transitions
+    aionui_confirmation_latency_seconds{method}           histogram, Create click -> confirmed issue
+    aionui_attachment_upload_bytes{submitter}             histogram, bytes per successful upload batch
+    aionui_metrics_last_update_timestamp_seconds          gauge
+
+Usage:
+    AIONUI_METRICS_FILE=/tmp/aionui.prom python metrics_exporter.py   # print the current textfile
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: best-effort without an inter-process lock
+    fcntl = None  # type: ignore[assignment]
+
+
+METRICS_ENV = "AIONUI_METRICS_FILE"
+LATENCY_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120)
+BYTES_BUCKETS = (10 * 1024, 100 * 1024, 512 * 1024, 1024 ** 2, 2 * 1024 ** 2, 5 * 1024 ** 2, 10 * 1024 ** 2, 25 * 1024 ** 2)
+
+_COUNTERS = {
+    "aionui_submissions_total": ("Submit events by submitter and status.", ("submitter", "status")),
+    "aionui_duplicate_skips_total": ("Submissions skipped as duplicates.", ("submitter",)),
+    "aionui_submit_retries_total": ("Create attempts that were retried.", ("submitter",)),
+    "aionui_runtime_status_changes_total": ("work_order runtime.status transitions.", ("status",)),
+}
+_HISTOGRAMS = {
+    "aionui_confirmation_latency_seconds": ("Seconds from Create click to a confirmed issue.", "method", LATENCY_BUCKETS),
+    "aionui_attachment_upload_bytes": ("Bytes uploaded per successful attachment batch.", "submitter", BYTES_BUCKETS),
+}
+
+
+def metrics_path() -> Optional[Path]:
+    raw = os.environ.get(METRICS_ENV, "").strip()
+    return Path(raw).expanduser() if raw else None
+
+
+def _label_key(values: Tuple[str, ...]) -> str:
+    return json.dumps(list(values), ensure_ascii=False)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: List[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+@contextlib.contextmanager
+def _locked_state(target: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the persisted totals for modification, then write them and re-render ``target``."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    state_path = target.with_name(target.name + ".state.json")
+    with open(target.with_name(target.name + ".lock"), "a+") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        state: Dict[str, Any] = {}
+        with contextlib.suppress(OSError, ValueError):
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        state.setdefault("counters", {})
+        state.setdefault("histograms", {})
+        yield state
+        state["updated_at"] = time.time()
+        _atomic_write(state_path, json.dumps(state, ensure_ascii=False))
+        _atomic_write(target, render(state))
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _inc(state: Dict[str, Any], name: str, labels: Tuple[str, ...], amount: float = 1) -> None:
+    series = state["counters"].setdefault(name, {})
+    key = _label_key(labels)
+    series[key] = series.get(key, 0) + amount
+
+
+def _observe(state: Dict[str, Any], name: str, label: str, value: float) -> None:
+    buckets = _HISTOGRAMS[name][2]
+    series = state["histograms"].setdefault(name, {})
+    item = series.setdefault(_label_key((label,)), {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0})
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            item["buckets"][index] += 1
+    item["sum"] += value
+    item["count"] += 1
+
+
+def render(state: Dict[str, Any]) -> str:
+    lines: List[str] = []
+    for name, (help_text, label_names) in _COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for key, value in sorted(state["counters"].get(name, {}).items()):
+            lines.append(f"{name}{_labels(label_names, json.loads(key))} {value:g}")
+    for name, (help_text, label_name, buckets) in _HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, item in sorted(state["histograms"].get(name, {}).items()):
+            values = json.loads(key)
+            for bound, count in zip(buckets, item["buckets"]):
+                le = 'le="%g"' % bound
+                lines.append(f"{name}_bucket{_labels((label_name,), values, le)} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{_labels((label_name,), values, le)} {item['count']}")
+            lines.append(f"{name}_sum{_labels((label_name,), values)} {item['sum']:g}")
+            lines.append(f"{name}_count{_labels((label_name,), values)} {item['count']}")
+    name = "aionui_metrics_last_update_timestamp_seconds"
+    lines += [f"# HELP {name} Last time this file was rewritten.", f"# TYPE {name} gauge"]
+    lines.append(f"{name} {float(state.get('updated_at') or time.time()):.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def _uploaded_bytes(extra: Dict[str, Any]) -> int:
+    if isinstance(extra.get("uploaded_bytes"), (int, float)):
+        return int(extra["uploaded_bytes"])
+    total = 0
+    for item in extra.get("files") or []:
+        if isinstance(item, dict) and item.get("state") == "done":
+            total += int(item.get("size_bytes") or 0)
+    return total
+
+
+def record_event_metrics(event: Dict[str, Any]) -> None:
+    """Hook for ``append_work_order_event``; never raises."""
+    target = metrics_path()
+    if target is None:
+        return
+    stage = str(event.get("stage") or "")
+    status = str(event.get("status") or "")
+    submitter = str(event.get("submitter") or "")
+    extra = event.get("extra") if isinstance(event.get("extra"), dict) else {}
+    uploaded = _uploaded_bytes(extra) if stage == "upload_attachments" and status == "succeeded" else 0
+    relevant = stage == "submit" or status == "skipped_duplicate" or (stage, status) == ("submit_attempt", "retry") or uploaded
+    if not relevant:
+        return
+    with contextlib.suppress(Exception):
+        with _locked_state(target) as state:
+            if stage == "submit":
+                _inc(state, "aionui_submissions_total", (submitter, status))
+            if status == "skipped_duplicate":
+                _inc(state, "aionui_duplicate_skips_total", (submitter,))
+            if (stage, status) == ("submit_attempt", "retry"):
+                _inc(state, "aionui_submit_retries_total", (submitter,))
+            if uploaded:
+                _observe(state, "aionui_attachment_upload_bytes", submitter, uploaded)
+
+
+def record_runtime_metrics(previous_status: str, new_status: str) -> None:
+    """Hook for ``update_work_order_runtime``: counts ``runtime.status`` transitions; never raises."""
+    target = metrics_path()
+    if target is None or not new_status or new_status == previous_status:
+        return
+    with contextlib.suppress(Exception):
+        with _locked_state(target) as state:
+            _inc(state, "aionui_runtime_status_changes_total", (new_status,))
+
+
+def observe_confirmation_latency(latency_sec: float, method: str) -> None:
+    target = metrics_path()
+    if target is None:
+        return
+    with contextlib.suppress(Exception):
+        with _locked_state(target) as state:
+            _observe(state, "aionui_confirmation_latency_seconds", method, max(0.0, float(latency_sec)))
+
+
+def main() -> int:
+    target = metrics_path()
+    if target is None:
+        print(f"{METRICS_ENV} is not set; metrics are disabled.")
+        return 1
+    with contextlib.suppress(OSError):
+        print(target.read_text(encoding="utf-8"), end="")
+        return 0
+    print(f"No metrics written yet: {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
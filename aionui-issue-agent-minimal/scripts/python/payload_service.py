@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Long-running JSON-RPC 2.0 helper for the github_mcp / chrome_mcp paths.
+
+An MCP agent can keep one process open for the whole chat session instead of
+spawning a fresh interpreter (and re-parsing the YAML templates) for every
+builder or upload step.
+
+Transport: newline-delimited JSON-RPC 2.0 over stdin/stdout (one request per
+line, one response per line).  Anything the handlers print goes to stderr so
+stdout only ever carries protocol messages.
+
+Methods:
+    build_payload       {"work_order", "output"?, "no_cache"?}
+    build_bundle        {"work_order", "output"?, "no_cache"?}
+    upload_attachments  {"work_order", "login", "repo_name"?, "branch"?, "writeback"?, "verify_raw_urls"?}
+    ensure_runtime      {"work_order"}
+    append_event        {"work_order", "stage", "status", "submitter"?, "message"?, ...}
+    ping                {}
+    shutdown            {}
+
+Usage:
+    python payload_service.py
+    > {"jsonrpc": "2.0", "id": 1, "method": "build_payload", "params": {"work_order": "/path/to/work_order.json"}}
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from chrome_mcp_build_bundle import build_bundle_for_work_order
+from github_mcp_build_payload import ASSETS_TEMPLATES_DIR, build_payload_for_work_order
+from github_mcp_upload_attachments import prepare_attachments
+from issue_payload_support import (
+    DEFAULT_ASSETS_REPO_NAME,
+    append_work_order_event,
+    ensure_work_order_runtime,
+    load_issue_template_cached,
+)
+
+
+JSONRPC_VERSION = "2.0"
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+_EVENT_FIELDS = ("submitter", "message", "error", "issue_url", "issue_number", "artifacts_dir")
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def _work_order_param(params: Dict[str, Any]) -> Path:
+    raw = str(params.get("work_order") or "").strip()
+    if not raw:
+        raise RpcError(INVALID_PARAMS, "params.work_order is required")
+    path = Path(raw).expanduser().resolve()
+    if not path.is_file():
+        raise RpcError(INVALID_PARAMS, f"work_order.json not found: {path}")
+    return path
+
+
+def _output_param(params: Dict[str, Any]) -> Optional[Path]:
+    raw = str(params.get("output") or "").strip()
+    return Path(raw).expanduser().resolve() if raw else None
+
+
+def preload_templates(templates_dir: Path = ASSETS_TEMPLATES_DIR) -> list[str]:
+    loaded = []
+    for template_path in sorted(templates_dir.glob("*.yml")):
+        load_issue_template_cached(template_path)
+        loaded.append(template_path.name)
+    return loaded
+
+
+class PayloadService:
+    def __init__(self) -> None:
+        self.templates = preload_templates()
+        self.running = True
+        self.methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "build_payload": self.build_payload,
+            "build_bundle": self.build_bundle,
+            "upload_attachments": self.upload_attachments,
+            "ensure_runtime": self.ensure_runtime,
+            "append_event": self.append_event,
+            "ping": self.ping,
+            "shutdown": self.shutdown,
+        }
+
+    def build_payload(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        payload, cache_hit = build_payload_for_work_order(
+            _work_order_param(params),
+            output_path=_output_param(params),
+            use_cache=not params.get("no_cache"),
+        )
+        return {"payload": payload, "cache_hit": cache_hit}
+
+    def build_bundle(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        bundle, cache_hit = build_bundle_for_work_order(
+            _work_order_param(params),
+            output_path=_output_param(params),
+            use_cache=not params.get("no_cache"),
+        )
+        return {"bundle": bundle, "cache_hit": cache_hit}
+
+    def upload_attachments(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        login = str(params.get("login") or "").strip()
+        if not login:
+            raise RpcError(INVALID_PARAMS, "params.login is required")
+        exit_code, result = prepare_attachments(
+            _work_order_param(params),
+            login=login,
+            repo_name=str(params.get("repo_name") or DEFAULT_ASSETS_REPO_NAME),
+            branch=str(params.get("branch") or "main"),
+            writeback=bool(params.get("writeback", True)),
+            verify_raw_urls=bool(params.get("verify_raw_urls")),
+        )
+        return {"exit_code": exit_code, "result": result}
+
+    def ensure_runtime(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        data = ensure_work_order_runtime(_work_order_param(params))
+        return {"work_id": data.get("work_id", ""), "runtime": data["runtime"]}
+
+    def append_event(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        stage = str(params.get("stage") or "").strip()
+        status = str(params.get("status") or "").strip()
+        if not stage or not status:
+            raise RpcError(INVALID_PARAMS, "params.stage and params.status are required")
+        extra = params.get("extra")
+        if extra is not None and not isinstance(extra, dict):
+            raise RpcError(INVALID_PARAMS, "params.extra must be an object")
+        data = append_work_order_event(
+            _work_order_param(params),
+            stage=stage,
+            status=status,
+            extra=extra,
+            **{key: str(params.get(key) or "") for key in _EVENT_FIELDS},
+        )
+        return {"event": data["events"][-1], "event_count": len(data["events"])}
+
+    def ping(self, _params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "templates": self.templates, "methods": sorted(self.methods)}
+
+    def shutdown(self, _params: Dict[str, Any]) -> Dict[str, Any]:
+        self.running = False
+        return {"ok": True}
+
+    def handle(self, request: Any) -> Optional[Dict[str, Any]]:
+        """Dispatch one decoded JSON-RPC request; returns None for notifications."""
+        if not isinstance(request, dict) or request.get("jsonrpc") != JSONRPC_VERSION:
+            return _error_response(None, RpcError(INVALID_REQUEST, "Invalid JSON-RPC 2.0 request"))
+        request_id = request.get("id")
+        is_notification = "id" not in request
+        method = self.methods.get(str(request.get("method") or ""))
+        try:
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {request.get('method')!r}")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            # Handlers must never write to stdout: it carries the protocol stream.
+            with contextlib.redirect_stdout(sys.stderr):
+                result = method(params)
+        except RpcError as exc:
+            return None if is_notification else _error_response(request_id, exc)
+        except Exception as exc:
+            traceback.print_exc(file=sys.stderr)
+            error = RpcError(SERVER_ERROR, str(exc) or exc.__class__.__name__, {"type": exc.__class__.__name__})
+            return None if is_notification else _error_response(request_id, error)
+        if is_notification:
+            return None
+        return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+    def serve(self, stdin: TextIO, stdout: TextIO) -> int:
+        for line in stdin:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                response: Any = _error_response(None, RpcError(PARSE_ERROR, f"Parse error: {exc}"))
+            else:
+                if isinstance(request, list):
+                    response = [item for item in (self.handle(entry) for entry in request) if item is not None]
+                    if not request:
+                        response = _error_response(None, RpcError(INVALID_REQUEST, "Empty batch"))
+                else:
+                    response = self.handle(request)
+            if response:
+                stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+                stdout.flush()
+            if not self.running:
+                break
+        return 0
+
+
+def _error_response(request_id: Any, error: RpcError) -> Dict[str, Any]:
+    body: Dict[str, Any] = {"code": error.code, "message": error.message}
+    if error.data is not None:
+        body["data"] = error.data
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "error": body}
+
+
+def main() -> int:
+    service = PayloadService()
+    print(f"[INFO] payload_service ready; templates preloaded: {', '.join(service.templates)}", file=sys.stderr)
+    return service.serve(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
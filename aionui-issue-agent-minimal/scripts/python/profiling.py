@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Opt-in cProfile (and sampled flamegraph) capture for the entry-point scripts.
+
+Every entry point (``skill_submit_aionui_issue.py``, ``skill_bootstrap.py``,
+``github_mcp_build_payload.py``, ``chrome_mcp_build_bundle.py``,
+``github_mcp_upload_attachments.py``) accepts:
+
+    --profile             write ``artifacts/profile_<entry>_<ts>.pstats``
+    --profile-flamegraph  also sample the main thread every 5 ms into
+                          ``artifacts/profile_<entry>_<ts>.collapsed`` (collapsed
+                          stacks, for flamegraph.pl / speedscope / inferno)
+
+or the same through ``AIONUI_PROFILE=1`` / ``AIONUI_PROFILE=flame``.  The paths,
+wall time and the ten most expensive functions (cumulative) are merged into the
+last event of the run as ``extra.profile``; when the work order has no event from
+that submitter yet, a ``stage="profile"`` event is appended instead.
+
+Read a profile with:
+    python -m pstats issue_runs/<session>/<work_id>/artifacts/profile_skill_submit_aionui_issue_<ts>.pstats
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+PROFILE_ENV = "AIONUI_PROFILE"
+FLAMEGRAPH_ENV_VALUE = "flame"
+SAMPLE_INTERVAL_SEC = 0.005
+TOP_FUNCTIONS = 10
+_ENABLED_VALUES = {"1", "true", "on", "yes", FLAMEGRAPH_ENV_VALUE}
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"Write a cProfile .pstats file into the artifacts dir (or set {PROFILE_ENV}=1)",
+    )
+    parser.add_argument(
+        "--profile-flamegraph",
+        action="store_true",
+        help=f"--profile plus sampled collapsed stacks for a flamegraph (or set {PROFILE_ENV}={FLAMEGRAPH_ENV_VALUE})",
+    )
+
+
+def _pre_parse(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--work-order")
+    parser.add_argument("--artifacts-dir")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--profile-flamegraph", action="store_true")
+    return parser.parse_known_args(argv)[0]
+
+
+def profile_mode(argv: Optional[List[str]] = None) -> str:
+    """``""`` (off), ``"cprofile"`` or ``"flame"`` from the CLI flags and ``AIONUI_PROFILE``."""
+    options = _pre_parse(list(sys.argv[1:] if argv is None else argv))
+    env = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if options.profile_flamegraph or env == FLAMEGRAPH_ENV_VALUE:
+        return "flame"
+    if options.profile or env in _ENABLED_VALUES:
+        return "cprofile"
+    return ""
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval_sec: float = SAMPLE_INTERVAL_SEC):
+        self.thread_id = thread_id
+        self.interval_sec = interval_sec
+        self.counts: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="aionui-profile-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            frame = sys._current_frames().get(self.thread_id)
+            names: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                key = ";".join(reversed(names))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+def top_functions(profile: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profile, stream=io.StringIO()).sort_stats("cumulative")
+    rows = []
+    for (filename, line, func) in stats.fcn_list[:limit]:  # type: ignore[attr-defined]
+        calls, _primitive, own_sec, cum_sec, _callers = stats.stats[(filename, line, func)]  # type: ignore[attr-defined]
+        rows.append(
+            {
+                "function": f"{Path(filename).name}:{line}({func})",
+                "calls": calls,
+                "own_sec": round(own_sec, 4),
+                "cumulative_sec": round(cum_sec, 4),
+            }
+        )
+    return rows
+
+
+def _default_artifacts(work_order: Optional[Path], artifacts_dir: Optional[str]) -> Path:
+    base = work_order.parent if work_order is not None else Path.cwd()
+    if artifacts_dir:
+        path = Path(artifacts_dir).expanduser()
+        return path if path.is_absolute() else base / path
+    return base / "artifacts"
+
+
+def run_profiled(
+    main_fn: Callable[[], int],
+    entry: str,
+    *,
+    submitter: str,
+    argv: Optional[List[str]] = None,
+    work_order: Optional[Path] = None,
+) -> int:
+    """Run ``main_fn`` under cProfile when requested; otherwise just call it."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    mode = profile_mode(argv)
+    if not mode:
+        return main_fn()
+    options = _pre_parse(argv)
+    if work_order is None and options.work_order:
+        work_order = Path(options.work_order).expanduser()
+    artifacts = _default_artifacts(work_order, options.artifacts_dir)
+
+    profile = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident()).start() if mode == "flame" else None
+    started = time.monotonic()
+    profile.enable()
+    try:
+        return main_fn()
+    finally:
+        profile.disable()
+        if sampler is not None:
+            sampler.stop()
+        with contextlib.suppress(Exception):
+            _write_profile(profile, sampler, entry, artifacts, work_order, submitter, time.monotonic() - started)
+
+
+def _write_profile(
+    profile: cProfile.Profile,
+    sampler: Optional[StackSampler],
+    entry: str,
+    artifacts: Path,
+    work_order: Optional[Path],
+    submitter: str,
+    wall_sec: float,
+) -> Dict[str, Any]:
+    artifacts.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    pstats_path = artifacts / f"profile_{entry}_{stamp}.pstats"
+    profile.dump_stats(str(pstats_path))
+    info: Dict[str, Any] = {
+        "entry": entry,
+        "pstats": str(pstats_path.resolve()),
+        "wall_sec": round(wall_sec, 3),
+        "top": top_functions(profile),
+    }
+    if sampler is not None:
+        collapsed_path = artifacts / f"profile_{entry}_{stamp}.collapsed"
+        collapsed_path.write_text(sampler.collapsed(), encoding="utf-8")
+        info["collapsed"] = str(collapsed_path.resolve())
+        info["samples"] = sum(sampler.counts.values())
+    # stderr: the builders print their JSON result on stdout
+    print(
+        f"[INFO] Profile written: {info['pstats']}" + (f" (+ {info['collapsed']})" if "collapsed" in info else ""),
+        file=sys.stderr,
+    )
+    if work_order is not None and work_order.is_file():
+        # imported here: skill_bootstrap loads this module before requirements (pyyaml) are installed
+        from issue_payload_support import annotate_last_work_order_event, append_work_order_event
+
+        if not annotate_last_work_order_event(work_order, {"profile": info}, submitter=submitter):
+            append_work_order_event(
+                work_order,
+                stage="profile",
+                status="written",
+                submitter=submitter,
+                message=f"Profiled {entry}.",
+                artifacts_dir=str(artifacts.resolve()),
+                extra={"profile": info},
+            )
+    return info
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Run log for the Playwright submitter: console stays live, disk writes go to a background thread.
+
+``start_run_logging(artifacts_dir)`` replaces ``sys.stdout`` / ``sys.stderr`` with
+line-buffered streams that echo to the console and hand every complete line to
+a ``QueueHandler``.  A ``QueueListener`` thread writes them to
+
+    - ``artifacts/run.log``:   human-readable, ``[HH:MM:SS] LEVEL message``
+    - ``artifacts/run.jsonl``: one JSON object per line (``ts`` / ``level`` / ``stream`` / ``msg``)
+
+both rotated by size (``AIONUI_RUN_LOG_MAX_MB``, default 5 MB, 3 backups), so a
+slow or network-mounted workspace never blocks a ``print`` in the submit loop.
+
+Levels come from the existing message prefixes: ``[DEBUG]``, ``[INFO]``,
+``[WARN]`` / ``[WARNING]``, ``[ERROR]`` / ``ERROR:`` / ``Traceback``; other stdout
+lines are INFO and other stderr lines WARNING.  ``AIONUI_LOG_LEVEL`` sets the
+minimum level written to the files (default INFO); the console always gets
+everything.
+"""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, TextIO
+
+
+RUN_LOG_FILENAME = "run.log"
+RUN_JSONL_FILENAME = "run.jsonl"
+DEFAULT_MAX_MB = 5
+DEFAULT_BACKUP_COUNT = 3
+LOGGER_NAME = "aionui.run"
+
+_PREFIX_LEVELS = (
+    ("[DEBUG]", logging.DEBUG),
+    ("[INFO]", logging.INFO),
+    ("[WARN]", logging.WARNING),
+    ("[WARNING]", logging.WARNING),
+    ("[ERROR]", logging.ERROR),
+    ("ERROR:", logging.ERROR),
+    ("Traceback", logging.ERROR),
+)
+
+
+def level_for_line(line: str, stream: str) -> int:
+    stripped = line.lstrip()
+    for prefix, level in _PREFIX_LEVELS:
+        if stripped.startswith(prefix):
+            return level
+    return logging.WARNING if stream == "stderr" else logging.INFO
+
+
+def _env_level() -> int:
+    name = os.environ.get("AIONUI_LOG_LEVEL", "").strip().upper()
+    level = logging.getLevelName(name) if name else logging.INFO
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _env_max_bytes() -> int:
+    raw = os.environ.get("AIONUI_RUN_LOG_MAX_MB", "").strip()
+    try:
+        mb = float(raw) if raw else float(DEFAULT_MAX_MB)
+    except ValueError:
+        mb = float(DEFAULT_MAX_MB)
+    return max(0, int(mb * 1024 * 1024))
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "ts": datetime.datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+                "level": record.levelname,
+                "stream": getattr(record, "stream", ""),
+                "msg": record.getMessage(),
+            },
+            ensure_ascii=False,
+        )
+
+
+class _LineLoggingStream:
+    """Text stream that echoes to ``console`` and logs each complete line without blocking."""
+
+    def __init__(self, console: Optional[TextIO], logger: logging.Logger, stream: str):
+        self.console = console
+        self.logger = logger
+        self.stream = stream
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def write(self, data: str) -> int:
+        if self.console is not None:
+            with contextlib.suppress(Exception):
+                self.console.write(data)
+        with self._lock:
+            self._buffer += data
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._emit(line)
+        return len(data)
+
+    def _emit(self, line: str) -> None:
+        line = line.rstrip("\r")
+        if line.strip():
+            self.logger.log(level_for_line(line, self.stream), line, extra={"stream": self.stream})
+
+    def flush(self) -> None:
+        if self.console is not None:
+            with contextlib.suppress(Exception):
+                self.console.flush()
+
+    def close_line(self) -> None:
+        with self._lock:
+            rest, self._buffer = self._buffer, ""
+        self._emit(rest)
+
+    def isatty(self) -> bool:
+        with contextlib.suppress(Exception):
+            return bool(self.console and self.console.isatty())
+        return False
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.console, "encoding", None) or "utf-8"
+
+
+class RunLogState:
+    def __init__(
+        self,
+        listener: logging.handlers.QueueListener,
+        handlers: List[logging.Handler],
+        logger: logging.Logger,
+        queue_handler: logging.Handler,
+        streams: List[_LineLoggingStream],
+        prev_stdout: Any,
+        prev_stderr: Any,
+        log_path: Path,
+        jsonl_path: Path,
+    ):
+        self.listener = listener
+        self.handlers = handlers
+        self.logger = logger
+        self.queue_handler = queue_handler
+        self.streams = streams
+        self.prev_stdout = prev_stdout
+        self.prev_stderr = prev_stderr
+        self.log_path = log_path
+        self.jsonl_path = jsonl_path
+
+
+def start_run_logging(
+    artifacts_dir: Path,
+    *,
+    max_bytes: Optional[int] = None,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    level: Optional[int] = None,
+) -> RunLogState:
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    max_bytes = _env_max_bytes() if max_bytes is None else max_bytes
+    log_path = artifacts_dir / RUN_LOG_FILENAME
+    jsonl_path = artifacts_dir / RUN_JSONL_FILENAME
+
+    text_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", errors="ignore"
+    )
+    text_handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s %(message)s", datefmt="%H:%M:%S"))
+    json_handler = logging.handlers.RotatingFileHandler(
+        jsonl_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", errors="ignore"
+    )
+    json_handler.setFormatter(_JsonLinesFormatter())
+    handlers: List[logging.Handler] = [text_handler, json_handler]
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=False)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger = logging.getLogger(f"{LOGGER_NAME}.{id(listener)}")
+    logger.setLevel(_env_level() if level is None else level)
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    listener.start()
+
+    ts = datetime.datetime.now().isoformat(timespec="seconds")
+    logger.info("=" * 80, extra={"stream": "meta"})
+    logger.info(f"run started {ts} pid={os.getpid()}", extra={"stream": "meta"})
+
+    prev_stdout, prev_stderr = sys.stdout, sys.stderr
+    streams = [
+        _LineLoggingStream(sys.__stdout__, logger, "stdout"),
+        _LineLoggingStream(sys.__stderr__, logger, "stderr"),
+    ]
+    sys.stdout, sys.stderr = streams
+    return RunLogState(listener, handlers, logger, queue_handler, streams, prev_stdout, prev_stderr, log_path, jsonl_path)
+
+
+def stop_run_logging(state: Optional[RunLogState]) -> None:
+    """Restore the console streams, then drain the queue and close the files."""
+    if not state:
+        return
+    sys.stdout = state.prev_stdout
+    sys.stderr = state.prev_stderr
+    for stream in state.streams:
+        stream.close_line()
+    with contextlib.suppress(Exception):
+        state.listener.stop()
+    state.logger.removeHandler(state.queue_handler)
+    for handler in state.handlers:
+        with contextlib.suppress(Exception):
+            handler.close()
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import contextlib
 import os
 import platform as py_platform
 import shutil
 import subprocess
 import sys
+import threading
 import time
 import json
 import datetime
@@ -85,6 +87,34 @@ def _apply_playwright_platform_override_for_macos_arm64() -> None:
     print(f"[INFO] Set PLAYWRIGHT_HOST_PLATFORM_OVERRIDE={override} for macOS arm64.")
 
 
+def _run_tee_stderr(cmd: List[str], timeout_sec: float) -> Tuple[int, str]:
+    """Run ``cmd`` echoing its stderr line by line as it arrives; returns ``(returncode, stderr)``.
+
+    Like ``subprocess.run(timeout=)``, kills the process and raises ``TimeoutExpired`` on timeout.
+    """
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True, errors="replace")
+    lines: List[str] = []
+
+    def pump() -> None:
+        for line in proc.stderr:
+            lines.append(line)
+            sys.stderr.write(line)
+            sys.stderr.flush()
+
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+    try:
+        code = proc.wait(timeout=timeout_sec)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        # a grandchild may still hold the pipe open; do not hang on it
+        reader.join(timeout=5)
+    return code, "".join(lines)
+
+
 def _install_playwright_browser(py: Path) -> bool:
     if os.environ.get("SKIP_PLAYWRIGHT_INSTALL") == "1":
         print("[INFO] SKIP_PLAYWRIGHT_INSTALL=1, skip Playwright browser install.")
@@ -106,8 +136,15 @@ def _install_playwright_browser(py: Path) -> bool:
 
     for attempt in range(1, retries + 1):
         try:
-            subprocess.check_call(cmd, timeout=timeout_sec)
-            return True
+            returncode, stderr = _run_tee_stderr(cmd, timeout_sec)
+            if returncode == 0:
+                return True
+            category = _classify_error_text(stderr)
+            if _is_permanent_error(category):
+                last_line = stderr.strip().splitlines()[-1:] or [""]
+                print(f"[WARN] Playwright browser install failed ({category}); not retrying: {last_line[0]}")
+                return False
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
         except subprocess.TimeoutExpired:
             if attempt >= retries:
                 print(
@@ -132,6 +169,23 @@ def _install_playwright_browser(py: Path) -> bool:
     return False
 
 
+def _classify_error_text(text: str) -> str:
+    """``error_classifier`` category of ``text``; imported lazily like ``profiling`` (it is stdlib-only)."""
+    try:
+        from error_classifier import classify_text
+    except ImportError:
+        return ""
+    return classify_text(text)
+
+
+def _is_permanent_error(category: str) -> bool:
+    try:
+        from error_classifier import is_permanent
+    except ImportError:
+        return False
+    return is_permanent(category)
+
+
 def _detect_system_browser_binary() -> Optional[str]:
     if os.name == "nt":
         candidates = []
@@ -273,6 +327,7 @@ def _append_work_order_event(
     issue_number: str = "",
     artifacts_dir: str = "",
     extra: Optional[Dict[str, Any]] = None,
+    error_category: str = "",
 ) -> Dict[str, Any]:
     data = _ensure_work_order_runtime(path)
     event: Dict[str, Any] = {
@@ -286,6 +341,8 @@ def _append_work_order_event(
         "issue_number": issue_number,
         "artifacts_dir": artifacts_dir,
     }
+    if error:
+        event["error_category"] = error_category or _classify_error_text(error)
     if extra is not None:
         event["extra"] = extra
     data["events"].append(event)
@@ -293,7 +350,48 @@ def _append_work_order_event(
     return data
 
 
+def _last_error_category(path: Path, since: int = 0) -> str:
+    """``error_category`` of the newest event after ``since`` that has one (the submitter's own failure)."""
+    with contextlib.suppress(OSError, ValueError):
+        for event in reversed((_load_work_order_data(path).get("events") or [])[since:]):
+            if isinstance(event, dict) and event.get("error_category"):
+                return str(event["error_category"])
+    return ""
+
+
+class _Timings:
+    """Bootstrap-side spans in stage_timings' shape; kept local so bootstrap has no sibling imports."""
+
+    def __init__(self) -> None:
+        self.origin = time.monotonic()
+        self.spans: List[Dict[str, Any]] = []
+
+    def record(self, name: str, started: float, *, ok: bool = True) -> None:
+        self.spans.append(
+            {
+                "name": f"bootstrap:{name}",
+                "start_sec": round(started - self.origin, 3),
+                "duration_sec": round(time.monotonic() - started, 3),
+                "ok": ok,
+            }
+        )
+
+
+def _append_timings_to_last_bootstrap_event(path: Path, spans: List[Dict[str, Any]]) -> None:
+    """Prepend the outer (pre-venv) process' spans to the event the re-exec'd bootstrap wrote last."""
+    with contextlib.suppress(Exception):
+        data = _load_work_order_data(path)
+        for event in reversed(data.get("events") or []):
+            if isinstance(event, dict) and event.get("stage") == "bootstrap":
+                extra = event.get("extra") if isinstance(event.get("extra"), dict) else {}
+                extra["timings"] = spans + list(extra.get("timings") or [])
+                event["extra"] = extra
+                _write_work_order_data(path, data)
+                return
+
+
 def main() -> int:
+    timings = _Timings()
     root = Path(__file__).resolve().parents[2]
     work_order, extra_args = _find_work_order_and_args(sys.argv[1:])
     if not work_order.is_file():
@@ -326,14 +424,24 @@ def main() -> int:
     )
 
     if not _in_venv():
+        started = time.monotonic()
         venv_py = _ensure_venv(root)
+        timings.record("ensure_venv", started)
         env = dict(os.environ)
-        return subprocess.call([str(venv_py), str(Path(__file__).resolve())] + sys.argv[1:], env=env)
+        started = time.monotonic()
+        code = subprocess.call([str(venv_py), str(Path(__file__).resolve())] + sys.argv[1:], env=env)
+        timings.record("venv_reexec", started, ok=code == 0)
+        _append_timings_to_last_bootstrap_event(work_order, timings.spans)
+        return code
 
     venv_py = Path(sys.executable)
     _apply_playwright_platform_override_for_macos_arm64()
+    started = time.monotonic()
     _install_requirements(venv_py, root)
+    timings.record("install_requirements", started)
+    started = time.monotonic()
     browser_ready = _install_playwright_browser(venv_py)
+    timings.record("install_browser", started, ok=browser_ready)
     fallback_browser = None
     if not browser_ready:
         fallback_browser = _detect_system_browser_binary()
@@ -368,7 +476,10 @@ def main() -> int:
     if not _has_cli_option(extra_args, "--pause-before-submit-sec"):
         cmd += ["--pause-before-submit-sec", str(pause_sec)]
     cmd += extra_args
+    events_before = len(_ensure_work_order_runtime(work_order)["events"])
+    started = time.monotonic()
     code = subprocess.call(cmd)
+    timings.record("submit_process", started, ok=code == 0)
     _write_status(final_artifacts, work_order, code)
     _update_work_order_runtime(
         work_order,
@@ -385,7 +496,9 @@ def main() -> int:
         submitter="skill",
         message="Bootstrap finished." if code == 0 else "",
         error="" if code == 0 else f"Bootstrap exited with code {code}",
+        error_category="" if code == 0 else _last_error_category(work_order, events_before),
         artifacts_dir=str(final_artifacts.resolve()),
+        extra={"timings": timings.spans},
     )
     if code == 0:
         print("[SUCCESS] Submission finished.")
@@ -396,5 +509,17 @@ def main() -> int:
     return code
 
 
+def _main_with_optional_profile() -> int:
+    """Profile only the venv-side bootstrap (the outer process just re-execs); ``profiling`` is imported lazily."""
+    args = sys.argv[1:]
+    requested = _has_cli_option(args, "--profile") or _has_cli_option(args, "--profile-flamegraph")
+    if not _in_venv() or not (requested or os.environ.get("AIONUI_PROFILE", "").strip()):
+        return main()
+    from profiling import run_profiled
+
+    work_order, extra_args = _find_work_order_and_args(args)
+    return run_profiled(main, "skill_bootstrap", submitter="skill", argv=extra_args, work_order=work_order)
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(_main_with_optional_profile())
@@ -8,38 +8,49 @@ import json
 import os
 import platform as py_platform
 import re
-import sys
+import threading
 import time
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+from artifacts_retention import apply_retention_for_run
+from attachment_cache import hosted_markdown, remember_hosted, split_hosted
+from attachment_upload_tracker import AttachmentUploadTracker
+from debug_capture import CAPTURE_LEVELS, DebugCapture, resolve_capture_level, resolve_max_bytes
+from error_classifier import classify_error, classify_text, is_permanent
+from github_issue_probe import RECENT_ISSUE_LOOKBACK_SEC, SubmissionSuccessInfo, find_recent_issue_by_title
+from issue_corpus_cache import DEFAULT_DUPLICATE_THRESHOLD, find_duplicate_issues
 from issue_payload_support import (
+    ATTACHMENT_UPLOAD_METHOD_BROWSER,
+    SUBMITTER_SKILL,
+    annotate_last_work_order_event,
     append_work_order_event,
     build_local_attachment_markdown,
     ensure_work_order_attachments,
     ensure_work_order_runtime,
     filter_uploadable_attachments,
     merge_markdown_blocks,
+    missing_required_fields,
     resolve_attachment_paths,
     update_work_order_runtime,
     write_work_order_updates,
 )
+from profiling import add_profile_args, run_profiled
+from run_logging import RunLogState, start_run_logging, stop_run_logging
+from stage_timings import StageTimer
+from submit_latency_stats import record_confirmation_latency, submit_wait_budget
 
 
 AIONUI_REPO = "iOfficeAI/AionUi"
 AIONUI_URL = "https://github.com/iOfficeAI/AionUi"
-GITHUB_API_BASE = "https://api.github.com"
-SUBMIT_RESULT_WAIT_SEC_MIN = 15
-SUBMIT_RESULT_WAIT_SEC_MAX = 45
-RECENT_ISSUE_LOOKBACK_SEC = 120
+ATTACHMENT_UPLOAD_RETRIES = 2
+ATTACHMENT_MARKDOWN_GRACE_SEC = 5
 
 
 # ---------------------------
@@ -126,14 +137,6 @@ class WorkOrder:
     raw: Dict[str, Any] = None
 
 
-@dataclass
-class SubmissionSuccessInfo:
-    issue_url: str
-    issue_number: str
-    detection_method: str
-    evidence: str = ""
-
-
 def _infer_platform_default() -> str:
     sysname = py_platform.system().lower()
     if "windows" in sysname:
@@ -268,13 +271,9 @@ def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
-def save_debug(page, artifacts: Path, prefix: str) -> None:
-    ensure_dir(artifacts)
-    ts = int(time.time())
-    with contextlib.suppress(Exception):
-        page.screenshot(path=str(artifacts / f"{prefix}_{ts}.png"), full_page=True)
-    with contextlib.suppress(Exception):
-        (artifacts / f"{prefix}_{ts}.html").write_text(page.content(), encoding="utf-8")
+def save_debug(page, capture: DebugCapture, prefix: str, *, failure: bool = False) -> None:
+    """Checkpoint capture; weight depends on ``--debug-capture`` (see debug_capture.py)."""
+    capture.capture(page, prefix, failure=failure)
 
 
 def _locator_exists(locator) -> bool:
@@ -401,37 +400,113 @@ def find_attachment_button_for_control(control):
     return None
 
 
-def upload_attachments_to_control(page, control, attachment_paths: List[Path], timeout_sec: int) -> Tuple[str, str]:
+def _hand_files_to_control(page, control, attachment_paths: List[Path], timeout_sec: int) -> None:
+    file_input = find_attachment_input_for_control(control)
+    if file_input is not None:
+        with contextlib.suppress(Exception):
+            file_input.set_input_files([str(path) for path in attachment_paths])
+        return
+    upload_button = find_attachment_button_for_control(control)
+    if upload_button is None:
+        raise PlaywrightError("Could not find file input or Add Files button for attachment upload.")
+    with page.expect_file_chooser(timeout=max(5000, timeout_sec * 1000)) as chooser_info:
+        upload_button.click()
+    chooser_info.value.set_files([str(path) for path in attachment_paths])
+
+
+def _wait_for_attachment_uploads(page, control, tracker: AttachmentUploadTracker, expected_total: int, deadline: float) -> str:
+    """Return the textarea value once every upload settled or the markdown count is reached."""
+    wait_for_event = getattr(page, "wait_for_event", None)
+    after = get_text_control_value(control)
+    while time.time() < deadline:
+        if len(_extract_uploaded_attachment_lines(after)) >= expected_total:
+            return after
+        if tracker.settled():
+            # GitHub inserts the markdown right after the finalize request; give it a moment.
+            settled_total = expected_total - len(tracker.failed_paths())
+            grace_deadline = min(deadline, time.time() + ATTACHMENT_MARKDOWN_GRACE_SEC)
+            while time.time() < grace_deadline and len(_extract_uploaded_attachment_lines(after)) < settled_total:
+                time.sleep(0.1)
+                after = get_text_control_value(control)
+            return after
+        remaining_ms = max(1, int(min(0.5, deadline - time.time()) * 1000))
+        if callable(wait_for_event):
+            with contextlib.suppress(PlaywrightTimeoutError, PlaywrightError):
+                wait_for_event("response", predicate=lambda _response: tracker.settled(), timeout=remaining_ms)
+        else:
+            time.sleep(0.5)
+        after = get_text_control_value(control)
+    return after
+
+
+def upload_attachments_to_control(
+    page,
+    control,
+    attachment_paths: List[Path],
+    timeout_sec: int,
+    report: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str]:
+    """Upload through the form's file input, tracking each file via the upload XHRs.
+
+    Files whose policy/storage/finalize request failed are handed to the input again
+    (up to ``ATTACHMENT_UPLOAD_RETRIES`` times); others are not re-uploaded.
+    ``report`` (if given) receives per-file state, attempts and throughput.
+    """
     if not attachment_paths:
         return get_text_control_value(control), ""
 
     before = get_text_control_value(control)
     baseline_count = len(_extract_uploaded_attachment_lines(before))
     expected_total = baseline_count + len(attachment_paths)
-    file_input = find_attachment_input_for_control(control)
-    if file_input is not None:
-        with contextlib.suppress(Exception):
-            file_input.set_input_files([str(path) for path in attachment_paths])
-    else:
-        upload_button = find_attachment_button_for_control(control)
-        if upload_button is None:
-            raise PlaywrightError("Could not find file input or Add Files button for attachment upload.")
-        with page.expect_file_chooser(timeout=max(5000, timeout_sec * 1000)) as chooser_info:
-            upload_button.click()
-        chooser_info.value.set_files([str(path) for path in attachment_paths])
-
+    tracker = AttachmentUploadTracker(attachment_paths)
+    tracker.attach(page)
     deadline = time.time() + max(30, timeout_sec)
     after = before
-    while time.time() < deadline:
-        time.sleep(0.5)
-        after = get_text_control_value(control)
-        uploaded_count = len(_extract_uploaded_attachment_lines(after))
-        if uploaded_count >= expected_total:
-            break
+    pending = list(attachment_paths)
+    try:
+        for attempt in range(ATTACHMENT_UPLOAD_RETRIES + 1):
+            tracker.begin_attempt(pending)
+            _hand_files_to_control(page, control, pending, timeout_sec)
+            after = _wait_for_attachment_uploads(page, control, tracker, expected_total, deadline)
+            if len(_extract_uploaded_attachment_lines(after)) >= expected_total:
+                break
+            pending = tracker.failed_paths()
+            if not pending or time.time() >= deadline or attempt >= ATTACHMENT_UPLOAD_RETRIES:
+                break
+            print(f"[WARN] Retrying {len(pending)} failed attachment upload(s): {', '.join(p.name for p in pending)}")
+    finally:
+        tracker.detach(page)
+        if report is not None:
+            report.update(tracker.report())
 
     return after, _extract_uploaded_attachment_markdown(before, after)
 
 
+def _remember_browser_uploads(
+    paths: List[Path],
+    report: Dict[str, Any],
+    uploaded_markdown: str,
+    owner_repo: str,
+) -> None:
+    """Cache files the upload tracker saw finish so a retry does not upload them again."""
+    lines = _extract_uploaded_attachment_lines(uploaded_markdown)
+    by_name = {path.name: path for path in paths}
+    for item in report.get("files", []):
+        path = by_name.get(item.get("name", ""))
+        url = str(item.get("asset_url") or "")
+        if path is None or item.get("state") != "done" or not url:
+            continue
+        line = next((candidate for candidate in lines if url in candidate), "")
+        if line:
+            remember_hosted(
+                path,
+                method=ATTACHMENT_UPLOAD_METHOD_BROWSER,
+                url=url,
+                markdown=line,
+                owner_repo=owner_repo,
+            )
+
+
 def dropdown_already_selected(control_btn, wanted: str) -> bool:
     try:
         txt = (control_btn.text_content() or "").strip()
@@ -663,77 +738,6 @@ def detect_issue_submission_success(page, project_url: str) -> Optional[Submissi
     return None
 
 
-def _parse_github_timestamp(value: str) -> Optional[datetime.datetime]:
-    text = str(value or "").strip()
-    if not text:
-        return None
-    with contextlib.suppress(ValueError):
-        return datetime.datetime.fromisoformat(text.replace("Z", "+00:00")).astimezone(datetime.timezone.utc)
-    return None
-
-
-def find_recent_issue_by_title(
-    owner_repo: str,
-    title: str,
-    *,
-    project_url: str,
-    not_before: datetime.datetime,
-    timeout_sec: int,
-) -> Optional[SubmissionSuccessInfo]:
-    parts = str(owner_repo or "").split("/", 1)
-    if len(parts) != 2 or not all(parts):
-        return None
-
-    api_url = (
-        f"{GITHUB_API_BASE}/repos/{parts[0]}/{parts[1]}/issues"
-        "?state=all&per_page=20&sort=created&direction=desc"
-    )
-    request = urllib.request.Request(
-        api_url,
-        headers={
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "aionui-issue-agent-minimal/submit-probe",
-            "X-GitHub-Api-Version": "2022-11-28",
-        },
-    )
-    wanted_title = re.sub(r"\s+", " ", str(title or "")).strip().casefold()
-    if not wanted_title:
-        return None
-    probe_timeout = max(5, min(timeout_sec, 15))
-
-    try:
-        with urllib.request.urlopen(request, timeout=probe_timeout) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-    except (urllib.error.URLError, TimeoutError, json.JSONDecodeError, OSError):
-        return None
-
-    if not isinstance(payload, list):
-        return None
-
-    cutoff = not_before.astimezone(datetime.timezone.utc)
-    for item in payload:
-        if not isinstance(item, dict) or item.get("pull_request"):
-            continue
-        candidate_title = re.sub(r"\s+", " ", str(item.get("title") or "")).strip().casefold()
-        if candidate_title != wanted_title:
-            continue
-        created_at = _parse_github_timestamp(str(item.get("created_at") or ""))
-        if created_at and created_at < cutoff:
-            continue
-        issue_url = str(item.get("html_url") or "").strip()
-        issue_number = str(item.get("number") or "").strip() or _extract_issue_number_from_url(issue_url)
-        if not issue_url or not issue_number:
-            continue
-        created_hint = created_at.isoformat() if created_at else str(item.get("created_at") or "")
-        return SubmissionSuccessInfo(
-            issue_url=issue_url,
-            issue_number=issue_number,
-            detection_method="github_api_recent_exact_title",
-            evidence=f"title={str(item.get('title') or '').strip()!r}; created_at={created_hint!r}",
-        )
-    return None
-
-
 def _write_back_defaults_if_needed(path: Path, updates: Dict[str, Any]) -> None:
     """
     Best-effort write-back to work_order.json for auto-defaulted fields.
@@ -781,22 +785,7 @@ def preflight_validate_required(tpl: dict, norm: Dict[str, Any], out_dir: Path,
     Validate required fields against Issue Forms YAML BEFORE launching browser.
     - If missing, write a report under out_dir and raise SystemExit.
     """
-    missing = []
-    for field in all_fields_from_template(tpl):
-        fid = field.get("id")
-        ftype = field_type(field)
-        flabel = field_label(field)
-        required = bool((field.get("validations", {}) or {}).get("required", False))
-        if not required:
-            continue
-        val = norm.get(fid, "")
-        if fid == "platform" and not str(val).strip():
-            val = _infer_platform_default()
-        if fid == "actual_behavior" and not str(val).strip():
-            val = norm.get("bug_description", "")
-        if not str(val).strip():
-            missing.append({"id": fid, "label": flabel, "type": ftype})
-
+    missing = missing_required_fields(tpl, norm)
     if missing:
         report = {
             "ok": False,
@@ -858,54 +847,58 @@ def apply_template_defaults(tpl: dict, norm: Dict[str, Any]) -> Tuple[Dict[str,
     return out, updates
 
 
-class _Tee:
-    """Write to multiple text streams (used to tee stdout/stderr into artifacts/run.log)."""
-    def __init__(self, *streams):
-        self.streams = streams
+def _record_stage_timings(work_order_path: Path, timer: StageTimer) -> None:
+    """Attach the run's spans to its final event (``extra.timings``) and print the summary into run.log."""
+    if not timer.spans:
+        return
+    for line in timer.summary_lines():
+        print(line)
+    with contextlib.suppress(Exception):
+        annotate_last_work_order_event(
+            work_order_path,
+            {"total_sec": timer.total_sec(), "timings": timer.spans},
+            submitter="skill",
+        )
 
-    def write(self, data):
-        for s in self.streams:
-            try:
-                s.write(data)
-            except Exception:
-                pass
 
-    def flush(self):
-        for s in self.streams:
-            try:
-                s.flush()
-            except Exception:
-                pass
+def _enable_run_logging(artifacts_dir: Path) -> RunLogState:
+    """Mirror stdout/stderr into artifacts/run.log (+ run.jsonl) via a background writer thread."""
+    return start_run_logging(artifacts_dir)
 
 
-def _enable_run_logging(artifacts_dir: Path):
-    """
-    Tee stdout/stderr to artifacts/run.log so users can debug even if runner doesn't capture console output.
+def _disable_run_logging(state: Optional[RunLogState]) -> None:
+    stop_run_logging(state)
+
+
+class _RecentIssueProbeThread:
+    """Runs the recent-issue API probe in the background while the DOM is polled.
+
+    Waits on an Event rather than ``time.sleep`` so stopping it is immediate.
     """
-    ensure_dir(artifacts_dir)
-    log_path = artifacts_dir / "run.log"
-    f = open(log_path, "a", encoding="utf-8", errors="ignore")
-    ts = datetime.datetime.now().isoformat(timespec="seconds")
-    f.write("\n" + "="*80 + "\n")
-    f.write(f"[{ts}] run started\n")
-    f.flush()
-    prev_stdout = sys.stdout
-    prev_stderr = sys.stderr
-    sys.stdout = _Tee(sys.__stdout__, f)
-    sys.stderr = _Tee(sys.__stderr__, f)
-    return prev_stdout, prev_stderr, f
-
-
-def _disable_run_logging(state) -> None:
-    if not state:
-        return
-    prev_stdout, prev_stderr, log_file = state
-    sys.stdout = prev_stdout
-    sys.stderr = prev_stderr
-    with contextlib.suppress(Exception):
-        log_file.flush()
-    with contextlib.suppress(Exception):
-        log_file.close()
+
+    def __init__(self, probe: Callable[[], Optional[SubmissionSuccessInfo]], *, delay_sec: float, interval_sec: float):
+        self.result: Optional[SubmissionSuccessInfo] = None
+        self._probe = probe
+        self._delay_sec = delay_sec
+        self._interval_sec = interval_sec
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="recent-issue-probe", daemon=True)
+
+    def _run(self) -> None:
+        if self._stop.wait(self._delay_sec):
+            return
+        while not self._stop.is_set():
+            with contextlib.suppress(Exception):
+                self.result = self._probe()
+            if self.result is not None or self._stop.wait(self._interval_sec):
+                return
+
+    def start(self) -> "_RecentIssueProbeThread":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
 
 
 def _record_submission_success(
@@ -963,6 +956,19 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--user-data-dir", default=None, help="Chromium user data dir to reuse login state")
     p.add_argument("--profile-dir", default=None, help="Profile dir name inside user-data-dir")
     p.add_argument("--artifacts-dir", default="artifacts", help="Where to write debug artifacts")
+    p.add_argument(
+        "--debug-capture",
+        choices=CAPTURE_LEVELS,
+        default=None,
+        help="Checkpoint capture: none / viewport (JPEG; failures full) / full (PNG+HTML) / trace. "
+        "Default: $AIONUI_DEBUG_CAPTURE or viewport",
+    )
+    p.add_argument(
+        "--debug-max-mb",
+        type=float,
+        default=None,
+        help="Cap on captured screenshots/HTML/traces in the artifacts dir (default: $AIONUI_DEBUG_MAX_MB or 50)",
+    )
     p.add_argument("--no-submit", action="store_true", help="Fill form but DO NOT click Create")
     p.add_argument(
         "--prepare-attachments-only",
@@ -971,6 +977,18 @@ def parse_args() -> argparse.Namespace:
     )
     p.add_argument("--pause-before-submit-sec", type=int, default=10, help="Pause after filling, before clicking Create")
     p.add_argument("--force", action="store_true", help="Ignore existing issue_number/issue_url and submit anyway")
+    p.add_argument(
+        "--skip-if-duplicate",
+        action="store_true",
+        help="Before opening the browser, skip submission if the local issue corpus has a near-identical title",
+    )
+    p.add_argument(
+        "--duplicate-threshold",
+        type=float,
+        default=DEFAULT_DUPLICATE_THRESHOLD,
+        help=f"Title similarity (0-1) treated as duplicate by --skip-if-duplicate (default: {DEFAULT_DUPLICATE_THRESHOLD})",
+    )
+    add_profile_args(p)
     return p.parse_args()
 
 
@@ -996,6 +1014,21 @@ def main() -> int:
         },
     )
     log_state = _enable_run_logging(artifacts)
+    try:
+        return _submit_work_order(args, work_order_path, artifacts)
+    finally:
+        # every exit (early return, SystemExit, any exception) drains the log queue
+        _disable_run_logging(log_state)
+
+
+def _submit_work_order(args: argparse.Namespace, work_order_path: Path, artifacts: Path) -> int:
+    retention = apply_retention_for_run(work_order_path, artifacts)
+    if retention and (retention["expired"] or retention["evicted"] or retention["compressed"]):
+        print(
+            f"[INFO] artifacts retention: expired={len(retention['expired'])} "
+            f"compressed={len(retention['compressed'])} evicted={len(retention['evicted'])} "
+            f"freed={retention['freed_bytes'] // 1024} KiB"
+        )
     try:
         _pre = json.loads(work_order_path.read_text(encoding='utf-8'))
         if not args.force and not args.prepare_attachments_only:
@@ -1084,6 +1117,41 @@ def main() -> int:
     wb.update(wb2)
     _write_back_defaults_if_needed(work_order_path, wb)
     preflight_validate_required(tpl, norm, artifacts, wo.issue_type)
+    if args.skip_if_duplicate and not args.force and not args.prepare_attachments_only and not args.no_submit:
+        duplicates = find_duplicate_issues(
+            wo.owner_repo,
+            wo.title,
+            threshold=args.duplicate_threshold,
+            timeout_sec=max(5, min(args.timeout_sec, 15)),
+        )
+        if duplicates:
+            top = duplicates[0]
+            update_work_order_runtime(
+                work_order_path,
+                {
+                    "status": "skipped_duplicate",
+                    "last_error": "",
+                    "last_error_at": "",
+                },
+            )
+            append_work_order_event(
+                work_order_path,
+                stage="submit",
+                status="skipped_duplicate",
+                submitter="skill",
+                message=f"Skip because issue #{top.number} in the local issue corpus has a near-identical title.",
+                artifacts_dir=str(artifacts.resolve()),
+                extra={
+                    "duplicate_source": "issue_corpus",
+                    "duplicate_candidates": [
+                        {"number": item.number, "title": item.title, "html_url": item.html_url, "score": item.score}
+                        for item in duplicates
+                    ],
+                },
+            )
+            print(f"Possible duplicate of #{top.number} (score={top.score}): {top.html_url}")
+            print("Skip submission. Re-run without --skip-if-duplicate (or with --force) to submit anyway.")
+            return 0
     runtime_snapshot = ensure_work_order_runtime(work_order_path)
     runtime = runtime_snapshot.get("runtime", {})
     update_work_order_runtime(
@@ -1113,6 +1181,12 @@ def main() -> int:
 
     page = None
     context = None
+    timer = StageTimer()
+    debug = DebugCapture(
+        artifacts,
+        level=resolve_capture_level(args.debug_capture),
+        max_bytes=resolve_max_bytes(args.debug_max_mb),
+    )
     try:
         with sync_playwright() as p:
             browser_args = [
@@ -1124,18 +1198,22 @@ def main() -> int:
             if args.profile_dir:
                 browser_args.append(f"--profile-directory={args.profile_dir}")
 
-            context = p.chromium.launch_persistent_context(
-                args.user_data_dir,
-                headless=args.headless,
-                args=browser_args,
-                viewport={"width": 1280, "height": 900},
-                executable_path=args.browser_binary or None,
-            )
+            with timer.span("browser_launch"):
+                context = p.chromium.launch_persistent_context(
+                    args.user_data_dir,
+                    headless=args.headless,
+                    args=browser_args,
+                    viewport={"width": 1280, "height": 900},
+                    executable_path=args.browser_binary or None,
+                )
             context.set_default_timeout(args.timeout_sec * 1000)
+            debug.start_tracing(context)
             page = context.pages[0] if context.pages else context.new_page()
 
-            page.goto(template_url, wait_until="domcontentloaded")
-            wait_until_issue_form_ready(page, template_url, login_wait_sec=args.login_wait_sec)
+            with timer.span("navigate"):
+                page.goto(template_url, wait_until="domcontentloaded")
+            with timer.span("login_wait"):
+                wait_until_issue_form_ready(page, template_url, login_wait_sec=args.login_wait_sec)
 
             title_input = page.locator("input[aria-label='Add a title']").first
             title_input.fill("")
@@ -1145,6 +1223,7 @@ def main() -> int:
             attachment_updates: Dict[str, Any] = {}
 
             for field in all_fields_from_template(tpl):
+                fill_started = timer.now()
                 fid = field.get("id")
                 ftype = field_type(field)
                 flabel = field_label(field)
@@ -1164,6 +1243,7 @@ def main() -> int:
                 if control is None:
                     if required:
                         missing_required.append(f"{flabel} (id={fid}, type={ftype}) [control not found]")
+                    timer.record(f"fill:{fid}", fill_started, ok=False)
                     continue
 
                 ok = False
@@ -1180,14 +1260,41 @@ def main() -> int:
                         if attachment_markdown:
                             attachment_updates["attachment_upload_status"] = "uploaded"
                         elif uploadable_attachment_paths:
-                            _, uploaded_markdown = upload_attachments_to_control(
-                                page,
-                                control,
-                                uploadable_attachment_paths,
-                                timeout_sec=max(args.timeout_sec * 2, 60),
+                            hosted_attachments, paths_to_upload = split_hosted(
+                                uploadable_attachment_paths, owner_repo=wo.owner_repo
                             )
+                            cached_markdown = hosted_markdown(hosted_attachments)
+                            if cached_markdown:
+                                set_text_control(control, merge_markdown_blocks(base_text, cached_markdown))
+                            upload_report: Dict[str, Any] = {}
+                            new_markdown = ""
+                            if paths_to_upload:
+                                with timer.span("upload_attachments", files=len(paths_to_upload)):
+                                    _, new_markdown = upload_attachments_to_control(
+                                        page,
+                                        control,
+                                        paths_to_upload,
+                                        timeout_sec=max(args.timeout_sec * 2, 60),
+                                        report=upload_report,
+                                    )
+                                _remember_browser_uploads(paths_to_upload, upload_report, new_markdown, wo.owner_repo)
+                            uploaded_markdown = "\n".join(block for block in (cached_markdown, new_markdown) if block)
                             uploaded_count = len(_extract_uploaded_attachment_lines(uploaded_markdown))
                             expected_upload_count = len(uploadable_attachment_paths)
+                            append_work_order_event(
+                                work_order_path,
+                                stage="upload_attachments",
+                                status="succeeded" if uploaded_count >= expected_upload_count else "upload_failed",
+                                submitter="skill",
+                                message=f"Browser upload: {uploaded_count}/{expected_upload_count} attachment(s) confirmed.",
+                                artifacts_dir=str(artifacts.resolve()),
+                                extra={
+                                    "method": ATTACHMENT_UPLOAD_METHOD_BROWSER,
+                                    "uploaded_count": uploaded_count,
+                                    "reused_from_cache": [path.name for path, _ in hosted_attachments],
+                                    **upload_report,
+                                },
+                            )
                             if uploaded_markdown and uploaded_count >= expected_upload_count:
                                 attachment_markdown = uploaded_markdown
                                 attachment_updates["attachment_markdown"] = uploaded_markdown
@@ -1239,6 +1346,7 @@ def main() -> int:
                     else:
                         ok = False
 
+                timer.record(f"fill:{fid}", fill_started, ok=ok)
                 if required and not ok:
                     missing_required.append(f"{flabel} (id={fid}, type={ftype})")
 
@@ -1266,7 +1374,7 @@ def main() -> int:
                 print("ERROR: Missing required fields or failed to fill:")
                 for m in missing_required:
                     print(" -", m)
-                save_debug(page, artifacts, "missing_required")
+                save_debug(page, debug, "missing_required", failure=True)
                 raise SystemExit("Missing required fields; see artifacts for details.")
 
             if args.prepare_attachments_only and uploadable_attachment_paths and attachment_updates.get("attachment_upload_status") != "uploaded":
@@ -1290,7 +1398,7 @@ def main() -> int:
                         "skipped_attachments": skipped_attachment_paths,
                     },
                 )
-                save_debug(page, artifacts, "prepare_attachments_failed")
+                save_debug(page, debug, "prepare_attachments_failed", failure=True)
                 raise SystemExit("Attachment preparation did not produce uploaded markdown. See artifacts for details.")
 
             pause = max(0, int(args.pause_before_submit_sec))
@@ -1320,7 +1428,7 @@ def main() -> int:
                     },
                 )
                 print("PREPARE-ATTACHMENTS-ONLY: attachment markdown prepared, issue not submitted.")
-                save_debug(page, artifacts, "prepare_attachments_only")
+                save_debug(page, debug, "prepare_attachments_only")
                 return 0
 
             if args.no_submit:
@@ -1341,50 +1449,99 @@ def main() -> int:
                     artifacts_dir=str(artifacts.resolve()),
                 )
                 print("NO-SUBMIT: filled the form but will not click Create.")
-                save_debug(page, artifacts, "no_submit")
+                save_debug(page, debug, "no_submit")
                 return 0
 
             max_attempts = 3
-            submit_wait_sec = max(
-                SUBMIT_RESULT_WAIT_SEC_MIN,
-                min(int(args.timeout_sec or 0), SUBMIT_RESULT_WAIT_SEC_MAX),
+            wait_budget = submit_wait_budget(args.timeout_sec, owner_repo=wo.owner_repo)
+            submit_wait_sec = wait_budget.wait_sec
+            print(
+                f"[INFO] Submit wait budget {submit_wait_sec}s ({wait_budget.source}, samples={wait_budget.samples}, "
+                f"p50={wait_budget.p50}s, p95={wait_budget.p95}s); API probe after {wait_budget.probe_delay_sec}s."
             )
+            # a permanent failure (browser closed, redirected to login) ends the loop instead of using all attempts
+            stop_error, stop_category = "", ""
             for attempt in range(1, max_attempts + 1):
                 attempt_started_at = datetime.datetime.now(datetime.timezone.utc)
                 try:
-                    btn = page.locator("button[data-testid='create-issue-button']").first
-                    btn.click()
+                    with timer.span("create_click", attempt=attempt):
+                        btn = page.locator("button[data-testid='create-issue-button']").first
+                        btn.click()
                 except Exception as e:
                     print(f"Attempt {attempt}: failed to click Create: {e}")
-                    save_debug(page, artifacts, f"create_click_fail_{attempt}")
+                    save_debug(page, debug, f"create_click_fail_{attempt}", failure=True)
+                    category = classify_error(e)
+                    if is_permanent(category, within_run=True):
+                        stop_error, stop_category = f"Create click failed on attempt {attempt}: {e}", category
+                        break
                     continue
+                clicked_at = time.monotonic()
+                # durable marker: after this point a worker or the orchestrator must not re-submit blindly
+                append_work_order_event(
+                    work_order_path,
+                    stage="submit_attempt",
+                    status="clicked",
+                    submitter="skill",
+                    message=f"Clicked Create (attempt {attempt}/{max_attempts}).",
+                    extra={"attempt": attempt},
+                )
+
+                def probe_recent_issue(started_at: datetime.datetime = attempt_started_at) -> Optional[SubmissionSuccessInfo]:
+                    return find_recent_issue_by_title(
+                        wo.owner_repo,
+                        wo.title,
+                        project_url=wo.project_url,
+                        not_before=started_at - datetime.timedelta(seconds=RECENT_ISSUE_LOOKBACK_SEC),
+                        timeout_sec=max(5, int(submit_wait_sec)),
+                    )
+
+                def confirmed(result: SubmissionSuccessInfo) -> int:
+                    timer.record("confirm", clicked_at, attempt=attempt, method=result.detection_method)
+                    record_confirmation_latency(
+                        time.monotonic() - clicked_at,
+                        method=result.detection_method,
+                        owner_repo=wo.owner_repo,
+                    )
+                    return _record_submission_success(work_order_path, artifacts, args, result)
 
                 success_result: Optional[SubmissionSuccessInfo] = None
-                poll_count = max(1, int((submit_wait_sec * 2)))
-                for _ in range(poll_count):
-                    time.sleep(0.5)
-                    success_result = detect_issue_submission_success(page, wo.project_url)
-                    if success_result:
-                        return _record_submission_success(work_order_path, artifacts, args, success_result)
-
-                recent_issue = find_recent_issue_by_title(
-                    wo.owner_repo,
-                    wo.title,
-                    project_url=wo.project_url,
-                    not_before=attempt_started_at - datetime.timedelta(seconds=RECENT_ISSUE_LOOKBACK_SEC),
-                    timeout_sec=submit_wait_sec,
-                )
+                probe_thread = _RecentIssueProbeThread(
+                    probe_recent_issue,
+                    delay_sec=wait_budget.probe_delay_sec,
+                    interval_sec=wait_budget.probe_interval_sec,
+                ).start()
+                try:
+                    poll_count = max(1, int((submit_wait_sec * 2)))
+                    for _ in range(poll_count):
+                        time.sleep(0.5)
+                        success_result = detect_issue_submission_success(page, wo.project_url) or probe_thread.result
+                        if success_result:
+                            return confirmed(success_result)
+                finally:
+                    probe_thread.stop()
+
+                recent_issue = probe_thread.result or probe_recent_issue()
                 if recent_issue:
                     print(
                         f"[INFO] Attempt {attempt}: submit result recovered from recent issue lookup "
                         f"({recent_issue.detection_method})."
                     )
-                    return _record_submission_success(work_order_path, artifacts, args, recent_issue)
-
-                save_debug(page, artifacts, f"submit_attempt_{attempt}")
-                observation = ""
+                    return confirmed(recent_issue)
+
+                timer.record("confirm", clicked_at, ok=False, attempt=attempt)
+                record_confirmation_latency(
+                    time.monotonic() - clicked_at,
+                    method="unconfirmed",
+                    owner_repo=wo.owner_repo,
+                    censored=True,
+                )
+                save_debug(page, debug, f"submit_attempt_{attempt}")
+                signals: Dict[str, str] = {}
                 with contextlib.suppress(Exception):
-                    observation = _summarize_submission_signals(_collect_submission_signals(page, wo.project_url))
+                    signals = _collect_submission_signals(page, wo.project_url)
+                observation = _summarize_submission_signals(signals) if signals else ""
+                # only the URL is classified: page titles and headings contain the user's issue title
+                page_category = classify_text(str(signals.get("current_url") or ""))
                 append_work_order_event(
                     work_order_path,
                     stage="submit_attempt",
@@ -1397,12 +1554,39 @@ def main() -> int:
                     extra={
                         "observation": observation,
                         "wait_sec": submit_wait_sec,
+                        "wait_budget": asdict(wait_budget),
+                        "page_category": page_category,
                     },
                 )
                 if observation:
                     print(f"Attempt {attempt}: no confirmed issue yet. Observation: {observation}")
+                if is_permanent(page_category, within_run=True):
+                    stop_error = f"Submit attempt {attempt} landed on {signals.get('current_url')}; retrying cannot help."
+                    stop_category = page_category
+                    break
                 print(f"Attempt {attempt}: no confirmed issue after {submit_wait_sec}s. Retrying...")
 
+            if stop_error:
+                print(f"[ERROR] {stop_error} ({stop_category})")
+                update_work_order_runtime(
+                    work_order_path,
+                    {
+                        "status": "failed",
+                        "last_error": stop_error,
+                        "last_error_at": datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0).isoformat(),
+                    },
+                )
+                append_work_order_event(
+                    work_order_path,
+                    stage="submit",
+                    status="failed",
+                    submitter="skill",
+                    error=stop_error,
+                    error_category=stop_category,
+                    artifacts_dir=str(artifacts.resolve()),
+                )
+                raise SystemExit(f"{stop_error} See artifacts/*.png and *.html for details.")
+
             update_work_order_runtime(
                 work_order_path,
                 {
@@ -1438,7 +1622,7 @@ def main() -> int:
             error=f"Timeout waiting for element/state: {e}",
             artifacts_dir=str(artifacts.resolve()),
         )
-        save_debug(page, artifacts, "timeout") if page else None
+        save_debug(page, debug, "timeout", failure=True) if page else None
         raise SystemExit(f"Timeout waiting for element/state: {e}") from e
     except PlaywrightError as e:
         update_work_order_runtime(
@@ -1457,7 +1641,7 @@ def main() -> int:
             error=str(e),
             artifacts_dir=str(artifacts.resolve()),
         )
-        save_debug(page, artifacts, "browser_error") if page else None
+        save_debug(page, debug, "browser_error", failure=True) if page else None
         err_text = str(e)
         print(f"[ERROR] Playwright detail: {err_text}")
         if "Executable doesn't exist" in err_text:
@@ -1500,11 +1684,12 @@ def main() -> int:
         )
         raise
     finally:
+        _record_stage_timings(work_order_path, timer)
+        debug.close()
         with contextlib.suppress(Exception):
             if context:
                 context.close()
-        _disable_run_logging(log_state)
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(run_profiled(main, "skill_submit_aionui_issue", submitter=SUBMITTER_SKILL))
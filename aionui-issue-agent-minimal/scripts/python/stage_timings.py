@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Per-stage timing spans for a submission run, plus a cross-work-order aggregate.
+
+A ``StageTimer`` records spans as ``{"name", "start_sec", "duration_sec", "ok", ...}``
+where ``start_sec`` is the monotonic offset from the timer's creation.  The
+``skill`` submitter attaches them to the final event of the run as
+``events[].extra.timings`` and prints ``summary_lines()`` at the end of
+``run.log``; ``skill_bootstrap.py`` records its own spans in the same shape.
+
+Span names:
+    bootstrap:ensure_venv / bootstrap:venv_reexec / bootstrap:install_requirements /
+    bootstrap:install_browser / bootstrap:submit_process,
+    browser_launch, navigate, login_wait, fill:<field_id>, upload_attachments,
+    create_click, confirm  (the last two carry ``attempt``)
+
+Usage:
+    python stage_timings.py aggregate issue_runs/chat-20260306-01
+    python stage_timings.py aggregate issue_runs --json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class StageTimer:
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.origin = clock()
+        self.spans: List[Dict[str, Any]] = []
+
+    def now(self) -> float:
+        return self.clock()
+
+    def record(self, name: str, started: float, duration_sec: Optional[float] = None, *, ok: bool = True, **attrs: Any) -> Dict[str, Any]:
+        """Add a span that started at ``started`` (a ``clock()`` value) and lasted until now unless given."""
+        if duration_sec is None:
+            duration_sec = self.clock() - started
+        span = {
+            "name": name,
+            "start_sec": round(max(0.0, started - self.origin), 3),
+            "duration_sec": round(max(0.0, duration_sec), 3),
+            "ok": ok,
+            **attrs,
+        }
+        self.spans.append(span)
+        return span
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block; ``attrs`` may be updated through the yielded dict before it exits."""
+        started = self.clock()
+        extra = dict(attrs)
+        try:
+            yield extra
+        except BaseException:
+            self.record(name, started, ok=False, **extra)
+            raise
+        self.record(name, started, **extra)
+
+    def total_sec(self) -> float:
+        return round(max(0.0, self.clock() - self.origin), 3)
+
+    def summary_lines(self) -> List[str]:
+        return summarize_spans(self.spans, self.total_sec())
+
+
+def summarize_spans(spans: List[Dict[str, Any]], total_sec: float) -> List[str]:
+    lines = [f"[TIMING] total {total_sec:.2f}s across {len(spans)} span(s)"]
+    width = max([len(_display_name(span)) for span in spans] + [4])
+    for span in spans:
+        share = (span["duration_sec"] / total_sec * 100) if total_sec > 0 else 0.0
+        flag = "" if span.get("ok", True) else "  FAILED"
+        lines.append(
+            f"[TIMING] {_display_name(span):<{width}}  +{span['start_sec']:>7.2f}s  {span['duration_sec']:>7.2f}s  {share:5.1f}%{flag}"
+        )
+    return lines
+
+
+def _display_name(span: Dict[str, Any]) -> str:
+    attempt = span.get("attempt")
+    return f"{span['name']}#{attempt}" if attempt else str(span["name"])
+
+
+# ---------------------------
+# Aggregation across work orders
+# ---------------------------
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def collect_spans(root: Path) -> List[Dict[str, Any]]:
+    """All spans from ``events[].extra.timings`` of every work_order.json under ``root``."""
+    spans: List[Dict[str, Any]] = []
+    for path in sorted(root.rglob("work_order.json")):
+        with contextlib.suppress(OSError, ValueError):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            for event in data.get("events") or []:
+                timings = (event.get("extra") or {}).get("timings") if isinstance(event, dict) else None
+                for span in timings or []:
+                    if isinstance(span, dict) and "name" in span:
+                        spans.append({**span, "work_id": data.get("work_id") or path.parent.name})
+    return spans
+
+
+def aggregate_spans(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        by_name.setdefault(str(span["name"]), []).append(span)
+    rows = []
+    for name, items in by_name.items():
+        durations = [float(item.get("duration_sec") or 0.0) for item in items]
+        slowest = max(items, key=lambda item: float(item.get("duration_sec") or 0.0))
+        rows.append(
+            {
+                "name": name,
+                "count": len(items),
+                "failed": sum(1 for item in items if not item.get("ok", True)),
+                "work_orders": len({item.get("work_id") for item in items}),
+                "mean_sec": round(sum(durations) / len(durations), 3),
+                "p50_sec": round(_percentile(durations, 50), 3),
+                "p95_sec": round(_percentile(durations, 95), 3),
+                "max_sec": round(max(durations), 3),
+                "slowest_work_id": slowest.get("work_id", ""),
+            }
+        )
+    rows.sort(key=lambda row: row["p95_sec"] * row["count"], reverse=True)
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Aggregate per-stage timings recorded in work_order.json events.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    aggregate = sub.add_parser("aggregate", help="Summarize spans across every work order under a directory")
+    aggregate.add_argument("root", help="Session directory (issue_runs/<session_id>) or the whole issue_runs")
+    aggregate.add_argument("--json", action="store_true", help="Print JSON rows instead of a table")
+    args = parser.parse_args()
+
+    rows = aggregate_spans(collect_spans(Path(args.root).expanduser()))
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return 0
+    print(f"{'stage':<32} {'n':>4} {'fail':>4} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}  slowest")
+    for row in rows:
+        print(
+            f"{row['name']:<32} {row['count']:>4} {row['failed']:>4} {row['mean_sec']:>8.2f} "
+            f"{row['p50_sec']:>8.2f} {row['p95_sec']:>8.2f} {row['max_sec']:>8.2f}  {row['slowest_work_id']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
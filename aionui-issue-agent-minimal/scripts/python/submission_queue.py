@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Durable SQLite queue of work orders waiting to be submitted in the background.
+
+The chat agent enqueues a work order with its chosen submitter and returns at
+once; ``submitter_runner.py`` worker processes claim jobs and run the existing
+submit code paths.  The queue only tracks jobs; the work order itself stays the
+source of truth (``issue_number`` / ``issue_url``, ``runtime.status``, ``events``).
+
+Job states:
+    queued     waiting; ``not_before`` delays retries (exponential backoff)
+    running    claimed by a worker; the lease is renewed while the job runs, and a
+               job whose lease expired (worker crashed) is claimed again
+    succeeded  the submitter exited 0, or the issue is recorded in the work order
+    skipped    the work order already had ``issue_number`` / ``issue_url``
+    failed     ``max_attempts`` used up, a failure that a retry cannot fix, or a skill
+               run that clicked Create without a confirmed issue (work order
+               ``runtime.status = needs_confirmation``; check the repo, then ``retry``)
+    cancelled  removed from the queue by ``cancel`` before a worker claimed it
+
+At most one queued/running job exists per work order, so enqueueing twice is a no-op.
+
+Queue location:
+    - ``$AIONUI_SUBMISSION_QUEUE`` if set
+    - otherwise ``<issue_runs>/submission_queue.sqlite3`` next to the work order index
+
+Usage:
+    python submission_queue.py enqueue issue_runs/<session>/<work_id>/work_order.json --submitter api
+    python submission_queue.py enqueue path/to/work_order.json --submitter skill -- --pause-before-submit-sec 0
+    python submission_queue.py status <work_id>
+    python submission_queue.py list --state queued
+    python submission_queue.py retry <work_id>
+    python submission_queue.py cancel <work_id>
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from issue_payload_support import (
+    SUBMITTER_API,
+    SUBMITTER_SKILL,
+    append_work_order_event,
+    iso_now,
+    update_work_order_runtime,
+)
+from work_order_index import ISSUE_RUNS_DIRNAME
+
+
+QUEUE_FILENAME = "submission_queue.sqlite3"
+QUEUE_ENV = "AIONUI_SUBMISSION_QUEUE"
+# chrome_mcp / github_mcp are driven by an MCP agent and cannot run unattended
+QUEUE_SUBMITTERS = (SUBMITTER_SKILL, SUBMITTER_API)
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_LEASE_SEC = 600.0
+FINAL_STATES = ("succeeded", "skipped", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    work_id TEXT NOT NULL,
+    work_order_path TEXT NOT NULL,
+    submitter TEXT NOT NULL,
+    args TEXT NOT NULL DEFAULT '[]',
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_until REAL NOT NULL DEFAULT 0,
+    worker TEXT NOT NULL DEFAULT '',
+    exit_code INTEGER,
+    last_error TEXT NOT NULL DEFAULT '',
+    issue_number TEXT NOT NULL DEFAULT '',
+    issue_url TEXT NOT NULL DEFAULT '',
+    enqueued_at TEXT NOT NULL DEFAULT '',
+    started_at TEXT NOT NULL DEFAULT '',
+    finished_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state_not_before ON jobs(state, not_before);
+CREATE INDEX IF NOT EXISTS idx_jobs_work_id ON jobs(work_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_work_order
+    ON jobs(work_order_path) WHERE state IN ('queued', 'running');
+"""
+
+
+def default_queue_path(work_order_path: Optional[Path] = None) -> Path:
+    override = str(os.environ.get(QUEUE_ENV) or "").strip()
+    if override:
+        return Path(override).expanduser()
+    if work_order_path is not None:
+        for parent in work_order_path.resolve().parents:
+            if parent.name == ISSUE_RUNS_DIRNAME:
+                return parent / QUEUE_FILENAME
+    return Path(ISSUE_RUNS_DIRNAME).resolve() / QUEUE_FILENAME
+
+
+def connect_queue(queue_path: Path) -> sqlite3.Connection:
+    """One connection per process/thread; ``BEGIN IMMEDIATE`` serializes claims across workers."""
+    queue_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(queue_path), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    with contextlib.suppress(sqlite3.DatabaseError):
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+@contextlib.contextmanager
+def _immediate(conn: sqlite3.Connection):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _job(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    job = dict(row)
+    job["args"] = json.loads(job.get("args") or "[]")
+    return job
+
+
+def backoff_delay(attempts: int, base_sec: float = 30.0, cap_sec: float = 900.0) -> float:
+    """Seconds before the next attempt after ``attempts`` failed ones: 30 s, 60 s, 120 s, ... up to 15 min."""
+    return min(cap_sec, base_sec * (2 ** max(0, attempts - 1)))
+
+
+def enqueue(
+    conn: sqlite3.Connection,
+    work_order_path: Path,
+    submitter: str,
+    *,
+    args: Optional[List[str]] = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> Dict[str, Any]:
+    """Add a job, or return the queued/running job the work order already has."""
+    if submitter not in QUEUE_SUBMITTERS:
+        raise ValueError(f"submitter must be one of {', '.join(QUEUE_SUBMITTERS)}, got: {submitter!r}")
+    work_order_path = work_order_path.resolve()
+    data = json.loads(work_order_path.read_text(encoding="utf-8"))
+    work_id = str(data.get("work_id") or work_order_path.parent.name)
+    with _immediate(conn):
+        existing = conn.execute(
+            "SELECT * FROM jobs WHERE work_order_path = ? AND state IN ('queued', 'running')",
+            (str(work_order_path),),
+        ).fetchone()
+        if existing is not None:
+            return {**_job(existing), "already_queued": True}
+        cursor = conn.execute(
+            "INSERT INTO jobs (work_id, work_order_path, submitter, args, max_attempts, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (work_id, str(work_order_path), submitter, json.dumps(list(args or [])), max(1, max_attempts), iso_now()),
+        )
+        job = _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (cursor.lastrowid,)).fetchone())
+    update_work_order_runtime(work_order_path, {"status": "queued", "last_submitter": submitter})
+    append_work_order_event(
+        work_order_path,
+        stage="queue",
+        status="enqueued",
+        submitter=submitter,
+        message=f"Queued for background submission (job {job['id']}).",
+        extra={"job_id": job["id"], "max_attempts": job["max_attempts"]},
+    )
+    return job
+
+
+def claim(conn: sqlite3.Connection, worker: str, *, lease_sec: float = DEFAULT_LEASE_SEC, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Take the oldest due job (or one whose worker's lease expired) and mark it running."""
+    now = time.time() if now is None else now
+    with _immediate(conn):
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE (state = 'queued' AND not_before <= ?) OR (state = 'running' AND lease_until < ?) "
+            "ORDER BY not_before, id LIMIT 1",
+            (now, now),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE jobs SET state = 'running', attempts = attempts + 1, worker = ?, lease_until = ?, started_at = ? WHERE id = ?",
+            (worker, now + lease_sec, iso_now(), row["id"]),
+        )
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+
+def renew_lease(conn: sqlite3.Connection, job_id: int, worker: str, *, lease_sec: float = DEFAULT_LEASE_SEC) -> bool:
+    with _immediate(conn):
+        cursor = conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND state = 'running' AND worker = ?",
+            (time.time() + lease_sec, job_id, worker),
+        )
+    return cursor.rowcount == 1
+
+
+def finish(
+    conn: sqlite3.Connection,
+    job: Dict[str, Any],
+    state: str,
+    *,
+    exit_code: Optional[int] = None,
+    error: str = "",
+    issue_number: str = "",
+    issue_url: str = "",
+) -> None:
+    if state not in FINAL_STATES:
+        raise ValueError(f"not a final state: {state!r}")
+    with _immediate(conn):
+        conn.execute(
+            "UPDATE jobs SET state = ?, exit_code = ?, last_error = ?, issue_number = ?, issue_url = ?, "
+            "lease_until = 0, finished_at = ? WHERE id = ?",
+            (state, exit_code, error, issue_number, issue_url, iso_now(), job["id"]),
+        )
+
+
+def schedule_retry(conn: sqlite3.Connection, job: Dict[str, Any], *, delay_sec: float, exit_code: Optional[int] = None, error: str = "") -> float:
+    """Put a failed job back in the queue; returns the epoch seconds it becomes due."""
+    not_before = time.time() + delay_sec
+    with _immediate(conn):
+        conn.execute(
+            "UPDATE jobs SET state = 'queued', not_before = ?, exit_code = ?, last_error = ?, lease_until = 0, worker = '' WHERE id = ?",
+            (not_before, exit_code, error, job["id"]),
+        )
+    return not_before
+
+
+def get_jobs(conn: sqlite3.Connection, work_id: str) -> List[Dict[str, Any]]:
+    """Every job of a work_id, newest first."""
+    return [_job(row) for row in conn.execute("SELECT * FROM jobs WHERE work_id = ? ORDER BY id DESC", (work_id,))]
+
+
+def list_jobs(conn: sqlite3.Connection, state: str = "") -> List[Dict[str, Any]]:
+    sql = "SELECT * FROM jobs"
+    params: List[str] = []
+    if state:
+        sql += " WHERE state = ?"
+        params.append(state)
+    return [_job(row) for row in conn.execute(sql + " ORDER BY id", params)]
+
+
+def state_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    return {row["state"]: row["n"] for row in conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state")}
+
+
+def requeue(conn: sqlite3.Connection, work_id: str) -> Optional[Dict[str, Any]]:
+    """Re-queue the newest failed/cancelled job of ``work_id`` with a fresh attempt budget."""
+    with _immediate(conn):
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE work_id = ? ORDER BY id DESC LIMIT 1", (work_id,)
+        ).fetchone()
+        if row is None or row["state"] not in ("failed", "cancelled"):
+            return None
+        conn.execute(
+            "UPDATE jobs SET state = 'queued', attempts = 0, not_before = 0, last_error = '', finished_at = '' WHERE id = ?",
+            (row["id"],),
+        )
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+
+def cancel(conn: sqlite3.Connection, work_id: str) -> int:
+    """Cancel queued (not running) jobs of ``work_id``; returns how many."""
+    with _immediate(conn):
+        cursor = conn.execute(
+            "UPDATE jobs SET state = 'cancelled', finished_at = ? WHERE work_id = ? AND state = 'queued'",
+            (iso_now(), work_id),
+        )
+    return cursor.rowcount
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Arguments after ``--`` are passed to the submitter unchanged."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    submitter_args: List[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, submitter_args = argv[:split], argv[split + 1:]
+    parser = argparse.ArgumentParser(description="Durable background submission queue for work orders.")
+    parser.add_argument("--queue", help=f"Queue file (default: ${QUEUE_ENV} or issue_runs/{QUEUE_FILENAME})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("enqueue", help="Queue a work order for background submission")
+    add.add_argument("work_order", help="Path to work_order.json")
+    add.add_argument("--submitter", choices=QUEUE_SUBMITTERS, default=SUBMITTER_SKILL)
+    add.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    status = sub.add_parser("status", help="Jobs of one work_id, newest first")
+    status.add_argument("work_id")
+    listing = sub.add_parser("list", help="List jobs")
+    listing.add_argument("--state", default="", help="Only jobs in this state")
+    sub.add_parser("stats", help="Count jobs by state")
+    retry = sub.add_parser("retry", help="Re-queue the latest failed/cancelled job of a work_id")
+    retry.add_argument("work_id")
+    cancel_parser = sub.add_parser("cancel", help="Cancel queued jobs of a work_id")
+    cancel_parser.add_argument("work_id")
+    args = parser.parse_args(argv)
+    args.submitter_args = submitter_args
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    work_order = Path(args.work_order).expanduser() if args.command == "enqueue" else None
+    queue_path = Path(args.queue).expanduser() if args.queue else default_queue_path(work_order)
+    conn = connect_queue(queue_path)
+    if args.command == "enqueue":
+        if not work_order.is_file():
+            print(json.dumps({"error": f"work_order.json not found: {work_order}"}, ensure_ascii=False))
+            return 2
+        result: Any = enqueue(conn, work_order, args.submitter, args=args.submitter_args, max_attempts=args.max_attempts)
+        result["queue"] = str(queue_path.resolve())
+    elif args.command == "status":
+        result = get_jobs(conn, args.work_id)
+    elif args.command == "list":
+        result = list_jobs(conn, args.state)
+    elif args.command == "stats":
+        result = state_counts(conn)
+    elif args.command == "retry":
+        result = requeue(conn, args.work_id) or {"error": f"no failed or cancelled job for {args.work_id}"}
+    else:
+        result = {"cancelled": cancel(conn, args.work_id)}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 1 if isinstance(result, dict) and result.get("error") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
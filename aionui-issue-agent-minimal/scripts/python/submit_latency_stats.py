@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Observed Create -> confirmed-issue latency, used to size the submit wait.
+
+Every confirmed ``skill`` submission appends one sample (seconds from the
+Create click to the confirming signal) to
+``<user_cache_dir()>/submit_latency.json``; an attempt that is never confirmed
+appends a ``censored`` sample at the time it waited.  Censored samples are capped
+at the p95 of the confirmed ones, so they keep the percentiles from drifting low
+without feeding the wait back into itself.  Only samples of the same
+``owner_repo`` count.  The next run derives its wait budget from recent
+percentiles instead of the fixed 15-45 s window:
+
+    cap             = max(15 s, min(--timeout-sec, 90 s))
+    wait_sec        = clamp(p95 + max(3 s, 25% of p95), 15 s, cap)
+    probe_delay_sec = clamp(p50, 2 s, wait_sec)   # first background API probe
+    probe_interval  = max(5 s, (wait_sec - probe_delay_sec) / 3)
+
+With fewer than ``MIN_SAMPLES`` samples the legacy window is used.
+
+Usage:
+    python submit_latency_stats.py            # print the current budget and percentiles
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from issue_payload_support import file_lock, iso_now, user_cache_dir
+from metrics_exporter import observe_confirmation_latency
+
+
+STATS_FILENAME = "submit_latency.json"
+MAX_SAMPLES = 200
+WINDOW_SAMPLES = 30
+MIN_SAMPLES = 5
+LEGACY_WAIT_SEC_MIN = 15
+LEGACY_WAIT_SEC_MAX = 45
+ADAPTIVE_WAIT_SEC_MIN = LEGACY_WAIT_SEC_MIN
+ADAPTIVE_WAIT_SEC_MAX = 90
+WAIT_MARGIN_SEC = 3.0
+WAIT_MARGIN_RATIO = 0.25
+PROBE_DELAY_SEC_MIN = 2.0
+PROBE_INTERVAL_SEC_MIN = 5.0
+
+
+@dataclass
+class SubmitWaitBudget:
+    wait_sec: float
+    probe_delay_sec: float
+    probe_interval_sec: float
+    source: str  # "history" | "default"
+    samples: int = 0
+    p50: float = 0.0
+    p95: float = 0.0
+
+
+def stats_path() -> Path:
+    return user_cache_dir() / STATS_FILENAME
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    with contextlib.suppress(OSError, ValueError):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict) and isinstance(data.get("samples"), list):
+            return data
+    return {"samples": []}
+
+
+def record_confirmation_latency(
+    latency_sec: float,
+    *,
+    method: str,
+    owner_repo: str = "",
+    path: Optional[Path] = None,
+    censored: bool = False,
+) -> None:
+    """Append one sample; best-effort, never raises.
+
+    ``censored`` marks an attempt that was not confirmed within ``latency_sec``:
+    the real latency is at least that long, so it still counts as a sample.
+    """
+    if not censored:
+        observe_confirmation_latency(latency_sec, method)
+    target = path or stats_path()
+    sample = {
+        "at": iso_now(),
+        "latency_sec": round(max(0.0, float(latency_sec)), 3),
+        "method": method,
+        "owner_repo": owner_repo,
+        **({"censored": True} if censored else {}),
+    }
+    with contextlib.suppress(OSError), file_lock(target):
+        data = _load(target)
+        data["samples"] = (data["samples"] + [sample])[-MAX_SAMPLES:]
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, target)
+
+
+def recent_latencies(path: Optional[Path] = None, limit: int = WINDOW_SAMPLES, owner_repo: str = "") -> List[float]:
+    """The newest ``limit`` samples (of ``owner_repo`` when given); censored ones capped at the confirmed p95."""
+    confirmed: List[float] = []
+    censored: List[float] = []
+    samples = [
+        sample
+        for sample in _load(path or stats_path())["samples"]
+        if isinstance(sample, dict) and (not owner_repo or sample.get("owner_repo") == owner_repo)
+    ]
+    for sample in samples[-limit:]:
+        with contextlib.suppress(TypeError, ValueError):
+            value = float(sample.get("latency_sec"))
+            if math.isfinite(value) and value >= 0:
+                (censored if sample.get("censored") else confirmed).append(value)
+    if not confirmed:
+        return []
+    cap = percentile(confirmed, 95)
+    return confirmed + [min(value, cap) for value in censored]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile, ``q`` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * min(100.0, max(0.0, q)) / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def submit_wait_budget(timeout_sec: int, path: Optional[Path] = None, owner_repo: str = "") -> SubmitWaitBudget:
+    values = recent_latencies(path, owner_repo=owner_repo)
+    if len(values) < MIN_SAMPLES:
+        wait_sec = float(max(LEGACY_WAIT_SEC_MIN, min(int(timeout_sec or 0), LEGACY_WAIT_SEC_MAX)))
+        probe_delay = wait_sec / 2
+        return SubmitWaitBudget(
+            wait_sec=wait_sec,
+            probe_delay_sec=probe_delay,
+            probe_interval_sec=max(PROBE_INTERVAL_SEC_MIN, (wait_sec - probe_delay) / 3),
+            source="default",
+            samples=len(values),
+        )
+    p50 = percentile(values, 50)
+    p95 = percentile(values, 95)
+    # --timeout-sec bounds the wait after Create the same way it bounds the legacy window
+    cap = max(ADAPTIVE_WAIT_SEC_MIN, min(int(timeout_sec or 0), ADAPTIVE_WAIT_SEC_MAX))
+    wait_sec = min(cap, max(ADAPTIVE_WAIT_SEC_MIN, p95 + max(WAIT_MARGIN_SEC, p95 * WAIT_MARGIN_RATIO)))
+    probe_delay = min(wait_sec, max(PROBE_DELAY_SEC_MIN, p50))
+    return SubmitWaitBudget(
+        wait_sec=round(wait_sec, 2),
+        probe_delay_sec=round(probe_delay, 2),
+        probe_interval_sec=round(max(PROBE_INTERVAL_SEC_MIN, (wait_sec - probe_delay) / 3), 2),
+        source="history",
+        samples=len(values),
+        p50=round(p50, 3),
+        p95=round(p95, 3),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show the adaptive submit wait budget derived from latency history.")
+    parser.add_argument("--timeout-sec", type=int, default=30, help="Upper bound of the wait (legacy window while history is short)")
+    parser.add_argument("--stats", help=f"Stats file (default: <user cache>/{STATS_FILENAME})")
+    parser.add_argument("--owner-repo", default="", help="Only samples of this repo (default: all)")
+    args = parser.parse_args()
+    path = Path(args.stats).expanduser() if args.stats else stats_path()
+    budget = submit_wait_budget(args.timeout_sec, path, owner_repo=args.owner_repo)
+    print(json.dumps({"stats": str(path), **asdict(budget)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
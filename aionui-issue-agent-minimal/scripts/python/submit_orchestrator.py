@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Deterministic cross-submitter failover for one work order.
+
+``AGENT_PROMPT.md`` asks the agent to switch to another submitter when one
+fails.  This CLI does that switch without a model round trip: it tries the
+submitters in ``--order`` (default ``skill,api,chrome_mcp``) and stops at the
+first one that records an issue.
+
+    skill       skill_bootstrap.py as a subprocess (output: artifacts/orchestrate_skill.log)
+    api         api_submit_issue.submit_work_order in-process
+    chrome_mcp  builds artifacts/chrome_mcp_bundle.json and hands off to the agent
+    github_mcp  builds artifacts/github_mcp_payload.json and hands off to the agent
+
+The skill runs in its own process group; on ``--skill-timeout-sec`` the whole
+group (bootstrap, venv python, browser) is killed and reaped before the next
+submitter starts.
+
+The MCP submitters need an agent to drive them, so reaching one ends the run with
+``status="handoff"`` (exit code 3) and the file the agent should use.
+
+Before each step the orchestrator skips options that are sure to fail:
+
+    skill  the last skill failure on this work order, within the past day, was
+           browser_missing or sandbox_blocked (``--retry-skill`` tries anyway,
+           e.g. after ``playwright install``), or Linux has no DISPLAY /
+           WAYLAND_DISPLAY and ``--headless`` was not passed
+    api    no GITHUB_TOKEN / GH_TOKEN
+
+After a failed step the newest error the step recorded is classified with
+``error_classifier`` (``error_category`` on the event); a ``validation`` failure stops the run
+because every submitter would reject the same work order.  The run also stops
+early when the work order already has ``issue_number`` / ``issue_url`` or is
+missing required fields.  Every step is recorded as an ``orchestrate`` event.
+
+A skill step that failed after clicking Create (``submit_attempt`` / ``clicked``)
+never fails over: the issue may exist already.  The repo is probed for the exact
+title; when nothing is found the run stops with ``status="needs_confirmation"``
+(exit code 4, ``runtime.status = needs_confirmation``).  Later runs stop the same
+way until the issue turns up or ``--confirmed-no-issue`` is passed.
+
+Exit codes: 0 submitted / already submitted / ``--dry-run``, 1 every step failed, 2 invalid
+work order, 3 handed off to an MCP submitter, 4 Create was clicked but no issue was confirmed.
+
+Usage:
+    python submit_orchestrator.py --work-order /path/to/work_order.json
+    python submit_orchestrator.py --work-order ... --order api,skill --skill-args "--headless --pause-before-submit-sec 0"
+    python submit_orchestrator.py --work-order ... --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform as py_platform
+import shlex
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from api_submit_issue import submit_work_order as api_submit_work_order
+from error_classifier import AUTH, BROWSER_MISSING, SANDBOX_BLOCKED, VALIDATION, classify_text
+from chrome_mcp_build_bundle import build_bundle_for_work_order
+from github_issue_probe import create_clicked_at, recover_clicked_issue
+from github_mcp_build_payload import ASSETS_TEMPLATES_DIR, build_payload_for_work_order
+from issue_payload_support import (
+    SUBMITTER_API,
+    SUBMITTER_CHROME_MCP,
+    SUBMITTER_GITHUB_MCP,
+    SUBMITTER_SKILL,
+    append_work_order_event,
+    ensure_work_order_runtime,
+    github_token_from_env,
+    load_issue_template_cached,
+    missing_required_fields,
+    normalize_work_order_dict,
+    template_for_issue_type,
+    update_work_order_runtime,
+)
+from submitter_runner import kill_process_group, start_process_group, submitter_command
+
+
+DEFAULT_ORDER = (SUBMITTER_SKILL, SUBMITTER_API, SUBMITTER_CHROME_MCP)
+SUBMITTERS = (SUBMITTER_SKILL, SUBMITTER_API, SUBMITTER_CHROME_MCP, SUBMITTER_GITHUB_MCP)
+HANDOFF_FILES = {
+    SUBMITTER_CHROME_MCP: "chrome_mcp_bundle.json",
+    SUBMITTER_GITHUB_MCP: "github_mcp_payload.json",
+}
+DEFAULT_SKILL_TIMEOUT_SEC = 1800
+
+# a skill failure in these categories means the browser cannot start on this machine
+_BROWSER_BLOCKERS = (BROWSER_MISSING, SANDBOX_BLOCKED)
+# ... until someone fixes it, so the skip expires
+BROWSER_BLOCKER_TTL_SEC = 24 * 3600
+
+
+def _issue_of(data: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "issue_number": str(data.get("issue_number") or "").strip(),
+        "issue_url": str(data.get("issue_url") or "").strip(),
+    }
+
+
+def _step_error(data: Dict[str, Any], events_before: int, submitter: str) -> Tuple[str, str]:
+    """``(error, category)`` of the newest error ``submitter`` recorded during the step."""
+    for event in reversed((data.get("events") or [])[events_before:]):
+        if isinstance(event, dict) and event.get("submitter") == submitter and event.get("error"):
+            error = str(event["error"])
+            return error, str(event.get("error_category") or classify_text(error))
+    error = str((data.get("runtime") or {}).get("last_error") or "")
+    return error, classify_text(error)
+
+
+def _last_failure(data: Dict[str, Any], submitter: str) -> Tuple[str, Optional[datetime.datetime]]:
+    """``(category, timestamp)`` of the newest error ``submitter`` recorded, unless it succeeded since."""
+    for event in reversed(data.get("events") or []):
+        if isinstance(event, dict) and event.get("submitter") == submitter:
+            if event.get("status") == "succeeded":
+                return "", None
+            if event.get("error"):
+                at = None
+                with contextlib.suppress(ValueError):
+                    at = datetime.datetime.fromisoformat(str(event.get("timestamp") or "").replace("Z", "+00:00"))
+                return str(event.get("error_category") or classify_text(str(event["error"]))), at
+    return "", None
+
+
+def skip_reason(submitter: str, data: Dict[str, Any], skill_args: List[str], *, retry_skill: bool = False) -> str:
+    """Why ``submitter`` is sure to fail right now ("" = worth trying)."""
+    if submitter == SUBMITTER_SKILL:
+        category, failed_at = _last_failure(data, SUBMITTER_SKILL)
+        recent = failed_at is not None and failed_at.tzinfo is not None and (
+            datetime.datetime.now(datetime.timezone.utc) - failed_at
+        ).total_seconds() < BROWSER_BLOCKER_TTL_SEC
+        if category in _BROWSER_BLOCKERS and recent and not retry_skill:
+            return f"{category}: the last skill run could not start a browser (pass --retry-skill to try again)"
+        headless = "--headless" in skill_args
+        if py_platform.system() == "Linux" and not headless and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+            return f"{BROWSER_MISSING}: no DISPLAY / WAYLAND_DISPLAY (pass --headless in --skill-args)"
+    if submitter == SUBMITTER_API and not github_token_from_env():
+        return f"{AUTH}: GITHUB_TOKEN / GH_TOKEN is not set"
+    return ""
+
+
+def _run_skill(work_order_path: Path, skill_args: List[str], timeout_sec: int) -> int:
+    log_path = work_order_path.parent / "artifacts" / "orchestrate_skill.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    command = submitter_command({"submitter": SUBMITTER_SKILL, "work_order_path": str(work_order_path), "args": skill_args})
+    with log_path.open("a", encoding="utf-8") as log:
+        child = start_process_group(command, stdout=log, stderr=subprocess.STDOUT, cwd=str(work_order_path.parent))
+        try:
+            return child.wait(timeout=timeout_sec)
+        except subprocess.TimeoutExpired:
+            # the browser must be gone before the next submitter starts
+            kill_process_group(child)
+            log.write(f"# killed after {timeout_sec}s\n")
+            return -9
+        except BaseException:
+            kill_process_group(child)
+            raise
+
+
+def _run_step(submitter: str, work_order_path: Path, skill_args: List[str], skill_timeout_sec: int) -> Tuple[int, Dict[str, Any]]:
+    if submitter == SUBMITTER_SKILL:
+        return _run_skill(work_order_path, skill_args, skill_timeout_sec), {}
+    if submitter == SUBMITTER_API:
+        return api_submit_work_order(work_order_path)
+    output_path = work_order_path.parent / "artifacts" / HANDOFF_FILES[submitter]
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    build = build_bundle_for_work_order if submitter == SUBMITTER_CHROME_MCP else build_payload_for_work_order
+    build(work_order_path, output_path=output_path)
+    return 0, {"handoff_path": str(output_path.resolve())}
+
+
+def _settle_click(work_order_path: Path, submitter: str, clicked_at: datetime.datetime, result: Dict[str, Any], step: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Outcome of a run that clicked Create without a confirmed issue: recovered, or needs confirmation."""
+    recovered = recover_clicked_issue(work_order_path, clicked_at, submitter=submitter)
+    if recovered is not None:
+        issue = {"issue_number": recovered.issue_number, "issue_url": recovered.issue_url}
+        step["status"] = "submitted"
+        _record(work_order_path, "succeeded", submitter, "Create was clicked; issue found by title.", **issue)
+        return 0, {**result, "status": "submitted", "submitter": submitter, **issue}
+    error = (
+        "Create was clicked but no issue was confirmed and none with this title was found; "
+        "check the repository, then re-run with --confirmed-no-issue."
+    )
+    step.update({"status": "needs_confirmation", "error": error})
+    update_work_order_runtime(work_order_path, {"status": "needs_confirmation", "last_error": error})
+    _record(work_order_path, "needs_confirmation", submitter, error=error)
+    return 4, {**result, "status": "needs_confirmation", "submitter": submitter, "error": error}
+
+
+def _record(work_order_path: Path, status: str, submitter: str, message: str = "", error: str = "", error_category: str = "", **extra: Any) -> None:
+    append_work_order_event(
+        work_order_path,
+        stage="orchestrate",
+        status=status,
+        submitter=submitter,
+        message=message,
+        error=error,
+        error_category=error_category,
+        issue_number=str(extra.pop("issue_number", "") or ""),
+        issue_url=str(extra.pop("issue_url", "") or ""),
+        extra=extra,
+    )
+
+
+def orchestrate(
+    work_order_path: Path,
+    *,
+    order: List[str],
+    skill_args: Optional[List[str]] = None,
+    skill_timeout_sec: int = DEFAULT_SKILL_TIMEOUT_SEC,
+    dry_run: bool = False,
+    confirmed_no_issue: bool = False,
+    retry_skill: bool = False,
+) -> Tuple[int, Dict[str, Any]]:
+    skill_args = list(skill_args or [])
+    data = ensure_work_order_runtime(work_order_path)
+    result: Dict[str, Any] = {"work_order": str(work_order_path), "order": order, "steps": []}
+
+    issue = _issue_of(data)
+    if issue["issue_number"] or issue["issue_url"]:
+        if not dry_run:
+            _record(work_order_path, "skipped_existing", "", "issue_number/issue_url already exists; nothing to submit.", **issue)
+        return 0, {**result, "status": "skipped_existing", **issue}
+
+    norm = normalize_work_order_dict(data)
+    _, template_path = template_for_issue_type(norm["issue_type"], ASSETS_TEMPLATES_DIR)
+    missing = missing_required_fields(load_issue_template_cached(template_path), norm)
+    if missing:
+        error = "Missing required fields: " + ", ".join(item["id"] for item in missing)
+        if not dry_run:
+            _record(work_order_path, "invalid", "", error=error, error_category=VALIDATION, missing_required=missing)
+        return 2, {**result, "status": "invalid", "error": error, "missing_required": missing}
+
+    if (data.get("runtime") or {}).get("status") == "needs_confirmation" and not confirmed_no_issue and not dry_run:
+        clicked_at = create_clicked_at(work_order_path, latest=True)
+        if clicked_at is not None:
+            step = {"submitter": SUBMITTER_SKILL}
+            result["steps"].append(step)
+            return _settle_click(work_order_path, SUBMITTER_SKILL, clicked_at, result, step)
+
+    for submitter in order:
+        data = ensure_work_order_runtime(work_order_path)
+        reason = skip_reason(submitter, data, skill_args, retry_skill=retry_skill)
+        step: Dict[str, Any] = {"submitter": submitter}
+        result["steps"].append(step)
+        if reason:
+            step.update({"status": "skipped", "reason": reason, "category": reason.split(":", 1)[0]})
+            if not dry_run:
+                _record(work_order_path, "skipped", submitter, reason, category=step["category"], order=order)
+            continue
+        if dry_run:
+            step["status"] = "would_run"
+            continue
+
+        _record(work_order_path, "started", submitter, f"Trying {submitter} ({order.index(submitter) + 1}/{len(order)}).", order=order)
+        events_before = len(ensure_work_order_runtime(work_order_path)["events"])
+        started = time.monotonic()
+        code, outcome = _run_step(submitter, work_order_path, skill_args, skill_timeout_sec)
+        step.update({"exit_code": code, "duration_sec": round(time.monotonic() - started, 3)})
+        data = ensure_work_order_runtime(work_order_path)
+        issue = _issue_of(data)
+
+        if issue["issue_number"] or issue["issue_url"]:
+            step["status"] = "submitted"
+            _record(work_order_path, "succeeded", submitter, f"Issue recorded via {submitter}.", exit_code=code, **issue)
+            return 0, {**result, "status": "submitted", "submitter": submitter, **issue}
+        if submitter in HANDOFF_FILES and code == 0:
+            step.update({"status": "handoff", "handoff_path": outcome["handoff_path"]})
+            _record(work_order_path, "handoff", submitter, f"Hand off to the agent with {outcome['handoff_path']}.", handoff_path=outcome["handoff_path"])
+            return 3, {**result, "status": "handoff", "submitter": submitter, "handoff_path": outcome["handoff_path"]}
+        if code == 0:
+            # exited cleanly without an issue (e.g. --no-submit, or the duplicate check skipped it)
+            step["status"] = "finished_without_issue"
+            _record(work_order_path, "finished_without_issue", submitter, f"{submitter} exited 0 without recording an issue.", exit_code=code)
+            return 0, {**result, "status": "finished_without_issue", "submitter": submitter}
+
+        clicked_at = create_clicked_at(work_order_path, events_before)
+        if clicked_at is not None:
+            # failing over now could post a second issue
+            return _settle_click(work_order_path, submitter, clicked_at, result, step)
+
+        error, category = _step_error(data, events_before, submitter)
+        if not error:
+            error, category = f"{submitter} exited with code {code}", classify_text(f"{submitter} exited with code {code}")
+        step.update({"status": "failed", "error": error, "category": category})
+        _record(work_order_path, "failed", submitter, error=error, error_category=category, exit_code=code)
+        if category == VALIDATION:
+            return 2, {**result, "status": "invalid", "error": error}
+
+    if dry_run:
+        return 0, {**result, "status": "planned"}
+    return 1, {**result, "status": "failed"}
+
+
+def parse_order(text: str) -> List[str]:
+    order = [item.strip() for item in str(text or "").split(",") if item.strip()]
+    unknown = [item for item in order if item not in SUBMITTERS]
+    if unknown or not order:
+        raise argparse.ArgumentTypeError(f"--order takes a comma list of {', '.join(SUBMITTERS)}")
+    return list(dict.fromkeys(order))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Try submitters in order until one records the issue.")
+    parser.add_argument("--work-order", required=True, help="Path to work_order.json")
+    parser.add_argument("--order", type=parse_order, default=list(DEFAULT_ORDER), help=f"Default: {','.join(DEFAULT_ORDER)}")
+    parser.add_argument("--skill-args", default="", help='Extra skill arguments, e.g. "--headless --timeout-sec 60"')
+    parser.add_argument("--skill-timeout-sec", type=int, default=DEFAULT_SKILL_TIMEOUT_SEC)
+    parser.add_argument("--dry-run", action="store_true", help="Only report which steps would run or be skipped")
+    parser.add_argument(
+        "--confirmed-no-issue",
+        action="store_true",
+        help="The repo was checked after a needs_confirmation run and has no such issue; submit again",
+    )
+    parser.add_argument(
+        "--retry-skill",
+        action="store_true",
+        help="Run the skill even though its last run could not start a browser (e.g. after playwright install)",
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    work_order_path = Path(args.work_order).expanduser().resolve()
+    if not work_order_path.is_file():
+        print(json.dumps({"status": "invalid", "error": f"work_order.json not found: {work_order_path}"}, ensure_ascii=False, indent=2))
+        return 2
+    code, result = orchestrate(
+        work_order_path,
+        order=args.order,
+        skill_args=shlex.split(args.skill_args),
+        skill_timeout_sec=args.skill_timeout_sec,
+        dry_run=args.dry_run,
+        confirmed_no_issue=args.confirmed_no_issue,
+        retry_skill=args.retry_skill,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
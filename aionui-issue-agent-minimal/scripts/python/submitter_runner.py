@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""Worker processes that drain ``submission_queue.py`` in the background.
+
+Each worker claims one job at a time and runs the same entry point a user would:
+
+    skill  python skill_bootstrap.py <work_order.json> <job args>
+    api    python api_submit_issue.py --work-order <work_order.json> <job args>
+
+Output goes to ``artifacts/queue_job_<id>.log`` next to the work order; the job
+lease is renewed while the child runs.  The child gets its own process group
+(session on POSIX), so a timeout, Ctrl-C or a terminated worker kills the
+bootstrap together with the venv python and browser it started.  Around every attempt the worker:
+
+    - skips the job (state ``skipped``) when ``issue_number`` / ``issue_url`` is
+      already set, unless the job args contain ``--force``
+    - sets ``runtime.status`` to ``submitting`` and records ``queue`` events
+      (``started`` / ``succeeded`` / ``retry_scheduled`` / ``failed``)
+    - treats an issue recorded in the work order as success even when the child
+      exited non-zero (the issue exists; retrying would duplicate it)
+    - never re-runs a skill attempt that already clicked Create (``submit_attempt`` /
+      ``clicked`` event): the repo is probed for the exact title first, and when
+      nothing is found the job fails with ``runtime.status = needs_confirmation``
+      so a person checks the repo before ``submission_queue.py retry``; the same
+      check runs before an attempt whose previous worker died mid-run
+    - retries other failures with exponential backoff (``--backoff-sec``, doubling,
+      capped at 15 min) until ``max_attempts``; exit code 2 (missing fields, missing
+      token, bad work order) or a permanent ``error_classifier`` category on the
+      submitter's newest error (browser missing, sandbox blocked, auth, ...) fails
+      at once because a retry cannot fix it
+
+Usage:
+    python submitter_runner.py --workers 2
+    python submitter_runner.py --workers 1 --drain      # exit once nothing is due
+    python submitter_runner.py --queue issue_runs/submission_queue.sqlite3 --poll-sec 2
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from error_classifier import classify_text, is_permanent
+from github_issue_probe import create_clicked_at, recover_clicked_issue
+from issue_payload_support import (
+    SUBMITTER_API,
+    SUBMITTER_SKILL,
+    append_work_order_event,
+    ensure_work_order_runtime,
+    update_work_order_runtime,
+)
+from submission_queue import (
+    DEFAULT_LEASE_SEC,
+    backoff_delay,
+    claim,
+    connect_queue,
+    default_queue_path,
+    finish,
+    renew_lease,
+    schedule_retry,
+)
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PERMANENT_EXIT_CODES = {2}
+DEFAULT_BACKOFF_SEC = 30.0
+DEFAULT_JOB_TIMEOUT_SEC = 1800.0
+
+
+def submitter_command(job: Dict[str, Any], python: str = sys.executable) -> List[str]:
+    work_order = str(job["work_order_path"])
+    if job["submitter"] == SUBMITTER_SKILL:
+        return [python, str(SCRIPTS_DIR / "skill_bootstrap.py"), work_order, *job["args"]]
+    if job["submitter"] == SUBMITTER_API:
+        return [python, str(SCRIPTS_DIR / "api_submit_issue.py"), "--work-order", work_order, *job["args"]]
+    raise ValueError(f"unsupported submitter: {job['submitter']!r}")
+
+
+def _issue_of(path: Path) -> Dict[str, str]:
+    data = ensure_work_order_runtime(path)
+    return {
+        "issue_number": str(data.get("issue_number") or "").strip(),
+        "issue_url": str(data.get("issue_url") or "").strip(),
+    }
+
+
+def _attempt_error(path: Path, since: int, fallback: str) -> Tuple[str, str]:
+    """The newest classified error the submitter recorded during this attempt, else ``fallback``."""
+    for event in reversed(ensure_work_order_runtime(path)["events"][since:]):
+        if isinstance(event, dict) and event.get("error"):
+            error = str(event["error"])
+            return error, str(event.get("error_category") or classify_text(error))
+    return fallback, classify_text(fallback)
+
+
+def _unfinished_attempt_start(path: Path) -> Optional[int]:
+    """Event index after the last ``queue/started`` event when that attempt never reported an outcome."""
+    events = ensure_work_order_runtime(path)["events"]
+    for index in range(len(events) - 1, -1, -1):
+        event = events[index]
+        if isinstance(event, dict) and event.get("stage") == "queue":
+            return index + 1 if event.get("status") == "started" else None
+    return None
+
+
+def _settle_clicked(
+    conn: Any,
+    job: Dict[str, Any],
+    path: Path,
+    summary: Dict[str, Any],
+    clicked_at: datetime.datetime,
+    code: Optional[int],
+) -> Dict[str, Any]:
+    """Finish a job whose skill run clicked Create without a confirmed issue; never retried."""
+    submitter = job["submitter"]
+    recovered = recover_clicked_issue(path, clicked_at, submitter=submitter)
+    if recovered is not None:
+        issue = {"issue_number": recovered.issue_number, "issue_url": recovered.issue_url}
+        finish(conn, job, "succeeded", exit_code=code, **issue)
+        append_work_order_event(
+            path,
+            stage="queue",
+            status="succeeded",
+            submitter=submitter,
+            message=f"Job {job['id']}: Create was clicked; issue found by title.",
+            extra={"job_id": job["id"], "attempt": job["attempts"], "exit_code": code},
+            **issue,
+        )
+        return {**summary, "state": "succeeded", **issue}
+
+    error = (
+        "Create was clicked but no issue was confirmed and none with this title was found; "
+        "check the repository before retrying, a re-run could create a duplicate."
+    )
+    finish(conn, job, "failed", exit_code=code, error=error)
+    update_work_order_runtime(path, {"status": "needs_confirmation", "last_error": error})
+    append_work_order_event(
+        path,
+        stage="queue",
+        status="needs_confirmation",
+        submitter=submitter,
+        error=error,
+        extra={"job_id": job["id"], "attempt": job["attempts"], "exit_code": code},
+    )
+    return {**summary, "state": "failed", "needs_confirmation": True, "error": error}
+
+
+def start_process_group(command: List[str], **popen_kwargs: Any) -> subprocess.Popen:
+    """Popen ``command`` as the leader of a new process group so ``kill_process_group`` reaches its children."""
+    if os.name == "nt":
+        popen_kwargs["creationflags"] = popen_kwargs.get("creationflags", 0) | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        popen_kwargs["start_new_session"] = True
+    return subprocess.Popen(command, **popen_kwargs)
+
+
+def kill_process_group(child: subprocess.Popen) -> None:
+    """Kill ``child`` and every process it started, then reap ``child``."""
+    if os.name == "nt":
+        with contextlib.suppress(OSError):
+            subprocess.call(
+                ["taskkill", "/T", "/F", "/PID", str(child.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+    else:
+        with contextlib.suppress(OSError):
+            os.killpg(child.pid, signal.SIGKILL)
+    with contextlib.suppress(OSError):
+        child.kill()
+    child.wait()
+
+
+def _run_child(conn: Any, job: Dict[str, Any], worker: str, *, lease_sec: float, timeout_sec: float) -> int:
+    path = Path(job["work_order_path"])
+    log_path = path.parent / "artifacts" / f"queue_job_{job['id']}.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout_sec
+    with log_path.open("a", encoding="utf-8") as log:
+        log.write(f"# job {job['id']} attempt {job['attempts']} worker {worker}\n")
+        log.flush()
+        child = start_process_group(submitter_command(job), stdout=log, stderr=subprocess.STDOUT, cwd=str(path.parent))
+        try:
+            while True:
+                try:
+                    return child.wait(timeout=max(1.0, min(lease_sec / 3, deadline - time.monotonic())))
+                except subprocess.TimeoutExpired:
+                    if time.monotonic() >= deadline:
+                        kill_process_group(child)
+                        log.write(f"# killed after {timeout_sec:.0f}s\n")
+                        return -9
+                    renew_lease(conn, job["id"], worker, lease_sec=lease_sec)
+        except BaseException:
+            # Ctrl-C, or SIGTERM from run_pool: do not leave the browser behind
+            kill_process_group(child)
+            raise
+
+
+def run_job(
+    conn: Any,
+    job: Dict[str, Any],
+    worker: str,
+    *,
+    lease_sec: float = DEFAULT_LEASE_SEC,
+    backoff_sec: float = DEFAULT_BACKOFF_SEC,
+    timeout_sec: float = DEFAULT_JOB_TIMEOUT_SEC,
+) -> Dict[str, Any]:
+    """Run one claimed job to a final state or a scheduled retry; returns a summary."""
+    path = Path(job["work_order_path"])
+    submitter = job["submitter"]
+    summary: Dict[str, Any] = {"job_id": job["id"], "work_id": job["work_id"], "submitter": submitter, "attempt": job["attempts"]}
+    if not path.is_file():
+        error = f"work_order.json not found: {path}"
+        finish(conn, job, "failed", error=error)
+        return {**summary, "state": "failed", "error": error}
+
+    issue = _issue_of(path)
+    if (issue["issue_number"] or issue["issue_url"]) and "--force" not in job["args"]:
+        finish(conn, job, "skipped", **issue)
+        update_work_order_runtime(path, {"status": "skipped_duplicate", "last_submitter": submitter})
+        append_work_order_event(
+            path,
+            stage="queue",
+            status="skipped_existing",
+            submitter=submitter,
+            message="Skip because issue_number/issue_url already exists in work_order.json.",
+            extra={"job_id": job["id"]},
+            **issue,
+        )
+        return {**summary, "state": "skipped", **issue}
+
+    unfinished = _unfinished_attempt_start(path)
+    clicked_at = create_clicked_at(path, unfinished) if unfinished is not None else None
+    if clicked_at is not None:
+        # the previous worker died after Create; settle it instead of clicking again
+        return _settle_clicked(conn, job, path, summary, clicked_at, None)
+
+    update_work_order_runtime(path, {"status": "submitting", "last_submitter": submitter})
+    append_work_order_event(
+        path,
+        stage="queue",
+        status="started",
+        submitter=submitter,
+        message=f"Worker {worker} started attempt {job['attempts']}/{job['max_attempts']}.",
+        extra={"job_id": job["id"], "attempt": job["attempts"], "worker": worker},
+    )
+    events_before = len(ensure_work_order_runtime(path)["events"])
+    started = time.monotonic()
+    code = _run_child(conn, job, worker, lease_sec=lease_sec, timeout_sec=timeout_sec)
+    summary.update({"exit_code": code, "duration_sec": round(time.monotonic() - started, 3)})
+
+    issue = _issue_of(path)
+    if code == 0 or issue["issue_number"] or issue["issue_url"]:
+        finish(conn, job, "succeeded", exit_code=code, **issue)
+        append_work_order_event(
+            path,
+            stage="queue",
+            status="succeeded",
+            submitter=submitter,
+            message=f"Job {job['id']} finished.",
+            extra={"job_id": job["id"], "attempt": job["attempts"], "exit_code": code},
+            **issue,
+        )
+        return {**summary, "state": "succeeded", **issue}
+
+    clicked_at = create_clicked_at(path, events_before)
+    if clicked_at is not None:
+        return _settle_clicked(conn, job, path, summary, clicked_at, code)
+
+    error, category = _attempt_error(path, events_before, f"{submitter} exited with code {code}")
+    summary["error_category"] = category
+    if code not in PERMANENT_EXIT_CODES and not is_permanent(category) and job["attempts"] < job["max_attempts"]:
+        delay = backoff_delay(job["attempts"], backoff_sec)
+        not_before = schedule_retry(conn, job, delay_sec=delay, exit_code=code, error=error)
+        update_work_order_runtime(path, {"status": "retry_scheduled", "last_error": error})
+        append_work_order_event(
+            path,
+            stage="queue",
+            status="retry_scheduled",
+            submitter=submitter,
+            error=error,
+            error_category=category,
+            extra={"job_id": job["id"], "attempt": job["attempts"], "exit_code": code, "retry_in_sec": delay},
+        )
+        return {**summary, "state": "queued", "retry_at": not_before, "error": error}
+
+    finish(conn, job, "failed", exit_code=code, error=error)
+    update_work_order_runtime(path, {"status": "failed", "last_error": error})
+    append_work_order_event(
+        path,
+        stage="queue",
+        status="failed",
+        submitter=submitter,
+        error=error,
+        error_category=category,
+        extra={"job_id": job["id"], "attempt": job["attempts"], "exit_code": code},
+    )
+    return {**summary, "state": "failed", "error": error}
+
+
+def worker_loop(
+    queue_path: str,
+    worker: str,
+    *,
+    drain: bool = False,
+    poll_sec: float = 5.0,
+    max_jobs: int = 0,
+    lease_sec: float = DEFAULT_LEASE_SEC,
+    backoff_sec: float = DEFAULT_BACKOFF_SEC,
+    timeout_sec: float = DEFAULT_JOB_TIMEOUT_SEC,
+) -> int:
+    """Claim and run jobs until stopped; with ``drain``, return when nothing is due."""
+    conn = connect_queue(Path(queue_path))
+    done = 0
+    while not max_jobs or done < max_jobs:
+        job = claim(conn, worker, lease_sec=lease_sec)
+        if job is None:
+            if drain:
+                break
+            time.sleep(poll_sec)
+            continue
+        summary = run_job(conn, job, worker, lease_sec=lease_sec, backoff_sec=backoff_sec, timeout_sec=timeout_sec)
+        print(json.dumps({"worker": worker, **summary}, ensure_ascii=False), flush=True)
+        done += 1
+    conn.close()
+    return done
+
+
+def _exit_on_sigterm(signum: int, _frame: Any) -> None:
+    raise SystemExit(128 + signum)
+
+
+def _worker_entry(queue_path: str, worker: str, options: Dict[str, Any]) -> None:
+    # run_pool stops workers with terminate(); unwind so _run_child kills its process group
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    worker_loop(queue_path, worker, **options)
+
+
+def run_pool(queue_path: Path, workers: int, **options: Any) -> None:
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_entry, args=(str(queue_path), f"{os.getpid()}-{index + 1}", options), daemon=False)
+        for index in range(max(1, workers))
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # running jobs keep their lease until it expires, then another worker re-claims them;
+        # each worker kills its child's process group on the way out
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run background submitter workers over the submission queue.")
+    parser.add_argument("--queue", help="Queue file (default: $AIONUI_SUBMISSION_QUEUE or issue_runs/submission_queue.sqlite3)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--drain", action="store_true", help="Exit when no job is due instead of polling")
+    parser.add_argument("--poll-sec", type=float, default=5.0)
+    parser.add_argument("--backoff-sec", type=float, default=DEFAULT_BACKOFF_SEC, help="First retry delay; doubles per attempt")
+    parser.add_argument("--lease-sec", type=float, default=DEFAULT_LEASE_SEC, help="A job whose worker stops renewing for this long is re-claimed")
+    parser.add_argument("--job-timeout-sec", type=float, default=DEFAULT_JOB_TIMEOUT_SEC)
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    queue_path = Path(args.queue).expanduser().resolve() if args.queue else default_queue_path()
+    options = {
+        "drain": args.drain,
+        "poll_sec": args.poll_sec,
+        "lease_sec": args.lease_sec,
+        "backoff_sec": args.backoff_sec,
+        "timeout_sec": args.job_timeout_sec,
+    }
+    if args.workers <= 1:
+        worker_loop(str(queue_path), f"{os.getpid()}-1", **options)
+    else:
+        run_pool(queue_path, args.workers, **options)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""SQLite index over issue_runs/<session_id>/<work_id>/work_order.json.
+
+The write helpers in ``issue_payload_support`` upsert one row per work order
+every time they persist it, so questions like "which work orders in this
+session are still unsubmitted" or "has this title already been filed" are a
+single indexed query instead of opening every JSON file.
+
+Index location:
+    - ``$AIONUI_WORK_ORDER_INDEX`` if set (``off`` disables indexing)
+    - otherwise ``<nearest issue_runs ancestor>/work_order_index.sqlite3``
+    - work orders outside an ``issue_runs`` tree are not indexed
+
+Usage:
+    python work_order_index.py --root issue_runs rebuild
+    python work_order_index.py --root issue_runs unsubmitted --session chat-20260306-01
+    python work_order_index.py --root issue_runs find-title "【Bug】发送按钮点击后卡死"
+    python work_order_index.py --root issue_runs get wo-20260306T111530-a1b2c3
+    python work_order_index.py --root issue_runs stats
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+INDEX_FILENAME = "work_order_index.sqlite3"
+INDEX_ENV = "AIONUI_WORK_ORDER_INDEX"
+ISSUE_RUNS_DIRNAME = "issue_runs"
+_DISABLED_VALUES = {"0", "off", "false", "no", "none"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_orders (
+    work_order_path TEXT PRIMARY KEY,
+    work_id TEXT NOT NULL,
+    session_id TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    title_hash TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    last_submitter TEXT NOT NULL DEFAULT '',
+    issue_number TEXT NOT NULL DEFAULT '',
+    issue_url TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_work_orders_work_id ON work_orders(work_id);
+CREATE INDEX IF NOT EXISTS idx_work_orders_session_status ON work_orders(session_id, status);
+CREATE INDEX IF NOT EXISTS idx_work_orders_title_hash ON work_orders(title_hash);
+"""
+
+_COLUMNS = (
+    "work_order_path",
+    "work_id",
+    "session_id",
+    "title",
+    "title_hash",
+    "status",
+    "last_submitter",
+    "issue_number",
+    "issue_url",
+    "updated_at",
+)
+
+_connections: Dict[str, sqlite3.Connection] = {}
+_connections_lock = threading.Lock()
+
+
+def normalize_issue_title(title: str) -> str:
+    return re.sub(r"\s+", " ", str(title or "")).strip().casefold()
+
+
+def issue_title_hash(title: str) -> str:
+    normalized = normalize_issue_title(title)
+    if not normalized:
+        return ""
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def default_index_path(work_order_path: Path) -> Optional[Path]:
+    override = os.environ.get(INDEX_ENV)
+    if override is not None:
+        if override.strip().lower() in _DISABLED_VALUES or not override.strip():
+            return None
+        return Path(override).expanduser()
+    for parent in work_order_path.resolve().parents:
+        if parent.name == ISSUE_RUNS_DIRNAME:
+            return parent / INDEX_FILENAME
+    return None
+
+
+def connect_index(index_path: Path) -> sqlite3.Connection:
+    """Return a process-wide cached connection so per-write upserts stay cheap."""
+    key = str(index_path.resolve())
+    with _connections_lock:
+        conn = _connections.get(key)
+        if conn is None:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            with contextlib.suppress(sqlite3.DatabaseError):
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _connections[key] = conn
+        return conn
+
+
+def close_index_connections() -> None:
+    with _connections_lock:
+        for conn in _connections.values():
+            with contextlib.suppress(Exception):
+                conn.close()
+        _connections.clear()
+
+
+def _row_for(work_order_path: Path, data: Dict[str, Any]) -> Dict[str, str]:
+    runtime = data.get("runtime") if isinstance(data.get("runtime"), dict) else {}
+    title = str(data.get("title") or "").strip()
+    return {
+        "work_order_path": str(work_order_path.resolve()),
+        "work_id": str(data.get("work_id") or ""),
+        "session_id": str(data.get("session_id") or ""),
+        "title": title,
+        "title_hash": issue_title_hash(title),
+        "status": str(runtime.get("status") or ""),
+        "last_submitter": str(runtime.get("last_submitter") or ""),
+        "issue_number": str(data.get("issue_number") or "").strip(),
+        "issue_url": str(data.get("issue_url") or "").strip(),
+        "updated_at": str(runtime.get("updated_at") or ""),
+    }
+
+
+def upsert_work_order(conn: sqlite3.Connection, work_order_path: Path, data: Dict[str, Any]) -> None:
+    row = _row_for(work_order_path, data)
+    placeholders = ", ".join(f":{column}" for column in _COLUMNS)
+    assignments = ", ".join(f"{column}=excluded.{column}" for column in _COLUMNS[1:])
+    with conn:
+        conn.execute(
+            f"INSERT INTO work_orders ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(work_order_path) DO UPDATE SET {assignments}",
+            row,
+        )
+
+
+def index_work_order(work_order_path: Path, data: Dict[str, Any], index_path: Optional[Path] = None) -> bool:
+    """Best-effort upsert used by the work order write helpers; never raises."""
+    try:
+        target = index_path or default_index_path(work_order_path)
+        if target is None:
+            return False
+        upsert_work_order(connect_index(target), work_order_path, data)
+        return True
+    except (sqlite3.Error, OSError):
+        return False
+
+
+def rebuild_index(root: Path, index_path: Optional[Path] = None) -> int:
+    target = index_path or (root / INDEX_FILENAME)
+    conn = connect_index(target)
+    count = 0
+    with conn:
+        conn.execute("DELETE FROM work_orders")
+    for work_order_path in sorted(root.glob("*/*/work_order.json")):
+        try:
+            data = json.loads(work_order_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict):
+            upsert_work_order(conn, work_order_path, data)
+            count += 1
+    return count
+
+
+def _rows(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def query_unsubmitted(conn: sqlite3.Connection, session_id: str = "") -> List[Dict[str, Any]]:
+    sql = "SELECT * FROM work_orders WHERE issue_number = '' AND issue_url = ''"
+    params: List[str] = []
+    if session_id:
+        sql += " AND session_id = ?"
+        params.append(session_id)
+    return _rows(conn.execute(sql + " ORDER BY updated_at DESC", params))
+
+
+def find_by_title(conn: sqlite3.Connection, title: str, *, submitted_only: bool = False) -> List[Dict[str, Any]]:
+    digest = issue_title_hash(title)
+    if not digest:
+        return []
+    sql = "SELECT * FROM work_orders WHERE title_hash = ?"
+    if submitted_only:
+        sql += " AND (issue_number != '' OR issue_url != '')"
+    return _rows(conn.execute(sql + " ORDER BY updated_at DESC", (digest,)))
+
+
+def get_work_order(conn: sqlite3.Connection, work_id: str) -> List[Dict[str, Any]]:
+    return _rows(conn.execute("SELECT * FROM work_orders WHERE work_id = ?", (work_id,)))
+
+
+def status_counts(conn: sqlite3.Connection, session_id: str = "") -> Dict[str, int]:
+    sql = "SELECT status, COUNT(*) AS n FROM work_orders"
+    params: List[str] = []
+    if session_id:
+        sql += " WHERE session_id = ?"
+        params.append(session_id)
+    return {row["status"] or "": row["n"] for row in conn.execute(sql + " GROUP BY status", params)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query the SQLite index of issue_runs work orders.")
+    parser.add_argument("--root", default=ISSUE_RUNS_DIRNAME, help="issue_runs directory (default: ./issue_runs)")
+    parser.add_argument("--index", help=f"Index file (default: $AIONUI_WORK_ORDER_INDEX or <root>/{INDEX_FILENAME})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Re-scan <root>/*/*/work_order.json into the index")
+    unsubmitted = sub.add_parser("unsubmitted", help="List work orders without issue_number/issue_url")
+    unsubmitted.add_argument("--session", default="", help="Restrict to one session_id")
+    find_title = sub.add_parser("find-title", help="Find work orders with the same normalized title")
+    find_title.add_argument("title")
+    find_title.add_argument("--submitted-only", action="store_true", help="Only rows that already have an issue")
+    get = sub.add_parser("get", help="Look up a work order by work_id")
+    get.add_argument("work_id")
+    stats = sub.add_parser("stats", help="Count work orders by runtime.status")
+    stats.add_argument("--session", default="", help="Restrict to one session_id")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    root = Path(args.root).expanduser().resolve()
+    override = os.environ.get(INDEX_ENV, "").strip()
+    if args.index:
+        index_path = Path(args.index).expanduser().resolve()
+    elif override and override.lower() not in _DISABLED_VALUES:
+        index_path = Path(override).expanduser().resolve()
+    else:
+        index_path = root / INDEX_FILENAME
+
+    if args.command == "rebuild":
+        result: Any = {"indexed": rebuild_index(root, index_path), "index": str(index_path)}
+    else:
+        conn = connect_index(index_path)
+        if args.command == "unsubmitted":
+            result = query_unsubmitted(conn, args.session)
+        elif args.command == "find-title":
+            result = find_by_title(conn, args.title, submitted_only=args.submitted_only)
+        elif args.command == "get":
+            result = get_work_order(conn, args.work_id)
+        else:
+            result = status_counts(conn, args.session)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
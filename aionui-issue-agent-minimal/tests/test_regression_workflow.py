@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import contextlib
 import datetime
 import importlib
 import importlib.util
+import gzip
+import hashlib
+import io
 import json
+import os
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from itertools import product
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
 
@@ -23,6 +34,34 @@ github_payload_mod = importlib.import_module("github_mcp_build_payload")
 chrome_bundle_mod = importlib.import_module("chrome_mcp_build_bundle")
 upload_mod = importlib.import_module("github_mcp_upload_attachments")
 support_mod = importlib.import_module("issue_payload_support")
+api_submit_mod = importlib.import_module("api_submit_issue")
+latency_mod = importlib.import_module("submit_latency_stats")
+service_mod = importlib.import_module("payload_service")
+index_mod = importlib.import_module("work_order_index")
+corpus_mod = importlib.import_module("issue_corpus_cache")
+http_mod = importlib.import_module("github_http")
+attachment_cache_mod = importlib.import_module("attachment_cache")
+debug_capture_mod = importlib.import_module("debug_capture")
+retention_mod = importlib.import_module("artifacts_retention")
+run_logging_mod = importlib.import_module("run_logging")
+stage_timings_mod = importlib.import_module("stage_timings")
+metrics_mod = importlib.import_module("metrics_exporter")
+
+BENCHMARKS_DIR = ROOT / "benchmarks"
+if str(BENCHMARKS_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+bench_common_mod = importlib.import_module("_bench_common")
+bench_persistence_mod = importlib.import_module("bench_persistence")
+fake_form_mod = importlib.import_module("fake_issue_form_server")
+bench_git_mod = importlib.import_module("bench_git_upload")
+stress_mod = importlib.import_module("stress_shared_workspace")
+profiling_mod = importlib.import_module("profiling")
+import_mod = importlib.import_module("import_work_orders")
+batch_validate_mod = importlib.import_module("batch_validate_work_orders")
+queue_mod = importlib.import_module("submission_queue")
+classifier_mod = importlib.import_module("error_classifier")
+runner_mod = importlib.import_module("submitter_runner")
+orchestrator_mod = importlib.import_module("submit_orchestrator")
 
 
 class FakeControl:
@@ -93,6 +132,7 @@ class FakePage:
         og_url_after_submit: str = "",
         body_issue_hint: str = "",
         keep_form_after_submit: bool = False,
+        create_click_error: str = "",
     ):
         self._url = "https://github.com/iOfficeAI/AionUi/issues/new?template=bug_report.yml"
         self.final_issue_url = final_issue_url
@@ -103,6 +143,8 @@ class FakePage:
         self.og_url_after_submit = og_url_after_submit
         self.body_issue_hint = body_issue_hint
         self.keep_form_after_submit = keep_form_after_submit
+        self.create_click_error = create_click_error
+        self.create_clicks = 0
         self.submitted = False
         self.url_reads_since_submit = 0
         self.title_control = FakeControl("title")
@@ -125,6 +167,9 @@ class FakePage:
         return None
 
     def handle_submit_click(self):
+        self.create_clicks += 1
+        if self.create_click_error:
+            raise submit_mod.PlaywrightError(self.create_click_error)
         self.submitted = True
         self.url_reads_since_submit = 0
         if self.final_issue_url and self.redirect_after_url_reads == 0:
@@ -205,10 +250,266 @@ class FakePlaywrightCM:
         return False
 
 
+class FakeUploadRequest:
+    def __init__(self, method: str, url: str, post_data: str = "", body: bytes = b""):
+        self.method = method
+        self.url = url
+        self.post_data = post_data
+        self.post_data_buffer = body
+        self.failure = None
+
+
+class FakeUploadResponse:
+    def __init__(self, request: FakeUploadRequest, status: int, payload: dict | None = None):
+        self.request = request
+        self.url = request.url
+        self.status = status
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+class FakeUploadPage:
+    """Replays GitHub's policy -> S3 -> finalize upload traffic as page events."""
+
+    S3_URL = "https://github-production-user-asset-6210df.s3.amazonaws.com/"
+
+    def __init__(self, control: FakeControl, fail_policy_once: set[str] | None = None):
+        self.control = control
+        self.fail_policy_once = set(fail_policy_once or ())
+        self.handlers: dict[str, list] = {}
+        self.queue: list[tuple] = []
+        self.handed_files: list[list[str]] = []
+        self.next_asset_id = 100
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers.get(event, []).remove(handler)
+
+    def hand_files(self, paths):
+        names = [Path(path).name for path in paths]
+        self.handed_files.append(names)
+        for name in names:
+            self.next_asset_id += 1
+            asset_id = self.next_asset_id
+            policy = FakeUploadRequest(
+                "POST",
+                "https://github.com/upload/policies/assets",
+                post_data=f'--b\r\nContent-Disposition: form-data; name="name"\r\n\r\n{name}\r\n--b--',
+            )
+            self.queue.append(("request", policy, None))
+            if name in self.fail_policy_once:
+                self.fail_policy_once.discard(name)
+                self.queue.append(("response", FakeUploadResponse(policy, 500), None))
+                continue
+            href = f"https://github.com/user-attachments/assets/{asset_id}"
+            self.queue.append(
+                (
+                    "response",
+                    FakeUploadResponse(
+                        policy,
+                        201,
+                        {
+                            "upload_url": self.S3_URL,
+                            "asset_upload_url": f"/upload/assets/{asset_id}",
+                            "form": {"key": f"key-{asset_id}"},
+                            "asset": {"href": href, "name": name},
+                        },
+                    ),
+                    None,
+                )
+            )
+            storage = FakeUploadRequest("POST", self.S3_URL, body=f"key-{asset_id}".encode("utf-8") + b"\x89PNG")
+            self.queue.append(("request", storage, None))
+            self.queue.append(("response", FakeUploadResponse(storage, 204), None))
+            finalize = FakeUploadRequest("PUT", f"https://github.com/upload/assets/{asset_id}")
+            self.queue.append(("request", finalize, None))
+            markdown = f"![{name}]({href})"
+            self.queue.append(
+                (
+                    "response",
+                    FakeUploadResponse(finalize, 200),
+                    lambda line=markdown: setattr(self.control, "value", (self.control.value + "\n" + line).strip()),
+                )
+            )
+
+    def wait_for_event(self, event, predicate=None, timeout=None):
+        while self.queue:
+            name, payload, effect = self.queue.pop(0)
+            for handler in list(self.handlers.get(name, [])):
+                handler(payload)
+            if effect:
+                effect()
+            if name == event and (predicate is None or predicate(payload)):
+                return payload
+        raise submit_mod.PlaywrightTimeoutError("no more upload events")
+
+
+class FakeFileInput:
+    def __init__(self, page: FakeUploadPage):
+        self.page = page
+
+    def set_input_files(self, paths):
+        self.page.hand_files(paths)
+
+
+class FakeGitHubAPI:
+    """Local HTTP stand-in for the subset of the GitHub REST API the scripts call."""
+
+    def __init__(self, issues: list[dict] | None = None):
+        self.issues = list(issues or [])
+        self.requests: list[dict] = []
+        self.rate_limit_reset: int | None = None
+        self.fail_statuses: list[int] = []
+        self.create_then_fail_status: int | None = None
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args):
+                return None
+
+            def do_GET(self):
+                parsed = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                api.requests.append(
+                    {
+                        "method": "GET",
+                        "path": parsed.path,
+                        "query": query,
+                        "headers": dict(self.headers),
+                        "client_port": self.client_address[1],
+                    }
+                )
+                if api.fail_statuses:
+                    return self._send(api.fail_statuses.pop(0), {"message": "Service Unavailable"})
+                if not parsed.path.endswith("/issues"):
+                    return self._send(404, {"message": "Not Found"})
+                if api.rate_limit_reset is not None:
+                    limit_headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(api.rate_limit_reset)}
+                    return self._send(403, {"message": "API rate limit exceeded"}, limit_headers)
+                since = query.get("since", "")
+                items = [item for item in api.issues if not since or item["updated_at"] >= since]
+                reverse = query.get("direction", "desc") == "desc"
+                items.sort(key=lambda item: item.get(query.get("sort", "created") + "_at", ""), reverse=reverse)
+                per_page = int(query.get("per_page", "30"))
+                page = int(query.get("page", "1"))
+                chunk = items[(page - 1) * per_page: page * per_page]
+                body = json.dumps(chunk).encode("utf-8")
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                headers = {"ETag": etag}
+                if page * per_page < len(items):
+                    query["page"] = str(page + 1)
+                    host = self.headers.get("Host")
+                    headers["Link"] = f'<http://{host}{parsed.path}?{urllib.parse.urlencode(query)}>; rel="next"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, None, headers)
+                return self._send(200, chunk, headers)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parsed = urllib.parse.urlsplit(self.path)
+                api.requests.append(
+                    {
+                        "method": "POST",
+                        "path": parsed.path,
+                        "body": body,
+                        "headers": dict(self.headers),
+                        "client_port": self.client_address[1],
+                    }
+                )
+                if api.fail_statuses:
+                    return self._send(api.fail_statuses.pop(0), {"message": "Service Unavailable"})
+                if not parsed.path.endswith("/issues"):
+                    return self._send(404, {"message": "Not Found"})
+                request = json.loads(body.decode("utf-8"))
+                number = max([item["number"] for item in api.issues] or [1000]) + 1
+                created_at = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                issue = make_api_issue(number, request["title"], updated_at=created_at, body=request.get("body", ""))
+                issue["labels"] = [{"name": name} for name in request.get("labels", [])]
+                api.issues.append(issue)
+                if api.create_then_fail_status is not None:
+                    status, api.create_then_fail_status = api.create_then_fail_status, None
+                    return self._send(status, {"message": "Bad Gateway"})
+                return self._send(201, issue, {"X-GitHub-Request-Id": f"REQ-{number}"})
+
+            def _send(self, status, payload, headers=None):
+                body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if payload is not None:
+                    self.send_header("Content-Type", "application/json")
+                if body and "gzip" in str(self.headers.get("Accept-Encoding") or ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+
+def make_api_issue(number: int, title: str, *, updated_at: str, state: str = "open", body: str = "") -> dict:
+    return {
+        "number": number,
+        "title": title,
+        "state": state,
+        "body": body,
+        "html_url": f"https://github.com/iOfficeAI/AionUi/issues/{number}",
+        "created_at": updated_at,
+        "updated_at": updated_at,
+    }
+
+
 def load_json(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+# stands in for skill_bootstrap: starts a long-lived grandchild, writes its pid to argv[1], then hangs
+GRANDCHILD_SPAWNER = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "open(sys.argv[1], 'w').write(str(child.pid))\n"
+    "time.sleep(60)\n"
+)
+
+
+def wait_for_exit(pid: int, timeout_sec: float = 5.0) -> bool:
+    """True once ``pid`` is gone (or a zombie nobody reaps yet)."""
+    deadline = time.monotonic() + timeout_sec
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        with contextlib.suppress(OSError):
+            if Path(f"/proc/{pid}/stat").read_text().split()[2] == "Z":
+                return True
+        time.sleep(0.05)
+    return False
+
+
 class WorkflowRegressionTests(unittest.TestCase):
     maxDiff = None
 
@@ -216,8 +517,12 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.tmp = tempfile.TemporaryDirectory()
         self.root = Path(self.tmp.name)
         self.session_id = "chat-20260306-01"
+        env_patch = mock.patch.dict(os.environ, {"AIONUI_CACHE_DIR": str(self.root / "user_cache")})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
 
     def tearDown(self):
+        index_mod.close_index_connections()
         self.tmp.cleanup()
 
     @staticmethod
@@ -348,6 +653,7 @@ class WorkflowRegressionTests(unittest.TestCase):
         final_issue_url: str | None = None,
         upload_markdown: str | None = None,
         should_timeout: bool = False,
+        should_fail: bool = False,
         recent_issue_result=None,
         page_kwargs: dict | None = None,
     ):
@@ -355,6 +661,7 @@ class WorkflowRegressionTests(unittest.TestCase):
         issue_type = work_data["issue_type"]
         controls = self.build_controls(issue_type)
         page = FakePage(final_issue_url=final_issue_url, **(page_kwargs or {}))
+        self.page = page
 
         def fake_find_control_by_label(_page, label):
             return None, controls[label]
@@ -363,7 +670,10 @@ class WorkflowRegressionTests(unittest.TestCase):
             control.value = option_text
             return True
 
-        def fake_upload_attachments(_page, control, attachment_paths, timeout_sec):
+        self.upload_calls = []
+
+        def fake_upload_attachments(_page, control, attachment_paths, timeout_sec, **_kwargs):
+            self.upload_calls.append([str(path) for path in attachment_paths])
             markdown = upload_markdown or "![screen](https://github.com/user-attachments/assets/mock)"
             control.value = (control.value + "\n" + markdown).strip()
             return control.value, markdown
@@ -383,7 +693,7 @@ class WorkflowRegressionTests(unittest.TestCase):
             mock.patch.object(submit_mod.time, "sleep", return_value=None), \
             wait_patch, \
             mock.patch.object(sys, "argv", ["skill_submit_aionui_issue.py", "--work-order", str(work_order), *args]):
-            if should_timeout:
+            if should_timeout or should_fail:
                 with self.assertRaises(SystemExit):
                     submit_mod.main()
             else:
@@ -414,6 +724,141 @@ class WorkflowRegressionTests(unittest.TestCase):
             self.assertEqual(rc, 0)
         return load_json(output)
 
+    def test_profile_flag_writes_pstats_and_collapsed_stacks_and_records_them_on_the_event(self):
+        import pstats
+
+        work_order = self.make_work_order("bug", "wo-profile-001")
+        argv = ["github_mcp_build_payload.py", "--work-order", str(work_order), "--profile-flamegraph"]
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(sys, "argv", argv), mock.patch.object(profiling_mod, "SAMPLE_INTERVAL_SEC", 0.001), \
+                mock.patch.object(sys, "stdout", stdout), mock.patch.object(sys, "stderr", stderr):
+            rc = profiling_mod.run_profiled(github_payload_mod.main, "github_mcp_build_payload", submitter="github_mcp")
+        self.assertEqual(rc, 0)
+        self.assertIn("title", json.loads(stdout.getvalue()))
+        self.assertIn("Profile written", stderr.getvalue())
+
+        event = load_json(work_order)["events"][-1]
+        self.assertEqual((event["stage"], event["submitter"]), ("payload_build", "github_mcp"))
+        profile = event["extra"]["profile"]
+        self.assertEqual(Path(profile["pstats"]).parent, (work_order.parent / "artifacts").resolve())
+        self.assertTrue(Path(profile["collapsed"]).is_file())
+        self.assertTrue(profile["top"] and all("cumulative_sec" in row for row in profile["top"]))
+        self.assertGreater(pstats.Stats(profile["pstats"]).total_calls, 0)
+
+        with mock.patch.dict(os.environ, {"AIONUI_PROFILE": ""}):
+            self.assertEqual(profiling_mod.profile_mode(["--work-order", "x"]), "")
+            self.assertEqual(profiling_mod.profile_mode(["--profile"]), "cprofile")
+        with mock.patch.dict(os.environ, {"AIONUI_PROFILE": "flame"}):
+            self.assertEqual(profiling_mod.profile_mode([]), "flame")
+
+    def test_import_work_orders_streams_csv_and_jsonl_and_reports_invalid_rows(self):
+        csv_path = self.root / "bugs.csv"
+        csv_path.write_text(
+            "title,Bug Description,AionUi Version,steps,expected,attachments,work_id\n"
+            '"[Bug] Freeze after Send",点击发送后卡死,1.2.2,"1. 打开\n2. 发送",应出现 loading,a.png;b.png,wo-import-a\n'
+            '"[Bug] Missing fields",,1.2.2,,,,wo-import-b\n',
+            encoding="utf-8",
+        )
+        issue_runs = self.root / "issue_runs"
+        report = io.StringIO()
+        summary = import_mod.import_rows(csv_path, session_id="import-01", root=issue_runs, fmt="csv", report=report)
+        self.assertEqual((summary["rows"], summary["created"], summary["failed"]), (2, 1, 1))
+
+        created = load_json(issue_runs / "import-01" / "wo-import-a" / "work_order.json")
+        self.assertEqual(created["bug_description"], "点击发送后卡死")
+        self.assertEqual(created["version"], "1.2.2")
+        self.assertEqual(created["attachments"], ["a.png", "b.png"])
+        self.assertEqual((created["session_id"], created["issue_type"]), ("import-01", "bug"))
+        self.assertEqual(created["events"][-1]["stage"], "import")
+        self.assertEqual(created["import_source"]["row"], 1)
+        failure = json.loads(report.getvalue().splitlines()[0])
+        self.assertEqual(failure["row"], 2)
+        self.assertIn("bug_description", [item["id"] for item in failure["missing_required"]])
+        self.assertFalse((issue_runs / "import-01" / "wo-import-b").exists())
+
+        again = import_mod.import_rows(csv_path, session_id="import-01", root=issue_runs, fmt="csv")
+        self.assertEqual((again["created"], again["skipped_existing"]), (0, 1))
+
+        # --overwrite refreshes the fields but keeps the submission history.
+        created_path = issue_runs / "import-01" / "wo-import-a" / "work_order.json"
+        created.update({"issue_number": 42, "issue_url": "https://github.com/o/r/issues/42", "runtime": {"status": "submitted"}})
+        created_path.write_text(json.dumps(created, ensure_ascii=False), encoding="utf-8")
+        csv_path.write_text(csv_path.read_text(encoding="utf-8").replace("点击发送后卡死", "点击发送后无响应"), encoding="utf-8")
+        import_mod.import_rows(csv_path, session_id="import-01", root=issue_runs, fmt="csv", overwrite=True)
+        overwritten = load_json(created_path)
+        self.assertEqual(overwritten["bug_description"], "点击发送后无响应")
+        self.assertEqual((overwritten["issue_number"], overwritten["runtime"]["status"]), (42, "submitted"))
+        self.assertEqual(overwritten["issue_url"], "https://github.com/o/r/issues/42")
+        self.assertEqual([event["stage"] for event in overwritten["events"]], ["import", "import"])
+
+        jsonl_path = self.root / "features.jsonl"
+        jsonl_path.write_text(
+            json.dumps(
+                {
+                    "issue_type": "feature",
+                    "title": "[Feature] Loading while sending",
+                    "feature_description": "发送时增加 loading。",
+                    "problem": "没有反馈。",
+                    "solution": "禁用按钮。",
+                    "category": "UI/UX Improvement",
+                },
+                ensure_ascii=False,
+            )
+            + "\n{not json\n\n[1, 2]\n",
+            encoding="utf-8",
+        )
+        report = io.StringIO()
+        summary = import_mod.import_rows(jsonl_path, session_id="import-02", root=issue_runs, fmt="jsonl", report=report, dry_run=True)
+        self.assertEqual((summary["rows"], summary["created"], summary["failed"]), (3, 1, 2))
+        self.assertEqual([json.loads(line)["row"] for line in report.getvalue().splitlines()], [2, 4])
+        self.assertFalse((issue_runs / "import-02").exists())
+
+    def test_batch_validate_matches_single_work_order_checks_and_consolidates_report(self):
+        good = self.make_work_order("bug", "wo-batch-good", with_attachment=True)
+        feature = self.make_work_order("feature", "wo-batch-feature")
+        broken = self.make_work_order("bug", "wo-batch-broken")
+        data = load_json(broken)
+        data.update({"version": "", "expected_behavior": "", "platform": "Amiga", "attachments": ["gone.png"]})
+        broken.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        feature_data = load_json(feature)
+        feature_data["feature_category"] = "Not a category"
+        feature.write_text(json.dumps(feature_data, ensure_ascii=False), encoding="utf-8")
+        no_category = self.make_work_order("feature", "wo-batch-no-category")
+        no_category_data = load_json(no_category)
+        no_category_data["feature_category"] = ""
+        no_category.write_text(json.dumps(no_category_data, ensure_ascii=False), encoding="utf-8")
+        submitted = self.make_work_order("bug", "wo-batch-submitted")
+        submitted_data = load_json(submitted)
+        submitted_data.update({"issue_number": "7", "title": ""})
+        submitted.write_text(json.dumps(submitted_data, ensure_ascii=False), encoding="utf-8")
+        corrupt = self.root / "issue_runs" / self.session_id / "wo-batch-corrupt" / "work_order.json"
+        corrupt.parent.mkdir(parents=True)
+        corrupt.write_text("{", encoding="utf-8")
+
+        records, unreadable = batch_validate_mod.load_records([good, feature, broken, no_category])
+        for (path, raw), result in zip(records, batch_validate_mod.validate_work_orders(records)):
+            with self.subTest(work_id=path.parent.name):
+                # same defaults + required check as the submitters' preflight
+                self.assertEqual(result["missing_required"], import_mod.validate_row(raw)[1])
+        self.assertEqual(import_mod.validate_row(no_category_data)[1], [])
+
+        report = batch_validate_mod.validate_paths([self.root / "issue_runs"], skip_submitted=True)
+        self.assertFalse(report["ok"])
+        self.assertEqual((report["checked"], report["valid"], report["invalid"], report["warnings"]), (5, 3, 2, 1))
+        self.assertEqual(report["missing_required_by_field"], {"version": 1, "expected_behavior": 1})
+        self.assertEqual(report["missing_attachments"], 1)
+        by_id = {item["work_id"]: item for item in report["work_orders"]}
+        self.assertEqual(set(by_id), {"wo-batch-broken", "wo-batch-feature", "wo-batch-corrupt"})
+        self.assertTrue(by_id["wo-batch-broken"]["missing_attachments"][0].endswith("gone.png"))
+        self.assertEqual(by_id["wo-batch-broken"]["invalid_options"][0]["id"], "platform")
+        self.assertTrue(by_id["wo-batch-feature"]["ok"])
+        self.assertEqual(by_id["wo-batch-feature"]["invalid_options"][0]["coerced_to"], "UI/UX Improvement")
+        self.assertIn("error", by_id["wo-batch-corrupt"])
+
+        output = self.root / "batch_report.json"
+        self.assertEqual(batch_validate_mod.main([str(good), "--output", str(output)]), 0)
+        self.assertTrue(load_json(output)["ok"])
+
     def test_skill_prepare_attachments_updates_runtime_and_history(self):
         work_order = self.make_work_order("bug", "wo-prepare-001", with_attachment=True)
         updated, controls = self.run_submit(work_order, args=["--prepare-attachments-only"])
@@ -426,6 +871,282 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.assertEqual(updated["events"][-1]["status"], "succeeded")
         self.assertIn("user-attachments", controls["Additional Context"].value)
 
+    def test_attachment_cache_skips_reupload_of_hosted_files(self):
+        work_order = self.make_work_order(
+            "bug",
+            "wo-attcache-001",
+            with_attachment=True,
+            attachment_names=["cached.png", "fresh.png"],
+        )
+        cached_path = work_order.parent / "cached.png"
+        fresh_path = work_order.parent / "fresh.png"
+        fresh_path.write_bytes(b"fresh-png-bytes")
+        cached_line = "![cached](https://github.com/user-attachments/assets/cached-1)"
+        attachment_cache_mod.remember_hosted(
+            cached_path,
+            method="browser",
+            url="https://github.com/user-attachments/assets/cached-1",
+            markdown=cached_line,
+            owner_repo="iOfficeAI/AionUi",
+        )
+        # Browser-hosted assets are only reused for the repo they were uploaded to.
+        self.assertIsNone(attachment_cache_mod.lookup_hosted(cached_path, owner_repo="someone/else"))
+
+        updated, controls = self.run_submit(work_order, args=["--prepare-attachments-only"])
+
+        self.assertEqual(self.upload_calls, [[str(fresh_path)]])
+        self.assertIn(cached_line, updated["attachment_markdown"])
+        self.assertIn("assets/mock", updated["attachment_markdown"])
+        self.assertIn(cached_line, controls["Additional Context"].value)
+        upload_event = next(event for event in updated["events"] if event["stage"] == "upload_attachments")
+        self.assertEqual(upload_event["extra"]["reused_from_cache"], ["cached.png"])
+
+        # A work order with the same bytes and no attachment_markdown embeds the hosted URL.
+        other = self.make_work_order("bug", "wo-attcache-002", with_attachment=True, attachment_name="copy.png")
+        (other.parent / "copy.png").write_bytes(cached_path.read_bytes())
+        payload = self.run_github_payload(other)
+        self.assertIn(cached_line, payload["body"])
+        self.assertNotIn("尚未上传", payload["body"])
+        self.assertEqual(payload["attachment_upload_status"], "uploaded")
+        self.assertEqual(self.run_chrome_bundle(other)["attachment_upload_status"], "uploaded")
+
+        # Concurrent writers keep each other's entries; stale and surplus files are evicted.
+        copies = []
+        for index in range(6):
+            copy = other.parent / f"lock-{index}.png"
+            copy.write_bytes(f"lock-{index}".encode())
+            copies.append(copy)
+        threads = [
+            threading.Thread(
+                target=attachment_cache_mod.remember_hosted,
+                args=(copy,),
+                kwargs={"method": "repo", "url": f"https://raw.example/{copy.name}", "markdown": "", "owner_repo": ""},
+            )
+            for copy in copies
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for copy in copies:
+            self.assertIsNotNone(attachment_cache_mod.lookup_hosted(copy, owner_repo="iOfficeAI/AionUi"))
+        data = load_json(attachment_cache_mod.cache_path())
+        data[attachment_cache_mod.file_sha256(copies[0])][0]["cached_at"] = "2000-01-01T00:00:00+00:00"
+        attachment_cache_mod.cache_path().write_text(json.dumps(data), encoding="utf-8")
+        with mock.patch.object(attachment_cache_mod, "MAX_FILES", 3):
+            attachment_cache_mod.remember_hosted(
+                copies[1], method="repo", url="https://raw.example/again.png", markdown="", owner_repo=""
+            )
+        self.assertIsNone(attachment_cache_mod.lookup_hosted(copies[0], owner_repo="iOfficeAI/AionUi"))
+        self.assertEqual(len(load_json(attachment_cache_mod.cache_path())), 3)
+        self.assertIsNotNone(attachment_cache_mod.lookup_hosted(copies[1], owner_repo="iOfficeAI/AionUi"))
+
+    def test_debug_capture_levels_and_size_cap(self):
+        class ShotPage:
+            def __init__(self):
+                self.calls = []
+
+            def screenshot(self, **kwargs):
+                self.calls.append(kwargs)
+                return b"J" * 1000 if kwargs.get("type") == "jpeg" else b"P" * 4000
+
+            def content(self):
+                return "<html>" + "x" * 3000 + "</html>"
+
+        class FakeTracing:
+            def __init__(self):
+                self.calls = []
+
+            def start(self, **kwargs):
+                self.calls.append("start")
+
+            def start_chunk(self):
+                self.calls.append("start_chunk")
+
+            def stop_chunk(self, path=None):
+                self.calls.append(("stop_chunk", Path(path).name if path else None))
+                if path:
+                    Path(path).write_bytes(b"trace")
+
+            def stop(self):
+                self.calls.append("stop")
+
+        artifacts = self.root / "capture_artifacts"
+        page = ShotPage()
+        capture = debug_capture_mod.DebugCapture(artifacts, level="viewport", max_bytes=10**6)
+        capture.capture(page, "no_submit")
+        capture.capture(page, "create_click_fail_1", failure=True)
+        capture.close()
+        names = sorted(path.name.rsplit("_", 1)[0] + path.suffix for path in artifacts.iterdir())
+        self.assertEqual(names, ["create_click_fail_1.html", "create_click_fail_1.png", "no_submit.jpg"])
+        self.assertEqual(page.calls[0], {"type": "jpeg", "quality": 60, "full_page": False})
+        self.assertEqual(page.calls[1], {"full_page": True})
+
+        none_dir = self.root / "capture_none"
+        debug_capture_mod.DebugCapture(none_dir, level="none").capture(page, "no_submit", failure=True)
+        self.assertFalse(none_dir.exists())
+
+        # Oldest captures are pruned first; unrelated artifacts are left alone.
+        capped = self.root / "capture_capped"
+        capped.mkdir()
+        (capped / "run.log").write_bytes(b"L" * 50000)
+        capture = debug_capture_mod.DebugCapture(capped, level="full", max_bytes=9000)
+        for index in range(3):
+            capture.capture(page, f"submit_attempt_{index}")
+            capture.flush()
+            time.sleep(0.01)
+        capture.close()
+        remaining = sorted(path.name for path in capped.iterdir())
+        self.assertIn("run.log", remaining)
+        self.assertTrue(all(not name.startswith("submit_attempt_0") for name in remaining))
+        self.assertTrue(any(name.startswith("submit_attempt_2") for name in remaining))
+        total = sum(path.stat().st_size for path in capped.iterdir() if path.name != "run.log")
+        self.assertLessEqual(total, 9000)
+
+        tracing = FakeTracing()
+        trace_dir = self.root / "capture_trace"
+        capture = debug_capture_mod.DebugCapture(trace_dir, level="trace")
+        capture.start_tracing(SimpleNamespace(tracing=tracing))
+        capture.capture(page, "submit_attempt_1")
+        capture.capture(page, "timeout", failure=True)
+        capture.close()
+        self.assertEqual(tracing.calls[:2], ["start", "start_chunk"])
+        self.assertTrue(tracing.calls[2][1].startswith("trace_timeout_"))
+        self.assertEqual(tracing.calls[-1], "stop")
+        self.assertEqual(sorted(path.suffix for path in trace_dir.iterdir()), [".jpg", ".zip"])
+
+    def test_artifacts_retention_expires_compresses_and_enforces_budget(self):
+        runs = self.root / "issue_runs" / "chat-retention"
+        now = time.time()
+        day = 86400
+
+        def make(work_id: str, *, data: dict, files: dict, age_days: float) -> Path:
+            artifacts = runs / work_id / "artifacts"
+            artifacts.mkdir(parents=True)
+            (runs / work_id / "work_order.json").write_text(json.dumps(data), encoding="utf-8")
+            for name, payload in files.items():
+                (artifacts / name).write_bytes(payload)
+            for path in [runs / work_id / "work_order.json", *artifacts.iterdir()]:
+                os.utime(path, (now - age_days * day, now - age_days * day))
+            return artifacts
+
+        submitted = make(
+            "wo-old-ok",
+            data={"issue_url": "https://github.com/o/r/issues/1"},
+            files={"run.log": b"x" * 100, "no_submit_1.jpg": b"j" * 100},
+            age_days=10,
+        )
+        failed = make(
+            "wo-old-failed",
+            data={"runtime": {"status": "failed"}},
+            files={"timeout_1.html": b"<html>" + b"a" * 5000, "timeout_1.png": b"p" * 300},
+            age_days=10,
+        )
+        draft = make("wo-draft", data={"runtime": {"status": "draft"}}, files={"big.png": b"b" * 4000}, age_days=1)
+        current = make("wo-current", data={}, files={"run.log": b"c" * 9000}, age_days=40)
+        recent_ok = make(
+            "wo-recent-ok",
+            data={"issue_number": 2},
+            files={"recent.png": b"r" * 200, "run.log.1": b"l" * 100},
+            age_days=1,
+        )
+        os.utime(recent_ok / "run.log.1", (now - 3 * day, now - 3 * day))
+        # A submitter may still need these: never expired, compressed or evicted.
+        retrying = make(
+            "wo-retrying",
+            data={"runtime": {"status": "retry_scheduled"}},
+            files={"retry.png": b"t" * 500, "run.jsonl": b"{}" * 50},
+            age_days=40,
+        )
+        policy = retention_mod.RetentionPolicy(budget_bytes=9000 + 600 + 600)
+
+        dry = retention_mod.apply_retention(runs.parent, policy, dry_run=True, exclude=[current], now=now)
+        self.assertEqual([Path(item["work_order"]).parent.name for item in dry["expired"]], ["wo-old-ok"])
+        self.assertEqual([Path(item["path"]).name for item in dry["compressed"]], ["timeout_1.html", "run.log.1"])
+        self.assertTrue((submitted / "run.log").exists())
+        self.assertTrue((failed / "timeout_1.html").exists())
+
+        report = retention_mod.apply_retention(runs.parent, policy, exclude=[current], now=now)
+        self.assertEqual(sorted(path.name for path in submitted.iterdir()), [])
+        self.assertTrue((runs / "wo-old-ok" / "work_order.json").exists())
+        self.assertEqual(
+            gzip.decompress((failed / "timeout_1.html.gz").read_bytes()), b"<html>" + b"a" * 5000
+        )
+        # Budget: submitted work orders go first, then the draft, never the failed work order's evidence.
+        self.assertEqual(
+            [Path(item["path"]).name for item in report["evicted"]], ["run.log.1.gz", "recent.png", "big.png"]
+        )
+        self.assertEqual(sorted(path.name for path in retrying.iterdir()), ["retry.png", "run.jsonl"])
+        self.assertFalse((draft / "big.png").exists())
+        self.assertTrue((failed / "timeout_1.png").exists())
+        self.assertTrue((current / "run.log").exists())
+        self.assertLessEqual(report["bytes_after"], policy.budget_bytes)
+
+    def test_run_logging_is_non_blocking_leveled_and_rotated(self):
+        artifacts = self.root / "run_log_artifacts"
+        release = threading.Event()
+        original_emit = run_logging_mod.logging.handlers.RotatingFileHandler.emit
+
+        def slow_emit(handler, record):
+            release.wait(5)
+            original_emit(handler, record)
+
+        with mock.patch.object(run_logging_mod.logging.handlers.RotatingFileHandler, "emit", slow_emit), \
+            mock.patch.object(run_logging_mod.sys, "__stdout__", io.StringIO()), \
+            mock.patch.object(run_logging_mod.sys, "__stderr__", io.StringIO()):
+            state = run_logging_mod.start_run_logging(artifacts, max_bytes=4000, backup_count=4)
+            try:
+                started = time.monotonic()
+                print("[INFO] filling form")
+                print("[WARN] Retrying submit")
+                print("ERROR: Missing required fields or failed to fill:")
+                sys.stderr.write("stray stderr line\n")
+                print("partial", end="")
+                # The disk writer is stalled, yet print() returned immediately.
+                self.assertLess(time.monotonic() - started, 1.0)
+                release.set()
+                for index in range(60):
+                    print(f"filler line {index:03d} " + "x" * 40)
+            finally:
+                run_logging_mod.stop_run_logging(state)
+
+        self.assertIsNot(sys.stdout, state.streams[0])
+        records = []
+        for path in sorted(artifacts.glob("run.jsonl*"), reverse=True):
+            records.extend(json.loads(line) for line in path.read_text(encoding="utf-8").splitlines())
+        levels = {record["msg"]: (record["level"], record["stream"]) for record in records}
+        self.assertEqual(levels["[INFO] filling form"], ("INFO", "stdout"))
+        self.assertEqual(levels["[WARN] Retrying submit"], ("WARNING", "stdout"))
+        self.assertEqual(levels["ERROR: Missing required fields or failed to fill:"], ("ERROR", "stdout"))
+        self.assertEqual(levels["stray stderr line"], ("WARNING", "stderr"))
+        self.assertIn("partialfiller line 000 " + "x" * 40, levels)
+        self.assertTrue((artifacts / "run.log.1").exists())
+        self.assertLessEqual(max((artifacts / "run.log").stat().st_size, (artifacts / "run.log.1").stat().st_size), 4000)
+        self.assertIn("filler line 059", (artifacts / "run.log").read_text(encoding="utf-8"))
+
+    def test_skill_run_log_is_drained_on_early_exits(self):
+        work_order = self.make_work_order("bug", "wo-runlog-exit-001")
+        data = load_json(work_order)
+        data["issue_number"] = 7
+        work_order.write_text(json.dumps(data), encoding="utf-8")
+        stdout_before = sys.stdout
+        with mock.patch.object(sys, "argv", ["skill_submit_aionui_issue.py", "--work-order", str(work_order)]):
+            self.assertEqual(submit_mod.main(), 0)
+        self.assertIs(sys.stdout, stdout_before)
+        run_log = (work_order.parent / "artifacts" / "run.log").read_text(encoding="utf-8")
+        self.assertIn("already has issue_number=", run_log)
+        self.assertIn("pass --force", run_log)
+
+        # SystemExit from load_work_order (before the submit try/finally) also restores the streams.
+        data.pop("issue_number")
+        data["owner_repo"] = "someone/else"
+        work_order.write_text(json.dumps(data), encoding="utf-8")
+        with mock.patch.object(sys, "argv", ["skill_submit_aionui_issue.py", "--work-order", str(work_order)]):
+            with self.assertRaises(SystemExit):
+                submit_mod.main()
+        self.assertIs(sys.stdout, stdout_before)
+        self.assertNotIsInstance(sys.stderr, run_logging_mod._LineLoggingStream)
+
     def test_unsupported_attachment_is_filtered_not_blocked(self):
         work_order = self.make_work_order(
             "bug",
@@ -468,6 +1189,229 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.assertEqual(updated["runtime"]["status"], "submitted")
         self.assertEqual(updated["events"][-1]["status"], "succeeded")
 
+    def test_stage_timings_recorded_on_events_and_aggregated(self):
+        work_order = self.make_work_order("bug", "wo-timings-001")
+        updated, _controls = self.run_submit(
+            work_order,
+            args=[],
+            final_issue_url="https://github.com/iOfficeAI/AionUi/issues/627",
+        )
+        final = updated["events"][-1]
+        self.assertEqual((final["stage"], final["status"]), ("submit", "succeeded"))
+        names = [span["name"] for span in final["extra"]["timings"]]
+        self.assertEqual(names[:3], ["browser_launch", "navigate", "login_wait"])
+        self.assertIn("fill:bug_description", names)
+        self.assertEqual(names[-2:], ["create_click", "confirm"])
+        self.assertTrue(all(span["duration_sec"] >= 0 and "start_sec" in span for span in final["extra"]["timings"]))
+        self.assertIn("[TIMING] total", (work_order.parent / "artifacts" / "run.log").read_text(encoding="utf-8"))
+
+        # Outside the venv, bootstrap adds its own spans to the event the re-exec'd run wrote last.
+        def fake_reexec(*_args, **_kwargs):
+            support_mod.append_work_order_event(
+                work_order,
+                stage="bootstrap",
+                status="succeeded",
+                submitter="skill",
+                extra={"timings": [{"name": "bootstrap:submit_process", "start_sec": 0.0, "duration_sec": 1.5, "ok": True}]},
+            )
+            return 0
+
+        with mock.patch.object(bootstrap_mod, "_in_venv", return_value=False), \
+            mock.patch.object(bootstrap_mod, "_ensure_venv", return_value=Path(sys.executable)), \
+            mock.patch.object(bootstrap_mod.subprocess, "call", side_effect=fake_reexec), \
+            mock.patch.object(sys, "argv", ["skill_bootstrap.py", str(work_order)]):
+            self.assertEqual(bootstrap_mod.main(), 0)
+        bootstrap_timings = load_json(work_order)["events"][-1]["extra"]["timings"]
+        self.assertEqual(
+            [span["name"] for span in bootstrap_timings],
+            ["bootstrap:ensure_venv", "bootstrap:venv_reexec", "bootstrap:submit_process"],
+        )
+
+        rows = {row["name"]: row for row in stage_timings_mod.aggregate_spans(
+            stage_timings_mod.collect_spans(self.root / "issue_runs" / self.session_id)
+        )}
+        self.assertEqual(rows["bootstrap:submit_process"]["max_sec"], 1.5)
+        self.assertEqual(rows["confirm"]["count"], 1)
+        self.assertEqual(rows["confirm"]["slowest_work_id"], "wo-timings-001")
+
+    def test_metrics_textfile_tracks_submissions_retries_and_histograms(self):
+        metrics_file = self.root / "textfile" / "aionui.prom"
+        work_order = self.make_work_order("bug", "wo-metrics-001")
+        with mock.patch.dict(os.environ, {"AIONUI_METRICS_FILE": str(metrics_file)}):
+            self.run_submit(work_order, args=[], final_issue_url="https://github.com/iOfficeAI/AionUi/issues/628")
+            support_mod.append_work_order_event(work_order, stage="submit_attempt", status="retry", submitter="skill")
+            support_mod.append_work_order_event(work_order, stage="submit", status="skipped_duplicate", submitter="api")
+            support_mod.append_work_order_event(
+                work_order,
+                stage="upload_attachments",
+                status="succeeded",
+                submitter="github_mcp",
+                extra={"uploaded_bytes": 300 * 1024},
+            )
+            latency_mod.record_confirmation_latency(12.5, method="page_title")
+
+        text = metrics_file.read_text(encoding="utf-8")
+        samples = {}
+        for line in text.splitlines():
+            if line and not line.startswith("#"):
+                key, value = line.rsplit(" ", 1)
+                samples[key] = float(value)
+        self.assertEqual(samples['aionui_submissions_total{submitter="skill",status="succeeded"}'], 1)
+        self.assertEqual(samples['aionui_submissions_total{submitter="skill",status="started"}'], 1)
+        self.assertEqual(samples['aionui_duplicate_skips_total{submitter="api"}'], 1)
+        self.assertEqual(samples['aionui_submit_retries_total{submitter="skill"}'], 1)
+        self.assertEqual(samples['aionui_runtime_status_changes_total{status="submitted"}'], 1)
+        self.assertEqual(samples['aionui_attachment_upload_bytes_bucket{submitter="github_mcp",le="102400"}'], 0)
+        self.assertEqual(samples['aionui_attachment_upload_bytes_bucket{submitter="github_mcp",le="524288"}'], 1)
+        self.assertEqual(samples['aionui_confirmation_latency_seconds_count{method="page_title"}'], 1)
+        self.assertEqual(samples['aionui_confirmation_latency_seconds_bucket{method="page_title",le="10"}'], 0)
+        self.assertEqual(samples['aionui_confirmation_latency_seconds_bucket{method="page_title",le="+Inf"}'], 1)
+        self.assertIn("# TYPE aionui_confirmation_latency_seconds histogram", text)
+
+        # Unset: nothing is written.
+        metrics_file.unlink()
+        support_mod.append_work_order_event(work_order, stage="submit", status="failed", submitter="skill")
+        self.assertFalse(metrics_file.exists())
+
+    def test_persistence_benchmark_smoke_and_baseline_regression_check(self):
+        cases = bench_persistence_mod.run([0, 100], [0, 50], repeat=1)
+        self.assertEqual(
+            sorted(cases),
+            sorted(
+                [f"{op}/events={n}" for op in ("ensure_runtime", "update_runtime", "append_event") for n in (0, 100)]
+                + ["ensure_attachments/files=0", "ensure_attachments/files=50"]
+            ),
+        )
+        self.assertTrue(all(result["runs"] >= 1 and result["median_ms"] >= 0 for result in cases.values()))
+
+        baseline = {"a": {"median_ms": 10.0}, "b": {"median_ms": 0.2}, "c": {"median_ms": 10.0}}
+        current = {"a": {"median_ms": 16.0}, "b": {"median_ms": 0.9}, "c": {"median_ms": 14.0}, "new": {"median_ms": 5.0}}
+        regressions = bench_common_mod.compare_to_baseline(current, baseline, threshold=0.5, min_delta_ms=1.0)
+        # "b" tripled but by less than 1 ms; "c" is within +50%; "new" has no baseline.
+        self.assertEqual([item["case"] for item in regressions], ["a"])
+
+    def test_stress_harness_runs_workers_and_flags_lost_events_and_duplicate_claims(self):
+        report = stress_mod.run(self.root / "stress", processes=2, ops=5, work_orders=1, seed=3)
+        self.assertEqual(report["throughput"]["ops"], 10)
+        self.assertEqual(set(report["throughput"]["by_role"]), set(stress_mod.ROLES))
+        summary = report["integrity"]["work_orders"]["wo-stress-001"]
+        self.assertEqual(summary["lost_events"], max(0, summary["expected_events"] - summary["events"]))
+
+        paths = stress_mod.write_work_orders(self.root / "manual", "s", 2)
+        support_mod.append_work_order_event(paths[0], stage="stress", status="issue_claimed", submitter="stress")
+        paths[1].write_text('{"events": [', encoding="utf-8")
+        records = [
+            {"role": "submitter", "work_order": str(paths[0]), "events": 1, "ok": True, "claimed_issue_number": "1"},
+            {"role": "submitter", "work_order": str(paths[0]), "events": 1, "ok": True, "claimed_issue_number": "2"},
+            {"role": "uploader", "work_order": str(paths[0]), "events": 0, "ok": False, "error_type": "corrupt_read"},
+            {"role": "runtime", "work_order": str(paths[0]), "events": 0, "ok": False, "error_type": "OperationalError"},
+        ]
+        integrity = stress_mod.check_integrity(paths, records)
+        self.assertFalse(integrity["ok"])
+        self.assertEqual(integrity["lost_events"], 1)
+        self.assertEqual(integrity["corrupt_reads"], 1)
+        self.assertEqual(integrity["errors"], {"OperationalError": 1})
+        self.assertEqual([item["claimed"] for item in integrity["duplicate_issue_claims"]], [["1", "2"]])
+        self.assertEqual([Path(item["work_order"]) for item in integrity["corrupt_files"]], [paths[1]])
+
+    def test_git_upload_benchmark_pushes_to_local_bare_repo_with_stage_spans(self):
+        cases = bench_git_mod.run([30], 1, files=2, upload_bytes=4096, image_bytes=256)
+        self.assertEqual(
+            sorted(cases), sorted(f"{stage}/images=30" for stage in (*bench_git_mod.STAGES, "total"))
+        )
+        self.assertGreater(cases["total/images=30"]["peak_disk_bytes"], 2 * 4096)
+
+        with mock.patch.dict(os.environ, bench_git_mod._GIT_IDENTITY):
+            bare = bench_git_mod.build_bare_repo(self.root / "issue-assets.git", 5, image_bytes=64)
+            shot = self.root / "shot.png"
+            shot.write_bytes(bench_git_mod.fake_png("shot", 2048))
+            timer = stage_timings_mod.StageTimer()
+            uploaded = upload_mod.upload_via_git(
+                "Asunfly",
+                "issue-assets",
+                "iOfficeAI/AionUi",
+                "wo-git-001",
+                [{"local_path": str(shot), "remote_path": "iOfficeAI/AionUi/wo-git-001/shot.png", "filename": "shot.png"}],
+                repo_url=bare.as_uri(),
+                timer=timer,
+            )
+        self.assertEqual([span["name"] for span in timer.spans], ["git:clone", "git:copy", "git:verify", "git:commit", "git:push"])
+        self.assertGreater(timer.spans[-1]["clone_bytes"], 2048)
+        self.assertIn("Asunfly/issue-assets", uploaded[0]["raw_url"])
+        tree = subprocess.run(
+            ["git", "ls-tree", "-r", "--name-only", "main"], cwd=bare, capture_output=True, text=True, check=True
+        ).stdout.split()
+        self.assertEqual(len(tree), 6)
+        self.assertIn("iOfficeAI/AionUi/wo-git-001/shot.png", tree)
+
+    def test_fake_issue_form_server_serves_form_upload_and_create_flow(self):
+        import urllib.request
+
+        class NoRedirect(urllib.request.HTTPRedirectHandler):
+            def redirect_request(self, *args, **kwargs):
+                return None
+
+        opener = urllib.request.build_opener(NoRedirect)
+
+        def request(url, data=None, method=None, headers=None):
+            req = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+            try:
+                with opener.open(req, timeout=5) as response:
+                    return response.status, dict(response.headers), response.read()
+            except urllib.error.HTTPError as exc:
+                return exc.code, dict(exc.headers), exc.read()
+
+        with fake_form_mod.FakeIssueFormServer(latency={"create": 0.05}) as server:
+            status, _headers, body = request(f"{server.project_url}/issues/new?template=bug_report.yml")
+            self.assertEqual(status, 200)
+            page = body.decode("utf-8")
+            self.assertIn("input type=\"text\" name=\"issue[title]\" aria-label=\"Add a title\"", page)
+            for label in ("Platform", "AionUi Version", "Bug Description", "Additional Context"):
+                self.assertIn(f">{label}</label>", page)
+            self.assertIn('aria-expanded="false" aria-labelledby="issue-form-label-platform"', page)
+            self.assertIn('<file-attachment><textarea name="issue_form[additional_context]"', page)
+            self.assertIn('data-testid="create-issue-button"', page)
+
+            status, _headers, body = request(
+                f"{server.base_url}/upload/policies/assets", data=urllib.parse.urlencode({"name": "screen.png"}).encode()
+            )
+            self.assertEqual(status, 201)
+            policy = json.loads(body)
+            self.assertTrue(policy["upload_url"].startswith(server.base_url))
+            status, _headers, _body = request(
+                f"{server.base_url}{policy['asset_upload_url']}", data=b"", method="PUT"
+            )
+            self.assertEqual(status, 422)  # finalize before the storage upload is rejected
+            storage_body = f"key={policy['form']['key']}&file=fake-png".encode()
+            self.assertEqual(request(policy["upload_url"], data=storage_body)[0], 204)
+            self.assertEqual(request(f"{server.base_url}{policy['asset_upload_url']}", data=b"", method="PUT")[0], 200)
+            self.assertTrue(policy["asset"]["href"].startswith(f"{server.base_url}/user-attachments/assets/"))
+
+            form = urllib.parse.urlencode(
+                {"issue[title]": "[Bug] Freeze after Send", "issue_form[platform]": "Linux", "issue_form[version]": "1.0.0"}
+            ).encode()
+            started = time.monotonic()
+            status, headers, _body = request(f"{server.project_url}/issues", data=form)
+            self.assertGreaterEqual(time.monotonic() - started, 0.05)
+            self.assertEqual(status, 303)
+            self.assertEqual(headers["Location"], "/iOfficeAI/AionUi/issues/1")
+            issue_url = f"{server.project_url}/issues/1"
+            self.assertTrue(submit_mod.is_issue_created_url(issue_url))
+            self.assertEqual(server.issues[0]["fields"], {"platform": "Linux", "version": "1.0.0"})
+            status, _headers, body = request(issue_url)
+            self.assertIn("Issue #1 · iOfficeAI/AionUi", body.decode("utf-8"))
+
+            with mock.patch.dict(os.environ, {"AIONUI_GITHUB_API_BASE": server.base_url}):
+                found = submit_mod.find_recent_issue_by_title(
+                    "iOfficeAI/AionUi",
+                    "[Bug] Freeze after Send",
+                    project_url=server.project_url,
+                    not_before=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=5),
+                    timeout_sec=5,
+                )
+            self.assertIsNotNone(found)
+            self.assertEqual((found.issue_url, found.issue_number), (issue_url, "1"))
+
     def test_skill_submit_recovers_success_from_issue_title_before_url_redirect(self):
         work_order = self.make_work_order("bug", "wo-submit-title-001")
         updated, _controls = self.run_submit(
@@ -503,6 +1447,111 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.assertEqual(updated["issue_url"], "https://github.com/iOfficeAI/AionUi/issues/1606")
         self.assertEqual(updated["events"][-1]["extra"]["detection_method"], "github_api_recent_exact_title")
 
+    def test_submit_wait_budget_follows_latency_history(self):
+        stats = self.root / "user_cache" / "submit_latency.json"
+        default = latency_mod.submit_wait_budget(30)
+        self.assertEqual((default.source, default.wait_sec), ("default", 30.0))
+
+        work_order = self.make_work_order("bug", "wo-submit-latency-001")
+        self.run_submit(work_order, args=[], final_issue_url="https://github.com/iOfficeAI/AionUi/issues/1607")
+        samples = load_json(stats)["samples"]
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0]["method"], "current_url")
+        self.assertEqual(samples[0]["owner_repo"], "iOfficeAI/AionUi")
+
+        for latency in (1.0, 1.5, 2.0, 2.5, 3.0, 3.5):
+            latency_mod.record_confirmation_latency(latency, method="url")
+        fast = latency_mod.submit_wait_budget(30)
+        self.assertEqual(fast.source, "history")
+        self.assertEqual(fast.samples, 7)
+        self.assertEqual(fast.wait_sec, latency_mod.ADAPTIVE_WAIT_SEC_MIN)
+        self.assertLessEqual(fast.probe_delay_sec, fast.wait_sec)
+
+        for latency in (40.0, 55.0, 60.0, 70.0, 80.0) * 6:
+            latency_mod.record_confirmation_latency(latency, method="github_api_recent_exact_title")
+        slow = latency_mod.submit_wait_budget(30)
+        self.assertEqual(slow.samples, latency_mod.WINDOW_SAMPLES)
+        self.assertEqual(slow.wait_sec, 30.0)
+        self.assertEqual(latency_mod.submit_wait_budget(300).wait_sec, latency_mod.ADAPTIVE_WAIT_SEC_MAX)
+
+        stats.unlink()
+        for latency in (2.0, 2.5, 3.0, 3.5, 4.0):
+            latency_mod.record_confirmation_latency(latency, method="url", owner_repo="o/r")
+        for _ in range(10):
+            latency_mod.record_confirmation_latency(45.0, method="unconfirmed", owner_repo="o/r", censored=True)
+        self.assertTrue(load_json(stats)["samples"][-1]["censored"])
+        # censored samples are capped at the confirmed p95: unconfirmed waits do not feed the next wait
+        confirmed_p95 = latency_mod.percentile([2.0, 2.5, 3.0, 3.5, 4.0], 95)
+        self.assertEqual(latency_mod.recent_latencies(stats, owner_repo="o/r")[5:], [confirmed_p95] * 10)
+        self.assertEqual(latency_mod.submit_wait_budget(60, owner_repo="o/r").wait_sec, latency_mod.LEGACY_WAIT_SEC_MIN)
+        self.assertEqual(latency_mod.submit_wait_budget(60, owner_repo="other/repo").source, "default")
+
+        threads = [
+            threading.Thread(target=lambda: [latency_mod.record_confirmation_latency(1.0, method="url") for _ in range(20)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(load_json(stats)["samples"]), 15 + 80)
+        self.assertAlmostEqual(latency_mod.percentile([1, 2, 3, 4], 50), 2.5)
+
+    def test_recent_issue_probe_thread_reports_first_match(self):
+        calls = []
+        recovered = submit_mod.SubmissionSuccessInfo("https://github.com/o/r/issues/7", "7", "github_api_recent_exact_title")
+
+        def probe():
+            calls.append(1)
+            return recovered if len(calls) >= 3 else None
+
+        probe_thread = submit_mod._RecentIssueProbeThread(probe, delay_sec=0, interval_sec=0.01).start()
+        probe_thread._thread.join(timeout=5)
+        self.assertIs(probe_thread.result, recovered)
+        self.assertEqual(len(calls), 3)
+
+        idle = submit_mod._RecentIssueProbeThread(probe, delay_sec=60, interval_sec=60).start()
+        idle.stop()
+        idle._thread.join(timeout=5)
+        self.assertFalse(idle._thread.is_alive())
+        self.assertEqual(len(calls), 3)
+
+    def test_browser_upload_tracks_xhrs_and_retries_only_failed_files(self):
+        paths = []
+        for name, size in (("a.png", 2048), ("b.png", 4096), ("c.png", 1024)):
+            path = self.root / name
+            path.write_bytes(b"\x89PNG" + b"0" * size)
+            paths.append(path)
+        control = FakeControl("Additional Context")
+        control.value = "原始说明"
+        page = FakeUploadPage(control, fail_policy_once={"b.png"})
+        report: dict = {}
+
+        with mock.patch.object(submit_mod, "find_attachment_input_for_control", return_value=FakeFileInput(page)):
+            after, markdown = submit_mod.upload_attachments_to_control(page, control, paths, timeout_sec=30, report=report)
+
+        self.assertEqual(page.handed_files, [["a.png", "b.png", "c.png"], ["b.png"]])
+        self.assertEqual(len(markdown.splitlines()), 3)
+        self.assertTrue(after.startswith("原始说明"))
+        self.assertTrue(report["xhr_observed"])
+        self.assertEqual(report["retried_files"], ["b.png"])
+        by_name = {item["name"]: item for item in report["files"]}
+        self.assertEqual({item["state"] for item in report["files"]}, {"done"})
+        self.assertEqual(by_name["b.png"]["attempts"], 2)
+        self.assertEqual(by_name["a.png"]["attempts"], 1)
+        self.assertEqual(by_name["a.png"]["size_bytes"], 2052)
+        self.assertTrue(by_name["c.png"]["asset_url"].startswith("https://github.com/user-attachments/assets/"))
+        self.assertIn("throughput_kib_s", by_name["a.png"])
+        self.assertEqual(page.handlers, {"request": [], "response": [], "requestfailed": []})
+
+        tracker = submit_mod.AttachmentUploadTracker(paths)
+        tracker.begin_attempt(paths[:2])
+        self.assertIsNone(tracker._claim("other.png"))
+        self.assertIsNone(tracker._claim(""))
+        self.assertEqual(tracker._claim("b.png").name, "b.png")
+        tracker.begin_attempt(paths[2:])
+        self.assertEqual(tracker._claim("").name, "c.png")
+
     def test_extract_uploaded_attachment_markdown_keeps_all_completed_lines(self):
         before = "原始说明"
         after = "\n".join(
@@ -581,26 +1630,13 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.assertIn("screens/3.webp", payload["body"])
 
     def test_recent_issue_lookup_matches_exact_title_and_recency(self):
-        payload = [
-            {
-                "number": 1400,
-                "title": "别的标题",
-                "html_url": "https://github.com/iOfficeAI/AionUi/issues/1400",
-                "created_at": "2026-03-20T17:14:30Z",
-            },
-            {
-                "number": 1605,
-                "title": "【Bug】发送按钮点击后卡死 / [Bug] Freeze after Send",
-                "html_url": "https://github.com/iOfficeAI/AionUi/issues/1605",
-                "created_at": "2026-03-20T17:14:12Z",
-            },
+        issues = [
+            make_api_issue(1400, "别的标题", updated_at="2026-03-20T17:14:30Z"),
+            make_api_issue(1605, "【Bug】发送按钮点击后卡死 / [Bug] Freeze after Send", updated_at="2026-03-20T17:14:12Z"),
+            make_api_issue(1300, "【Bug】发送按钮点击后卡死 / [Bug] Freeze after Send", updated_at="2026-03-19T08:00:00Z"),
         ]
-        response = mock.MagicMock()
-        response.read.return_value = json.dumps(payload).encode("utf-8")
-        response.__enter__.return_value = response
-        response.__exit__.return_value = False
 
-        with mock.patch.object(submit_mod.urllib.request, "urlopen", return_value=response):
+        with FakeGitHubAPI(issues) as api, mock.patch.dict(os.environ, {"AIONUI_GITHUB_API_BASE": api.base_url}):
             result = submit_mod.find_recent_issue_by_title(
                 "iOfficeAI/AionUi",
                 "【Bug】发送按钮点击后卡死 / [Bug] Freeze after Send",
@@ -614,6 +1650,444 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.assertEqual(result.issue_number, "1605")
         self.assertEqual(result.detection_method, "github_api_recent_exact_title")
 
+    def test_pooled_http_client_reuses_connections_decodes_gzip_and_retries(self):
+        issues = [make_api_issue(n, f"issue {n}", updated_at=f"2026-03-{n:02d}T00:00:00Z") for n in range(1, 6)]
+        with FakeGitHubAPI(issues) as api, http_mod.PooledHttpClient(backoff_sec=0) as client:
+            url = f"{api.base_url}/repos/iOfficeAI/AionUi/issues?per_page=2"
+            first = client.get(url)
+            second = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+            api.fail_statuses = [503]
+            retried = client.get(url)
+            api.fail_statuses = [503]
+            not_retried = client.request("POST", url, body=b"{}")
+            opened = client.connections_opened
+
+        self.assertEqual(first.status, 200)
+        self.assertEqual(first.headers["content-encoding"], "gzip")
+        self.assertEqual([item["number"] for item in first.json()], [5, 4])
+        self.assertEqual(second.status, 304)
+        self.assertEqual(retried.status, 200)
+        self.assertEqual(not_retried.status, 503)
+        self.assertEqual(sum(1 for entry in api.requests if entry["method"] == "POST"), 1)
+        self.assertEqual(opened, 1)
+        self.assertEqual(len({entry["client_port"] for entry in api.requests}), 1)
+        self.assertEqual(api.requests[0]["headers"]["Accept-Encoding"], "gzip")
+        with self.assertRaises(http_mod.HttpStatusError):
+            not_retried.raise_for_status()
+
+    def test_recent_issue_probe_uses_etag_cache_and_rate_limit_backoff(self):
+        title = "【Bug】发送按钮点击后卡死 / [Bug] Freeze after Send"
+        issues = [
+            make_api_issue(1400, "别的标题", updated_at="2026-03-20T17:14:30Z"),
+            make_api_issue(1605, title, updated_at="2026-03-20T17:14:12Z", body="x" * 500),
+        ]
+        probe_kwargs = {
+            "project_url": "https://github.com/iOfficeAI/AionUi",
+            "not_before": datetime.datetime(2026, 3, 20, 17, 13, 30, tzinfo=datetime.timezone.utc),
+            "timeout_sec": 10,
+        }
+        env = {"AIONUI_GITHUB_API_BASE": "", "GITHUB_TOKEN": "tok-123", "GH_TOKEN": ""}
+        with FakeGitHubAPI(issues) as api, mock.patch.dict(os.environ, env):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            first = submit_mod.find_recent_issue_by_title("iOfficeAI/AionUi", title, **probe_kwargs)
+            second = submit_mod.find_recent_issue_by_title("iOfficeAI/AionUi", title, **probe_kwargs)
+            api.rate_limit_reset = int(time.time()) + 600
+            api.issues.append(make_api_issue(1606, "新问题", updated_at="2026-03-20T17:15:00Z"))
+            limited = submit_mod.find_recent_issue_by_title("iOfficeAI/AionUi", title, **probe_kwargs)
+            requests_before_backoff = len(api.requests)
+            backed_off = submit_mod.find_recent_issue_by_title("iOfficeAI/AionUi", title, **probe_kwargs)
+
+        self.assertEqual(first.issue_number, "1605")
+        self.assertEqual(second.issue_number, "1605")
+        self.assertNotIn("If-None-Match", api.requests[0]["headers"])
+        self.assertEqual(api.requests[0]["headers"]["Authorization"], "Bearer tok-123")
+        self.assertTrue(api.requests[1]["headers"]["If-None-Match"])
+        self.assertIsNone(limited)
+        self.assertIsNone(backed_off)
+        self.assertEqual(len(api.requests), requests_before_backoff)
+
+        cache_path = self.root / "user_cache" / "github_api" / "recent_issues_iOfficeAI__AionUi.json"
+        cache = load_json(cache_path)
+        self.assertEqual(cache["blocked_until"], api.rate_limit_reset)
+        self.assertNotIn("body", cache["payload"][0])
+
+    def test_api_submitter_posts_once_and_recovers_lost_response(self):
+        first = self.make_work_order("bug", "wo-api-001")
+        second = self.make_work_order("bug", "wo-api-002")
+        second_data = load_json(second)
+        second_data["title"] = "【Bug】上传附件后崩溃 / [Bug] Crash after upload"
+        second.write_text(json.dumps(second_data, ensure_ascii=False), encoding="utf-8")
+        no_token = self.make_work_order("feature", "wo-api-003")
+
+        with FakeGitHubAPI() as api, mock.patch.dict(os.environ, {"GITHUB_TOKEN": "tok-api", "GH_TOKEN": ""}):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            code, result = api_submit_mod.submit_work_order(first)
+            again_code, again = api_submit_mod.submit_work_order(first)
+            api.create_then_fail_status = 502
+            lost_code, lost = api_submit_mod.submit_work_order(second)
+            os.environ["GITHUB_TOKEN"] = ""
+            missing_code, missing = api_submit_mod.submit_work_order(no_token)
+
+        posts = [entry for entry in api.requests if entry["method"] == "POST"]
+        self.assertEqual(len(posts), 2)
+        first_post = json.loads(posts[0]["body"].decode("utf-8"))
+        self.assertEqual(first_post["labels"], ["bug"])
+        self.assertIn("## Bug Description", first_post["body"])
+        self.assertEqual(posts[0]["headers"]["Authorization"], "Bearer tok-api")
+
+        self.assertEqual((code, result["status"], result["issue_number"]), (0, "submitted", "1001"))
+        first_data = load_json(first)
+        self.assertEqual(first_data["issue_number"], "1001")
+        self.assertEqual(first_data["runtime"]["status"], "skipped_duplicate")
+        self.assertEqual(first_data["events"][-2]["status"], "succeeded")
+        self.assertEqual(first_data["events"][-2]["submitter"], "api")
+        self.assertEqual(first_data["events"][-2]["extra"]["detection_method"], "github_api_create")
+        self.assertEqual((again_code, again["status"]), (0, "skipped_existing"))
+
+        self.assertEqual((lost_code, lost["issue_number"]), (0, "1002"))
+        self.assertEqual(lost["detection_method"], "github_api_recent_exact_title")
+        self.assertEqual(load_json(second)["runtime"]["status"], "submitted")
+
+        self.assertEqual(missing_code, 2)
+        self.assertIn("GITHUB_TOKEN", missing["error"])
+        self.assertEqual(load_json(no_token)["runtime"]["status"], "failed")
+
+    def test_api_submitter_posts_attachments_hosted_by_the_uploader(self):
+        uploaded = self.make_work_order("bug", "wo-api-uploaded", with_attachment=True)
+        data = load_json(uploaded)
+        data["attachment_markdown"] = "![screen](https://github.com/user-attachments/assets/uploaded)"
+        uploaded.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        local_only = self.make_work_order("bug", "wo-api-local-only", with_attachment=True)
+
+        with FakeGitHubAPI() as api, mock.patch.dict(os.environ, {"GITHUB_TOKEN": "tok-api", "GH_TOKEN": ""}):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            code, result = api_submit_mod.submit_work_order(uploaded)
+            local_code, local = api_submit_mod.submit_work_order(local_only)
+
+        self.assertEqual((code, result["status"]), (0, "submitted"))
+        self.assertIn("user-attachments/assets/uploaded", api.issues[0]["body"])
+        self.assertEqual(len(api.issues), 1)
+        self.assertEqual(local_code, 2)
+        self.assertIn("github_mcp_upload_attachments.py", local["error"])
+
+    @unittest.skipIf(os.name == "nt", "POSIX process groups")
+    def test_submitter_runner_timeout_kills_the_whole_process_group(self):
+        work_order = self.make_work_order("bug", "wo-runner-pgroup")
+        pid_file = self.root / "grandchild.pid"
+        job = {"id": 1, "attempts": 1, "work_order_path": str(work_order), "submitter": "skill", "args": []}
+
+        with mock.patch.object(runner_mod, "submitter_command", return_value=[sys.executable, "-c", GRANDCHILD_SPAWNER, str(pid_file)]):
+            code = runner_mod._run_child(mock.Mock(), job, "w-test", lease_sec=60, timeout_sec=1.5)
+
+        self.assertEqual(code, -9)
+        self.assertTrue(wait_for_exit(int(pid_file.read_text())))
+        self.assertIn("# killed after", (work_order.parent / "artifacts" / "queue_job_1.log").read_text(encoding="utf-8"))
+
+    def test_submission_queue_workers_retry_skip_existing_and_track_status(self):
+        flaky = self.make_work_order("bug", "wo-queue-flaky")
+        flaky_data = load_json(flaky)
+        flaky_data["title"] = "【Bug】上传附件后崩溃 / [Bug] Crash after upload"
+        flaky.write_text(json.dumps(flaky_data, ensure_ascii=False), encoding="utf-8")
+        ok = self.make_work_order("bug", "wo-queue-ok")
+        existing = self.make_work_order("bug", "wo-queue-existing")
+        existing_data = load_json(existing)
+        existing_data["issue_number"] = "77"
+        existing.write_text(json.dumps(existing_data, ensure_ascii=False), encoding="utf-8")
+        invalid = self.make_work_order("feature", "wo-queue-invalid")
+        invalid_data = load_json(invalid)
+        invalid_data["problem_statement"] = ""
+        invalid.write_text(json.dumps(invalid_data, ensure_ascii=False), encoding="utf-8")
+
+        queue_path = self.root / "issue_runs" / "submission_queue.sqlite3"
+        self.assertEqual(queue_mod.default_queue_path(ok), queue_path)
+        conn = queue_mod.connect_queue(queue_path)
+        self.addCleanup(conn.close)
+        first = queue_mod.enqueue(conn, flaky, "api", max_attempts=2)
+        for path in (ok, existing, invalid):
+            queue_mod.enqueue(conn, path, "api")
+        again = queue_mod.enqueue(conn, ok, "api")
+        self.assertTrue(again["already_queued"])
+        with self.assertRaises(ValueError):
+            queue_mod.enqueue(conn, ok, "github_mcp")
+        self.assertEqual(load_json(ok)["runtime"]["status"], "queued")
+        self.assertEqual(load_json(ok)["events"][-1]["stage"], "queue")
+
+        with FakeGitHubAPI() as api, mock.patch.dict(os.environ, {"GITHUB_TOKEN": "tok-queue", "GH_TOKEN": ""}):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            api.fail_statuses = [503] * 20
+            job = queue_mod.claim(conn, "w-test")
+            self.assertEqual((job["id"], job["attempts"]), (first["id"], 1))
+            outcome = runner_mod.run_job(conn, job, "w-test", backoff_sec=0)
+            self.assertEqual((outcome["state"], outcome["exit_code"]), ("queued", 1))
+            self.assertEqual(load_json(flaky)["runtime"]["status"], "retry_scheduled")
+            api.fail_statuses = []
+            done = runner_mod.worker_loop(str(queue_path), "w-test", drain=True, backoff_sec=0)
+
+        self.assertEqual(done, 4)
+        states = {work_id: queue_mod.get_jobs(conn, work_id)[0] for work_id in ("wo-queue-flaky", "wo-queue-ok", "wo-queue-existing", "wo-queue-invalid")}
+        self.assertEqual(states["wo-queue-flaky"]["state"], "succeeded")
+        self.assertEqual(states["wo-queue-flaky"]["attempts"], 2)
+        self.assertEqual(states["wo-queue-ok"]["state"], "succeeded")
+        self.assertEqual({states[key]["issue_number"] for key in ("wo-queue-flaky", "wo-queue-ok")}, {"1001", "1002"})
+        self.assertEqual((states["wo-queue-existing"]["state"], states["wo-queue-existing"]["issue_number"]), ("skipped", "77"))
+        self.assertEqual((states["wo-queue-invalid"]["state"], states["wo-queue-invalid"]["exit_code"]), ("failed", 2))
+        self.assertEqual(queue_mod.state_counts(conn), {"succeeded": 2, "skipped": 1, "failed": 1})
+        self.assertEqual(len(api.issues), 2)
+
+        ok_data = load_json(ok)
+        self.assertEqual(ok_data["issue_number"], states["wo-queue-ok"]["issue_number"])
+        self.assertEqual([event["status"] for event in ok_data["events"] if event["stage"] == "queue"], ["enqueued", "started", "succeeded"])
+        self.assertEqual(load_json(existing)["events"][-1]["status"], "skipped_existing")
+        self.assertEqual(load_json(invalid)["runtime"]["status"], "failed")
+        self.assertTrue((flaky.parent / "artifacts" / f"queue_job_{first['id']}.log").is_file())
+
+        self.assertEqual(queue_mod.requeue(conn, "wo-queue-invalid")["state"], "queued")
+        self.assertEqual(queue_mod.cancel(conn, "wo-queue-invalid"), 1)
+
+    def test_submission_queue_never_reruns_skill_after_create_click(self):
+        lost = self.make_work_order("bug", "wo-queue-clicked")
+        found = self.make_work_order("bug", "wo-queue-clicked-found")
+        crashed = self.make_work_order("bug", "wo-queue-crashed")
+        for path in (lost, found, crashed):
+            data = load_json(path)
+            data["title"] = f"[Bug] Create clicked ({path.parent.name})"
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        queue_path = self.root / "issue_runs" / "submission_queue.sqlite3"
+        conn = queue_mod.connect_queue(queue_path)
+        self.addCleanup(conn.close)
+        for path in (lost, found):
+            queue_mod.enqueue(conn, path, "skill", max_attempts=3)
+
+        def clicked_then_failed(_conn, job, _worker, **_kwargs):
+            path = Path(job["work_order_path"])
+            support_mod.append_work_order_event(path, stage="submit_attempt", status="clicked", submitter="skill", extra={"attempt": 1})
+            support_mod.append_work_order_event(
+                path, stage="submit", status="failed", submitter="skill", error="Failed to confirm issue creation after 3 attempts."
+            )
+            return 1
+
+        now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        issues = [make_api_issue(1500, load_json(found)["title"], updated_at=now)]
+        with FakeGitHubAPI(issues) as api, mock.patch.dict(os.environ, {"GITHUB_TOKEN": "", "GH_TOKEN": ""}):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            with mock.patch.object(runner_mod, "_run_child", side_effect=clicked_then_failed):
+                done = runner_mod.worker_loop(str(queue_path), "w-test", drain=True, backoff_sec=0)
+
+            # a worker that died after Create: the re-claimed attempt is settled, not re-run
+            queue_mod.enqueue(conn, crashed, "skill")
+            job = queue_mod.claim(conn, "w-dead")
+            support_mod.append_work_order_event(crashed, stage="queue", status="started", submitter="skill")
+            support_mod.append_work_order_event(crashed, stage="submit_attempt", status="clicked", submitter="skill")
+            with mock.patch.object(runner_mod, "_run_child", side_effect=AssertionError("must not re-run")):
+                crashed_outcome = runner_mod.run_job(conn, job, "w-test", backoff_sec=0)
+
+        self.assertEqual(done, 2)
+        self.assertFalse([request for request in api.requests if request["method"] == "POST"])
+        lost_job = queue_mod.get_jobs(conn, "wo-queue-clicked")[0]
+        self.assertEqual((lost_job["state"], lost_job["attempts"]), ("failed", 1))
+        self.assertIn("Create was clicked", lost_job["last_error"])
+        self.assertEqual(load_json(lost)["runtime"]["status"], "needs_confirmation")
+        self.assertEqual(load_json(lost)["events"][-1]["status"], "needs_confirmation")
+        found_job = queue_mod.get_jobs(conn, "wo-queue-clicked-found")[0]
+        self.assertEqual((found_job["state"], found_job["issue_number"]), ("succeeded", "1500"))
+        self.assertEqual(load_json(found)["issue_number"], "1500")
+        self.assertEqual((crashed_outcome["state"], crashed_outcome["needs_confirmation"]), ("failed", True))
+
+    def test_submit_orchestrator_skips_doomed_submitters_and_fails_over(self):
+        via_api = self.make_work_order("bug", "wo-orch-api")
+        handoff = self.make_work_order("feature", "wo-orch-handoff")
+        no_browser = self.make_work_order("bug", "wo-orch-no-browser")
+        support_mod.append_work_order_event(
+            no_browser, stage="playwright", status="failed", submitter="skill",
+            error="BrowserType.launch: Executable doesn't exist at /ms-playwright/chromium/chrome",
+        )
+        invalid = self.make_work_order("feature", "wo-orch-invalid")
+        invalid_data = load_json(invalid)
+        invalid_data["proposed_solution"] = ""
+        invalid_data["expected_behavior"] = ""
+        invalid.write_text(json.dumps(invalid_data, ensure_ascii=False), encoding="utf-8")
+        order = list(orchestrator_mod.DEFAULT_ORDER)
+        headless_env = {"DISPLAY": "", "WAYLAND_DISPLAY": "", "GITHUB_TOKEN": "tok-orch", "GH_TOKEN": ""}
+
+        with FakeGitHubAPI() as api, mock.patch.dict(os.environ, headless_env), mock.patch.object(
+            orchestrator_mod.py_platform, "system", return_value="Linux"
+        ):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            plan_code, plan = orchestrator_mod.orchestrate(via_api, order=order, skill_args=["--headless"], dry_run=True)
+            api_code, api_result = orchestrator_mod.orchestrate(via_api, order=order)
+            again_code, again = orchestrator_mod.orchestrate(via_api, order=order)
+            os.environ["DISPLAY"] = ":0"
+            browser_reason = orchestrator_mod.skip_reason("skill", load_json(no_browser), [])
+            retry_reason = orchestrator_mod.skip_reason("skill", load_json(no_browser), [], retry_skill=True)
+            stale = load_json(no_browser)
+            stale["events"][-1]["timestamp"] = "2020-01-01T00:00:00+00:00"
+            stale_reason = orchestrator_mod.skip_reason("skill", stale, [])
+            api.fail_statuses = [503] * 20
+            failed_code, failed = orchestrator_mod.orchestrate(no_browser, order=["skill", "api"])
+            os.environ["GITHUB_TOKEN"] = ""
+            os.environ["DISPLAY"] = ""
+            handoff_code, handoff_result = orchestrator_mod.orchestrate(handoff, order=order)
+            invalid_code, invalid_result = orchestrator_mod.orchestrate(invalid, order=order)
+
+        self.assertEqual((plan_code, plan["status"]), (0, "planned"))
+        self.assertEqual([step["status"] for step in plan["steps"]], ["would_run", "would_run", "would_run"])
+
+        self.assertEqual((api_code, api_result["status"], api_result["submitter"]), (0, "submitted", "api"))
+        self.assertEqual(api_result["steps"][0]["category"], "browser_missing")
+        orchestrate_events = [event for event in load_json(via_api)["events"] if event["stage"] == "orchestrate"]
+        self.assertEqual([(event["submitter"], event["status"]) for event in orchestrate_events],
+                         [("skill", "skipped"), ("api", "started"), ("api", "succeeded"), ("", "skipped_existing")])
+        self.assertEqual(orchestrate_events[-1]["issue_number"], "1001")
+        self.assertEqual((again_code, again["status"]), (0, "skipped_existing"))
+
+        self.assertTrue(browser_reason.startswith("browser_missing: the last skill run"))
+        # --retry-skill overrides the skip, and an old failure no longer blocks the skill
+        self.assertEqual((retry_reason, stale_reason), ("", ""))
+        self.assertEqual((failed_code, failed["status"]), (1, "failed"))
+        self.assertEqual([step["status"] for step in failed["steps"]], ["skipped", "failed"])
+        self.assertEqual(failed["steps"][1]["exit_code"], 1)
+
+        self.assertEqual((handoff_code, handoff_result["status"], handoff_result["submitter"]), (3, "handoff", "chrome_mcp"))
+        self.assertEqual([step.get("category") for step in handoff_result["steps"][:2]], ["browser_missing", "auth"])
+        self.assertEqual(load_json(Path(handoff_result["handoff_path"]))["submitter"], "chrome_mcp")
+        self.assertEqual(load_json(handoff)["events"][-1]["status"], "handoff")
+
+        self.assertEqual((invalid_code, invalid_result["status"]), (2, "invalid"))
+        self.assertEqual([item["id"] for item in invalid_result["missing_required"]], ["proposed_solution"])
+        self.assertEqual(invalid_result["steps"], [])
+
+    @unittest.skipIf(os.name == "nt", "POSIX process groups")
+    def test_submit_orchestrator_skill_timeout_kills_the_process_group(self):
+        work_order = self.make_work_order("bug", "wo-orch-pgroup")
+        pid_file = self.root / "orch-grandchild.pid"
+        with mock.patch.object(
+            orchestrator_mod, "submitter_command", return_value=[sys.executable, "-c", GRANDCHILD_SPAWNER, str(pid_file)]
+        ):
+            code = orchestrator_mod._run_skill(work_order, [], 1)
+
+        self.assertEqual(code, -9)
+        # the skill's browser is gone before _run_skill returns and the next submitter starts
+        self.assertTrue(wait_for_exit(int(pid_file.read_text()), timeout_sec=0.5))
+        self.assertIn("# killed after 1s", (work_order.parent / "artifacts" / "orchestrate_skill.log").read_text(encoding="utf-8"))
+
+    def test_submit_orchestrator_does_not_fail_over_after_create_click(self):
+        lost = self.make_work_order("bug", "wo-orch-clicked")
+        found = self.make_work_order("bug", "wo-orch-clicked-found")
+        for path in (lost, found):
+            data = load_json(path)
+            data["title"] = f"[Bug] Create clicked ({path.parent.name})"
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        runs = []
+
+        def killed_after_click(work_order_path, _skill_args, _timeout_sec):
+            runs.append(work_order_path)
+            support_mod.append_work_order_event(work_order_path, stage="submit_attempt", status="clicked", submitter="skill")
+            return -9
+
+        now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        env = {"DISPLAY": ":0", "GITHUB_TOKEN": "tok-orch", "GH_TOKEN": ""}
+        with FakeGitHubAPI([make_api_issue(1600, load_json(found)["title"], updated_at=now)]) as api, \
+                mock.patch.dict(os.environ, env), mock.patch.object(orchestrator_mod, "_run_skill", side_effect=killed_after_click):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            lost_code, lost_result = orchestrator_mod.orchestrate(lost, order=["skill", "api"])
+            again_code, again = orchestrator_mod.orchestrate(lost, order=["skill", "api"])
+            found_code, found_result = orchestrator_mod.orchestrate(found, order=["skill", "api"])
+
+        self.assertFalse([request for request in api.requests if request["method"] == "POST"])
+        self.assertEqual(runs, [lost, found])
+        self.assertEqual((lost_code, lost_result["status"]), (4, "needs_confirmation"))
+        self.assertEqual([step["status"] for step in lost_result["steps"]], ["needs_confirmation"])
+        self.assertEqual(load_json(lost)["runtime"]["status"], "needs_confirmation")
+        self.assertEqual((again_code, again["status"]), (4, "needs_confirmation"))
+        self.assertEqual((found_code, found_result["status"], found_result["issue_number"]), (0, "submitted", "1600"))
+        self.assertEqual(load_json(found)["issue_number"], "1600")
+
+    def test_error_classifier_categorizes_failures_and_stops_permanent_retries(self):
+        samples = {
+            "BrowserType.launch: Executable doesn't exist at /ms-playwright/chromium/chrome": "browser_missing",
+            "bootstrap_check_in org.chromium.Chromium.MachPortRendezvousServer: Permission denied (1100)": "sandbox_blocked",
+            "Target page, context or browser has been closed": "browser_closed",
+            "Missing required fields: problem_statement": "validation",
+            "Missing GitHub token. Set GITHUB_TOKEN or GH_TOKEN.": "auth",
+            "page.goto: net::ERR_NAME_NOT_RESOLVED; Could not resolve host: github.com": "transient_network",
+            "Page.goto: net::ERR_NAME_NOT_RESOLVED at https://github.com/login": "transient_network",
+            "https://github.com/login?return_to=%2FiOfficeAI%2FAionUi%2Fissues%2Fnew": "auth",
+            "Timeout 30000ms exceeded.": "timeout",
+            "HTTP 403 for https://api.github.com/repos/o/r/issues: Resource not accessible by personal access token": "auth",
+            "HTTP 403 for https://api.github.com/repos/o/r/issues: API rate limit exceeded": "rate_limited",
+            "browserType.launch: spawn /ms-playwright/chromium/chrome EACCES": "sandbox_blocked",
+            "EACCES: permission denied, open '/repo/.git/index.lock'": "unknown",
+            "! [rejected] main -> main (fetch first)": "conflict",
+            "something odd": "unknown",
+            "": "",
+        }
+        self.assertEqual({text: classifier_mod.classify_text(text) for text in samples}, samples)
+        response = SimpleNamespace(status=403, url="https://api.github.com/x")
+        self.assertEqual(classifier_mod.classify_error(http_mod.HttpStatusError(response)), "auth")
+        response.status = 502
+        self.assertEqual(classifier_mod.classify_error(http_mod.HttpStatusError(response)), "transient_network")
+        self.assertEqual(classifier_mod.classify_error(text="API rate limit exceeded", status=403), "rate_limited")
+        crashed = subprocess.CalledProcessError(1, ["playwright", "install"], stderr="Host system is missing dependencies to run browsers.")
+        self.assertEqual(classifier_mod.classify_error(crashed), "browser_missing")
+        self.assertEqual(classifier_mod.classify_error(subprocess.TimeoutExpired(["git"], 5)), "timeout")
+        self.assertEqual(classifier_mod.classify_error(ConnectionResetError("reset by peer")), "transient_network")
+        self.assertTrue(classifier_mod.is_permanent("auth"))
+        self.assertFalse(classifier_mod.is_permanent("transient_network"))
+        self.assertFalse(classifier_mod.is_permanent("browser_closed"))
+        self.assertTrue(classifier_mod.is_permanent("browser_closed", within_run=True))
+
+        # the skill Create loop stops after one click once the browser is gone, or GitHub wants a login
+        closed = self.make_work_order("bug", "wo-classify-closed")
+        self.run_submit(closed, args=[], should_fail=True, page_kwargs={"create_click_error": "Target page, context or browser has been closed"})
+        self.assertEqual(self.page.create_clicks, 1)
+        failed = load_json(closed)["events"][-1]
+        self.assertEqual((failed["stage"], failed["status"], failed["error_category"]), ("submit", "failed", "browser_closed"))
+        login = self.make_work_order("bug", "wo-classify-login")
+        self.run_submit(login, args=[], should_fail=True, final_issue_url="https://github.com/login?return_to=%2Fissues%2Fnew")
+        self.assertEqual(self.page.create_clicks, 1)
+        self.assertEqual(load_json(login)["events"][-1]["error_category"], "auth")
+
+        # bootstrap does not retry `playwright install` when stderr says the sandbox blocks it
+        def failing_install(stderr_text):
+            return lambda *_a, **_k: SimpleNamespace(stderr=io.StringIO(stderr_text), wait=lambda timeout=None: 1, kill=lambda: None)
+
+        blocked = failing_install("bootstrap_check_in org.chromium: Permission denied (1100)\n")
+        flaky = failing_install("Error: getaddrinfo ENOTFOUND playwright.azureedge.net\n")
+        with mock.patch.dict(os.environ, {"SKIP_PLAYWRIGHT_INSTALL": "", "PLAYWRIGHT_INSTALL_RETRIES": "3"}), \
+                mock.patch.object(bootstrap_mod.time, "sleep") as sleep, mock.patch.object(sys, "stderr", io.StringIO()) as stderr:
+            with mock.patch.object(bootstrap_mod.subprocess, "Popen", side_effect=blocked) as popen:
+                self.assertFalse(bootstrap_mod._install_playwright_browser(Path(sys.executable)))
+            self.assertEqual((popen.call_count, sleep.call_count), (1, 0))
+            self.assertIn("Permission denied (1100)", stderr.getvalue())
+            with mock.patch.object(bootstrap_mod.subprocess, "Popen", side_effect=flaky) as popen:
+                self.assertFalse(bootstrap_mod._install_playwright_browser(Path(sys.executable)))
+            self.assertEqual(popen.call_count, 3)
+
+            # install progress reaches the console while the command is still running
+            slow = [sys.executable, "-c", "import sys, time; print('Downloading Chromium 10%', file=sys.stderr, flush=True); time.sleep(30)"]
+            with self.assertRaises(subprocess.TimeoutExpired):
+                bootstrap_mod._run_tee_stderr(slow, timeout_sec=1.5)
+            self.assertIn("Downloading Chromium 10%", stderr.getvalue())
+
+        work_order = self.make_work_order("bug", "wo-classify")
+        support_mod.append_work_order_event(work_order, stage="api", status="failed", submitter="api", error="HTTP 503 for https://api.github.com")
+        support_mod.append_work_order_event(work_order, stage="api", status="failed", submitter="api", error="boom", error_category="auth")
+        support_mod.append_work_order_event(work_order, stage="api", status="started", submitter="api")
+        events = load_json(work_order)["events"]
+        self.assertEqual([event.get("error_category") for event in events[-3:]], ["transient_network", "auth", None])
+        self.assertEqual(classifier_mod.scan(work_order.parent)["counts"], {"transient_network": 1, "auth": 1})
+
+        conn = queue_mod.connect_queue(self.root / "issue_runs" / "submission_queue.sqlite3")
+        self.addCleanup(conn.close)
+        queue_mod.enqueue(conn, work_order, "api", max_attempts=3)
+        with FakeGitHubAPI() as api, mock.patch.dict(os.environ, {"GITHUB_TOKEN": "tok-revoked", "GH_TOKEN": ""}):
+            os.environ["AIONUI_GITHUB_API_BASE"] = api.base_url
+            api.fail_statuses = [401] * 10
+            outcome = runner_mod.run_job(conn, queue_mod.claim(conn, "w-test"), "w-test", backoff_sec=0)
+        self.assertEqual((outcome["state"], outcome["error_category"]), ("failed", "auth"))
+        self.assertEqual(queue_mod.get_jobs(conn, "wo-classify")[0]["attempts"], 1)
+        self.assertEqual(load_json(work_order)["events"][-1]["error_category"], "auth")
+
     def test_skill_failure_records_structured_error(self):
         work_order = self.make_work_order("bug", "wo-timeout-001")
         self.run_submit(work_order, args=[], should_timeout=True)
@@ -664,6 +2138,170 @@ class WorkflowRegressionTests(unittest.TestCase):
         self.assertEqual(chrome_bundle["attachment_upload_status"], "listed_local")
         self.assertIn("unsupported_extension:.txt", github_payload["body"])
 
+    def test_payload_builders_reuse_cached_output_until_inputs_change(self):
+        work_order = self.make_work_order(
+            "bug",
+            "wo-payload-cache-001",
+            with_attachment=True,
+            attachment_bytes=self.png_bytes(),
+        )
+
+        first_payload = self.run_github_payload(work_order)
+        first_bundle = self.run_chrome_bundle(work_order)
+        self.assertEqual(load_json(work_order)["events"][-1]["status"], "succeeded")
+
+        second_payload = self.run_github_payload(work_order)
+        updated = load_json(work_order)
+        self.assertEqual(second_payload, first_payload)
+        self.assertEqual(updated["events"][-1]["stage"], "payload_build")
+        self.assertEqual(updated["events"][-1]["status"], "payload_cache_hit")
+        self.assertEqual(updated["runtime"]["status"], "payload_ready")
+
+        second_bundle = self.run_chrome_bundle(work_order)
+        self.assertEqual(second_bundle, first_bundle)
+        self.assertEqual(load_json(work_order)["events"][-1]["status"], "payload_cache_hit")
+
+        data = load_json(work_order)
+        data["title"] = "【Bug】新的标题 / [Bug] New title"
+        work_order.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        third_payload = self.run_github_payload(work_order)
+        self.assertEqual(third_payload["title"], "【Bug】新的标题 / [Bug] New title")
+        self.assertEqual(load_json(work_order)["events"][-1]["status"], "succeeded")
+
+        attachment = self.workspace_dir_for(work_order) / "screen.png"
+        attachment.write_bytes(self.png_bytes() + b"\x00")
+        self.run_github_payload(work_order)
+        self.assertEqual(load_json(work_order)["events"][-1]["status"], "succeeded")
+
+    def test_payload_service_serves_builders_over_jsonrpc_stdio(self):
+        work_order = self.make_work_order("bug", "wo-service-001", with_attachment=True)
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "ping"},
+            {"jsonrpc": "2.0", "id": 2, "method": "build_payload", "params": {"work_order": str(work_order)}},
+            {"jsonrpc": "2.0", "id": 3, "method": "build_payload", "params": {"work_order": str(work_order)}},
+            {"jsonrpc": "2.0", "id": 4, "method": "build_bundle", "params": {"work_order": str(work_order)}},
+            {"jsonrpc": "2.0", "id": 5, "method": "ensure_runtime", "params": {"work_order": str(work_order)}},
+            {
+                "jsonrpc": "2.0",
+                "id": 6,
+                "method": "append_event",
+                "params": {
+                    "work_order": str(work_order),
+                    "stage": "submit",
+                    "status": "succeeded",
+                    "submitter": "github_mcp",
+                    "issue_number": "42",
+                    "extra": {"via": "service"},
+                },
+            },
+            {"jsonrpc": "2.0", "id": 7, "method": "nope"},
+            {"jsonrpc": "2.0", "method": "ping"},
+            {"jsonrpc": "2.0", "id": 8, "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 9, "method": "ping"},
+        ]
+        stdin = io.StringIO("\n".join(json.dumps(r, ensure_ascii=False) for r in requests) + "\nnot json\n")
+        stdout = io.StringIO()
+
+        rc = service_mod.PayloadService().serve(stdin, stdout)
+
+        self.assertEqual(rc, 0)
+        responses = {item["id"]: item for item in map(json.loads, stdout.getvalue().splitlines())}
+        self.assertEqual(sorted(responses), [1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertIn("bug_report.yml", responses[1]["result"]["templates"])
+        self.assertFalse(responses[2]["result"]["cache_hit"])
+        self.assertTrue(responses[3]["result"]["cache_hit"])
+        self.assertEqual(responses[3]["result"]["payload"], responses[2]["result"]["payload"])
+        self.assertEqual(responses[4]["result"]["bundle"]["submitter"], "chrome_mcp")
+        self.assertEqual(responses[5]["result"]["work_id"], "wo-service-001")
+        self.assertEqual(responses[6]["result"]["event"]["extra"], {"via": "service"})
+        self.assertEqual(responses[7]["error"]["code"], service_mod.METHOD_NOT_FOUND)
+        updated = load_json(work_order)
+        self.assertEqual(updated["events"][-1]["issue_number"], "42")
+        self.assertEqual(updated["runtime"]["status"], "chrome_bundle_ready")
+
+    def test_work_order_index_tracks_session_status_and_duplicate_titles(self):
+        bug = self.make_work_order("bug", "wo-index-bug-001")
+        feature = self.make_work_order("feature", "wo-index-feature-001")
+        self.run_github_payload(bug)
+        self.run_chrome_bundle(feature)
+        index_path = self.root / "issue_runs" / index_mod.INDEX_FILENAME
+        self.assertTrue(index_path.is_file())
+        conn = index_mod.connect_index(index_path)
+
+        unsubmitted = index_mod.query_unsubmitted(conn, self.session_id)
+        self.assertEqual({row["work_id"] for row in unsubmitted}, {"wo-index-bug-001", "wo-index-feature-001"})
+        self.assertEqual(index_mod.status_counts(conn, self.session_id), {"payload_ready": 1, "chrome_bundle_ready": 1})
+
+        support_mod.update_work_order_runtime(
+            bug,
+            {"status": "submitted"},
+            {"issue_number": "901", "issue_url": "https://github.com/iOfficeAI/AionUi/issues/901"},
+        )
+        unsubmitted = index_mod.query_unsubmitted(conn, self.session_id)
+        self.assertEqual([row["work_id"] for row in unsubmitted], ["wo-index-feature-001"])
+        duplicates = index_mod.find_by_title(
+            conn,
+            "  【Bug】发送按钮点击后卡死   / [BUG] freeze after send ",
+            submitted_only=True,
+        )
+        self.assertEqual([row["issue_number"] for row in duplicates], ["901"])
+
+        index_path.unlink()
+        index_mod.close_index_connections()
+        self.assertEqual(index_mod.rebuild_index(self.root / "issue_runs"), 2)
+        rebuilt = index_mod.connect_index(index_path)
+        self.assertEqual(index_mod.get_work_order(rebuilt, "wo-index-bug-001")[0]["status"], "submitted")
+
+    def test_issue_corpus_syncs_incrementally_and_finds_fuzzy_duplicates(self):
+        issues = [
+            make_api_issue(10 + i, f"[Bug] unrelated crash number {i}", updated_at=f"2026-03-01T00:00:{i:02d}Z")
+            for i in range(5)
+        ]
+        issues.append(
+            make_api_issue(
+                1700,
+                "【Bug】发送按钮点击后卡死 / [Bug] Freeze after clicking Send",
+                updated_at="2026-03-02T00:00:00Z",
+                body="点击发送后界面卡死",
+            )
+        )
+        issues.append({**make_api_issue(1701, "PR title", updated_at="2026-03-02T00:00:01Z"), "pull_request": {}})
+
+        with FakeGitHubAPI(issues) as api, mock.patch.dict(os.environ, {"AIONUI_GITHUB_API_BASE": api.base_url}):
+            conn = corpus_mod.open_corpus(corpus_mod.corpus_path("iOfficeAI/AionUi"))
+            with mock.patch.object(corpus_mod, "PAGE_SIZE", 3):
+                first = corpus_mod.sync_corpus(conn, "iOfficeAI/AionUi")
+                second = corpus_mod.sync_corpus(conn, "iOfficeAI/AionUi")
+                third = corpus_mod.sync_corpus(conn, "iOfficeAI/AionUi")
+
+            self.assertEqual(first.pages, 3)
+            self.assertEqual(first.upserted, 6)
+            self.assertEqual(first.since, "2026-03-02T00:00:01Z")
+            self.assertFalse(second.not_modified)
+            self.assertTrue(third.not_modified)
+            self.assertEqual(api.requests[-1]["query"]["since"], "2026-03-02T00:00:01Z")
+            self.assertIn("If-None-Match", api.requests[-1]["headers"])
+
+            matches = corpus_mod.search_similar_titles(conn, "【Bug】发送按钮点击后卡死 / [Bug] Freeze after Send")
+            conn.close()
+            self.assertEqual([item.number for item in matches], [1700])
+            self.assertGreater(matches[0].score, corpus_mod.DEFAULT_DUPLICATE_THRESHOLD)
+
+            work_order = self.make_work_order("bug", "wo-corpus-dup-001")
+            with mock.patch.object(submit_mod, "sync_playwright", side_effect=AssertionError("browser must not start")), \
+                mock.patch.object(
+                    sys,
+                    "argv",
+                    ["skill_submit_aionui_issue.py", "--work-order", str(work_order), "--skip-if-duplicate"],
+                ):
+                rc = submit_mod.main()
+
+        self.assertEqual(rc, 0)
+        updated = load_json(work_order)
+        self.assertEqual(updated["runtime"]["status"], "skipped_duplicate")
+        self.assertEqual(updated["issue_number"], "")
+        self.assertEqual(updated["events"][-1]["extra"]["duplicate_candidates"][0]["number"], 1700)
+
     def test_github_mcp_git_upload_writes_repo_status_and_project_scoped_paths(self):
         work_order = self.make_work_order(
             "bug",